@@ -11,61 +11,162 @@
  */
 
 const { spawn } = require('child_process');
+const EventEmitter = require('events');
+const fs = require('fs');
 const path = require('path');
 const os = require('os');
+const readline = require('readline');
+
+// 一次启动同时检查版本和 pyautogui / One interpreter start checks both the version and pyautogui
+const PROBE = [
+  'import sys',
+  'if sys.version_info < (3, 6): sys.exit(2)',
+  'try:',
+  '    import pyautogui',
+  'except Exception:',
+  '    sys.exit(3)',
+].join('\n');
 
 /**
- * Find Python executable
- * @returns {Promise<string>} Path to Python executable
+ * Cache file for the resolved interpreter
+ * 解析出的解释器的缓存文件
+ * @returns {string} Path of the cache file
  */
-function findPython() {
-  return new Promise((resolve, reject) => {
-    const commands = ['python3', 'python'];
-    let index = 0;
+function cacheFile() {
+  const base =
+    process.env.XDG_CACHE_HOME ||
+    (process.platform === 'win32' && process.env.LOCALAPPDATA) ||
+    path.join(os.homedir(), '.cache');
+  return path.join(base, 'mouse-keepalive', 'python.json');
+}
 
-    function tryNext() {
-      if (index >= commands.length) {
-        reject(new Error('Python not found. Please install Python 3.6 or higher.'));
-        return;
-      }
+function readCache() {
+  try {
+    return JSON.parse(fs.readFileSync(cacheFile(), 'utf8'));
+  } catch (err) {
+    return null;
+  }
+}
 
-      const cmd = commands[index++];
-      const python = spawn(cmd, ['--version'], { stdio: 'pipe' });
+function writeCache(entry) {
+  try {
+    fs.mkdirSync(path.dirname(cacheFile()), { recursive: true });
+    fs.writeFileSync(cacheFile(), JSON.stringify(entry));
+  } catch (err) {
+    // 缓存只是优化，写不进去不影响运行 / The cache is only an optimization
+  }
+}
 
-      python.on('close', (code) => {
-        if (code === 0) {
-          resolve(cmd);
-        } else {
-          tryNext();
+/**
+ * Resolve a command on PATH without spawning it
+ * 不启动进程，在 PATH 中查找命令
+ * @param {string} cmd - Command name
+ * @returns {string|null} Absolute path, or null when not found
+ */
+function which(cmd) {
+  const extensions =
+    process.platform === 'win32'
+      ? (process.env.PATHEXT || '.EXE;.CMD;.BAT').split(';')
+      : [''];
+  const dirs = (process.env.PATH || '').split(path.delimiter).filter(Boolean);
+  for (const dir of dirs) {
+    for (const ext of extensions) {
+      const candidate = path.join(dir, cmd + ext);
+      try {
+        if (fs.statSync(candidate).isFile()) {
+          return fs.realpathSync(candidate);
         }
-      });
-
-      python.on('error', () => {
-        tryNext();
-      });
+      } catch (err) {
+        // 继续查找 / Keep looking
+      }
     }
+  }
+  return null;
+}
 
-    tryNext();
-  });
+function mtimeOf(file) {
+  try {
+    return fs.statSync(file).mtimeMs;
+  } catch (err) {
+    return null;
+  }
 }
 
 /**
- * Check if pyautogui is installed
+ * Check the interpreter version and pyautogui with one spawn
+ * 用一次进程启动检查解释器版本和 pyautogui
  * @param {string} pythonCmd - Python command to use
- * @returns {Promise<boolean>} Whether pyautogui is installed
+ * @returns {Promise<string|null>} 'ok', 'missing' (no pyautogui), or null (unusable interpreter)
  */
-function checkPyAutogui(pythonCmd) {
+function probePython(pythonCmd) {
   return new Promise((resolve) => {
-    const python = spawn(pythonCmd, ['-c', 'import pyautogui'], { stdio: 'pipe' });
+    const python = spawn(pythonCmd, ['-c', PROBE], { stdio: 'pipe' });
     python.on('close', (code) => {
-      resolve(code === 0);
+      if (code === 0) {
+        resolve('ok');
+      } else if (code === 3) {
+        resolve('missing');
+      } else {
+        resolve(null);
+      }
     });
     python.on('error', () => {
-      resolve(false);
+      resolve(null);
     });
   });
 }
 
+/**
+ * Find a Python executable with pyautogui, using the cache when the interpreter is unchanged
+ * 查找可用的 Python；解释器未变化（路径和 mtime 相同）时直接使用缓存，不启动任何进程
+ * @returns {Promise<{command: string, pyautogui: boolean}>} Python command and whether pyautogui is installed
+ */
+async function findPython() {
+  const cached = readCache();
+  const commands = ['python3', 'python'];
+  if (cached && commands.includes(cached.command)) {
+    const resolved = which(cached.command);
+    if (resolved && resolved === cached.path && mtimeOf(resolved) === cached.mtime) {
+      return { command: cached.command, pyautogui: true };
+    }
+  }
+
+  for (const cmd of commands) {
+    const status = await probePython(cmd);
+    if (status === null) {
+      continue;
+    }
+    return { command: cmd, pyautogui: status === 'ok' };
+  }
+  throw new Error('Python not found. Please install Python 3.6 or higher.');
+}
+
+/**
+ * Remember a working interpreter, keyed on its path and mtime
+ * 记住可用的解释器，以路径和 mtime 为键
+ * @param {string} pythonCmd - Python command that passed the checks
+ */
+function rememberPython(pythonCmd) {
+  const resolved = which(pythonCmd);
+  if (resolved) {
+    writeCache({ command: pythonCmd, path: resolved, mtime: mtimeOf(resolved) });
+  }
+}
+
+/**
+ * Find Python and make sure pyautogui is installed
+ * 查找 Python 并确保已安装 pyautogui
+ * @returns {Promise<string>} Python command
+ */
+async function preparePython() {
+  const python = await findPython();
+  if (!python.pyautogui) {
+    await installPyAutogui(python.command);
+  }
+  rememberPython(python.command);
+  return python.command;
+}
+
 /**
  * Install pyautogui if not present
  * @param {string} pythonCmd - Python command to use
@@ -149,19 +250,8 @@ function runPythonModule(pythonCmd, args) {
  */
 async function moveMouse(interval = 60, duration = null, verbose = false) {
   try {
-    // Find Python
-    const pythonCmd = await findPython();
-
-    // Check if pyautogui is installed
-    const hasPyAutogui = await checkPyAutogui(pythonCmd);
-    if (!hasPyAutogui) {
-      try {
-        await installPyAutogui(pythonCmd);
-      } catch (err) {
-        console.error(err.message);
-        process.exit(1);
-      }
-    }
+    // Find Python and check pyautogui (cached after the first successful launch)
+    const pythonCmd = await preparePython();
 
     // Build arguments
     const args = [];
@@ -184,5 +274,142 @@ async function moveMouse(interval = 60, duration = null, verbose = false) {
   }
 }
 
-module.exports = { moveMouse };
+/**
+ * Client of a long-lived Python worker (`python -m mouse_keepalive worker`)
+ * 常驻 Python 工作进程的客户端
+ *
+ * Requests and replies are JSON lines over stdio. Run events (start, move, finish, ...) are emitted
+ * as 'event'; the process exits after close() or when its stdin closes.
+ * 请求和回复是 stdio 上的 JSON 行；运行事件以 'event' 发出。
+ */
+class KeepaliveWorker extends EventEmitter {
+  /**
+   * @param {import('child_process').ChildProcess} child - Worker process
+   */
+  constructor(child) {
+    super();
+    this.child = child;
+    this.nextId = 1;
+    this.pending = new Map();
+    this.exited = false;
+
+    readline.createInterface({ input: child.stdout }).on('line', (line) => this.onLine(line));
+    child.on('exit', (code, signal) => {
+      this.fail(new Error(`Worker exited (${signal || code})`));
+      this.emit('exit', code, signal);
+    });
+    // 启动失败（例如找不到解释器）/ Start-up failures, e.g. the interpreter is gone
+    child.on('error', (err) => this.fail(err));
+  }
+
+  fail(err) {
+    this.exited = true;
+    for (const { reject } of this.pending.values()) {
+      reject(err);
+    }
+    this.pending.clear();
+  }
+
+  onLine(line) {
+    let message;
+    try {
+      message = JSON.parse(line);
+    } catch (err) {
+      return;
+    }
+    if (message.id === undefined) {
+      this.emit('event', message);
+      return;
+    }
+    const request = this.pending.get(message.id);
+    if (!request) {
+      return;
+    }
+    this.pending.delete(message.id);
+    if (message.ok) {
+      request.resolve(message.result);
+    } else {
+      request.reject(new Error(message.error));
+    }
+  }
+
+  /**
+   * Send one request
+   * @param {string} cmd - Command name
+   * @param {object} [fields] - Extra request fields
+   * @returns {Promise<any>} Result of the command
+   */
+  request(cmd, fields = {}) {
+    if (this.exited) {
+      return Promise.reject(new Error('Worker has exited'));
+    }
+    const id = this.nextId++;
+    return new Promise((resolve, reject) => {
+      this.pending.set(id, { resolve, reject });
+      this.child.stdin.write(JSON.stringify({ ...fields, id, cmd }) + '\n');
+    });
+  }
+
+  /**
+   * Start keepalive
+   * @param {object} [options] - interval, duration, method, idle_threshold, scheduler, missed_policy, jitter
+   */
+  start(options = {}) {
+    return this.request('start', options);
+  }
+
+  stop() {
+    return this.request('stop');
+  }
+
+  pause() {
+    return this.request('pause');
+  }
+
+  resume() {
+    return this.request('resume');
+  }
+
+  setInterval(seconds) {
+    return this.request('set-interval', { interval: seconds });
+  }
+
+  setMethod(method) {
+    return this.request('set-method', { method });
+  }
+
+  stats() {
+    return this.request('stats');
+  }
+
+  /**
+   * Stop keepalive and let the worker exit
+   * @returns {Promise<void>}
+   */
+  close() {
+    if (this.exited) {
+      return Promise.resolve();
+    }
+    const exited = new Promise((resolve) => this.once('exit', () => resolve()));
+    return this.request('quit')
+      .catch(() => {})
+      .then(() => exited);
+  }
+}
+
+/**
+ * Start a long-lived worker; Python starts once and keepalive can then be started, stopped
+ * and queried repeatedly
+ * 启动常驻工作进程：Python 只启动一次，之后可以反复开始、停止和查询
+ * @returns {Promise<KeepaliveWorker>} Worker client
+ */
+async function startWorker() {
+  const pythonCmd = await preparePython();
+  const child = spawn(pythonCmd, ['-m', 'mouse_keepalive', 'worker'], {
+    stdio: ['pipe', 'pipe', 'inherit'],
+  });
+  return new KeepaliveWorker(child);
+}
+
+module.exports = { moveMouse, startWorker, KeepaliveWorker };
 
@@ -8,20 +8,41 @@
 - 支持依赖注入，便于测试
 """
 
-try:
-    from importlib.metadata import version, PackageNotFoundError
-except ImportError:
-    # Python < 3.8
-    from importlib_metadata import version, PackageNotFoundError  # type: ignore[no-redef]
-
-try:
-    __version__ = version("mouse-keepalive")
-except PackageNotFoundError:
-    # 如果包未安装，使用硬编码版本 / Fallback if package not installed
-    __version__ = "1.2.1"
-
 __author__ = "motoish"
 
 from .move_mouse import move_mouse, main, MouseMover, MouseController, MousePosition, ScreenSize
 
-__all__ = ["move_mouse", "main", "MouseMover", "MouseController", "MousePosition", "ScreenSize"]
+__all__ = ["move_mouse", "main", "MouseMover", "AsyncMouseMover", "MouseController", "MousePosition", "ScreenSize"]
+
+
+def __getattr__(name):
+    """
+    延迟计算 __version__ 和 AsyncMouseMover / Lazily resolve __version__ and AsyncMouseMover
+
+    importlib.metadata 和 asyncio 的导入开销较大，只在真正访问时才执行，
+    保证 import mouse_keepalive 和 --help 足够快
+    importlib.metadata and asyncio are expensive to import, so only do it when actually accessed
+    """
+    if name == "AsyncMouseMover":
+        from .async_mover import AsyncMouseMover
+
+        globals()[name] = AsyncMouseMover
+        return AsyncMouseMover
+
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        # Python < 3.8
+        from importlib_metadata import version, PackageNotFoundError  # type: ignore[no-redef]
+
+    try:
+        value = version("mouse-keepalive")
+    except PackageNotFoundError:
+        # 如果包未安装，使用硬编码版本 / Fallback if package not installed
+        value = "1.2.1"
+
+    globals()["__version__"] = value
+    return value
@@ -0,0 +1,165 @@
+"""
+asyncio 版本的保活引擎 / asyncio-native keepalive engine
+
+在事件循环中等待下一个 tick，后端调用放到执行器中运行，不阻塞事件循环。
+Awaits between ticks on the event loop and runs backend calls in an executor,
+so keepalive can share one loop with other I/O.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from .move_mouse import MouseMover, MousePosition
+from .scheduler import DeadlineScheduler
+
+
+class AsyncMouseMover(MouseMover):
+    """
+    异步鼠标移动器 / Async mouse mover
+
+    复用 MouseMover 的 perform_move / perform_key_press / calculate_next_position 和回调约定；
+    停止方式：stop()、取消任务或达到运行时长。不支持 method="auto" 和运行时控制通道（control）
+    Reuses MouseMover's perform_move / perform_key_press / calculate_next_position and callback
+    conventions; stops via stop(), task cancellation or reaching the duration. method="auto" and the
+    runtime control channel (control) are not supported
+    """
+
+    def __init__(self, *args, executor: Optional[Executor] = None, **kwargs):
+        """
+        Args:
+            executor: 运行后端调用的执行器，None 表示每次 run_async 使用一个专用的单线程执行器；
+                SetThreadExecutionState 等状态属于调用线程，method="inhibit" 需要单线程执行器 /
+                Executor for backend calls, None uses a dedicated single-thread executor per run_async.
+                State such as SetThreadExecutionState belongs to the calling thread, so method="inhibit"
+                needs a single-thread executor
+            其余参数同 MouseMover / Other arguments are the same as MouseMover
+        """
+        super().__init__(*args, **kwargs)
+        self.executor = executor
+        self._stop_event: Optional[asyncio.Event] = None
+        self._stop_requested = False
+
+    def stop(self) -> None:
+        """
+        请求停止 run_async，正在等待的 tick 会立即被唤醒 / Ask run_async to stop, waking any pending wait
+
+        必须在事件循环线程中调用 / Must be called from the event loop thread
+        """
+        self._stop_requested = True
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def _wait(self, delay: float) -> None:
+        """可被 stop() 打断的等待 / Wait that stop() can interrupt"""
+        assert self._stop_event is not None
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run_async(
+        self,
+        interval: float = 60,
+        duration: Optional[float] = None,
+        method: str = "mouse",
+        on_start: Optional[Callable[[], None]] = None,
+        on_move: Optional[Callable[[int, MousePosition, float, bool], None]] = None,
+        on_finish: Optional[Callable[[int, float], None]] = None,
+        idle_threshold: Optional[float] = None,
+        on_skip: Optional[Callable[[float, float], None]] = None,
+        missed_policy: str = "skip",
+        jitter: float = 0.0,
+    ) -> Tuple[int, float]:
+        """
+        异步运行保活循环，使用 monotonic_func 的截止时间调度 / Run the keepalive loop on deadline scheduling
+
+        参数含义同 MouseMover.run / Arguments have the same meaning as MouseMover.run
+
+        Returns:
+            (移动次数, 运行时长) / (Move count, duration)
+
+        Raises:
+            ValueError: method="auto" 或设置了 control / method="auto" or control is set
+            asyncio.CancelledError: 任务被取消时（on_finish 已调用）/ When the task is cancelled (on_finish already called)
+        """
+        # 两者都依赖 run() 的同步循环（验证探测、可中断的 sleep）/ Both rely on run()'s synchronous loop (the
+        # verification probe, the interruptible sleep)
+        if method == "auto":
+            raise ValueError('run_async does not support method="auto", use run()')
+        if self.control is not None:
+            raise ValueError("run_async does not support control, use run()")
+
+        loop = asyncio.get_running_loop()
+        # 所有后端调用和 close() 都在同一个线程上，不占用事件循环 / Every backend call and close() run on
+        # one thread, off the event loop
+        owned = ThreadPoolExecutor(max_workers=1, thread_name_prefix="keepalive") if self.executor is None else None
+        executor = owned or self.executor
+        self._stop_event = asyncio.Event()
+        if self._stop_requested:
+            self._stop_event.set()
+
+        if on_start:
+            on_start()
+
+        clock = self.monotonic_func
+        deadlines = DeadlineScheduler(interval, policy=missed_policy, jitter=jitter)
+        self.deadlines = deadlines
+        start_time = clock()
+        deadlines.start(start_time)
+        move_count = 0
+        elapsed = 0.0
+        cancelled = False
+
+        try:
+            while not self._stop_event.is_set():
+                deadlines.advance(clock())
+                if self.metrics is not None:
+                    self.metrics.observe_lateness(deadlines.last_lateness)
+
+                idle = None
+                if idle_threshold is not None:
+                    idle = await loop.run_in_executor(executor, self.idle_func)
+
+                if idle is not None and idle_threshold is not None and idle < idle_threshold:
+                    elapsed = clock() - start_time
+                    if self.metrics is not None:
+                        self.metrics.record_skip()
+                    if on_skip:
+                        on_skip(idle, elapsed)
+                else:
+                    current_pos, move_count, success = await loop.run_in_executor(
+                        executor, self.perform_tick, method, move_count
+                    )
+                    elapsed = clock() - start_time
+                    if self.metrics is not None:
+                        self.metrics.record_tick(method, success)
+                    if on_move:
+                        on_move(move_count, current_pos, elapsed, success)
+
+                if duration and elapsed >= duration:
+                    break
+
+                now = clock()
+                delay = deadlines.delay(now)
+                if duration:
+                    delay = min(delay, max(0.0, start_time + duration - now))
+                await self._wait(delay)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            # close() 会等待调用线程退出，不能在事件循环线程中执行 / close() joins the call worker, so it must
+            # not run on the event loop thread
+            await loop.run_in_executor(executor, self.close)
+            if owned is not None:
+                owned.shutdown(wait=False)
+            self._stop_event = None
+            self._stop_requested = False
+            if cancelled and on_finish:
+                on_finish(move_count, clock() - start_time)
+
+        elapsed = clock() - start_time
+        if on_finish:
+            on_finish(move_count, elapsed)
+        return move_count, elapsed
@@ -0,0 +1,323 @@
+"""
+输入注入后端注册表 / Input-injection backend registry
+
+每个后端声明自己的能力，并提供一个探测函数用于自动选择；控制器实例按 (后端, 显示) 缓存，
+多个 MouseMover 共享同一个长连接。
+Each backend declares its capabilities and a probe used for auto-detection; controller
+instances are cached per (backend, display) so several MouseMovers share one long-lived
+connection.
+
+内置后端 / Built-in backends:
+- xlib: libX11 + XTest（ctypes，持久连接，支持空闲查询）/ libX11 + XTest (ctypes, persistent, idle query)
+- pyautogui: 跨平台 / cross-platform
+- uinput: Linux 虚拟输入设备，不依赖显示服务器（无 X、Wayland）/ Linux virtual input device, no display server
+  needed (headless, Wayland)
+- xdotool: 每次调用启动一个 xdotool 进程，开销最大 / spawns one xdotool process per call, the most expensive
+- null: 不注入任何输入，用于测试和测量开销 / injects nothing, for tests and overhead measurements
+"""
+
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from .move_mouse import MouseController, MousePosition, ScreenSize
+
+# 能力 / Capabilities
+RELATIVE = "relative"  # jiggle(dx, dy)
+KEYS = "keys"  # press_key(key)
+IDLE = "idle"  # idle_seconds()
+PERSISTENT = "persistent"  # 长连接，不会每次调用重新打开 / long-lived connection, not reopened per call
+BLOCKING = "blocking"  # 调用可能卡住，默认启用 --call-timeout / calls can hang, --call-timeout is on by default
+
+
+@dataclass(frozen=True)
+class Backend:
+    """已注册的后端 / A registered backend"""
+
+    name: str
+    # 根据显示名创建控制器 / Creates a controller for a display name
+    factory: Callable[[Optional[str]], Any]
+    capabilities: FrozenSet[str]
+    # 该后端在当前主机上是否可用（不打开连接）/ Whether the backend can work on this host (without connecting)
+    probe: Callable[[Optional[str]], bool]
+    description: str = ""
+
+
+_registry: Dict[str, Backend] = {}
+
+# 自动选择时的尝试顺序，开销低的在前 / Order tried by auto-detection, cheapest first
+AUTO_ORDER: List[str] = ["xlib", "uinput", "pyautogui", "xdotool"]
+
+_instances: Dict[Tuple[str, Optional[str]], Any] = {}
+_instances_lock = threading.Lock()
+
+
+def register_backend(
+    name: str,
+    factory: Callable[[Optional[str]], Any],
+    capabilities: Iterable[str] = (),
+    probe: Optional[Callable[[Optional[str]], bool]] = None,
+    description: str = "",
+) -> Backend:
+    """
+    注册一个后端，同名后端会被替换 / Register a backend, replacing any with the same name
+
+    Args:
+        name: 后端名，用于 --backend / Backend name, used by --backend
+        factory: 根据显示名创建控制器 / Creates a controller for a display name
+        capabilities: 能力集合 / Capability set
+        probe: 可用性探测，None 表示总是可用 / Availability probe, None means always available
+        description: 说明 / Description
+    """
+    backend = Backend(name, factory, frozenset(capabilities), probe or (lambda display: True), description)
+    _registry[name] = backend
+    return backend
+
+
+def get_backend(name: str) -> Backend:
+    """
+    按名称获取后端 / Look up a backend by name
+
+    Raises:
+        ValueError: 未知后端 / Unknown backend
+    """
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError(f"未知后端 / Unknown backend: {name}") from None
+
+
+def backend_names() -> List[str]:
+    """所有已注册的后端名 / Names of all registered backends"""
+    return list(_registry)
+
+
+def detect_backend(display: Optional[str] = None) -> Optional[str]:
+    """
+    按 AUTO_ORDER 返回第一个可用的后端 / Return the first available backend in AUTO_ORDER
+
+    Wayland 会话中 XWayland 也会设置 $DISPLAY，但 XTest 事件不会重置合成器的空闲计时器，因此先尝试 uinput
+    In a Wayland session XWayland sets $DISPLAY as well, but XTest events do not reset the compositor's idle
+    timer, so uinput is tried first
+
+    Returns:
+        后端名，没有可用后端时返回 None / Backend name, None when nothing is available
+    """
+    order = list(AUTO_ORDER)
+    if display is None and _is_wayland_session() and "uinput" in order:
+        order.remove("uinput")
+        order.insert(0, "uinput")
+    for name in order:
+        backend = _registry.get(name)
+        if backend is None:
+            continue
+        try:
+            if backend.probe(display):
+                return name
+        except Exception:
+            continue
+    return None
+
+
+def get_controller(name: str = "auto", display: Optional[str] = None) -> Any:
+    """
+    获取共享的控制器实例 / Get a shared controller instance
+
+    Args:
+        name: 后端名或 "auto" / Backend name or "auto"
+        display: 显示名，None 表示默认显示 / Display name, None for the default display
+
+    Raises:
+        ValueError: 未知后端或没有可用后端 / Unknown backend or no backend available
+    """
+    if name == "auto":
+        detected = detect_backend(display)
+        if detected is None:
+            raise ValueError("没有可用的输入后端 / No input backend available")
+        name = detected
+    backend = get_backend(name)
+
+    key = (name, display)
+    with _instances_lock:
+        controller = _instances.get(key)
+        if controller is None:
+            controller = _instances[key] = backend.factory(display)
+    return controller
+
+
+def reopen_controller(name: str, display: Optional[str] = None) -> Any:
+    """
+    丢弃共享实例并创建新的（用于后端卡住后重连）/ Drop the shared instance and create a new one (reconnect
+    after a stalled backend)
+
+    旧实例不会被关闭：卡住的调用可能仍在使用它 / The old instance is not closed, as a stuck call may still use it
+    """
+    with _instances_lock:
+        _instances.pop((name, display), None)
+    return get_controller(name, display)
+
+
+def close_controllers() -> None:
+    """关闭并丢弃所有共享的控制器 / Close and drop every shared controller"""
+    with _instances_lock:
+        controllers = list(_instances.values())
+        _instances.clear()
+    for controller in controllers:
+        close = getattr(controller, "close", None)
+        if close is not None:
+            close()
+
+
+class NullController:
+    """不注入任何输入的控制器 / Controller that injects nothing"""
+
+    def __init__(self, display: Optional[str] = None):
+        self._position = MousePosition(500, 400)
+        self._screen = ScreenSize(1920, 1080)
+
+    def get_position(self) -> MousePosition:
+        return self._position
+
+    def get_screen_size(self) -> ScreenSize:
+        return self._screen
+
+    def move_to(self, x: int, y: int, duration: float = 0.1) -> None:
+        pass
+
+    def jiggle(self, dx: int, dy: int) -> None:
+        pass
+
+    def move_path(self, steps: Sequence[int]) -> None:
+        pass
+
+    def press_key(self, key: str = "shift") -> None:
+        pass
+
+
+class XdotoolController:
+    """
+    通过 xdotool 命令注入 / Inject through the xdotool command
+
+    没有持久连接：每次调用启动一个进程，只适合作为其他后端都不可用时的回退
+    No persistent connection: every call spawns a process, so it is only a fallback
+    """
+
+    def __init__(self, display: Optional[str] = None):
+        self.display = display
+
+    def _run(self, *args: str) -> str:
+        import subprocess
+
+        env = dict(os.environ, DISPLAY=self.display) if self.display else None
+        result = subprocess.run(["xdotool", *args], capture_output=True, text=True, check=True, env=env)
+        return result.stdout
+
+    def get_position(self) -> MousePosition:
+        """获取当前鼠标位置 / Get current mouse position"""
+        values = dict(line.split("=", 1) for line in self._run("getmouselocation", "--shell").split() if "=" in line)
+        return MousePosition(int(values["X"]), int(values["Y"]))
+
+    def get_screen_size(self) -> ScreenSize:
+        """获取屏幕尺寸 / Get screen size"""
+        width, height = self._run("getdisplaygeometry").split()
+        return ScreenSize(int(width), int(height))
+
+    def move_to(self, x: int, y: int, duration: float = 0.1) -> None:
+        """移动鼠标到指定位置（瞬时）/ Move mouse to specified position (instantaneous)"""
+        self._run("mousemove", str(int(x)), str(int(y)))
+
+    def jiggle(self, dx: int, dy: int) -> None:
+        """在同一个 xdotool 进程中相对移动并移回 / Relative move and back within one xdotool process"""
+        dx, dy = int(dx), int(dy)
+        self._run("mousemove_relative", "--", str(dx), str(dy), "mousemove_relative", "--", str(-dx), str(-dy))
+
+    def move_path(self, steps: Sequence[int]) -> None:
+        """整条路径在同一个 xdotool 进程中完成 / The whole path within one xdotool process"""
+        args: List[str] = []
+        for i in range(0, len(steps), 2):
+            args += ["mousemove_relative", "--", str(int(steps[i])), str(int(steps[i + 1]))]
+        self._run(*args)
+
+    def press_key(self, key: str = "shift") -> None:
+        """模拟按键按下和释放 / Simulate key press and release"""
+        from .x11 import _KEYSYM_NAMES
+
+        self._run("key", _KEYSYM_NAMES.get(key, key))
+
+
+def _is_wayland_session() -> bool:
+    return bool(os.environ.get("WAYLAND_DISPLAY")) or os.environ.get("XDG_SESSION_TYPE") == "wayland"
+
+
+def _has_x_display(display: Optional[str]) -> bool:
+    return sys.platform.startswith("linux") and bool(display or os.environ.get("DISPLAY"))
+
+
+def _probe_xlib(display: Optional[str]) -> bool:
+    import ctypes.util
+
+    return _has_x_display(display) and all(ctypes.util.find_library(name) for name in ("X11", "Xtst"))
+
+
+def _probe_pyautogui(display: Optional[str]) -> bool:
+    import importlib.util
+
+    if display is not None:
+        # pyautogui 只能使用进程的 $DISPLAY / pyautogui can only use the process's $DISPLAY
+        return False
+    return "pyautogui" in sys.modules or importlib.util.find_spec("pyautogui") is not None
+
+
+def _probe_xdotool(display: Optional[str]) -> bool:
+    import shutil
+
+    return _has_x_display(display) and shutil.which("xdotool") is not None
+
+
+def _probe_uinput(display: Optional[str]) -> bool:
+    return sys.platform.startswith("linux") and os.access("/dev/uinput", os.W_OK)
+
+
+def _xlib_factory(display: Optional[str]) -> Any:
+    from .x11 import X11Controller
+
+    return X11Controller(display)
+
+
+def _uinput_factory(display: Optional[str]) -> Any:
+    from .uinput import UinputController
+
+    return UinputController(display)
+
+
+register_backend(
+    "xlib",
+    _xlib_factory,
+    {RELATIVE, KEYS, IDLE, PERSISTENT, BLOCKING},
+    _probe_xlib,
+    "libX11 + XTest，持久连接 / libX11 + XTest, persistent connection",
+)
+register_backend(
+    "uinput",
+    _uinput_factory,
+    {RELATIVE, KEYS, PERSISTENT},
+    _probe_uinput,
+    "Linux uinput 虚拟设备，不需要显示服务器 / Linux uinput virtual device, no display server needed",
+)
+register_backend(
+    "pyautogui",
+    lambda display: MouseController(),
+    {RELATIVE, KEYS, PERSISTENT, BLOCKING},
+    _probe_pyautogui,
+    "跨平台 / Cross-platform",
+)
+register_backend(
+    "xdotool",
+    XdotoolController,
+    {RELATIVE, KEYS, BLOCKING},
+    _probe_xdotool,
+    "xdotool 命令，每次调用一个进程 / xdotool command, one process per call",
+)
+register_backend("null", NullController, {RELATIVE, KEYS}, None, "不注入输入 / Injects nothing")
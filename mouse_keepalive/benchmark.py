@@ -0,0 +1,246 @@
+"""
+tick 热路径基准测试 / Benchmarks for the tick hot path
+
+用法 / Usage:
+    python -m mouse_keepalive.benchmark                      # 假控制器，测纯开销 / fake controller, pure overhead
+    python -m mouse_keepalive.benchmark --backend pyautogui  # 真实后端（例如在 Xvfb 下）/ real backend (e.g. under Xvfb)
+    python -m mouse_keepalive.benchmark --backend xlib --display :99
+    python -m mouse_keepalive.benchmark -o bench.json        # 保存 JSON 结果 / save JSON results
+
+结果包含每次调用的耗时统计（纳秒）和内存分配（tracemalloc），便于跨版本对比。
+Results contain per-call latency statistics (ns) and allocations (tracemalloc) so that
+regressions show up release over release.
+"""
+
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .move_mouse import MouseController, MouseMover, MousePosition, ScreenSize
+from .patterns import get_pattern
+from .reporter import Reporter, RunReporter
+
+
+class FakeController(MouseController):
+    """什么都不做的控制器，用于测量纯开销 / No-op controller for measuring pure overhead"""
+
+    def __init__(self) -> None:
+        self._position = MousePosition(500, 400)
+        self._screen = ScreenSize(1920, 1080)
+
+    def get_position(self) -> MousePosition:
+        return self._position
+
+    def get_screen_size(self) -> ScreenSize:
+        return self._screen
+
+    def move_to(self, x: int, y: int, duration: float = 0.1) -> None:
+        pass
+
+    def jiggle(self, dx: int, dy: int) -> None:
+        pass
+
+    def move_path(self, steps: Sequence[int]) -> None:
+        pass
+
+    def press_key(self, key: str = "shift") -> None:
+        pass
+
+
+def _percentile(samples: List[int], fraction: float) -> int:
+    index = min(len(samples) - 1, int(round(fraction * (len(samples) - 1))))
+    return samples[index]
+
+
+def measure(func: Callable[[], Any], iterations: int, warmup: int = 10) -> Dict[str, Any]:
+    """
+    测量函数的单次调用耗时和内存分配 / Measure per-call latency and allocations of a function
+
+    Args:
+        func: 被测函数 / Function under test
+        iterations: 迭代次数 / Number of iterations
+        warmup: 预热次数 / Number of warmup calls
+
+    Returns:
+        统计结果（纳秒、字节）/ Statistics (ns, bytes)
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    perf_counter_ns = time.perf_counter_ns
+    for _ in range(iterations):
+        start = perf_counter_ns()
+        func()
+        samples.append(perf_counter_ns() - start)
+    samples.sort()
+
+    # 分配单独测量，避免 tracemalloc 影响耗时 / Measure allocations separately so tracemalloc doesn't skew timing
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        snapshot_start = tracemalloc.take_snapshot()
+        for _ in range(iterations):
+            func()
+        snapshot_end = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    diff = snapshot_end.compare_to(snapshot_start, "filename")
+    allocated = sum(stat.size_diff for stat in diff if stat.size_diff > 0)
+    allocations = sum(stat.count_diff for stat in diff if stat.count_diff > 0)
+
+    return {
+        "iterations": iterations,
+        "min_ns": samples[0],
+        "median_ns": _percentile(samples, 0.5),
+        "p95_ns": _percentile(samples, 0.95),
+        "max_ns": samples[-1],
+        "mean_ns": sum(samples) // len(samples),
+        "alloc_bytes_per_call": allocated / iterations,
+        "alloc_blocks_per_call": allocations / iterations,
+        "peak_bytes": max(0, peak - before),
+    }
+
+
+def _null_print(*args, **kwargs) -> None:
+    pass
+
+
+class _NullStream:
+    def write(self, text: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+
+def run_benchmarks(controller: Optional[Any] = None, iterations: int = 1000) -> Dict[str, Any]:
+    """
+    运行所有基准 / Run all benchmarks
+
+    Args:
+        controller: 被测控制器，None 表示 FakeController / Controller under test, None uses FakeController
+        iterations: 每项迭代次数 / Iterations per benchmark
+
+    Returns:
+        {基准名: 统计结果} / {benchmark name: statistics}
+    """
+    controller = controller or FakeController()
+    mover = MouseMover(controller=controller, print_func=_null_print, sleep_func=lambda seconds: None)
+    screen = ScreenSize(1920, 1080)
+    position = MousePosition(500, 400)
+    counter = [0]
+
+    def calculate():
+        counter[0] += 1
+        mover.calculate_next_position(position, screen, counter[0])
+
+    def perform_move():
+        counter[0] += 1
+        mover.perform_move(counter[0])
+
+    zero_tween = MouseMover(controller=controller, print_func=_null_print, move_duration=0)
+
+    def perform_move_zero_tween():
+        counter[0] += 1
+        zero_tween.perform_move(counter[0])
+
+    pattern_mover = MouseMover(controller=controller, print_func=_null_print, pattern=get_pattern("bezier", seed=0))
+
+    def perform_move_pattern():
+        counter[0] += 1
+        pattern_mover.perform_move(counter[0])
+
+    def perform_key_press():
+        counter[0] += 1
+        mover.perform_key_press(counter[0])
+
+    # 与 move_mouse()/main() 相同的回调格式化路径（同步写出，包含格式化开销）
+    # Same callback formatting path as move_mouse()/main() (written synchronously, includes formatting)
+    callbacks = RunReporter(Reporter(stream=_NullStream(), background=False))  # type: ignore[arg-type]
+
+    def callback_format():
+        counter[0] += 1
+        callbacks.on_move(counter[0], position, counter[0] * 60.0, True)
+
+    # 时钟每次调用前进 1 秒，duration=1 使每次 run() 恰好执行一次 tick
+    # The clock advances 1s per call, so duration=1 makes every run() perform exactly one tick
+    run_mover = MouseMover(
+        controller=controller,
+        print_func=_null_print,
+        sleep_func=lambda seconds: None,
+        time_func=itertools.count().__next__,
+    )
+
+    def on_move(move_count, current_pos, elapsed, success):
+        _null_print(f"[{int(elapsed)}s] 已移动鼠标 {move_count} 次 / Moved mouse {move_count} times")
+
+    def run_iteration():
+        run_mover.run(interval=1, duration=1, on_move=on_move)
+
+    results = {
+        "calculate_next_position": measure(calculate, iterations),
+        "perform_move": measure(perform_move, iterations),
+        "perform_move_zero_tween": measure(perform_move_zero_tween, iterations),
+        "perform_move_pattern": measure(perform_move_pattern, iterations),
+        "perform_key_press": measure(perform_key_press, iterations),
+        "callback_format": measure(callback_format, iterations),
+        "run_iteration": measure(run_iteration, iterations),
+    }
+    # 每次 tick 的后端调用次数 / Backend calls per tick
+    mover.perform_move(0)
+    results["perform_move"]["backend_calls_per_tick"] = dict(mover.last_tick_calls)
+    pattern_mover.perform_move(0)
+    results["perform_move_pattern"]["backend_calls_per_tick"] = dict(pattern_mover.last_tick_calls)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """基准测试入口 / Benchmark entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m mouse_keepalive.benchmark", description=__doc__.split("\n")[1])
+    from .backends import backend_names, get_controller
+
+    parser.add_argument(
+        "--backend",
+        choices=["fake", *backend_names()],
+        default="fake",
+        help="fake（纯开销）或已注册的后端 / fake (pure overhead) or a registered backend",
+    )
+    parser.add_argument("--display", default=None, help="后端使用的显示 / Display for the backend")
+    parser.add_argument("-n", "--iterations", type=int, default=1000, help="每项迭代次数 / Iterations per benchmark")
+    parser.add_argument("-o", "--output", default=None, help="JSON 输出文件 / JSON output file")
+    args = parser.parse_args(argv)
+
+    controller = FakeController() if args.backend == "fake" else get_controller(args.backend, args.display)
+    report = {
+        "version": _package_version(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "backend": args.backend,
+        "timestamp": time.time(),
+        "results": run_benchmarks(controller, iterations=args.iterations),
+    }
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+def _package_version() -> str:
+    from . import __version__
+
+    version: str = __version__
+    return version
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+有时限的后端调用 / Backend calls with a deadline
+
+X 服务器卡住或 Win32 钩子阻塞时，控制器调用可能永远不返回；try/except 只能捕获异常，挡不住挂起。
+CallWorker 在专用线程上执行调用并限时等待：超时后放弃该线程（它仍被卡住），后续调用改用新线程。
+A stalled X server or a blocking Win32 hook can keep a controller call from ever returning, and
+try/except only catches errors, not hangs. CallWorker runs calls on a dedicated thread and waits with
+a deadline.
+
+超时后不会另开线程去调用同一个控制器（例如未 XInitThreads 的 Display* 不能被两个线程同时使用），
+而是在卡住的调用返回前拒绝新调用；换用新控制器（重连）后再调用 abandon() 改用新线程。
+After a timeout the same controller is never called from a second thread (an un-XInitThreads'ed
+Display*, for one, must not be used by two threads at once); new calls are refused until the stuck
+call returns, and abandon() moves to a fresh thread once a new controller (a reconnect) is in use.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+# 可能卡住的后端的默认时限（秒）/ Default deadline for backends that can hang (seconds)
+DEFAULT_TIMEOUT = 5.0
+
+
+class CallTimeout(Exception):
+    """后端调用超时或正处于退避期 / A backend call timed out or is in backoff"""
+
+    def __init__(self, name: str, timeout: float, message: Optional[str] = None):
+        super().__init__(message or f"{name} did not return within {timeout:g}s")
+        self.name = name
+        self.timeout = timeout
+
+
+class _Job:
+    __slots__ = ("name", "func", "args", "kwargs", "done", "result", "error")
+
+    def __init__(self, func: Callable[..., Any], args: tuple, kwargs: dict):
+        self.name = getattr(func, "__name__", "call")
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def _serve(jobs: "queue.SimpleQueue[Optional[_Job]]") -> None:
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        try:
+            job.result = job.func(*job.args, **job.kwargs)
+        except BaseException as e:  # noqa: B036 - 原样交给调用方 / handed to the caller as is
+            job.error = e
+        job.done.set()
+
+
+class CallWorker:
+    """
+    在专用线程上串行执行调用 / Run calls one at a time on a dedicated thread
+
+    所有调用都在同一个线程上串行执行，因此不要求后端线程安全
+    Calls are serialized on one thread, so backends need not be thread-safe
+    """
+
+    def __init__(self, name: str = "backend-call"):
+        self.name = name
+        # 因调用卡住而放弃的线程数 / Threads abandoned because a call hung
+        self.abandoned = 0
+        self._jobs: Optional["queue.SimpleQueue[Optional[_Job]]"] = None
+        # 超时后仍可能在执行的调用 / A call that timed out and may still be running
+        self._stuck: Optional[_Job] = None
+        self._lock = threading.Lock()
+
+    @property
+    def stuck(self) -> bool:
+        """是否有超时的调用仍未返回 / Whether a timed-out call has not returned yet"""
+        job = self._stuck
+        return job is not None and not job.done.is_set()
+
+    def call(self, timeout: float, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        执行 func 并最多等待 timeout 秒 / Run func and wait at most timeout seconds
+
+        之前的调用仍卡住时，先最多等它 timeout 秒，等不到就不执行 func
+        While an earlier call is still stuck, waits up to timeout seconds for it and skips func if it
+        does not return
+
+        Raises:
+            CallTimeout: 超时，或之前的调用仍卡住 / The call timed out, or an earlier call is still stuck
+        """
+        stuck = self._stuck
+        if stuck is not None:
+            if not stuck.done.wait(timeout):
+                name = getattr(func, "__name__", "call")
+                raise CallTimeout(name, timeout, f"{name} skipped: {stuck.name} has not returned")
+            self._stuck = None
+        with self._lock:
+            if self._jobs is None:
+                self._jobs = queue.SimpleQueue()
+                threading.Thread(target=_serve, args=(self._jobs,), name=self.name, daemon=True).start()
+            jobs = self._jobs
+        job = _Job(func, args, kwargs)
+        jobs.put(job)
+        if not job.done.wait(timeout):
+            self._stuck = job
+            raise CallTimeout(job.name, timeout)
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def abandon(self) -> None:
+        """
+        放弃卡住的线程，之后的调用使用新线程 / Abandon the stuck thread; later calls use a fresh one
+
+        只应在不再使用卡住调用所用的控制器之后调用 / Only call this once the controller the stuck call
+        uses is no longer in use
+        """
+        with self._lock:
+            if self._jobs is not None:
+                # 卡住的线程返回后读到 None 即退出 / The stuck thread exits on None once it returns
+                self._jobs.put(None)
+                self._jobs = None
+            if self.stuck:
+                self.abandoned += 1
+            self._stuck = None
+
+    def close(self) -> None:
+        """停止工作线程 / Stop the worker thread"""
+        with self._lock:
+            if self._jobs is not None:
+                self._jobs.put(None)
+                self._jobs = None
+            self._stuck = None
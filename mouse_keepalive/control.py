@@ -0,0 +1,412 @@
+"""
+运行时控制通道 / Runtime control channel
+
+在本地 Unix socket（Windows 上为 127.0.0.1 端口）上提供一个按行的文本协议，
+每行一条命令，每条命令回复一行 "ok ..." 或 "error ..."：
+A line-based text protocol on a local Unix socket (a 127.0.0.1 port on Windows);
+one command per line, each answered with one "ok ..." or "error ..." line:
+
+    pause                  暂停注入 / Pause injection
+    resume                 恢复注入 / Resume injection
+    set-interval SECONDS   修改间隔 / Change the interval
+    set-method METHOD      修改活动方式（mouse、keyboard、inhibit）/ Change the method
+    stats                  以 JSON 返回状态和计数 / Status and counters as JSON
+    stop                   结束运行 / Stop the run
+
+连接在后台线程中处理；保活循环每个 tick 只读取几个属性，不加锁。
+Connections are served on a background thread; the keepalive loop only reads a few
+attributes per tick, without locking.
+
+用法 / Usage:
+    mouse-keepalive --control
+    mouse-keepalive ctl pause
+    echo stats | socat - UNIX-CONNECT:$XDG_RUNTIME_DIR/mouse-keepalive-$USER-$DISPLAY.sock
+
+默认 socket 与单实例锁一样按“用户 + 显示”区分，不同显示上的实例互不干扰。
+The default socket is per user and display, like the instance lock, so instances on different
+displays do not interfere.
+
+TCP 端口对本机所有用户可见，因此 TCP 连接的第一行必须是 "auth TOKEN"；令牌在启动时随机生成，
+写入 state_dir() 中只有当前用户可读的文件，ctl 从该文件读取。Unix socket 本身只允许当前用户访问，不需要令牌。
+A TCP port is reachable by every local user, so the first line on a TCP connection must be "auth TOKEN";
+the token is generated at startup and written to an owner-only file in state_dir(), where ctl reads it.
+The Unix socket is owner-only already and needs no token.
+"""
+
+import errno
+import hmac
+import json
+import math
+import os
+import secrets
+import stat
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import socketserver
+
+METHODS = ("mouse", "keyboard", "inhibit", "auto")
+
+# 最小间隔（秒），与 --interval 相同 / Minimum interval (seconds), the same as --interval
+MIN_INTERVAL = 1
+
+# Windows 没有 Unix socket 时使用的本地端口 / Local port used on Windows, which lacks Unix sockets
+DEFAULT_PORT = 47231
+
+
+def default_address() -> str:
+    """默认控制地址，按 instance_lock.session_key() 区分 / Default control address, per instance_lock.session_key()"""
+    if sys.platform == "win32":
+        return f"127.0.0.1:{DEFAULT_PORT}"
+    from .instance_lock import session_key, state_dir
+
+    return f"unix:{os.path.join(state_dir(), f'mouse-keepalive-{session_key()}.sock')}"
+
+
+def token_path(port: int) -> str:
+    """TCP 控制端口的令牌文件 / Token file of a TCP control port"""
+    from .instance_lock import state_dir
+
+    return os.path.join(state_dir(), f"mouse-keepalive-control-{port}.token")
+
+
+def write_token(path: str) -> str:
+    """
+    生成新令牌并写入只有当前用户可读的文件 / Generate a new token and write it to an owner-only file
+
+    Returns:
+        令牌 / The token
+    """
+    token = secrets.token_hex(16)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    # O_EXCL：不跟随别人预先放好的符号链接 / O_EXCL: do not follow a symlink planted by someone else
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token + "\n")
+    return token
+
+
+def remove_stale_socket(path: str) -> None:
+    """
+    删除上次运行遗留的 Unix socket；仍有进程在监听时拒绝 / Remove a Unix socket left over by an earlier run;
+    refuse while a process still listens on it
+
+    Raises:
+        OSError: socket 仍在使用，或路径不是 socket / The socket is still in use, or the path is not a socket
+    """
+    import socket
+
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EEXIST, f"not a socket: {path}")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(1.0)
+        try:
+            probe.connect(path)
+        except OSError:
+            # 没有进程在监听 / Nobody is listening
+            pass
+        else:
+            raise OSError(errno.EADDRINUSE, f"address already in use: {path}")
+    os.unlink(path)
+
+
+class Control:
+    """
+    运行中的保活循环的可变状态 / Mutable state of a running keepalive loop
+
+    MouseMover.run 在每个 tick 读取 paused、stopped、interval 和 method，并通过 record() 上报计数；
+    sleep() 可以被 stop 和 set-interval 提前唤醒
+    MouseMover.run reads paused, stopped, interval and method every tick and reports counters
+    through record(); sleep() is woken early by stop and set-interval
+    """
+
+    def __init__(
+        self,
+        monotonic_func: Optional[Callable[[], float]] = None,
+        on_change: Optional[Callable[[str, Any], None]] = None,
+    ):
+        """
+        Args:
+            monotonic_func: 单调时钟 / Monotonic clock
+            on_change: 状态被命令修改后的回调，参数为 (命令, 值) / Called with (command, value) after a command
+                changes the state
+        """
+        self.monotonic_func = monotonic_func or time.monotonic
+        self.on_change = on_change
+        self.paused = False
+        self.stopped = False
+        # None 表示使用启动时的配置 / None keeps the configuration the run started with
+        self.interval: Optional[float] = None
+        self.method: Optional[str] = None
+        self._counters: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def record(self, **counters: Any) -> None:
+        """由保活循环调用，更新 stats 中的计数 / Called by the keepalive loop to update the stats counters"""
+        with self._lock:
+            self._counters.update(counters)
+
+    def stats(self) -> Dict[str, Any]:
+        """当前状态和计数 / Current state and counters"""
+        with self._lock:
+            counters = dict(self._counters)
+        return {"paused": self.paused, "interval": self.interval, "method": self.method, **counters}
+
+    def sleep(self, seconds: float) -> None:
+        """
+        可中断的 sleep，作为 MouseMover 的 sleep_func / Interruptible sleep, used as MouseMover's sleep_func
+
+        stop 立即返回；set-interval 把结束时间缩短到新间隔（变长的间隔从下一个 tick 生效）
+        stop returns at once; set-interval shortens the end to the new interval (a longer interval applies
+        from the next tick)
+        """
+        start = self.monotonic_func()
+        end = start + seconds
+        while not self.stopped:
+            remaining = end - self.monotonic_func()
+            if remaining <= 0:
+                return
+            if self._wake.wait(remaining):
+                self._wake.clear()
+                if self.interval is not None:
+                    end = min(end, start + self.interval)
+
+    def _changed(self, command: str, value: Any) -> None:
+        self._wake.set()
+        if self.on_change is not None:
+            self.on_change(command, value)
+
+    def pause(self) -> None:
+        self.paused = True
+        self._changed("pause", True)
+
+    def resume(self) -> None:
+        self.paused = False
+        self._changed("resume", False)
+
+    def stop(self) -> None:
+        self.stopped = True
+        self._changed("stop", True)
+
+    def set_interval(self, interval: float) -> None:
+        # nan 会让 sleep() 空转，inf 会让 Event.wait 溢出 / nan would spin sleep(), inf overflows Event.wait
+        if not math.isfinite(interval) or interval < MIN_INTERVAL:
+            raise ValueError(f"interval must be a finite number of at least {MIN_INTERVAL} second(s)")
+        self.interval = interval
+        self._changed("set-interval", interval)
+
+    def set_method(self, method: str) -> None:
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {', '.join(METHODS)}")
+        self.method = method
+        self._changed("set-method", method)
+
+    def handle(self, line: str) -> str:
+        """
+        执行一行命令 / Execute one command line
+
+        Returns:
+            回复行（不含换行符）/ Reply line (without newline)
+        """
+        parts = line.split()
+        if not parts:
+            return "error empty command"
+        command, args = parts[0].lower(), parts[1:]
+        try:
+            if command == "pause" and not args:
+                self.pause()
+                return "ok paused"
+            if command == "resume" and not args:
+                self.resume()
+                return "ok running"
+            if command == "stop" and not args:
+                self.stop()
+                return "ok stopping"
+            if command == "stats" and not args:
+                return "ok " + json.dumps(self.stats(), sort_keys=True)
+            if command == "set-interval" and len(args) == 1:
+                self.set_interval(float(args[0]))
+                return f"ok interval {args[0]}"
+            if command == "set-method" and len(args) == 1:
+                self.set_method(args[0])
+                return f"ok method {args[0]}"
+        except ValueError as e:
+            return f"error {e}"
+        return f"error unknown command: {line.strip()}"
+
+
+class ControlServer:
+    """
+    在后台线程中提供控制通道 / Serve the control channel from a background thread
+
+    地址格式与 --metrics 相同："unix:/path" 或 "127.0.0.1:PORT"；Unix socket 只允许当前用户访问
+    Same address formats as --metrics: "unix:/path" or "127.0.0.1:PORT"; the Unix socket is owner-only
+    """
+
+    def __init__(self, control: Control, address: Optional[str] = None):
+        self.control = control
+        self.address = address or default_address()
+        self._server: Optional["socketserver.BaseServer"] = None
+        self._thread: Optional[threading.Thread] = None
+        self._token_path: Optional[str] = None
+
+    def start(self) -> "ControlServer":
+        """启动服务 / Start serving"""
+        import socketserver
+
+        control = self.control
+        # 只有 TCP 连接需要令牌，绑定端口后生成 / Only TCP connections need a token, generated once the port is bound
+        token: Optional[str] = None
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                if token is not None:
+                    parts = self.rfile.readline().decode("utf-8", "replace").split()
+                    if len(parts) != 2 or parts[0] != "auth" or not hmac.compare_digest(parts[1], token):
+                        self.wfile.write(b"error unauthorized\n")
+                        return
+                    self.wfile.write(b"ok authenticated\n")
+                    self.wfile.flush()
+                for raw in self.rfile:
+                    reply = control.handle(raw.decode("utf-8", "replace"))
+                    self.wfile.write(reply.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+        if self.address.startswith("unix:"):
+            path = self.address[len("unix:") :]
+            remove_stale_socket(path)
+
+            class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+                daemon_threads = True
+
+            umask = os.umask(0o177)
+            try:
+                self._server = UnixServer(path, Handler)
+            finally:
+                os.umask(umask)
+        else:
+            host, _, port = self.address.rpartition(":")
+
+            class TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+                daemon_threads = True
+                # Windows 上 SO_REUSEADDR 允许抢占正在使用的端口 / On Windows SO_REUSEADDR can steal a port in use
+                allow_reuse_address = sys.platform != "win32"
+
+            self._server = TCPServer((host or "127.0.0.1", int(port)), Handler)
+            try:
+                self._token_path = token_path(self._server.server_address[1])
+                token = write_token(self._token_path)
+            except OSError:
+                self._server.server_close()
+                self._server = None
+                raise
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="control", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def server_address(self):
+        """实际监听的地址 / Bound address"""
+        return self._server.server_address if self._server is not None else None
+
+    def close(self) -> None:
+        """停止服务 / Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if self.address.startswith("unix:"):
+                try:
+                    os.unlink(self.address[len("unix:") :])
+                except OSError:
+                    pass
+            if self._token_path is not None:
+                try:
+                    os.unlink(self._token_path)
+                except OSError:
+                    pass
+                self._token_path = None
+            self._server = None
+
+
+def send_command(line: str, address: Optional[str] = None, timeout: float = 2.0) -> str:
+    """
+    向运行中的实例发送一条命令 / Send one command to a running instance
+
+    TCP 地址先用令牌文件中的令牌认证 / TCP addresses first authenticate with the token from the token file
+
+    Raises:
+        OSError: 无法连接，或读不到令牌文件 / Cannot connect, or the token file cannot be read
+    """
+    import socket
+
+    address = address or default_address()
+    request = line.strip().encode("utf-8") + b"\n"
+    replies = 1
+    if address.startswith("unix:"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        target: Any = address[len("unix:") :]
+    else:
+        host, _, port = address.rpartition(":")
+        with open(token_path(int(port))) as f:
+            request = f"auth {f.read().strip()}\n".encode("utf-8") + request
+        replies = 2
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        target = (host or "127.0.0.1", int(port))
+    with sock:
+        sock.settimeout(timeout)
+        sock.connect(target)
+        sock.sendall(request)
+        reply = b""
+        while reply.count(b"\n") < replies:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            reply += chunk
+    lines = reply.decode("utf-8").splitlines()
+    if replies == 2 and lines and not lines[0].startswith("ok"):
+        # 认证失败 / Authentication failed
+        return lines[0].strip()
+    return lines[replies - 1].strip() if len(lines) >= replies else ""
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """ctl 子命令入口 / Entry point of the ctl subcommand"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="mouse-keepalive ctl",
+        description="控制运行中的 mouse-keepalive --control / Control a running mouse-keepalive --control",
+    )
+    parser.add_argument(
+        "command",
+        nargs="+",
+        help="pause | resume | stop | stats | set-interval SECONDS | set-method METHOD",
+    )
+    parser.add_argument(
+        "--address",
+        default=None,
+        help="控制地址，默认与 --control 相同 / Control address, defaults to the same as --control",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        reply = send_command(" ".join(args.command), args.address)
+    except OSError as e:
+        print(f"错误: 无法连接控制通道: {e}")
+        print(f"Error: Cannot connect to the control channel: {e}")
+        sys.exit(1)
+    print(reply)
+    if not reply.startswith("ok"):
+        sys.exit(1)
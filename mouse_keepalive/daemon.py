@@ -0,0 +1,182 @@
+"""
+守护进程模式：systemd 通知、看门狗和优雅退出 / Daemon mode: systemd notifications, watchdog and graceful exit
+
+- 启动后发送 READY=1，运行中更新 STATUS=，退出前发送 STOPPING=1
+  READY=1 after start-up, STATUS= updates while running, STOPPING=1 before exit
+- WATCHDOG=1 只在最近一个间隔内有成功（或被跳过）的 tick 时发送；后端调用卡住或持续失败时
+  停止喂狗，由 systemd 重启
+  WATCHDOG=1 is only sent while a tick succeeded (or was skipped) within the latest interval; a stuck
+  or failing backend stops the pings so that systemd restarts the service
+- SIGTERM/SIGHUP 不会打断当前 tick：只请求停止，循环在 tick 结束后调用 on_finish 并返回
+  SIGTERM/SIGHUP never interrupt a tick: they request a stop, and the loop calls on_finish after the tick
+
+示例 unit / Example unit:
+    [Service]
+    Type=notify
+    ExecStart=mouse-keepalive --daemon
+    WatchdogSec=120
+    Restart=on-failure
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from .control import Control
+
+# 允许一个 tick 超出间隔的时间（秒）/ How far a tick may overrun its interval (seconds)
+GRACE = 30.0
+# 没有看门狗时更新 STATUS 的周期（秒）/ STATUS update period without a watchdog (seconds)
+STATUS_PERIOD = 10.0
+
+
+def notify(state: str, address: Optional[str] = None) -> bool:
+    """
+    向 $NOTIFY_SOCKET 发送 sd_notify 消息 / Send an sd_notify message to $NOTIFY_SOCKET
+
+    Returns:
+        是否已发送；不在 systemd 下运行时返回 False / Whether it was sent, False when not run by systemd
+    """
+    address = address or os.environ.get("NOTIFY_SOCKET")
+    if not address:
+        return False
+    if address.startswith("@"):
+        address = "\0" + address[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(state.encode("utf-8"))
+    except OSError:
+        return False
+    return True
+
+
+def watchdog_interval() -> Optional[float]:
+    """
+    systemd 看门狗超时（秒），未启用时返回 None / systemd watchdog timeout (seconds), None when disabled
+    """
+    usec = os.environ.get("WATCHDOG_USEC")
+    pid = os.environ.get("WATCHDOG_PID")
+    if not usec or (pid and pid != str(os.getpid())):
+        return None
+    try:
+        value = int(usec) / 1_000_000
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+class Daemon:
+    """
+    把 Control 的计数转换成 systemd 通知 / Turn Control counters into systemd notifications
+
+    MouseMover.run 每个 tick 都调用 control.record()；这里的后台线程周期性比较计数，
+    判断循环是否仍然健康 / MouseMover.run calls control.record() every tick; a background thread
+    compares the counters periodically to decide whether the loop is still healthy
+    """
+
+    def __init__(
+        self,
+        control: "Control",
+        notify_func: Optional[Callable[[str], Any]] = None,
+        monotonic_func: Optional[Callable[[], float]] = None,
+        watchdog: Optional[float] = None,
+        grace: float = GRACE,
+    ):
+        """
+        Args:
+            control: 运行控制 / Run control
+            notify_func: 发送通知的函数，默认 notify / Notification sender, defaults to notify
+            monotonic_func: 单调时钟 / Monotonic clock
+            watchdog: 看门狗超时（秒），None 表示读取 WATCHDOG_USEC / Watchdog timeout (seconds),
+                None reads WATCHDOG_USEC
+            grace: tick 允许超出间隔的时间（秒）/ How far a tick may overrun its interval (seconds)
+        """
+        self.control = control
+        self.notify_func = notify_func or notify
+        self.monotonic_func = monotonic_func or time.monotonic
+        self.watchdog = watchdog if watchdog is not None else watchdog_interval()
+        self.grace = grace
+        self._last_healthy = self.monotonic_func()
+        self._last_progress = (0, 0)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _status(self, stats: Dict[str, Any]) -> str:
+        state = "paused" if stats.get("paused") else "running"
+        return f"{state}, {stats.get('successes', 0)} ticks, {stats.get('skips', 0)} skipped"
+
+    def healthy(self) -> bool:
+        """
+        最近一个间隔（加 grace）内是否有成功或跳过的 tick / Whether a tick succeeded or was skipped within the
+        latest interval (plus grace)
+        """
+        stats = self.control.stats()
+        progress = (stats.get("successes", 0), stats.get("skips", 0))
+        now = self.monotonic_func()
+        if progress != self._last_progress:
+            self._last_progress = progress
+            self._last_healthy = now
+        interval = stats.get("current_interval") or 0
+        return now - self._last_healthy <= interval + self.grace
+
+    def check(self) -> bool:
+        """
+        检查一次并发送 STATUS 和（健康时的）WATCHDOG / Check once, sending STATUS and, when healthy, WATCHDOG
+
+        Returns:
+            是否健康 / Whether the loop is healthy
+        """
+        healthy = self.healthy()
+        stats = self.control.stats()
+        message = f"STATUS={self._status(stats)}"
+        if healthy and self.watchdog:
+            message = "WATCHDOG=1\n" + message
+        self.notify_func(message)
+        return healthy
+
+    def _loop(self) -> None:
+        period = self.watchdog / 2 if self.watchdog else STATUS_PERIOD
+        while not self._stop.wait(period):
+            self.check()
+
+    def start(self) -> "Daemon":
+        """发送 READY=1 并开始周期检查 / Send READY=1 and start the periodic checks"""
+        self.notify_func(f"READY=1\nSTATUS=starting\nMAINPID={os.getpid()}")
+        self._thread = threading.Thread(target=self._loop, name="daemon", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """发送 STOPPING=1 并停止检查线程 / Send STOPPING=1 and stop the check thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1)
+            self._thread = None
+        self.notify_func("STOPPING=1")
+
+
+def install_signal_handlers(control: "Control", signals: Optional[list] = None) -> None:
+    """
+    SIGTERM/SIGHUP 请求在当前 tick 结束后停止 / SIGTERM/SIGHUP request a stop after the current tick
+
+    停止在另一个线程中执行：信号处理函数可能在主线程持有 Event 内部锁时运行，直接调用会死锁
+    The stop runs on another thread: the handler may run while the main thread holds the Event's
+    internal lock, and calling it directly could deadlock
+    """
+    import signal
+
+    if signals is None:
+        signals = [signal.SIGTERM]
+        if hasattr(signal, "SIGHUP"):
+            signals.append(signal.SIGHUP)
+
+    def handler(signum: int, frame: Any) -> None:
+        control.stopped = True
+        threading.Thread(target=control.stop, name="stop", daemon=True).start()
+
+    for signum in signals:
+        signal.signal(signum, handler)
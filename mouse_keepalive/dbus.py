@@ -0,0 +1,318 @@
+"""
+最小的 D-Bus 会话总线客户端 / Minimal D-Bus session bus client
+
+只用标准库实现方法调用所需的部分：Unix socket 连接、EXTERNAL 认证、基本类型的编解码。
+保持连接打开即可让基于连接的资源（例如 ScreenSaver 抑制）一直有效。
+Implements just what method calls need with the standard library: a Unix socket connection,
+EXTERNAL authentication and marshalling of basic types. Keeping the connection open keeps
+connection-scoped resources (such as ScreenSaver inhibitions) alive.
+"""
+
+import os
+import socket
+import struct
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+# 消息类型 / Message types
+METHOD_CALL = 1
+METHOD_RETURN = 2
+ERROR = 3
+SIGNAL = 4
+
+# 头字段 / Header fields
+PATH = 1
+INTERFACE = 2
+MEMBER = 3
+ERROR_NAME = 4
+REPLY_SERIAL = 5
+DESTINATION = 6
+SENDER = 7
+SIGNATURE = 8
+
+_FIELD_TYPES = {
+    PATH: "o",
+    INTERFACE: "s",
+    MEMBER: "s",
+    ERROR_NAME: "s",
+    REPLY_SERIAL: "u",
+    DESTINATION: "s",
+    SENDER: "s",
+    SIGNATURE: "g",
+}
+
+BUS_NAME = "org.freedesktop.DBus"
+BUS_PATH = "/org/freedesktop/DBus"
+
+
+class DBusError(Exception):
+    """D-Bus 返回的错误 / Error returned over D-Bus"""
+
+    def __init__(self, name: str, message: str = ""):
+        super().__init__(f"{name}: {message}" if message else name)
+        self.name = name
+
+
+@dataclass
+class Message:
+    """一条 D-Bus 消息 / One D-Bus message"""
+
+    type: int
+    serial: int
+    fields: Dict[int, Any] = field(default_factory=dict)
+    body: List[Any] = field(default_factory=list)
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.buf = bytearray()
+
+    def align(self, alignment: int) -> None:
+        self.buf.extend(b"\0" * (-len(self.buf) % alignment))
+
+    def write(self, code: str, value: Any) -> None:
+        if code == "y":
+            self.buf.append(value)
+        elif code in "ub":
+            self.align(4)
+            self.buf.extend(struct.pack("<I", int(value)))
+        elif code == "i":
+            self.align(4)
+            self.buf.extend(struct.pack("<i", value))
+        elif code in "so":
+            data = value.encode()
+            self.align(4)
+            self.buf.extend(struct.pack("<I", len(data)) + data + b"\0")
+        elif code == "g":
+            data = value.encode()
+            self.buf.append(len(data))
+            self.buf.extend(data + b"\0")
+        else:
+            raise ValueError(f"unsupported D-Bus type: {code}")
+
+
+class _Reader:
+    def __init__(self, data: bytes, offset: int = 0) -> None:
+        self.data = data
+        self.offset = offset
+
+    def align(self, alignment: int) -> None:
+        self.offset += -self.offset % alignment
+
+    def read(self, code: str) -> Any:
+        if code == "y":
+            self.offset += 1
+            return self.data[self.offset - 1]
+        if code in "ubi":
+            self.align(4)
+            (value,) = struct.unpack_from("<i" if code == "i" else "<I", self.data, self.offset)
+            self.offset += 4
+            return bool(value) if code == "b" else value
+        if code in "so":
+            self.align(4)
+            (length,) = struct.unpack_from("<I", self.data, self.offset)
+            start = self.offset + 4
+            self.offset = start + length + 1
+            return self.data[start : start + length].decode()
+        if code == "g":
+            length = self.data[self.offset]
+            start = self.offset + 1
+            self.offset = start + length + 1
+            return self.data[start : start + length].decode()
+        raise ValueError(f"unsupported D-Bus type: {code}")
+
+
+def encode_message(message: Message, signature: str = "") -> bytes:
+    """
+    编码消息 / Encode a message
+
+    Args:
+        message: 消息 / Message
+        signature: body 的签名，只支持基本类型 / Body signature, basic types only
+    """
+    body = _Writer()
+    for code, value in zip(signature, message.body):
+        body.write(code, value)
+
+    fields = dict(message.fields)
+    if signature:
+        fields[SIGNATURE] = signature
+    header = _Writer()
+    header.buf.extend(b"l" + bytes([message.type, 0, 1]))
+    header.buf.extend(struct.pack("<II", len(body.buf), message.serial))
+    array = _Writer()
+    for field_code, value in fields.items():
+        array.align(8)
+        array.write("y", field_code)
+        array.write("g", _FIELD_TYPES[field_code])
+        array.write(_FIELD_TYPES[field_code], value)
+    header.buf.extend(struct.pack("<I", len(array.buf)))
+    header.buf.extend(array.buf)
+    header.align(8)
+    return bytes(header.buf + body.buf)
+
+
+def message_size(prefix: bytes) -> int:
+    """根据前 16 字节计算整条消息的长度 / Total message length from its first 16 bytes"""
+    body_length, _, fields_length = struct.unpack_from("<III", prefix, 4)
+    size: int = 16 + fields_length + (-fields_length % 8) + body_length
+    return size
+
+
+def decode_message(data: bytes, body: bool = True) -> Message:
+    """
+    解码一条完整的消息 / Decode one complete message
+
+    Args:
+        data: 完整的消息 / One complete message
+        body: 是否解码 body；只看头部时不会因不支持的类型而失败 / Whether to decode the body; reading only
+            the header never fails on unsupported types
+
+    Raises:
+        ValueError: 字节序或 body 类型不受支持 / Unsupported byte order or body type
+    """
+    if data[:1] != b"l":
+        raise ValueError("only little-endian D-Bus messages are supported")
+    _, message_type, _, _, body_length, serial, fields_length = struct.unpack_from("<cBBBIII", data)
+    reader = _Reader(data, 16)
+    end = 16 + fields_length
+    fields: Dict[int, Any] = {}
+    while reader.offset < end:
+        reader.align(8)
+        code = reader.read("y")
+        fields[code] = reader.read(reader.read("g"))
+    if not body:
+        return Message(message_type, serial, fields)
+    reader.align(8)
+    return Message(message_type, serial, fields, [reader.read(code) for code in fields.get(SIGNATURE, "")])
+
+
+def session_bus_address() -> Optional[str]:
+    """会话总线地址（DBUS_SESSION_BUS_ADDRESS 或 $XDG_RUNTIME_DIR/bus）/ Session bus address"""
+    address = os.environ.get("DBUS_SESSION_BUS_ADDRESS")
+    if address:
+        return address
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.exists(os.path.join(runtime_dir, "bus")):
+        return f"unix:path={os.path.join(runtime_dir, 'bus')}"
+    return None
+
+
+def _socket_path(address: str) -> str:
+    for entry in address.split(";"):
+        transport, _, params = entry.partition(":")
+        if transport != "unix":
+            continue
+        options = dict(option.split("=", 1) for option in params.split(",") if "=" in option)
+        if "path" in options:
+            return options["path"]
+        if "abstract" in options:
+            return "\0" + options["abstract"]
+    raise OSError(f"不支持的 D-Bus 地址 / Unsupported D-Bus address: {address}")
+
+
+class Connection:
+    """
+    一个 D-Bus 连接 / One D-Bus connection
+
+    只支持同步方法调用；等待回复时收到的信号会被丢弃 / Synchronous method calls only; signals
+    received while waiting for a reply are discarded
+    """
+
+    def __init__(self, address: Optional[str] = None, timeout: float = 2.0):
+        """
+        Args:
+            address: 总线地址，None 表示会话总线 / Bus address, None for the session bus
+            timeout: socket 超时（秒）/ Socket timeout (seconds)
+
+        Raises:
+            OSError: 无法连接或认证失败 / Cannot connect or authenticate
+        """
+        address = address or session_bus_address()
+        if not address:
+            raise OSError("未找到 D-Bus 会话总线 / No D-Bus session bus found")
+        self._sock: Optional[socket.socket] = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._buffer = b""
+        self._serial = 0
+        try:
+            self._sock.settimeout(timeout)
+            self._sock.connect(_socket_path(address))
+            self._authenticate()
+            self.unique_name = self.call(BUS_NAME, BUS_PATH, BUS_NAME, "Hello")[0]
+        except (OSError, DBusError, ValueError) as e:
+            self.close()
+            raise OSError(f"D-Bus 连接失败 / D-Bus connection failed: {e}") from e
+
+    def _authenticate(self) -> None:
+        assert self._sock is not None
+        uid = str(os.getuid()).encode().hex()
+        self._sock.sendall(b"\0AUTH EXTERNAL " + uid.encode() + b"\r\n")
+        line = self._read_line()
+        if not line.startswith(b"OK"):
+            raise OSError(f"D-Bus 认证失败 / D-Bus authentication failed: {line!r}")
+        self._sock.sendall(b"BEGIN\r\n")
+
+    def _read_line(self) -> bytes:
+        while b"\r\n" not in self._buffer:
+            self._recv()
+        line, _, self._buffer = self._buffer.partition(b"\r\n")
+        return line
+
+    def _recv(self) -> None:
+        assert self._sock is not None
+        chunk = self._sock.recv(4096)
+        if not chunk:
+            raise OSError("D-Bus 连接已关闭 / D-Bus connection closed")
+        self._buffer += chunk
+
+    def _read_message(self) -> bytes:
+        while len(self._buffer) < 16:
+            self._recv()
+        size = message_size(self._buffer)
+        while len(self._buffer) < size:
+            self._recv()
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def call(
+        self,
+        destination: str,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        args: Sequence[Any] = (),
+    ) -> List[Any]:
+        """
+        同步调用方法 / Call a method synchronously
+
+        Returns:
+            回复的 body / Reply body
+
+        Raises:
+            DBusError: 对方返回错误 / The peer returned an error
+            OSError: 连接错误 / Connection error
+            ValueError: 回复使用了不支持的类型 / The reply uses an unsupported type
+        """
+        if self._sock is None:
+            raise OSError("D-Bus 连接已关闭 / D-Bus connection closed")
+        self._serial += 1
+        serial = self._serial
+        fields = {PATH: path, INTERFACE: interface, MEMBER: member, DESTINATION: destination}
+        self._sock.sendall(encode_message(Message(METHOD_CALL, serial, fields, list(args)), signature))
+        while True:
+            data = self._read_message()
+            # 其他消息（例如信号）只看头部，其 body 可能含有不支持的类型 / Other messages (e.g. signals) are
+            # only read up to the header, their body may use types that are not supported
+            if decode_message(data, body=False).fields.get(REPLY_SERIAL) != serial:
+                continue
+            reply = decode_message(data)
+            if reply.type == ERROR:
+                raise DBusError(reply.fields.get(ERROR_NAME, ""), reply.body[0] if reply.body else "")
+            return reply.body
+
+    def close(self) -> None:
+        """关闭连接 / Close the connection"""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
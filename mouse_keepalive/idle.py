@@ -0,0 +1,367 @@
+"""
+系统空闲时间来源 / System idle-time sources
+
+- Windows: GetLastInputInfo
+- Linux (X11): XScreenSaver 扩展，复用一个持久的 X 连接 / XScreenSaver extension over a persistent X connection
+- Linux (无 X / no X): evdev 设备或 /proc/interrupts 计数回退 / evdev devices or /proc/interrupts counters as fallback
+- macOS: CoreGraphics 的 CGEventSourceSecondsSinceLastEventType
+- 其他系统: 返回 None / Other OS: returns None
+"""
+
+import os
+import struct
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class IdleSource:
+    """
+    空闲时间来源接口 / Idle-time source interface
+    idle_seconds() 返回 None 表示无法判断 / idle_seconds() returns None when idle time is unknown
+    """
+
+    name = "none"
+
+    def idle_seconds(self) -> Optional[float]:
+        """获取系统空闲时间（秒）/ Get system idle time (seconds)"""
+        return None
+
+    def close(self) -> None:
+        """释放持有的资源 / Release held resources"""
+
+
+class WindowsIdleSource(IdleSource):
+    """使用 GetLastInputInfo 读取空闲时间 / Read idle time via GetLastInputInfo"""
+
+    name = "win32"
+
+    def idle_seconds(self) -> Optional[float]:
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class LASTINPUTINFO(ctypes.Structure):
+                _fields_ = [("cbSize", wintypes.UINT), ("dwTime", wintypes.DWORD)]
+
+            last_input_info = LASTINPUTINFO()
+            last_input_info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+
+            # BOOL GetLastInputInfo(PLASTINPUTINFO plii);
+            if ctypes.windll.user32.GetLastInputInfo(ctypes.byref(last_input_info)) == 0:  # type: ignore[attr-defined]
+                return None
+
+            # DWORD GetTickCount(void);  (millis since system start)
+            tick_count_ms = ctypes.windll.kernel32.GetTickCount()  # type: ignore[attr-defined]
+            idle_ms = tick_count_ms - last_input_info.dwTime
+            return float(idle_ms) / 1000.0
+        except Exception:
+            return None
+
+
+class XScreenSaverIdleSource(IdleSource):
+    """
+    通过 XScreenSaver 扩展读取 X 会话空闲时间 / Read X session idle time via the XScreenSaver extension
+    X 连接在第一次查询时打开并一直复用，避免每次查询都重新握手
+    The X connection is opened on first query and reused, avoiding a handshake per query
+    """
+
+    name = "xscreensaver"
+
+    def __init__(self, display: Optional[str] = None):
+        self.display = display
+        self._xlib = None
+        self._xss = None
+        self._dpy = None
+        # XScreenSaverInfo，类在 _connect() 中定义 / XScreenSaverInfo, a class defined in _connect()
+        self._info: Any = None
+
+    def _connect(self) -> bool:
+        import ctypes
+
+        from .x11 import guard_connection, load_library
+
+        class XScreenSaverInfo(ctypes.Structure):
+            _fields_ = [
+                ("window", ctypes.c_ulong),
+                ("state", ctypes.c_int),
+                ("kind", ctypes.c_int),
+                ("til_or_since", ctypes.c_ulong),
+                ("idle", ctypes.c_ulong),
+                ("eventMask", ctypes.c_ulong),
+            ]
+
+        try:
+            xlib = load_library("X11")
+            xss = load_library("Xss")
+        except OSError:
+            return False
+
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xss.XScreenSaverQueryInfo.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XScreenSaverInfo)]
+
+        display = self.display.encode() if self.display else None
+        dpy = xlib.XOpenDisplay(display)
+        if not dpy:
+            return False
+        guard_connection(xlib, dpy)
+
+        self._xlib, self._xss, self._dpy = xlib, xss, dpy
+        self._info = XScreenSaverInfo()
+        return True
+
+    def idle_seconds(self) -> Optional[float]:
+        try:
+            import ctypes
+
+            if self._dpy is None and not self._connect():
+                return None
+            assert self._xlib is not None and self._xss is not None and self._info is not None
+            from .x11 import connection_lost
+
+            root = self._xlib.XDefaultRootWindow(self._dpy)
+            ok = self._xss.XScreenSaverQueryInfo(self._dpy, root, ctypes.byref(self._info))
+            if connection_lost(self._dpy):
+                # 下次查询时重新连接 / Reconnect on the next query
+                self._dpy = None
+                return None
+            if not ok:
+                return None
+            return float(self._info.idle) / 1000.0
+        except Exception:
+            return None
+
+    def close(self) -> None:
+        if self._dpy is not None and self._xlib is not None:
+            self._xlib.XCloseDisplay(self._dpy)
+        self._dpy = None
+
+
+class MacOSIdleSource(IdleSource):
+    """
+    通过 CGEventSourceSecondsSinceLastEventType 读取 HID 层的空闲时间 / Read HID-level idle time via
+    CGEventSourceSecondsSinceLastEventType
+    """
+
+    name = "quartz"
+
+    # kCGEventSourceStateHIDSystemState / kCGAnyInputEventType
+    HID_SYSTEM_STATE = 1
+    ANY_INPUT_EVENT = 0xFFFFFFFF
+
+    FRAMEWORK = "/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices"
+
+    def __init__(self):
+        self._func = None
+
+    def _load(self) -> bool:
+        import ctypes
+        import ctypes.util
+
+        try:
+            lib = ctypes.CDLL(ctypes.util.find_library("ApplicationServices") or self.FRAMEWORK)
+            func = lib.CGEventSourceSecondsSinceLastEventType
+        except (OSError, AttributeError):
+            return False
+        func.restype = ctypes.c_double
+        func.argtypes = [ctypes.c_int32, ctypes.c_uint32]
+        self._func = func
+        return True
+
+    def idle_seconds(self) -> Optional[float]:
+        try:
+            if self._func is None and not self._load():
+                return None
+            assert self._func is not None
+            return float(self._func(self.HID_SYSTEM_STATE, self.ANY_INPUT_EVENT))
+        except Exception:
+            return None
+
+
+# struct input_event：timeval（秒、微秒）、type、code、value / struct input_event: timeval (sec, usec), type, code, value
+_INPUT_EVENT = struct.Struct("llHHi")
+
+# _IOW('E', 0xa0, int)：选择事件时间戳使用的时钟 / Selects the clock of the event timestamps
+_EVIOCSCLOCKID = 0x400445A0
+_CLOCK_MONOTONIC = 1
+
+
+class EvdevIdleSource(IdleSource):
+    """
+    通过非阻塞读取 /dev/input/event* 判断空闲 / Detect idle by non-blocking reads of /dev/input/event*
+    需要对输入设备有读权限（通常是 input 组）/ Requires read access to input devices (usually the input group)
+
+    空闲时间从最后一个事件的内核时间戳算起，而不是读取的时间，两次读取之间的活动不会被算晚
+    Idle time counts from the kernel timestamp of the last event rather than the time of the read, so activity
+    between two reads is not dated late
+    """
+
+    name = "evdev"
+
+    def __init__(self, paths: Optional[Sequence[str]] = None, clock: Optional[Callable[[], float]] = None):
+        import glob
+
+        self.clock = clock or time.monotonic
+        self._fds: List[int] = []
+        # 每个设备时间戳所用的时钟 / Clock of each device's timestamps
+        self._event_clocks: Dict[int, Callable[[], float]] = {}
+        for path in paths if paths is not None else sorted(glob.glob("/dev/input/event*")):
+            try:
+                fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            except OSError:
+                continue
+            self._fds.append(fd)
+            self._event_clocks[fd] = self._select_clock(fd)
+        self._last_activity = self.clock()
+
+    @staticmethod
+    def _select_clock(fd: int) -> Callable[[], float]:
+        """尽量让内核用单调时钟打时间戳，否则为墙上时钟 / Ask for monotonic timestamps, else they are wall clock"""
+        try:
+            import fcntl
+
+            fcntl.ioctl(fd, _EVIOCSCLOCKID, struct.pack("i", _CLOCK_MONOTONIC))
+        except (ImportError, OSError):
+            return time.time
+        return time.monotonic
+
+    @property
+    def available(self) -> bool:
+        """是否至少打开了一个输入设备 / Whether at least one input device could be opened"""
+        return bool(self._fds)
+
+    def idle_seconds(self) -> Optional[float]:
+        if not self._fds:
+            return None
+        for fd in self._fds:
+            data = b""
+            try:
+                # 读空缓冲区；evdev 每次只返回完整的事件，保留最后一次读到的 / Drain the buffer; evdev only
+                # returns whole events per read, so keep the last read
+                while True:
+                    chunk = os.read(fd, 4096)
+                    if not chunk:
+                        break
+                    data = chunk
+            except OSError:
+                pass
+            if data:
+                self._record_activity(fd, data)
+        return self.clock() - self._last_activity
+
+    def _record_activity(self, fd: int, data: bytes) -> None:
+        now = self.clock()
+        end = len(data) - len(data) % _INPUT_EVENT.size
+        if not end:
+            # 不完整的事件：退回到读取的时间 / Incomplete event: fall back to the time of the read
+            self._last_activity = now
+            return
+        sec, usec, _, _, _ = _INPUT_EVENT.unpack_from(data, end - _INPUT_EVENT.size)
+        age = max(0.0, self._event_clocks[fd]() - (sec + usec / 1e6))
+        self._last_activity = max(self._last_activity, now - age)
+
+    def close(self) -> None:
+        for fd in self._fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds = []
+        self._event_clocks = {}
+
+
+class ProcInterruptsIdleSource(IdleSource):
+    """
+    通过 /proc/interrupts 中输入设备的中断计数判断空闲 / Detect idle from input-device IRQ counters in /proc/interrupts
+    精度取决于查询频率，只能作为最后的回退 / Resolution depends on polling frequency, so it is only a last resort
+    """
+
+    name = "proc-interrupts"
+
+    # 认为是输入设备的中断名称片段 / IRQ name fragments treated as input devices
+    INPUT_IRQ_NAMES = ("i8042", "hid", "kbd", "keyboard", "mouse", "touchpad")
+
+    def __init__(self, path: str = "/proc/interrupts", clock: Optional[Callable[[], float]] = None):
+        self.path = path
+        self.clock = clock or time.monotonic
+        self._last_counts: Optional[Dict[str, int]] = None
+        self._last_activity = self.clock()
+
+    def _read_counts(self) -> Optional[Dict[str, int]]:
+        try:
+            with open(self.path, "r", encoding="ascii", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+
+        counts: Dict[str, int] = {}
+        for line in lines[1:]:
+            irq, _, rest = line.partition(":")
+            fields = rest.split()
+            description = " ".join(fields).lower()
+            if not any(name in description for name in self.INPUT_IRQ_NAMES):
+                continue
+            counts[irq.strip()] = sum(int(field) for field in fields if field.isdigit())
+        return counts
+
+    def idle_seconds(self) -> Optional[float]:
+        counts = self._read_counts()
+        if not counts:
+            return None
+        if self._last_counts is not None and counts != self._last_counts:
+            self._last_activity = self.clock()
+        self._last_counts = counts
+        return self.clock() - self._last_activity
+
+
+def default_idle_source() -> IdleSource:
+    """
+    按平台选择最合适的空闲时间来源 / Pick the best idle source for this platform
+
+    Linux 顺序 / Linux order: XScreenSaver -> evdev -> /proc/interrupts
+    """
+    if sys.platform == "win32":
+        return WindowsIdleSource()
+    if sys.platform == "darwin":
+        return MacOSIdleSource()
+    if not sys.platform.startswith("linux"):
+        return IdleSource()
+
+    if os.environ.get("DISPLAY"):
+        x_source = XScreenSaverIdleSource()
+        if x_source.idle_seconds() is not None:
+            return x_source
+        x_source.close()
+
+    evdev_source = EvdevIdleSource()
+    if evdev_source.available:
+        return evdev_source
+
+    proc_source = ProcInterruptsIdleSource()
+    if proc_source.idle_seconds() is not None:
+        return proc_source
+    return IdleSource()
+
+
+_default_source: Optional[IdleSource] = None
+
+
+def get_system_idle_seconds() -> Optional[float]:
+    """
+    获取系统空闲时间（秒）/ Get system idle time (seconds)
+
+    - Windows: 使用 GetLastInputInfo 读取系统最后一次“输入事件”到当前的时间差
+      Use GetLastInputInfo to get time since last input event.
+    - Linux: XScreenSaver（持久 X 连接），或 evdev、/proc/interrupts 回退
+      XScreenSaver (persistent X connection), falling back to evdev or /proc/interrupts
+    - macOS: CGEventSourceSecondsSinceLastEventType
+    - 其他系统: 返回 None / Other OS: returns None
+    """
+    global _default_source
+    if _default_source is None:
+        _default_source = default_idle_source()
+    return _default_source.idle_seconds()
@@ -0,0 +1,254 @@
+"""
+不注入输入的防休眠方式 / Keeping the session awake without synthetic input
+
+- Linux: org.freedesktop.ScreenSaver.Inhibit（会话总线，连接关闭即失效）或 systemd-inhibit
+  org.freedesktop.ScreenSaver.Inhibit (session bus, dropped with the connection) or systemd-inhibit
+- Windows: SetThreadExecutionState
+- macOS: caffeinate
+
+抑制在获取后一直持有；保活循环每个 tick 只做一次廉价的有效性检查。
+An inhibition is held once acquired; the keepalive loop only does a cheap validity check per tick.
+"""
+
+import os
+import sys
+from typing import Any, List, Optional, Sequence
+
+APP_NAME = "mouse-keepalive"
+REASON = "Keeping the session awake"
+
+
+class Inhibitor:
+    """
+    抑制器接口 / Inhibitor interface
+
+    acquire() 返回是否成功；valid() 检查抑制是否仍然有效；release() 可以重复调用
+    acquire() returns whether it succeeded; valid() checks the inhibition still holds; release() is idempotent
+    """
+
+    name = "none"
+
+    def acquire(self) -> bool:
+        """获取抑制 / Acquire the inhibition"""
+        return False
+
+    def valid(self) -> bool:
+        """抑制是否仍然有效 / Whether the inhibition still holds"""
+        return False
+
+    def release(self) -> None:
+        """释放抑制 / Release the inhibition"""
+
+
+class ScreenSaverInhibitor(Inhibitor):
+    """
+    通过会话总线上的 org.freedesktop.ScreenSaver 抑制 / Inhibit through org.freedesktop.ScreenSaver on the session bus
+
+    屏保服务重启后旧的 cookie 失效，因此 valid() 比较服务的唯一名称是否变化
+    A restarted screensaver service forgets old cookies, so valid() checks its unique name is unchanged
+    """
+
+    name = "org.freedesktop.ScreenSaver"
+    SERVICE = "org.freedesktop.ScreenSaver"
+    PATHS = ("/org/freedesktop/ScreenSaver", "/ScreenSaver")
+
+    def __init__(self, address: Optional[str] = None):
+        """
+        Args:
+            address: D-Bus 地址，None 表示会话总线 / D-Bus address, None for the session bus
+        """
+        self.address = address
+        self._connection: Any = None
+        self._owner: Optional[str] = None
+        self._path: Optional[str] = None
+        self._cookie: Optional[int] = None
+
+    def _owner_of_service(self) -> str:
+        from .dbus import BUS_NAME, BUS_PATH
+
+        owner: str = self._connection.call(BUS_NAME, BUS_PATH, BUS_NAME, "GetNameOwner", "s", [self.SERVICE])[0]
+        return owner
+
+    def acquire(self) -> bool:
+        from .dbus import Connection, DBusError
+
+        self.release()
+        try:
+            self._connection = Connection(self.address)
+            self._owner = self._owner_of_service()
+            for path in self.PATHS:
+                try:
+                    self._cookie = self._connection.call(
+                        self.SERVICE, path, self.SERVICE, "Inhibit", "ss", [APP_NAME, REASON]
+                    )[0]
+                except DBusError:
+                    continue
+                self._path = path
+                return True
+        except (OSError, DBusError, ValueError):
+            pass
+        self.release()
+        return False
+
+    def valid(self) -> bool:
+        if self._cookie is None:
+            return False
+        try:
+            return self._owner_of_service() == self._owner
+        except Exception:
+            return False
+
+    def release(self) -> None:
+        if self._connection is None:
+            return
+        if self._cookie is not None:
+            try:
+                self._connection.call(self.SERVICE, self._path, self.SERVICE, "UnInhibit", "u", [self._cookie])
+            except Exception:
+                pass
+        self._connection.close()
+        self._connection = None
+        self._cookie = None
+
+
+class ProcessInhibitor(Inhibitor):
+    """
+    由子进程持有的抑制（systemd-inhibit、caffeinate）/ Inhibition held by a child process (systemd-inhibit, caffeinate)
+
+    子进程存活即有效；本进程无论怎样退出（包括 SIGKILL），子进程都不能继续持有抑制
+    Valid for as long as the child process is alive; however this process ends (SIGKILL included), the child
+    must not keep holding the inhibition
+    """
+
+    # 子进程启动后立即退出视为失败的等待时间（秒）/ How long to watch for an immediate exit (seconds)
+    STARTUP_CHECK = 0.2
+
+    def __init__(self, name: str, command: Sequence[str], hold_stdin: bool = False):
+        """
+        Args:
+            name: 抑制器名称 / Inhibitor name
+            command: 持有抑制的命令 / Command holding the inhibition
+            hold_stdin: 通过管道连接子进程的 stdin；本进程退出时管道关闭，读到 EOF 的子进程随之退出 /
+                Connect the child's stdin to a pipe; it closes when this process ends, and a child reading
+                it until EOF exits with it
+        """
+        self.name = name
+        self.command = list(command)
+        self.hold_stdin = hold_stdin
+        self._process: Any = None
+
+    def acquire(self) -> bool:
+        import shutil
+        import subprocess
+
+        self.release()
+        if shutil.which(self.command[0]) is None:
+            return False
+        try:
+            process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE if self.hold_stdin else subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            return False
+        try:
+            # 没有 logind、权限不足等情况下会立即退出 / Exits at once without logind, permissions, etc.
+            process.wait(self.STARTUP_CHECK)
+            if process.stdin is not None:
+                process.stdin.close()
+            return False
+        except subprocess.TimeoutExpired:
+            self._process = process
+            return True
+
+    def valid(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def release(self) -> None:
+        if self._process is None:
+            return
+        if self._process.stdin is not None:
+            self._process.stdin.close()
+        self._process.terminate()
+        try:
+            self._process.wait(1)
+        except Exception:
+            self._process.kill()
+        self._process = None
+
+
+def systemd_inhibitor() -> ProcessInhibitor:
+    """
+    logind 空闲和休眠抑制 / logind idle and sleep inhibition
+
+    systemd-inhibit 运行 cat 并转交 stdin；本进程退出时管道关闭，cat 读到 EOF 后退出，抑制随之释放，
+    与 caffeinate 的 -w pid 作用相同
+    systemd-inhibit runs cat with our pipe as its stdin. When this process ends the pipe closes, cat sees
+    EOF and exits, and the inhibition goes with it, the same job caffeinate's -w pid does
+    """
+    return ProcessInhibitor(
+        "systemd-inhibit",
+        [
+            "systemd-inhibit",
+            "--what=idle:sleep",
+            f"--who={APP_NAME}",
+            f"--why={REASON}",
+            "--mode=block",
+            "cat",
+        ],
+        hold_stdin=True,
+    )
+
+
+def caffeinate_inhibitor() -> ProcessInhibitor:
+    """macOS 显示器和系统休眠抑制 / macOS display and system sleep inhibition"""
+    return ProcessInhibitor("caffeinate", ["caffeinate", "-d", "-i", "-w", str(os.getpid())])
+
+
+class WindowsInhibitor(Inhibitor):
+    """
+    SetThreadExecutionState(ES_CONTINUOUS | ES_SYSTEM_REQUIRED | ES_DISPLAY_REQUIRED)
+
+    该状态属于调用线程，valid() 会在当前线程重新声明 / The state belongs to the calling thread, so valid()
+    re-asserts it on the current thread
+    """
+
+    name = "SetThreadExecutionState"
+
+    ES_CONTINUOUS = 0x80000000
+    ES_SYSTEM_REQUIRED = 0x00000001
+    ES_DISPLAY_REQUIRED = 0x00000002
+
+    def __init__(self) -> None:
+        self._held = False
+
+    def _set(self, flags: int) -> bool:
+        try:
+            import ctypes
+
+            return bool(ctypes.windll.kernel32.SetThreadExecutionState(flags))  # type: ignore[attr-defined]
+        except Exception:
+            return False
+
+    def acquire(self) -> bool:
+        self._held = self._set(self.ES_CONTINUOUS | self.ES_SYSTEM_REQUIRED | self.ES_DISPLAY_REQUIRED)
+        return self._held
+
+    def valid(self) -> bool:
+        return self._held and self.acquire()
+
+    def release(self) -> None:
+        if self._held:
+            self._set(self.ES_CONTINUOUS)
+            self._held = False
+
+
+def default_inhibitors() -> List[Inhibitor]:
+    """当前平台按优先级排列的抑制器 / Inhibitors for this platform, in order of preference"""
+    if sys.platform == "win32":
+        return [WindowsInhibitor()]
+    if sys.platform == "darwin":
+        return [caffeinate_inhibitor()]
+    return [ScreenSaverInhibitor(), systemd_inhibitor()]
@@ -0,0 +1,238 @@
+"""
+每个会话只运行一个注入进程 / One injector per desktop session
+
+mka、mouse-keepalive、npm 的 lib/moveMouse.js 和 move_mouse.sh 最终都会执行 main()，
+因此在 main() 中按“用户 + 显示”加锁即可覆盖所有入口：
+mka, mouse-keepalive, the npm lib/moveMouse.js wrapper and move_mouse.sh all end up in main(),
+so one lock per user and display there covers every entry point:
+
+- Unix: 对 $XDG_RUNTIME_DIR（或临时目录下仅本用户可访问的子目录）中的锁文件 flock，进程退出时内核自动释放
+  flock on a lock file in $XDG_RUNTIME_DIR (or an owner-only directory under the temp directory),
+  released by the kernel on exit
+- Windows: Local\\ 命名空间下的命名互斥量（本身就是按会话隔离的）
+  A named mutex in the Local\\ namespace (which is per session already)
+
+锁文件（Windows 上为旁边的信息文件）记录持有者的 pid 和控制通道地址，用于 takeover 和 stats。
+The lock file (a side file on Windows) records the holder's pid and control address, for takeover and stats.
+"""
+
+import errno
+import getpass
+import json
+import os
+import re
+import stat
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+# takeover 时等待旧实例退出的时间（秒）/ How long takeover waits for the old instance to exit (seconds)
+TAKEOVER_TIMEOUT = 5.0
+
+
+def session_key() -> str:
+    """当前用户和显示组成的会话标识 / Session key made of the user and display"""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = str(os.getuid()) if hasattr(os, "getuid") else "user"
+    display = os.environ.get("WAYLAND_DISPLAY") or os.environ.get("DISPLAY") or os.environ.get("XDG_SESSION_ID") or ""
+    key = f"{user}-{display}" if display else user
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+
+
+def state_dir() -> str:
+    """
+    锁文件和控制 socket 所在目录 / Directory of the lock file and the control socket
+
+    没有 $XDG_RUNTIME_DIR 时使用临时目录下的 mouse-keepalive-UID（0700），不直接使用所有人可写的临时目录
+    Without $XDG_RUNTIME_DIR, mouse-keepalive-UID (0700) under the temp directory is used rather than the
+    world-writable temp directory itself
+
+    Raises:
+        OSError: 目录无法创建，或不是本用户独占的目录 / The directory cannot be created or is not private to
+            this user
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return runtime_dir
+    if sys.platform == "win32":
+        # Windows 的临时目录本身就是按用户的 / The Windows temp directory is per user already
+        return tempfile.gettempdir()
+    path = os.path.join(tempfile.gettempdir(), f"mouse-keepalive-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise OSError(errno.EPERM, f"not a private directory of this user: {path}")
+    return path
+
+
+class InstanceLock:
+    """
+    会话级单实例锁 / Session-wide single-instance lock
+
+    acquire() 不阻塞；持有者信息通过 owner() 读取 / acquire() never blocks; read the holder's info with owner()
+    """
+
+    def __init__(self, key: Optional[str] = None, directory: Optional[str] = None):
+        """
+        Args:
+            key: 会话标识，None 表示 session_key() / Session key, None uses session_key()
+            directory: 锁文件目录，None 表示 $XDG_RUNTIME_DIR 或临时目录 / Lock file directory,
+                None uses $XDG_RUNTIME_DIR or the temp directory
+        """
+        self.key = key or session_key()
+        self.path = os.path.join(directory or state_dir(), f"mouse-keepalive-{self.key}.lock")
+        self._file: Any = None
+        self._mutex: Any = None
+        self._info: Dict[str, Any] = {}
+
+    @property
+    def held(self) -> bool:
+        """本进程是否持有锁 / Whether this process holds the lock"""
+        return self._file is not None or self._mutex is not None
+
+    def _info_path(self) -> str:
+        # Windows 的互斥量无法携带数据，信息写在旁边的文件里 / A Windows mutex carries no data, so use a side file
+        return self.path + ".json" if sys.platform == "win32" else self.path
+
+    def acquire(self) -> bool:
+        """
+        尝试获取锁 / Try to take the lock
+
+        Returns:
+            是否成功；已被其他进程持有时返回 False / Whether it succeeded, False when another process holds it
+
+        Raises:
+            OSError: 无法打开锁文件（例如没有权限，或锁文件是符号链接）/ The lock file cannot be opened (e.g.
+                no permission, or it is a symlink)
+        """
+        if self.held:
+            return True
+        if sys.platform == "win32":
+            if not self._acquire_mutex():
+                return False
+        else:
+            import fcntl
+
+            # 不跟随符号链接 / Never follow a symlink
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC, 0o600)
+            lock_file = os.fdopen(fd, "r+")
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+            self._file = lock_file
+        self.update(pid=os.getpid(), started=time.time(), control=None)
+        return True
+
+    def _acquire_mutex(self) -> bool:
+        import ctypes
+
+        ERROR_ALREADY_EXISTS = 183
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)  # type: ignore[attr-defined]
+        kernel32.CreateMutexW.restype = ctypes.c_void_p
+        kernel32.CreateMutexW.argtypes = [ctypes.c_void_p, ctypes.c_bool, ctypes.c_wchar_p]
+        kernel32.CloseHandle.argtypes = [ctypes.c_void_p]
+        handle = kernel32.CreateMutexW(None, False, f"Local\\mouse-keepalive-{self.key}")
+        if not handle:
+            raise OSError(ctypes.get_last_error(), "CreateMutexW failed")  # type: ignore[attr-defined]
+        if ctypes.get_last_error() == ERROR_ALREADY_EXISTS:  # type: ignore[attr-defined]
+            kernel32.CloseHandle(handle)
+            return False
+        self._mutex = (kernel32, handle)
+        return True
+
+    def update(self, **info: Any) -> None:
+        """更新持有者信息（例如控制通道地址）/ Update the holder's info (e.g. the control address)"""
+        if not self.held:
+            return
+        self._info.update(info)
+        data = json.dumps(self._info)
+        if self._file is not None:
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(data)
+            self._file.flush()
+        else:
+            with open(self._info_path(), "w") as f:
+                f.write(data)
+
+    def owner(self) -> Optional[Dict[str, Any]]:
+        """
+        当前持有者的信息 / Info of the current holder
+
+        Returns:
+            {"pid", "started", "control"}，读不到时返回 None / None when it cannot be read
+        """
+        try:
+            with open(self._info_path()) as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return info if isinstance(info, dict) else None
+
+    def wait(self, timeout: float, poll: float = 0.1) -> bool:
+        """
+        在 timeout 秒内反复尝试获取锁 / Keep trying to take the lock for up to timeout seconds
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.acquire():
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll)
+
+    def release(self) -> None:
+        """释放锁，可以重复调用 / Release the lock; idempotent"""
+        if self._file is not None:
+            import fcntl
+
+            self._file.seek(0)
+            self._file.truncate()
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        if self._mutex is not None:
+            kernel32, handle = self._mutex
+            try:
+                os.unlink(self._info_path())
+            except OSError:
+                pass
+            kernel32.CloseHandle(handle)
+            self._mutex = None
+        self._info = {}
+
+
+def stop_owner(info: Dict[str, Any]) -> bool:
+    """
+    让持有者退出：优先通过控制通道 stop，否则发送 SIGTERM / Ask the holder to exit: stop over its control
+    channel when it has one, SIGTERM otherwise
+
+    Returns:
+        请求是否已送达 / Whether the request was delivered
+    """
+    if info.get("control"):
+        from .control import send_command
+
+        try:
+            if send_command("stop", info["control"]).startswith("ok"):
+                return True
+        except OSError:
+            pass
+    pid = info.get("pid")
+    if not isinstance(pid, int) or pid == os.getpid():
+        return False
+    import signal
+
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        return False
+    return True
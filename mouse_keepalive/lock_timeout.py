@@ -0,0 +1,222 @@
+"""
+读取屏保/锁屏超时并推导保活间隔 / Read the screensaver/lock timeout and derive the keepalive interval
+
+- X11: XGetScreenSaver 超时和已启用的 DPMS 超时 / XGetScreenSaver timeout and enabled DPMS timeouts
+- GNOME: gsettings org.gnome.desktop.session idle-delay
+- Windows: SystemParametersInfo(SPI_GETSCREENSAVETIMEOUT)
+- macOS: com.apple.screensaver idleTime
+
+取所有来源中最短的一个；读不到时使用默认间隔。
+The shortest of all readings wins; the default interval is used when nothing can be read.
+
+用法 / Usage:
+    mouse-keepalive --interval auto
+"""
+
+import os
+import sys
+import time
+from typing import Callable, List, Optional
+
+# 读不到超时时的间隔（秒）/ Interval used when no timeout can be read (seconds)
+DEFAULT_INTERVAL = 60.0
+# 最短间隔（秒）/ Shortest interval (seconds)
+MIN_INTERVAL = 5.0
+# 重新读取超时的周期（秒）/ How often the timeout is re-read (seconds)
+REFRESH_INTERVAL = 300.0
+
+
+def x11_timeout(display: Optional[str] = None) -> Optional[float]:
+    """X 屏保超时和 DPMS 超时中最短的一个 / Shortest of the X screensaver and DPMS timeouts"""
+    import ctypes
+
+    from .x11 import load_library
+
+    try:
+        xlib = load_library("X11")
+    except OSError:
+        return None
+    xlib.XOpenDisplay.restype = ctypes.c_void_p
+    xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+    xlib.XGetScreenSaver.argtypes = [ctypes.c_void_p] + [ctypes.POINTER(ctypes.c_int)] * 4
+
+    dpy = xlib.XOpenDisplay(display.encode() if display else None)
+    if not dpy:
+        return None
+    try:
+        timeouts: List[int] = []
+        timeout, cycle, prefer_blanking, allow_exposures = (ctypes.c_int() for _ in range(4))
+        xlib.XGetScreenSaver(
+            dpy,
+            ctypes.byref(timeout),
+            ctypes.byref(cycle),
+            ctypes.byref(prefer_blanking),
+            ctypes.byref(allow_exposures),
+        )
+        timeouts.append(timeout.value)
+
+        try:
+            xext = load_library("Xext")
+        except OSError:
+            xext = None
+        if xext is not None:
+            xext.DPMSCapable.argtypes = [ctypes.c_void_p]
+            xext.DPMSInfo.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort), ctypes.POINTER(ctypes.c_ubyte)]
+            xext.DPMSGetTimeouts.argtypes = [ctypes.c_void_p] + [ctypes.POINTER(ctypes.c_ushort)] * 3
+            power_level, enabled = ctypes.c_ushort(), ctypes.c_ubyte()
+            if xext.DPMSCapable(dpy) and xext.DPMSInfo(dpy, ctypes.byref(power_level), ctypes.byref(enabled)):
+                if enabled.value:
+                    standby, suspend, off = ctypes.c_ushort(), ctypes.c_ushort(), ctypes.c_ushort()
+                    xext.DPMSGetTimeouts(dpy, ctypes.byref(standby), ctypes.byref(suspend), ctypes.byref(off))
+                    timeouts.extend((standby.value, suspend.value, off.value))
+    finally:
+        xlib.XCloseDisplay(dpy)
+
+    positive = [value for value in timeouts if value > 0]
+    return float(min(positive)) if positive else None
+
+
+def _command_output(command: List[str]) -> Optional[str]:
+    import shutil
+    import subprocess
+
+    if shutil.which(command[0]) is None:
+        return None
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def gnome_idle_delay() -> Optional[float]:
+    """GNOME 的 idle-delay（例如 "uint32 300"）/ GNOME idle-delay (e.g. "uint32 300")"""
+    output = _command_output(["gsettings", "get", "org.gnome.desktop.session", "idle-delay"])
+    if not output:
+        return None
+    try:
+        value = float(output.split()[-1])
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def macos_idle_time() -> Optional[float]:
+    """macOS 屏保启动时间 / macOS screensaver idle time"""
+    output = _command_output(["defaults", "-currentHost", "read", "com.apple.screensaver", "idleTime"])
+    try:
+        value = float(output) if output else 0.0
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def windows_screensaver_timeout() -> Optional[float]:
+    """Windows 屏保超时，屏保未启用时返回 None / Windows screensaver timeout, None when it is disabled"""
+    try:
+        import ctypes
+
+        SPI_GETSCREENSAVETIMEOUT = 0x000E
+        SPI_GETSCREENSAVEACTIVE = 0x0010
+        user32 = ctypes.windll.user32  # type: ignore[attr-defined]
+        active, timeout = ctypes.c_int(), ctypes.c_int()
+        if not user32.SystemParametersInfoW(SPI_GETSCREENSAVEACTIVE, 0, ctypes.byref(active), 0) or not active.value:
+            return None
+        if not user32.SystemParametersInfoW(SPI_GETSCREENSAVETIMEOUT, 0, ctypes.byref(timeout), 0):
+            return None
+        return float(timeout.value) if timeout.value > 0 else None
+    except Exception:
+        return None
+
+
+def effective_idle_timeout() -> Optional[float]:
+    """
+    当前平台最短的空闲超时（秒）/ Shortest idle timeout on this platform (seconds)
+
+    Returns:
+        超时秒数，读不到时返回 None / Timeout in seconds, None when nothing can be read
+    """
+    readers: List[Callable[[], Optional[float]]]
+    if sys.platform == "win32":
+        readers = [windows_screensaver_timeout]
+    elif sys.platform == "darwin":
+        readers = [macos_idle_time]
+    else:
+        readers = [gnome_idle_delay]
+        if os.environ.get("DISPLAY"):
+            readers.insert(0, x11_timeout)
+
+    timeouts = []
+    for reader in readers:
+        try:
+            value = reader()
+        except Exception:
+            continue
+        if value:
+            timeouts.append(value)
+    return min(timeouts) if timeouts else None
+
+
+def interval_for(timeout: Optional[float], default: float = DEFAULT_INTERVAL, minimum: float = MIN_INTERVAL) -> float:
+    """
+    超时触发前留出余量的间隔 / Interval that leaves a margin before the timeout fires
+
+    余量为超时的 10%，至少 5 秒 / The margin is 10% of the timeout, at least 5 seconds
+    """
+    if not timeout:
+        return default
+    return max(minimum, timeout - max(5.0, timeout * 0.1))
+
+
+class AutoInterval:
+    """
+    --interval auto：可调用对象，返回当前应使用的间隔 / --interval auto: a callable returning the interval to use now
+
+    超时读数按 refresh 周期刷新，用户修改屏保设置后无需重启
+    The timeout reading is refreshed every refresh seconds, so changed screensaver settings apply without a restart
+    """
+
+    def __init__(
+        self,
+        reader: Optional[Callable[[], Optional[float]]] = None,
+        refresh: float = REFRESH_INTERVAL,
+        default: float = DEFAULT_INTERVAL,
+        minimum: float = MIN_INTERVAL,
+        monotonic_func: Optional[Callable[[], float]] = None,
+        on_change: Optional[Callable[[Optional[float], float], None]] = None,
+    ):
+        """
+        Args:
+            reader: 读取超时的函数，默认 effective_idle_timeout / Timeout reader, defaults to effective_idle_timeout
+            refresh: 刷新周期（秒）/ Refresh period (seconds)
+            default: 读不到超时时的间隔 / Interval when no timeout can be read
+            minimum: 最短间隔 / Shortest interval
+            monotonic_func: 单调时钟 / Monotonic clock
+            on_change: 间隔变化时的回调，参数为 (timeout, interval) / Called with (timeout, interval) when it changes
+        """
+        self.reader = reader or effective_idle_timeout
+        self.refresh = refresh
+        self.default = default
+        self.minimum = minimum
+        self.monotonic_func = monotonic_func or time.monotonic
+        self.on_change = on_change
+        self.timeout: Optional[float] = None
+        self.value: Optional[float] = None
+        self._read_at: Optional[float] = None
+
+    def __call__(self) -> float:
+        now = self.monotonic_func()
+        if self._read_at is None or now - self._read_at >= self.refresh:
+            self._read_at = now
+            try:
+                self.timeout = self.reader()
+            except Exception:
+                self.timeout = None
+            value = interval_for(self.timeout, self.default, self.minimum)
+            if value != self.value:
+                self.value = value
+                if self.on_change:
+                    self.on_change(self.timeout, value)
+        assert self.value is not None
+        return self.value
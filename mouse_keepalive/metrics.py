@@ -0,0 +1,270 @@
+"""
+运行指标与 Prometheus 文本端点 / Runtime metrics and a Prometheus text endpoint
+
+由 MouseMover.run 直接更新计数器，不需要解析日志；端点可以监听本地端口或 Unix socket。
+Counters are fed directly by MouseMover.run rather than parsed from logs; the endpoint can
+listen on a local port or a Unix socket.
+
+用法 / Usage:
+    mouse-keepalive --metrics 127.0.0.1:9464
+    mouse-keepalive --metrics unix:/run/user/1000/mouse-keepalive.metrics
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import socketserver
+
+# 默认延迟分桶（秒）/ Default latency buckets (seconds)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """累积分桶直方图 / Cumulative-bucket histogram"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """记录一个观测值 / Record one observation"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """返回 (le, 累计数) 列表，最后一项为 +Inf / Return (le, cumulative count) pairs ending with +Inf"""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((repr(float(bound)), total))
+        result.append(("+Inf", self.count))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        分位数的上界（所在分桶的 le）/ Upper bound of a quantile (the le of its bucket)
+
+        没有观测值时返回 None，落在 +Inf 桶时返回 inf / None without observations, inf in the +Inf bucket
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return float(bound)
+        return float("inf")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+class Metrics:
+    """
+    保活进程的指标集合（线程安全）/ Metric set of a keepalive process (thread-safe)
+
+    - mouse_keepalive_ticks_total: tick 总数 / Total ticks
+    - mouse_keepalive_injections_total{method,result}: 注入成功/失败次数 / Injection successes and failures
+    - mouse_keepalive_skipped_total: 因用户活跃跳过的 tick / Ticks skipped because the user was active
+    - mouse_keepalive_call_duration_seconds{call}: 后端调用延迟 / Backend call latency
+    - mouse_keepalive_call_timeouts_total{call}: 超时的后端调用 / Backend calls that timed out
+    - mouse_keepalive_scheduler_lateness_seconds: tick 相对计划时间的延迟 / Tick lateness vs. schedule
+    - mouse_keepalive_last_success_timestamp_seconds: 最近一次成功注入的 Unix 时间 / Unix time of the last success
+    """
+
+    def __init__(self, clock: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            clock: 墙上时钟，用于时间戳，默认 time.time / Wall clock for timestamps, defaults to time.time
+        """
+        self.clock = clock or time.time
+        self._lock = threading.Lock()
+        self.ticks = 0
+        self.skipped = 0
+        self.injections: Counter = Counter()
+        self.call_durations: Dict[str, Histogram] = {}
+        self.call_timeouts: Counter = Counter()
+        self.lateness = Histogram()
+        self.last_success: Optional[float] = None
+        self.started = self.clock()
+
+    def observe_call(self, name: str, seconds: float) -> None:
+        """记录一次后端调用耗时 / Record the duration of one backend call"""
+        with self._lock:
+            histogram = self.call_durations.get(name)
+            if histogram is None:
+                histogram = self.call_durations[name] = Histogram()
+            histogram.observe(seconds)
+
+    def record_timeout(self, name: str) -> None:
+        """记录一次超时的后端调用 / Record a backend call that timed out"""
+        with self._lock:
+            self.call_timeouts[name] += 1
+
+    def record_tick(self, method: str, success: bool) -> None:
+        """记录一次注入结果 / Record the outcome of one injection"""
+        with self._lock:
+            self.ticks += 1
+            self.injections[(method, "success" if success else "failure")] += 1
+            if success:
+                self.last_success = self.clock()
+
+    def record_skip(self) -> None:
+        """记录一次因用户活跃而跳过的 tick / Record a tick skipped because the user was active"""
+        with self._lock:
+            self.ticks += 1
+            self.skipped += 1
+
+    def observe_lateness(self, seconds: float) -> None:
+        """记录调度延迟 / Record scheduler lateness"""
+        with self._lock:
+            self.lateness.observe(max(0.0, seconds))
+
+    def render(self) -> str:
+        """渲染为 Prometheus 文本格式 / Render in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, series: Sequence[Tuple[Dict[str, str], Histogram]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                for le, count in hist.cumulative():
+                    lines.append(f"{name}_bucket{_labels(**labels, le=le)} {count}")
+                lines.append(f"{name}_sum{_labels(**labels)} {hist.sum}")
+                lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+
+        with self._lock:
+            lines.append("# HELP mouse_keepalive_ticks_total Keepalive ticks, including skipped ones.")
+            lines.append("# TYPE mouse_keepalive_ticks_total counter")
+            lines.append(f"mouse_keepalive_ticks_total {self.ticks}")
+
+            lines.append("# HELP mouse_keepalive_injections_total Injections by method and result.")
+            lines.append("# TYPE mouse_keepalive_injections_total counter")
+            for (method, result), count in sorted(self.injections.items()):
+                lines.append(f"mouse_keepalive_injections_total{_labels(method=method, result=result)} {count}")
+
+            lines.append("# HELP mouse_keepalive_skipped_total Ticks skipped because the user was active.")
+            lines.append("# TYPE mouse_keepalive_skipped_total counter")
+            lines.append(f"mouse_keepalive_skipped_total {self.skipped}")
+
+            lines.append("# HELP mouse_keepalive_call_timeouts_total Backend calls that timed out.")
+            lines.append("# TYPE mouse_keepalive_call_timeouts_total counter")
+            for name, count in sorted(self.call_timeouts.items()):
+                lines.append(f"mouse_keepalive_call_timeouts_total{_labels(call=name)} {count}")
+
+            histogram(
+                "mouse_keepalive_call_duration_seconds",
+                "Backend call latency.",
+                [({"call": name}, hist) for name, hist in sorted(self.call_durations.items())],
+            )
+            histogram(
+                "mouse_keepalive_scheduler_lateness_seconds",
+                "How late ticks started relative to their schedule.",
+                [({}, self.lateness)],
+            )
+
+            lines.append("# HELP mouse_keepalive_last_success_timestamp_seconds Unix time of the last success.")
+            lines.append("# TYPE mouse_keepalive_last_success_timestamp_seconds gauge")
+            lines.append(f"mouse_keepalive_last_success_timestamp_seconds {self.last_success or 0}")
+
+            lines.append("# HELP mouse_keepalive_start_timestamp_seconds Unix time the process started.")
+            lines.append("# TYPE mouse_keepalive_start_timestamp_seconds gauge")
+            lines.append(f"mouse_keepalive_start_timestamp_seconds {self.started}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    在后台线程中提供 /metrics 的 HTTP 服务 / Serve /metrics over HTTP from a background thread
+
+    地址格式 / Address formats:
+    - "127.0.0.1:9464" 或 ":9464"（只监听本地）/ or ":9464" (local only)
+    - "unix:/path/to/socket"
+    """
+
+    def __init__(self, metrics: Metrics, address: str):
+        self.metrics = metrics
+        self.address = address
+        self._server: Optional["socketserver.BaseServer"] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MetricsServer":
+        """启动服务 / Start serving"""
+        import socketserver
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def address_string(self):
+                return str(self.client_address[0]) if self.client_address else "unix"
+
+            def log_message(self, format, *args):  # noqa: A002
+                pass
+
+        if self.address.startswith("unix:"):
+            from .control import remove_stale_socket
+
+            path = self.address[len("unix:") :]
+            remove_stale_socket(path)
+
+            class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+                daemon_threads = True
+
+            self._server = UnixHTTPServer(path, Handler)
+        else:
+            host, _, port = self.address.rpartition(":")
+
+            class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+                daemon_threads = True
+
+            self._server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), Handler)
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def server_address(self):
+        """实际监听的地址（端口为 0 时可查看分配的端口）/ Bound address (shows the port when 0 was requested)"""
+        return self._server.server_address if self._server is not None else None
+
+    def close(self) -> None:
+        """停止服务 / Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if self.address.startswith("unix:"):
+                try:
+                    os.unlink(self.address[len("unix:") :])
+                except OSError:
+                    pass
+            self._server = None
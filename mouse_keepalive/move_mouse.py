@@ -7,55 +7,57 @@
 import sys
 import os
 import time
-import platform
-from typing import Optional, Callable, Tuple
+from collections import Counter
+from typing import TYPE_CHECKING, Any, List, Optional, Callable, Sequence, Tuple, Union
 from dataclasses import dataclass
 
-try:
-    import pyautogui
-except ImportError:
-    print("错误: 未安装 pyautogui 库")
-    print("Error: pyautogui library not installed")
-    print("请运行: pip install pyautogui")
-    print("Please run: pip install pyautogui")
-    sys.exit(1)
+from .idle import get_system_idle_seconds
 
-# 禁用 pyautogui 的安全功能（防止鼠标移到屏幕角落时停止）
-# Disable pyautogui failsafe (prevents stopping when mouse moves to screen corner)
-pyautogui.FAILSAFE = False
+if TYPE_CHECKING:
+    from .call_timeout import CallWorker
+    from .control import Control
+    from .inhibit import Inhibitor
+    from .instance_lock import InstanceLock
+    from .metrics import Metrics
+    from .patterns import Pattern
+    from .policy import EscalationPolicy
+    from .probe import ResetProbe
+    from .profiling import PhaseHook, TickTracer
+    from .reporter import Reporter
+    from .scheduler import DeadlineScheduler
+    from .work_hours import WorkSchedule
 
+# pyautogui 会连带导入 Xlib、PIL、pymsgbox 等，开销很大，因此延迟到第一次使用时才加载
+# pyautogui pulls in Xlib, PIL, pymsgbox, etc., so it is only loaded on first use
+_pyautogui = None
 
-def get_system_idle_seconds() -> Optional[float]:
-    """
-    获取系统空闲时间（秒）/ Get system idle time (seconds)
 
-    - Windows: 使用 GetLastInputInfo 读取系统最后一次“输入事件”到当前的时间差
-      Use GetLastInputInfo to get time since last input event.
-    - 其他系统: 返回 None / Other OS: returns None
+def _load_pyautogui():
     """
-    if platform.system() != "Windows":
-        return None
-
-    try:
-        import ctypes
-        from ctypes import wintypes
-
-        class LASTINPUTINFO(ctypes.Structure):
-            _fields_ = [("cbSize", wintypes.UINT), ("dwTime", wintypes.DWORD)]
+    延迟加载 pyautogui / Lazily import pyautogui
 
-        last_input_info = LASTINPUTINFO()
-        last_input_info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+    Returns:
+        pyautogui 模块 / The pyautogui module
 
-        # BOOL GetLastInputInfo(PLASTINPUTINFO plii);
-        if ctypes.windll.user32.GetLastInputInfo(ctypes.byref(last_input_info)) == 0:
-            return None
+    Raises:
+        ImportError: 未安装 pyautogui 时抛出（库代码不再直接退出进程）/
+            Raised when pyautogui is not installed (library code no longer exits the process)
+    """
+    global _pyautogui
+    if _pyautogui is None:
+        try:
+            import pyautogui
+        except ImportError as e:
+            raise ImportError(
+                "未安装 pyautogui 库，请运行: pip install pyautogui / "
+                "pyautogui library not installed, please run: pip install pyautogui"
+            ) from e
 
-        # DWORD GetTickCount(void);  (millis since system start)
-        tick_count_ms = ctypes.windll.kernel32.GetTickCount()
-        idle_ms = tick_count_ms - last_input_info.dwTime
-        return float(idle_ms) / 1000.0
-    except Exception:
-        return None
+        # 禁用 pyautogui 的安全功能（防止鼠标移到屏幕角落时停止）
+        # Disable pyautogui failsafe (prevents stopping when mouse moves to screen corner)
+        pyautogui.FAILSAFE = False
+        _pyautogui = pyautogui
+    return _pyautogui
 
 
 @dataclass
@@ -78,25 +80,41 @@ class MouseController:
     """
     鼠标控制器接口 / Mouse controller interface
     封装鼠标操作，便于测试时替换实现
+    pyautogui 在第一次调用时才加载 / pyautogui is loaded on first call
     """
 
     def get_position(self) -> MousePosition:
         """获取当前鼠标位置 / Get current mouse position"""
-        x, y = pyautogui.position()
+        x, y = _load_pyautogui().position()
         return MousePosition(x, y)
 
     def get_screen_size(self) -> ScreenSize:
         """获取屏幕尺寸 / Get screen size"""
-        width, height = pyautogui.size()
+        width, height = _load_pyautogui().size()
         return ScreenSize(width, height)
 
+    # _pause=False 跳过 pyautogui 每次调用后的全局 PAUSE 睡眠（默认 0.1 秒）
+    # _pause=False skips pyautogui's global PAUSE sleep after each call (0.1s by default)
+
     def move_to(self, x: int, y: int, duration: float = 0.1) -> None:
         """移动鼠标到指定位置 / Move mouse to specified position"""
-        pyautogui.moveTo(x, y, duration=duration)
+        _load_pyautogui().moveTo(x, y, duration=duration, _pause=False)
+
+    def jiggle(self, dx: int, dy: int) -> None:
+        """相对移动后立即反向移回，无补间 / Move by (dx, dy) and straight back, without tweening"""
+        pyautogui = _load_pyautogui()
+        pyautogui.moveRel(dx, dy, duration=0, _pause=False)
+        pyautogui.moveRel(-dx, -dy, duration=0, _pause=False)
+
+    def move_path(self, steps: Sequence[int]) -> None:
+        """按 dx、dy 交错的相对步长逐步移动，无补间 / Move through interleaved dx, dy steps, without tweening"""
+        pyautogui = _load_pyautogui()
+        for i in range(0, len(steps), 2):
+            pyautogui.moveRel(steps[i], steps[i + 1], duration=0, _pause=False)
 
     def press_key(self, key: str = "shift") -> None:
         """模拟按键按下和释放 / Simulate key press and release"""
-        pyautogui.press(key)
+        _load_pyautogui().press(key, _pause=False)
 
 
 class MouseMover:
@@ -111,6 +129,23 @@ class MouseMover:
         time_func: Optional[Callable[[], float]] = None,
         sleep_func: Optional[Callable[[float], None]] = None,
         print_func: Optional[Callable[[str], None]] = None,
+        idle_func: Optional[Callable[[], Optional[float]]] = None,
+        monotonic_func: Optional[Callable[[], float]] = None,
+        screen_size_ttl: Optional[float] = 30.0,
+        metrics: Optional["Metrics"] = None,
+        reporter: Optional["Reporter"] = None,
+        move_duration: float = 0.1,
+        inhibitors: Optional[Sequence["Inhibitor"]] = None,
+        inhibit_fallback: str = "mouse",
+        control: Optional["Control"] = None,
+        call_timeout: Optional[float] = None,
+        reconnect: Optional[Callable[[], Any]] = None,
+        reconnect_after: int = 3,
+        max_backoff: float = 300.0,
+        pattern: Optional["Pattern"] = None,
+        probe: Optional["ResetProbe"] = None,
+        policy: Optional["EscalationPolicy"] = None,
+        tracer: Optional["TickTracer"] = None,
     ):
         """
         初始化鼠标移动器 / Initialize mouse mover
@@ -120,10 +155,76 @@ class MouseMover:
             time_func: 时间函数，默认使用 time.time / Time function, defaults to time.time
             sleep_func: 睡眠函数，默认使用 time.sleep / Sleep function, defaults to time.sleep
             print_func: 打印函数，默认使用 print / Print function, defaults to print
+            idle_func: 系统空闲时间函数，默认使用 get_system_idle_seconds /
+                Idle-time function, defaults to get_system_idle_seconds
+            monotonic_func: 单调时钟，用于缓存过期等，默认使用 time.monotonic /
+                Monotonic clock for cache expiry etc., defaults to time.monotonic
+            screen_size_ttl: 屏幕尺寸缓存有效期（秒），None 表示永不过期，0 表示不缓存 /
+                Screen size cache lifetime (seconds), None never expires, 0 disables caching
+            metrics: 指标集合，None 表示不采集 / Metric set, None disables collection
+            reporter: 结构化输出，设置后警告和诊断信息不再经过 print_func /
+                Structured output; when set, warnings and diagnostics bypass print_func
+            move_duration: 每次移动的补间时长（秒）；为 0（或控制器的 instant_moves 为真，本来就不补间）且控制器
+                提供 jiggle() 时，一次调用完成相对移动和反向移动 / Tween duration of each move (seconds); at 0 (or
+                when the controller's instant_moves is true, so it never tweens) and when the controller provides
+                jiggle(), one call performs the relative move and its inverse
+            inhibitors: method="inhibit" 时按顺序尝试的抑制器，None 表示当前平台的默认列表 /
+                Inhibitors tried in order for method="inhibit", None uses the platform defaults
+            inhibit_fallback: 无法抑制休眠时使用的方式，"mouse" 或 "keyboard" /
+                Method used when inhibition is unavailable, "mouse" or "keyboard"
+            control: 运行时控制（暂停、修改间隔和方式、停止），None 表示不可控制 /
+                Runtime control (pause, retune interval and method, stop), None disables it
+            call_timeout: 单次后端调用的时限（秒），超时计为失败；None 表示直接调用、不限时 /
+                Deadline of one backend call (seconds), a timeout counts as a failure; None calls directly
+            reconnect: 返回新控制器的函数，连续 reconnect_after 次超时后调用 /
+                Returns a fresh controller, called after reconnect_after consecutive timeouts
+            reconnect_after: 触发重连的连续超时次数 / Consecutive timeouts that trigger a reconnect
+            max_backoff: 超时后暂停调用后端的最长时间（秒），按 call_timeout 指数增长 /
+                Longest pause of backend calls after timeouts (seconds), growing exponentially from call_timeout
+            pattern: 预计算的移动图案，None 表示默认的 ±25 像素对角移动 /
+                Precomputed movement pattern, None keeps the default ±25px diagonal move
+            probe: 注入有效性探测，每次移动或按键后测量空闲计时器是否、多快重置 /
+                Injection-effectiveness probe, measures whether and how fast the idle timer resets after
+                every move or key press
+            policy: method="auto" 使用的升级策略，None 时按默认参数创建 /
+                Escalation policy of method="auto", created with defaults when None
+            tracer: 分阶段计时（环形缓冲区），None 表示不计时 / Per-phase timing (ring buffer), None disables it
         """
         self.controller = controller or MouseController()
         self.time_func = time_func or time.time
         self.sleep_func = sleep_func or time.sleep
+        self.idle_func = idle_func or get_system_idle_seconds
+        self.monotonic_func = monotonic_func or time.monotonic
+        self.screen_size_ttl = screen_size_ttl
+        self.metrics = metrics
+        self.reporter = reporter
+        self.move_duration = move_duration
+        self.inhibitors: Optional[List["Inhibitor"]] = list(inhibitors) if inhibitors is not None else None
+        self.inhibit_fallback = inhibit_fallback
+        self.control = control
+        self.call_timeout = call_timeout
+        self.reconnect = reconnect
+        self.reconnect_after = reconnect_after
+        self.max_backoff = max_backoff
+        self.pattern = pattern
+        self.probe = probe
+        self.policy = policy
+        self.tracer = tracer
+        # 连续超时次数和按调用统计的超时 / Consecutive timeouts and timeouts per call
+        self.stalls = 0
+        self.call_timeouts: Counter = Counter()
+        self._backoff_until = 0.0
+        self._worker: Optional["CallWorker"] = None
+        # 当前持有的抑制器 / Inhibitor currently held
+        self.inhibitor: Optional["Inhibitor"] = None
+        self._inhibit_unavailable = False
+        self._screen_size: Optional[ScreenSize] = None
+        self._screen_size_at = 0.0
+        # 后端调用计数：累计值和最近一次 tick 的值 / Backend call counts: totals and for the latest tick
+        self.backend_calls: Counter = Counter()
+        self.last_tick_calls: Counter = Counter()
+        # 当前 run() 使用的截止时间调度器（deadline 模式）/ Deadline scheduler of the current run() (deadline mode)
+        self.deadlines: Optional["DeadlineScheduler"] = None
         # 默认使用带刷新的 print 函数，解决 Windows 输出缓冲问题
         # Default to print with flush to solve Windows output buffering issue
         if print_func is None:
@@ -137,6 +238,155 @@ class MouseMover:
         else:
             self.print_func = print_func
 
+    def _call(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        调用控制器方法并计数 / Call a controller method and count it
+
+        Args:
+            name: 调用名称，用于计数 / Call name used for counting
+            func: 控制器方法 / Controller method
+        """
+        self.backend_calls[name] += 1
+        self.last_tick_calls[name] += 1
+        if self.tracer is not None:
+            return self._traced_call(name, func, *args, **kwargs)
+        if self.call_timeout is not None:
+            return self._call_with_timeout(name, func, *args, **kwargs)
+        if self.metrics is None:
+            return func(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.metrics.observe_call(name, time.perf_counter() - start)
+
+    def _traced_call(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """带阶段计时的 _call / _call with phase timing"""
+        tracer = self.tracer
+        assert tracer is not None
+        start = time.perf_counter_ns()
+        try:
+            if self.call_timeout is not None:
+                return self._call_with_timeout(name, func, *args, **kwargs)
+            return func(*args, **kwargs)
+        finally:
+            end = time.perf_counter_ns()
+            tracer.record(name, start, end)
+            if self.metrics is not None and self.call_timeout is None:
+                self.metrics.observe_call(name, (end - start) / 1e9)
+
+    def add_phase_hook(self, hook: "PhaseHook") -> None:
+        """
+        注册阶段钩子，每个阶段结束时以 (阶段名, 开始纳秒, 结束纳秒) 调用 / Register a phase hook, called
+        with (phase name, start ns, end ns) at the end of every phase
+
+        没有 tracer 时创建一个默认容量的 / Creates a tracer with the default capacity when there is none
+        """
+        if self.tracer is None:
+            from .profiling import TickTracer
+
+            self.tracer = TickTracer()
+        self.tracer.hooks.append(hook)
+
+    def remove_phase_hook(self, hook: "PhaseHook") -> None:
+        """移除阶段钩子 / Remove a phase hook"""
+        if self.tracer is not None and hook in self.tracer.hooks:
+            self.tracer.hooks.remove(hook)
+
+    def _sleep(self, seconds: float) -> None:
+        tracer = self.tracer
+        if tracer is None:
+            self.sleep_func(seconds)
+            return
+        start = time.perf_counter_ns()
+        try:
+            self.sleep_func(seconds)
+        finally:
+            tracer.record("sleep", start, time.perf_counter_ns())
+
+    def _call_with_timeout(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        from .call_timeout import CallTimeout, CallWorker
+
+        assert self.call_timeout is not None
+        if self.monotonic_func() < self._backoff_until:
+            raise CallTimeout(name, self.call_timeout, f"{name} skipped: backing off after a timeout")
+        if self._worker is None:
+            self._worker = CallWorker()
+
+        # 补间移动本身就会阻塞 move_duration 秒 / A tweened move blocks for move_duration by design
+        timeout = self.call_timeout + (self.move_duration if name == "move_to" else 0.0)
+        start = time.perf_counter()
+        try:
+            result = self._worker.call(timeout, func, *args, **kwargs)
+        except CallTimeout:
+            self._on_stall(name)
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_call(name, time.perf_counter() - start)
+        self.stalls = 0
+        return result
+
+    def _on_stall(self, name: str) -> None:
+        """一次调用超时：退避，连续多次时重连 / One call timed out: back off, and reconnect after several"""
+        assert self.call_timeout is not None
+        self.stalls += 1
+        self.call_timeouts[name] += 1
+        if self.metrics is not None:
+            self.metrics.record_timeout(name)
+        backoff = min(self.max_backoff, self.call_timeout * 2 ** (self.stalls - 1))
+        self._backoff_until = self.monotonic_func() + backoff
+        self._notify(
+            "warning",
+            "call_timeout",
+            f"警告: {name} 超过 {self.call_timeout:g} 秒未返回 / Warning: {name} did not return within "
+            f"{self.call_timeout:g}s",
+            call=name,
+            timeout=self.call_timeout,
+            backoff=backoff,
+        )
+        if self.reconnect is None or self.stalls % self.reconnect_after != 0:
+            return
+        try:
+            self.controller = self.reconnect()
+        except Exception as e:
+            self._notify(
+                "warning",
+                "reconnect_failed",
+                f"警告: 重连后端失败 / Warning: Backend reconnect failed: {e}",
+                error=str(e),
+            )
+            return
+        if self._worker is not None:
+            # 新控制器不与卡住的调用共享连接，可以换用新线程 / The new controller shares nothing with the stuck
+            # call, so a fresh thread may use it
+            self._worker.abandon()
+        self.invalidate_screen_size()
+        self._notify("info", "reconnect", "已重新连接后端 / Backend reconnected", stalls=self.stalls)
+
+    def invalidate_screen_size(self) -> None:
+        """使屏幕尺寸缓存失效（分辨率或显示器变化时调用）/ Drop the cached screen size (call on display changes)"""
+        self._screen_size = None
+
+    def get_screen_size(self) -> ScreenSize:
+        """
+        获取屏幕尺寸，优先使用缓存 / Get screen size, served from cache when possible
+
+        控制器如果提供 screen_changed() （例如监听 RandR 事件），返回 True 时缓存立即失效
+        If the controller provides screen_changed() (e.g. watching RandR events), a True result drops the cache
+        """
+        screen_changed = getattr(self.controller, "screen_changed", None)
+        if screen_changed is not None and screen_changed():
+            self.invalidate_screen_size()
+
+        now = self.monotonic_func()
+        expired = self.screen_size_ttl is not None and now - self._screen_size_at >= self.screen_size_ttl
+        if self._screen_size is None or expired:
+            self._screen_size = self._call("get_screen_size", self.controller.get_screen_size)
+            self._screen_size_at = now
+        return self._screen_size
+
     def calculate_next_position(
         self, current_pos: MousePosition, screen_size: ScreenSize, move_count: int
     ) -> Tuple[int, int]:
@@ -179,18 +429,22 @@ class MouseMover:
             (当前位置, 新的移动计数, 是否成功) / (Current position, new move count, success)
         """
         current_pos = MousePosition(0, 0)  # 默认值 / Default value
+        self.last_tick_calls = Counter()
         try:
             # 获取当前鼠标位置（用于日志显示）/ Get current mouse position (for logging)
-            current_pos = self.controller.get_position()
+            current_pos = self._call("get_position", self.controller.get_position)
 
             # 模拟按下 Shift 键（不会影响当前输入，但会被系统识别为活动）
             # Simulate pressing Shift key (won't affect current input, but recognized as activity)
-            self.controller.press_key("shift")
+            self._call("press_key", self.controller.press_key, "shift")
             move_count += 1
 
             return current_pos, move_count, True
         except Exception as e:
             # 记录错误但不中断程序 / Log error but don't interrupt program
+            if self.reporter is not None:
+                self.reporter.warning("key_error", error=str(e))
+                return current_pos, move_count, False
             self.print_func(f"警告: 键盘输入失败 / Warning: Key press failed: {e}")
             self.print_func(f"Warning: Key press failed: {e}")
             return current_pos, move_count, False
@@ -206,54 +460,268 @@ class MouseMover:
             (原始位置, 新的移动计数, 是否成功) / (Original position, new move count, success)
         """
         current_pos = MousePosition(0, 0)  # 默认值 / Default value
+        self.last_tick_calls = Counter()
         try:
             # 获取当前鼠标位置 / Get current mouse position
-            current_pos = self.controller.get_position()
+            current_pos = self._call("get_position", self.controller.get_position)
 
-            # 获取屏幕尺寸 / Get screen size
-            screen_size = self.controller.get_screen_size()
+            # 获取屏幕尺寸（缓存）/ Get screen size (cached)
+            screen_size = self.get_screen_size()
+
+            if self.pattern is not None:
+                self._replay_pattern(current_pos, screen_size, move_count)
+                return current_pos, move_count + 1, True
 
             # 计算下一个位置 / Calculate next position
-            new_x, new_y = self.calculate_next_position(current_pos, screen_size, move_count)
+            tracer = self.tracer
+            if tracer is None:
+                new_x, new_y = self.calculate_next_position(current_pos, screen_size, move_count)
+            else:
+                start = time.perf_counter_ns()
+                new_x, new_y = self.calculate_next_position(current_pos, screen_size, move_count)
+                tracer.record("calculate_next_position", start, time.perf_counter_ns())
+
+            # 类属性：Mock 控制器的任意属性都为真 / A class attribute: any attribute of a Mock controller is truthy
+            tweened = self.move_duration != 0 and not getattr(type(self.controller), "instant_moves", False)
+            jiggle = None if tweened else getattr(self.controller, "jiggle", None)
+            if jiggle is not None:
+                # 无补间：一次相对移动加反向移动，用户移动鼠标时也不会被拉回
+                # Zero tween: one relative move plus its inverse, which also never drags the user's cursor back
+                self._call("jiggle", jiggle, new_x - current_pos.x, new_y - current_pos.y)
+                return current_pos, move_count + 1, True
 
             # 移动鼠标 / Move mouse
-            self.controller.move_to(new_x, new_y, duration=0.1)
+            self._call("move_to", self.controller.move_to, new_x, new_y, duration=self.move_duration)
             move_count += 1
 
             # 立即移回原位置（这样用户感觉不到鼠标移动）
             # Immediately move back to original position (user won't notice the movement)
-            self.controller.move_to(current_pos.x, current_pos.y, duration=0.1)
+            self._call("move_to", self.controller.move_to, current_pos.x, current_pos.y, duration=self.move_duration)
 
             return current_pos, move_count, True
         except Exception as e:
             # 记录错误但不中断程序 / Log error but don't interrupt program
+            if self.reporter is not None:
+                self.reporter.warning("move_error", error=str(e))
+                return current_pos, move_count, False
             self.print_func(f"警告: 鼠标移动失败 / Warning: Mouse movement failed: {e}")
             self.print_func(f"Warning: Mouse movement failed: {e}")
             return current_pos, move_count, False
 
+    def _replay_pattern(self, current_pos: MousePosition, screen_size: ScreenSize, move_count: int) -> None:
+        """
+        回放图案的一条路径 / Replay one path of the pattern
+
+        控制器提供 move_path() 时一次调用回放整条路径，否则逐点 move_to()，补间时长平分到各点
+        Controllers with move_path() replay the whole path in one call; otherwise each point is a move_to(),
+        with the tween duration split across the points
+        """
+        assert self.pattern is not None
+        shift = self.pattern.shift(current_pos.x, current_pos.y, screen_size.width, screen_size.height)
+        move_path = getattr(self.controller, "move_path", None)
+        if move_path is not None:
+            self._call("move_path", move_path, self.pattern.steps(move_count, shift))
+            return
+
+        points = self.pattern.points(move_count)
+        origin_x, origin_y = current_pos.x + shift[0], current_pos.y + shift[1]
+        duration = self.move_duration / (len(points) // 2)
+        for i in range(0, len(points), 2):
+            x, y = origin_x + points[i], origin_y + points[i + 1]
+            self._call("move_to", self.controller.move_to, x, y, duration=duration)
+        if shift != (0, 0):
+            self._call("move_to", self.controller.move_to, current_pos.x, current_pos.y, duration=duration)
+
+    def _notify(self, level: str, event: str, message: str, **fields: Any) -> None:
+        """输出到 reporter，没有时使用 print_func / Report through the reporter, or print_func without one"""
+        if self.reporter is not None:
+            self.reporter.emit(level, event, **fields)
+        else:
+            self.print_func(message)
+
+    def _acquire_inhibitor(self) -> Optional["Inhibitor"]:
+        if self.inhibitors is None:
+            from .inhibit import default_inhibitors
+
+            self.inhibitors = default_inhibitors()
+        for inhibitor in self.inhibitors:
+            try:
+                if self._call("inhibit_acquire", inhibitor.acquire):
+                    return inhibitor
+            except Exception:
+                continue
+        return None
+
+    def perform_inhibit(self, move_count: int) -> Tuple[MousePosition, int, bool]:
+        """
+        持有休眠抑制，只在失效时重新获取 / Hold a sleep inhibition, re-acquiring it only when lost
+
+        从一开始就无法抑制时，本次及之后的 tick 都改用 inhibit_fallback；抑制中途失效时，
+        本次 tick 回退，下次 tick 再尝试获取
+        If inhibition is unavailable from the start, this and every later tick use inhibit_fallback;
+        if a held inhibition is lost, this tick falls back and the next one retries
+
+        Args:
+            move_count: 当前计数 / Current count
+
+        Returns:
+            (位置, 新的计数, 是否成功) / (Position, new count, success)
+        """
+        if self._inhibit_unavailable:
+            return self.perform_tick(self.inhibit_fallback, move_count)
+
+        self.last_tick_calls = Counter()
+        inhibitor = self.inhibitor
+        if inhibitor is not None:
+            try:
+                if self._call("inhibit_check", inhibitor.valid):
+                    return MousePosition(0, 0), move_count + 1, True
+            except Exception:
+                pass
+            self._notify(
+                "warning",
+                "inhibit_lost",
+                f"警告: 休眠抑制已失效 / Warning: Inhibition lost: {inhibitor.name}",
+                name=inhibitor.name,
+            )
+            self.release_inhibitor()
+
+        held_before = inhibitor is not None
+        self.inhibitor = self._acquire_inhibitor()
+        if self.inhibitor is not None:
+            name = self.inhibitor.name
+            self._notify("info", "inhibit_acquired", f"已阻止休眠: {name} / Inhibition acquired: {name}", name=name)
+            return MousePosition(0, 0), move_count + 1, True
+
+        if not held_before:
+            self._inhibit_unavailable = True
+            fallback = self.inhibit_fallback
+            self._notify(
+                "warning",
+                "inhibit_unavailable",
+                f"无法阻止休眠，改用 {fallback} / Inhibition unavailable, falling back to {fallback}",
+                fallback=fallback,
+            )
+        return self.perform_tick(self.inhibit_fallback, move_count)
+
+    def release_inhibitor(self) -> None:
+        """
+        释放持有的休眠抑制 / Release the held inhibition
+
+        与 acquire 走同一条调用路径：有 call_timeout 时它们都在 CallWorker 线程上执行，而
+        SetThreadExecutionState 的状态属于调用线程
+        Goes through the same call path as acquire: with call_timeout both run on the CallWorker thread,
+        and SetThreadExecutionState state belongs to the calling thread
+        """
+        inhibitor = self.inhibitor
+        if inhibitor is None:
+            return
+        self.inhibitor = None
+        try:
+            self._call("inhibit_release", inhibitor.release)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """
+        释放休眠抑制并停止调用线程 / Release the inhibition and stop the call thread
+
+        run() 结束时自动调用；直接使用 perform_tick() 的调用方（例如 Supervisor）需要自己调用
+        run() calls this on exit; callers that use perform_tick() directly (e.g. Supervisor) call it themselves
+        """
+        self.release_inhibitor()
+        if self._worker is not None:
+            self._worker.close()
+            self._worker = None
+
+    def _auto_policy(self) -> "EscalationPolicy":
+        if self.policy is None:
+            from .policy import EscalationPolicy
+
+            self.policy = EscalationPolicy()
+        if self.policy.probe is None:
+            from .probe import ResetProbe
+
+            self.policy.probe = ResetProbe(clock=self.monotonic_func, sleep=self.sleep_func)
+        return self.policy
+
+    def _perform_level(self, policy: "EscalationPolicy", move_count: int) -> Tuple[MousePosition, int, bool]:
+        """按策略的当前级别执行一次注入 / Perform one injection at the policy's current level"""
+        pattern = self.pattern
+        if policy.pattern is not None:
+            self.pattern = policy.pattern
+        try:
+            return self.perform_tick(policy.method, move_count)
+        finally:
+            self.pattern = pattern
+
+    def perform_tick(self, method: str, move_count: int) -> Tuple[MousePosition, int, bool]:
+        """
+        按活动方式执行一次注入 / Perform one injection for the given method
+
+        Args:
+            method: 活动方式，"mouse"、"keyboard" 或 "inhibit" / Activity method, "mouse", "keyboard" or "inhibit"
+            move_count: 当前移动计数 / Current move count
+
+        Returns:
+            (当前位置, 新的移动计数, 是否成功) / (Current position, new move count, success)
+        """
+        if method == "keyboard":
+            return self.perform_key_press(move_count)
+        if method == "inhibit":
+            return self.perform_inhibit(move_count)
+        return self.perform_move(move_count)
+
     def run(
         self,
-        interval: int = 60,
-        duration: Optional[int] = None,
+        interval: Union[float, Callable[[], float]] = 60,
+        duration: Optional[float] = None,
         verbose: bool = False,
         method: str = "mouse",
         diagnose: bool = False,
         on_start: Optional[Callable[[], None]] = None,
-        on_move: Optional[Callable[[int, MousePosition, float, bool], None]] = None,
+        on_move: Optional[Callable[..., None]] = None,
         on_finish: Optional[Callable[[int, float], None]] = None,
+        idle_threshold: Optional[float] = None,
+        on_skip: Optional[Callable[[float, float], None]] = None,
+        scheduler: str = "interval",
+        missed_policy: str = "skip",
+        jitter: float = 0.0,
+        schedule: Optional["WorkSchedule"] = None,
     ) -> Tuple[int, float]:
         """
         运行鼠标移动循环 / Run mouse movement loop
 
         Args:
-            interval: 移动间隔（秒）/ Movement interval (seconds)
+            interval: 移动间隔（秒），或每个 tick 调用一次、返回当前间隔的函数（例如 AutoInterval）/
+                Movement interval (seconds), or a function called once per tick that returns the current
+                interval (e.g. AutoInterval)
             duration: 运行时长（秒），None 表示无限运行 / Duration (seconds), None means infinite
             verbose: 是否显示详细日志 / Whether to show verbose logs
-            method: 活动方式，"mouse" 或 "keyboard" / Activity method, "mouse" or "keyboard"
-            diagnose: 是否输出系统空闲时间诊断信息（Windows）/ Whether to print idle-time diagnostics (Windows)
+            method: 活动方式，"mouse"、"keyboard"、"inhibit"（持有休眠抑制，结束时释放）或 "auto"
+                （按 self.policy 逐级升降，见 policy 模块）/ Activity method, "mouse", "keyboard", "inhibit"
+                (holds a sleep inhibition, released at the end) or "auto" (moves between levels by
+                self.policy, see the policy module)
+            diagnose: 是否输出系统空闲时间诊断信息 / Whether to print idle-time diagnostics
             on_start: 启动回调函数 / Start callback function
-            on_move: 移动回调函数，参数为 (move_count, position, elapsed, success) / Move callback function
+            on_move: 移动回调函数，参数为 (move_count, position, elapsed, success)；method="auto" 时
+                多一个 PolicyState / Move callback function; with method="auto" a PolicyState is appended
             on_finish: 完成回调函数 / Finish callback function
+            idle_threshold: 只在系统空闲超过该秒数时才注入输入，None 表示每次都注入；
+                无法获取空闲时间时照常注入 / Only inject when the system has been idle longer than this
+                many seconds; None injects every tick. Injects as usual when idle time is unknown
+            on_skip: 用户活跃而跳过注入时的回调，参数为 (idle_seconds, elapsed) /
+                Callback when a tick is skipped because the user is active, args (idle_seconds, elapsed)
+            scheduler: 调度方式 / Scheduling mode
+                - "interval": 每次 tick 之后 sleep(interval)，使用 time_func / sleep(interval) after each tick, uses time_func
+                - "deadline": 基于 monotonic_func 的绝对截止时间，不会漂移 /
+                  absolute deadlines on monotonic_func, drift-free
+            missed_policy: deadline 模式下错过截止时间的策略，"skip" 或 "catch-up" /
+                Missed-deadline policy in deadline mode, "skip" or "catch-up"
+            jitter: deadline 模式下的最大抖动（秒，只会提前）/ Max jitter in deadline mode (seconds, early only)
+            schedule: 工作时间，窗口之外一次休眠到下一个窗口开始；按 time_func 判断 /
+                Working hours; outside a window the loop sleeps once until the next window opens, judged
+                by time_func
 
         Returns:
             (移动次数, 运行时长) / (Move count, duration)
@@ -261,35 +729,200 @@ class MouseMover:
         if on_start:
             on_start()
 
-        start_time = self.time_func()
+        # 只在这里区分两种形式，之后的 tick_interval 总是 float / The two forms are told apart only here,
+        # tick_interval is always a float afterwards
+        interval_func: Optional[Callable[[], float]]
+        tick_interval: float
+        if callable(interval):
+            interval_func = interval
+            tick_interval = interval()
+        else:
+            interval_func = None
+            tick_interval = interval
+
+        deadlines = None
+        clock = self.time_func
+        if scheduler == "deadline":
+            from .scheduler import DeadlineScheduler
+
+            deadlines = DeadlineScheduler(tick_interval, policy=missed_policy, jitter=jitter)
+            clock = self.monotonic_func
+        self.deadlines = deadlines
+
+        start_time = clock()
+        if deadlines is not None:
+            deadlines.start(start_time)
         move_count = 0
         success_count = 0
+        skip_count = 0
+        control = self.control
 
         try:
             while True:
-                idle_before = get_system_idle_seconds() if diagnose else None
+                if control is not None and control.stopped:
+                    elapsed = clock() - start_time
+                    if on_finish:
+                        on_finish(move_count, elapsed)
+                    break
 
-                # 执行移动或按键 / Perform move or key press
-                if method == "keyboard":
-                    current_pos, move_count, success = self.perform_key_press(move_count)
+                if interval_func is not None:
+                    tick_interval = interval_func()
+                tick_method = method
+                if control is not None:
+                    if control.interval is not None:
+                        tick_interval = control.interval
+                    tick_method = control.method or method
+                policy = None
+                if tick_method == "auto":
+                    policy = self._auto_policy()
+                    tick_method = policy.method
+                if tick_method != "inhibit" and (control is not None or policy is not None):
+                    self.release_inhibitor()
+
+                if schedule is not None:
+                    wait = schedule.seconds_until_active(self.time_func())
+                    if wait > 0:
+                        # 工作时间之外：一次长等待，stop 可以打断 / Outside working hours: one long wait, stop wakes it
+                        elapsed = clock() - start_time
+                        if duration and elapsed >= duration:
+                            if on_finish:
+                                on_finish(move_count, elapsed)
+                            break
+                        until = schedule.format(self.time_func() + wait)
+                        if duration:
+                            wait = min(wait, start_time + duration - clock())
+                        skip_count += 1
+                        self.release_inhibitor()
+                        if self.metrics is not None:
+                            self.metrics.record_skip()
+                        self._notify(
+                            "info",
+                            "schedule_sleep",
+                            f"不在工作时间，休眠到 {until} / Outside working hours, sleeping until {until}",
+                            until=until,
+                            seconds=int(wait),
+                        )
+                        if control is not None:
+                            # 看门狗按这次等待判断健康 / The watchdog judges health against this wait
+                            control.record(
+                                moves=move_count,
+                                successes=success_count,
+                                skips=skip_count,
+                                elapsed=elapsed,
+                                current_interval=wait,
+                            )
+                        self._sleep(wait)
+                        if deadlines is not None:
+                            # 从窗口开始重新对齐，夜间不算错过的 tick / Re-anchor at the window, nights are not missed ticks
+                            deadlines.start(clock())
+                        continue
+
+                if deadlines is not None:
+                    if interval_func is not None or control is not None:
+                        deadlines.set_interval(tick_interval)
+                    deadlines.advance(clock())
+                    if self.metrics is not None:
+                        self.metrics.observe_lateness(deadlines.last_lateness)
+
+                tracer = self.tracer
+                tick_start = time.perf_counter_ns() if tracer is not None else 0
+                probe = self.probe
+                if policy is not None and probe is None:
+                    probe = policy.probe
+                measure = diagnose or idle_threshold is not None or probe is not None
+                idle_before = self.idle_func() if measure else None
+                if tracer is not None and measure:
+                    tracer.record("idle", tick_start, time.perf_counter_ns())
+
+                if control is not None and control.paused:
+                    # 通过控制通道暂停 / Paused through the control channel
+                    elapsed = clock() - start_time
+                    skip_count += 1
+                    self.release_inhibitor()
+                    if self.metrics is not None:
+                        self.metrics.record_skip()
+                    self._notify("debug", "paused", f"[{int(elapsed)}s] paused", elapsed=int(elapsed))
+                # 用户仍在操作时无需注入输入 / No need to inject while the user is still active
+                elif idle_threshold is not None and idle_before is not None and idle_before < idle_threshold:
+                    elapsed = clock() - start_time
+                    skip_count += 1
+                    if self.metrics is not None:
+                        self.metrics.record_skip()
+                    if on_skip:
+                        on_skip(idle_before, elapsed)
                 else:
-                    current_pos, move_count, success = self.perform_move(move_count)
-                if success:
-                    success_count += 1
-
-                elapsed = self.time_func() - start_time
-
-                if diagnose:
-                    idle_after = get_system_idle_seconds()
-                    # Windows 下：如果 idle_before/after 没变化，说明系统未把这次操作计入“真实输入”
-                    # On Windows: if idle doesn't change, system likely didn't count this as real input
-                    self.print_func(
-                        f"[{int(elapsed)}s] diagnose: idle_before={idle_before}, idle_after={idle_after} (seconds)"
+                    # 执行移动或按键 / Perform move or key press
+                    probe_started = probe.clock() if probe is not None else 0.0
+                    if policy is not None:
+                        current_pos, move_count, success = self._perform_level(policy, move_count)
+                    else:
+                        current_pos, move_count, success = self.perform_tick(tick_method, move_count)
+                    if success:
+                        success_count += 1
+                    if self.metrics is not None:
+                        self.metrics.record_tick(tick_method, success)
+
+                    # 休眠抑制本就不重置空闲计时，只验证回退时的注入 / Inhibition does not reset the idle timer
+                    # by design; only a fallback injection is verified
+                    label: Optional[str] = policy.level if policy is not None else tick_method
+                    if tick_method == "inhibit":
+                        label = self.inhibit_fallback if self.inhibitor is None else None
+                    verdict = "held" if success else "failed"
+                    if probe is not None and success and label is not None:
+                        phase_start = time.perf_counter_ns() if tracer is not None else 0
+                        probe.observe(label, self.idle_func, idle_before, probe_started)
+                        verdict = probe.last_verdict
+                        if tracer is not None:
+                            tracer.record("probe", phase_start, time.perf_counter_ns())
+                    state = None
+                    if policy is not None:
+                        state = policy.update(verdict, self.monotonic_func())
+                        if state.changed is not None:
+                            self._notify(
+                                "info",
+                                f"policy_{state.changed}",
+                                f"策略 / Policy: {state.level} -> {state.next_level} ({state.verdict})",
+                                previous=state.level,
+                                current=state.next_level,
+                                verdict=state.verdict,
+                            )
+
+                    elapsed = clock() - start_time
+
+                    if diagnose:
+                        idle_after = self.idle_func()
+                        # 如果 idle_before/after 没变化，说明系统未把这次操作计入“真实输入”
+                        # If idle doesn't change, the system likely didn't count this as real input
+                        if self.reporter is not None:
+                            self.reporter.info(
+                                "diagnose", elapsed=int(elapsed), idle_before=idle_before, idle_after=idle_after
+                            )
+                        else:
+                            self.print_func(
+                                f"[{int(elapsed)}s] diagnose: idle_before={idle_before}, "
+                                f"idle_after={idle_after} (seconds)"
+                            )
+
+                    if on_move:
+                        phase_start = time.perf_counter_ns() if tracer is not None else 0
+                        if state is not None:
+                            on_move(move_count, current_pos, elapsed, success, state)
+                        else:
+                            on_move(move_count, current_pos, elapsed, success)
+                        if tracer is not None:
+                            tracer.record("on_move", phase_start, time.perf_counter_ns())
+                    if tracer is not None:
+                        tracer.record("tick", tick_start, time.perf_counter_ns())
+
+                if control is not None:
+                    control.record(
+                        moves=move_count,
+                        successes=success_count,
+                        skips=skip_count,
+                        elapsed=elapsed,
+                        current_interval=tick_interval,
                     )
 
-                if on_move:
-                    on_move(move_count, current_pos, elapsed, success)
-
                 # 检查是否达到运行时长 / Check if duration is reached
                 if duration and elapsed >= duration:
                     if on_finish:
@@ -297,132 +930,206 @@ class MouseMover:
                     break
 
                 # 等待指定间隔 / Wait for specified interval
-                self.sleep_func(interval)
+                if deadlines is None:
+                    if self.metrics is None:
+                        self._sleep(tick_interval)
+                        continue
+                    # 间隔模式下，调度延迟即 sleep 的超时部分 / In interval mode, lateness is the sleep overshoot
+                    slept_from = self.monotonic_func()
+                    self._sleep(tick_interval)
+                    self.metrics.observe_lateness(self.monotonic_func() - slept_from - tick_interval)
+                    continue
+
+                # 等到下一个截止时间，但不超过运行时长的终点 / Wait for the next deadline, capped at the end of duration
+                now = clock()
+                delay = deadlines.delay(now)
+                if duration:
+                    delay = min(delay, max(0.0, start_time + duration - now))
+                if delay > 0:
+                    self._sleep(delay)
 
         except KeyboardInterrupt:
-            elapsed = self.time_func() - start_time
+            elapsed = clock() - start_time
             if on_finish:
                 on_finish(move_count, elapsed)
             raise
+        finally:
+            self.close()
 
-        elapsed = self.time_func() - start_time
+        elapsed = clock() - start_time
         return move_count, elapsed
 
 
+def _auto_interval(reporter: "Reporter") -> Callable[[], float]:
+    """--interval auto 的间隔函数，间隔变化时输出 / Interval function for --interval auto, reports changes"""
+    from .lock_timeout import AutoInterval
+
+    def on_change(timeout: Optional[float], interval: float) -> None:
+        if timeout is None:
+            reporter.info("interval_auto_default", interval=round(interval, 1))
+        else:
+            reporter.info("interval_auto", timeout=round(timeout, 1), interval=round(interval, 1))
+
+    return AutoInterval(on_change=on_change)
+
+
+def _claim_instance(policy: str) -> "InstanceLock":
+    """
+    获取会话锁，已有实例时按 --if-running 处理 / Take the session lock, handling a running instance per --if-running
+
+    exit 和 stats 在这里退出进程；takeover 让旧实例退出后接手 / exit and stats end the process here; takeover
+    stops the old instance and takes its place
+    """
+    from .instance_lock import TAKEOVER_TIMEOUT, InstanceLock, stop_owner
+
+    try:
+        lock = InstanceLock()
+        if lock.acquire():
+            return lock
+    except OSError as e:
+        print(f"错误: 无法获取会话锁: {e}")
+        print(f"Error: Cannot take the session lock: {e}")
+        sys.exit(1)
+
+    owner = lock.owner() or {}
+    pid = owner.get("pid", "?")
+    if policy == "stats":
+        if owner.get("control"):
+            from .control import send_command
+
+            try:
+                print(send_command("stats", owner["control"]))
+                sys.exit(0)
+            except OSError:
+                pass
+        print(f"已在运行（pid {pid}），未开启控制通道，无法查询统计")
+        print(f"Already running (pid {pid}) without a control channel, no stats available")
+        sys.exit(0)
+
+    if policy == "takeover":
+        print(f"接管本会话中运行的实例（pid {pid}）")
+        print(f"Taking over the instance running in this session (pid {pid})")
+        if stop_owner(owner) and lock.wait(TAKEOVER_TIMEOUT):
+            return lock
+        print("错误: 旧实例没有退出")
+        print("Error: The running instance did not exit")
+        sys.exit(1)
+
+    print(f"本会话中已有实例在运行（pid {pid}），退出")
+    print(f"Already running in this session (pid {pid}), exiting")
+    sys.exit(0)
+
+
+def _interval_arg(value: str) -> Any:
+    """-i/--interval 的参数类型：整数秒或 auto / Argument type for -i/--interval: integer seconds or auto"""
+    import argparse
+
+    if value == "auto":
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid interval: {value!r} (integer seconds or 'auto')")
+
+
 def move_mouse(
-    interval: int = 60,
+    interval: Union[int, str] = 60,
     duration: Optional[int] = None,
     verbose: bool = False,
     method: str = "mouse",
+    idle_threshold: Optional[float] = None,
+    reporter: Optional["Reporter"] = None,
+    move_duration: float = 0.1,
+    pattern: Optional[str] = None,
 ) -> None:
     """
     自动移动鼠标 / Automatically move mouse
     这是主要的公共 API，保持向后兼容性
 
     Args:
-        interval: 移动间隔（秒），默认60秒 / Movement interval (seconds), default 60
+        interval: 移动间隔（秒），默认60秒；"auto" 按屏保/锁屏超时推导 /
+            Movement interval (seconds), default 60; "auto" derives it from the screensaver/lock timeout
         duration: 运行时长（秒），None表示无限运行 / Duration (seconds), None means infinite
         verbose: 是否显示详细日志 / Whether to show verbose logs
         method: 活动方式，"mouse"（鼠标移动）或 "keyboard"（键盘按键），默认 "mouse" /
             Activity method, "mouse" or "keyboard", default "mouse"
+        idle_threshold: 只在系统空闲超过该秒数时才注入，None 表示每次都注入 /
+            Only inject when idle longer than this many seconds, None injects every tick
+        reporter: 输出接收器，None 表示按 verbose 创建默认的中英双语输出 /
+            Output sink, None creates the default bilingual output according to verbose
+        move_duration: 每次移动的补间时长（秒），0 表示无补间 / Tween duration of each move (seconds), 0 disables tweening
+        pattern: 移动图案名称（见 patterns.PATTERNS），None 表示 ±25 像素对角移动 /
+            Movement pattern name (see patterns.PATTERNS), None keeps the ±25px diagonal move
+
+    Raises:
+        ImportError: 未安装 pyautogui 时抛出 / Raised when pyautogui is not installed
     """
-    mover = MouseMover()
-    success_count = [0]  # 使用列表以便在闭包中修改 / Use list to allow modification in closure
-
-    def on_start():
-        if method == "keyboard":
-            mover.print_func("开始自动按键保持活动...")
-            mover.print_func("Starting keyboard keepalive...")
-        else:
-            mover.print_func("开始自动移动鼠标...")
-            mover.print_func("Starting mouse keepalive...")
-        mover.print_func(f"活动方式: {method} / Method: {method}")
-        mover.print_func(f"移动间隔: {interval} 秒 / Interval: {interval} seconds")
-        if duration:
-            mover.print_func(f"运行时长: {duration} 秒 / Duration: {duration} seconds")
-        else:
-            mover.print_func("运行时长: 无限（按 Ctrl+C 停止） / Duration: Infinite (Press Ctrl+C to stop)")
-        mover.print_func(f"操作系统: {platform.system()} / OS: {platform.system()}")
-        if verbose:
-            mover.print_func("详细模式: 已启用 / Verbose mode: Enabled")
-        mover.print_func("-" * 50)
-
-    def on_move(move_count: int, current_pos: MousePosition, elapsed: float, success: bool):
-        if success:
-            success_count[0] += 1
-
-        if method == "keyboard":
-            if verbose:
-                status = "成功" if success else "失败"
-                mover.print_func(
-                    f"[{int(elapsed)}s] 已按键 {move_count} 次 (状态: {status}) / "
-                    f"Pressed key {move_count} times (status: {status})"
-                )
-            elif success:
-                mover.print_func(f"[{int(elapsed)}s] 已按键 {move_count} 次 / Pressed key {move_count} times")
-            elif not success:
-                mover.print_func(f"[{int(elapsed)}s] 警告: 按键失败 / Warning: Key press failed (attempt {move_count})")
-        else:
-            if verbose:
-                status = "成功" if success else "失败"
-                mover.print_func(
-                    f"[{int(elapsed)}s] 已移动鼠标 {move_count} 次 (当前位置: {current_pos.x}, {current_pos.y}, 状态: {status})"
-                )
-                status_text = "success" if success else "failed"
-                mover.print_func(
-                    f"[{int(elapsed)}s] Moved mouse {move_count} times "
-                    f"(current position: {current_pos.x}, {current_pos.y}, status: {status_text})"
-                )
-            elif success:
-                # 非详细模式下，每次成功移动都输出日志（包含坐标） / In non-verbose mode, output every successful move (with coordinates)
-                mover.print_func(
-                    f"[{int(elapsed)}s] 已移动鼠标 {move_count} 次 "
-                    f"(位置: {current_pos.x}, {current_pos.y}) / "
-                    f"Moved mouse {move_count} times "
-                    f"(position: {current_pos.x}, {current_pos.y})"
-                )
-            elif not success:
-                # 移动失败时也输出警告 / Output warning when move fails
-                mover.print_func(
-                    f"[{int(elapsed)}s] 警告: 鼠标移动失败 / Warning: Mouse movement failed (attempt {move_count})"
-                )
-
-    def on_finish(move_count: int, elapsed: float):
-        if duration:
-            mover.print_func(f"\n达到运行时长 {duration} 秒，程序退出")
-            mover.print_func(f"Duration {duration} seconds reached, exiting")
-        else:
-            mover.print_func("\n\n程序被用户中断")
-            mover.print_func("Program interrupted by user")
-        if method == "keyboard":
-            mover.print_func(f"总共按键 {move_count} 次 / Total key presses: {move_count}")
-        else:
-            mover.print_func(f"总共移动鼠标 {move_count} 次 / Total moves: {move_count}")
-        if method == "keyboard":
-            mover.print_func(f"成功按键: {success_count[0]} 次 / Successful key presses: {success_count[0]}")
-        else:
-            mover.print_func(f"成功移动: {success_count[0]} 次 / Successful moves: {success_count[0]}")
-        mover.print_func(f"运行时长: {int(elapsed)} 秒 / Duration: {int(elapsed)} seconds")
+    from .reporter import Reporter, RunReporter
+
+    # 提前加载后端，缺少依赖时立即报错，而不是每个间隔都打印失败
+    # Load the backend up front so a missing dependency fails fast instead of failing every interval
+    _load_pyautogui()
+    if reporter is None:
+        reporter = Reporter(level="debug" if verbose else "info")
+    if pattern is not None:
+        from .patterns import get_pattern
+
+        mover = MouseMover(reporter=reporter, move_duration=move_duration, pattern=get_pattern(pattern))
+    else:
+        mover = MouseMover(reporter=reporter, move_duration=move_duration)
+    run_interval: Union[float, Callable[[], float]] = _auto_interval(reporter) if interval == "auto" else int(interval)
+    callbacks = RunReporter(
+        reporter,
+        method=method,
+        interval=run_interval,
+        duration=duration,
+        verbose=verbose,
+        idle_threshold=idle_threshold,
+    )
 
     try:
         mover.run(
-            interval=interval,
+            interval=run_interval,
             duration=duration,
             verbose=verbose,
             method=method,
             diagnose=False,
-            on_start=on_start,
-            on_move=on_move,
-            on_finish=on_finish,
+            on_start=callbacks.on_start,
+            on_move=callbacks.on_move,
+            on_finish=callbacks.on_finish,
+            idle_threshold=idle_threshold,
+            on_skip=callbacks.on_skip,
         )
     except KeyboardInterrupt:
         # on_finish 已经在 KeyboardInterrupt 处理中调用
         pass
+    finally:
+        reporter.close()
 
 
 def main():
     """命令行入口函数 / Command line entry function"""
     import argparse
+    import platform
+
+    # 子命令 / Subcommands
+    if sys.argv[1:2] == ["serve"]:
+        from .supervisor import main as serve_main
+
+        serve_main(sys.argv[2:])
+        return
+
+    if sys.argv[1:2] == ["ctl"]:
+        from .control import main as ctl_main
+
+        ctl_main(sys.argv[2:])
+        return
+
+    if sys.argv[1:2] == ["worker"]:
+        from .worker import main as worker_main
+
+        worker_main(sys.argv[2:])
+        return
 
     # 在 Windows 上设置输出为行缓冲模式，解决输出延迟问题
     # Set output to line buffering on Windows to solve output delay issue
@@ -450,9 +1157,19 @@ def main():
   mouse-keepalive -i 30              # 每30秒移动一次 / Move every 30s
   mouse-keepalive -i 120 -d 3600     # 每120秒移动一次，运行1小时 / Move every 120s, run for 1 hour
   mouse-keepalive -v                 # 显示详细日志 / Show verbose logs
-  mouse-keepalive -m keyboard         # 使用键盘按键方式（推荐用于 Teams） / Use keyboard method (recommended for Teams)
+  mouse-keepalive -m keyboard         # 使用键盘按键方式 / Use keyboard method
   mouse-keepalive -m mouse            # 使用鼠标移动方式（默认） / Use mouse method (default)
-  mouse-keepalive --diagnose          # 输出 Windows 系统 idle 秒数（诊断 Teams 为何不认） / Print Windows idle seconds (diagnose)
+  mouse-keepalive -m auto             # 自动选用有效且最省开销的方式 / Pick the cheapest method that works
+  mouse-keepalive --diagnose          # 输出系统 idle 秒数（诊断 Teams 为何不认） / Print system idle seconds (diagnose)
+  mouse-keepalive --probe -d 600      # 测量注入是否重置空闲计时 / Measure whether injections reset the idle timer
+  mouse-keepalive --profile trace.json # 分阶段计时并写出 Chrome 追踪 / Per-phase timing with a Chrome trace
+  mouse-keepalive --idle-threshold 50 # 仅在空闲超过50秒时注入 / Only inject after 50s of user inactivity
+  mouse-keepalive --scheduler deadline # 无漂移的截止时间调度 / Drift-free deadline scheduling
+  mouse-keepalive serve --displays :1,:2 # 一个进程守护多个 X 显示 / One process for several X displays
+  mouse-keepalive --metrics 127.0.0.1:9464 # 提供 Prometheus 指标 / Serve Prometheus metrics
+  mouse-keepalive --control          # 开启控制通道 / Enable the control channel
+  mouse-keepalive ctl pause          # 暂停运行中的实例 / Pause the running instance
+  mouse-keepalive --daemon           # systemd Type=notify 服务 / systemd Type=notify service
   mka -i 30                          # 使用简短别名 / Use short alias
   python -m mouse_keepalive         # 使用模块方式运行 / Run as module
         """,
@@ -461,9 +1178,12 @@ def main():
     parser.add_argument(
         "-i",
         "--interval",
-        type=int,
+        type=_interval_arg,
         default=60,
-        help="鼠标移动间隔（秒），默认60秒 / Mouse movement interval (seconds), default 60",
+        help=(
+            "鼠标移动间隔（秒），默认60秒；auto 按屏保/锁屏超时自动推导 / "
+            "Mouse movement interval (seconds), default 60; auto derives it from the screensaver/lock timeout"
+        ),
     )
 
     parser.add_argument(
@@ -485,26 +1205,260 @@ def main():
         "-m",
         "--method",
         type=str,
-        choices=["mouse", "keyboard"],
+        choices=["mouse", "keyboard", "inhibit", "auto"],
         default="mouse",
         help=(
-            "活动方式：mouse（鼠标移动）或 keyboard（键盘按键）。键盘方式对 Teams 等应用更有效 / "
-            "Activity method: mouse or keyboard. Keyboard method is more effective for Teams"
+            "活动方式：mouse（鼠标移动）、keyboard（键盘按键）、inhibit（不注入输入，直接阻止屏保和休眠）"
+            "或 auto（从 1 像素移动开始，验证空闲计时未重置时才逐级升级）。哪种方式在本机有效，用 --probe 测量 / "
+            "Activity method: mouse, keyboard, inhibit (no input, inhibits the screensaver and sleep) or auto "
+            "(starts with a 1px move and escalates only when the idle timer does not reset). "
+            "Use --probe to measure which one works on this machine"
         ),
     )
 
+    parser.add_argument(
+        "--fallback-method",
+        type=str,
+        choices=["mouse", "keyboard"],
+        default="mouse",
+        help="inhibit 不可用时改用的方式 / Method used when inhibit is unavailable",
+    )
+
     parser.add_argument(
         "--diagnose",
         action="store_true",
         help=(
-            "输出 Windows 系统 idle 秒数（用于诊断 Teams 为何不把模拟输入算作活动） / "
-            "Print Windows idle seconds to diagnose why Teams may not count simulated input"
+            "输出系统 idle 秒数（用于诊断 Teams 为何不把模拟输入算作活动） / "
+            "Print system idle seconds to diagnose why Teams may not count simulated input"
+        ),
+    )
+
+    parser.add_argument(
+        "--probe",
+        action="store_true",
+        help=(
+            "测量每次注入后系统空闲计时器是否、多快重置，结束时按方式和后端输出直方图和摘要 / "
+            "Measure whether and how fast the idle timer resets after each injection; reports a histogram "
+            "and a summary per method and backend at the end"
+        ),
+    )
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="FILE",
+        help=(
+            "记录每个 tick 各阶段（后端调用、计算位置、on_move、sleep）的耗时，退出时输出摘要和最慢的 tick；"
+            "给出 FILE 时另写出 Chrome 追踪文件 / Time every tick phase (backend calls, position calculation, "
+            "on_move, sleep) and print a summary and the slowest ticks at exit; with FILE also write a Chrome trace"
+        ),
+    )
+
+    parser.add_argument(
+        "--cprofile",
+        default=None,
+        metavar="FILE",
+        help="在 cProfile 下运行，退出时写出 pstats 文件 / Run under cProfile and write a pstats file at exit",
+    )
+
+    parser.add_argument(
+        "--idle-threshold",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "只在系统空闲超过该秒数时才注入输入（Windows、Linux），默认每次都注入 / "
+            "Only inject input when the system has been idle longer than this (Windows, Linux); default always"
+        ),
+    )
+
+    class VersionAction(argparse.Action):
+        """只在传入 --version 时才查询版本号 / Only resolve the version when --version is given"""
+
+        def __call__(self, parser, namespace, values, option_string=None):
+            from . import __version__
+
+            parser.exit(message=f"{parser.prog} {__version__}\n")
+
+    parser.add_argument(
+        "-V",
+        "--version",
+        action=VersionAction,
+        nargs=0,
+        help="显示版本号 / Show version",
+    )
+
+    parser.add_argument(
+        "--scheduler",
+        type=str,
+        choices=["interval", "deadline"],
+        default="interval",
+        help=(
+            "调度方式：interval（每次执行后等待间隔）或 deadline（单调时钟绝对截止时间，无漂移） / "
+            "Scheduling: interval (sleep after each tick) or deadline (monotonic absolute deadlines, drift-free)"
+        ),
+    )
+
+    parser.add_argument(
+        "--missed",
+        type=str,
+        choices=["skip", "catch-up"],
+        default="skip",
+        help=(
+            "deadline 模式下挂起恢复后如何处理错过的 tick：skip（跳过）或 catch-up（立即补一次） / "
+            "How deadline mode handles ticks missed during suspend: skip or catch-up (fire one immediately)"
+        ),
+    )
+
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="deadline 模式下的最大随机抖动（只会提前） / Max random jitter in deadline mode (early only)",
+    )
+
+    parser.add_argument(
+        "--schedule",
+        default=None,
+        metavar="SPEC",
+        help=(
+            "只在工作时间保活，例如 'Mon-Fri 08:30-18:00' 或 'TZ=Europe/Berlin Mon-Fri 08:00-17:00'；"
+            "其余时间一次休眠到下一个窗口 / Keep alive during working hours only, e.g. 'Mon-Fri 08:30-18:00'; "
+            "outside them sleep once until the next window"
+        ),
+    )
+
+    parser.add_argument(
+        "--holidays",
+        default=None,
+        metavar="DATES",
+        help=(
+            "--schedule 的节假日：逗号分隔的 ISO 日期，或每行一个日期的文件 / "
+            "Holidays for --schedule: comma-separated ISO dates, or a file with one date per line"
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        default=None,
+        metavar="ADDRESS",
+        help=(
+            "在本地端口（如 127.0.0.1:9464）或 Unix socket（unix:/path）上提供 Prometheus 指标 / "
+            "Serve Prometheus metrics on a local port (e.g. 127.0.0.1:9464) or Unix socket (unix:/path)"
+        ),
+    )
+
+    parser.add_argument(
+        "--call-timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "单次后端调用的时限，超时计为失败并退避，连续 3 次后重连后端；0 表示不限时；默认可能卡住的后端"
+            "（xlib、pyautogui、xdotool）为 5 秒，其他不限时 / "
+            "Deadline of one backend call; a timeout counts as a failure and backs off, 3 in a row reconnect "
+            "the backend; 0 disables it; defaults to 5 seconds for backends that can hang (xlib, pyautogui, "
+            "xdotool) and off for the rest"
+        ),
+    )
+
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "守护进程模式：systemd READY/STATUS/WATCHDOG 通知，SIGTERM/SIGHUP 在当前 tick 结束后退出 / "
+            "Daemon mode: systemd READY/STATUS/WATCHDOG notifications, SIGTERM/SIGHUP exit after the current tick"
         ),
     )
 
+    parser.add_argument(
+        "--if-running",
+        choices=["exit", "takeover", "stats"],
+        default="exit",
+        help=(
+            "本会话（用户 + 显示）已有实例时：exit 直接退出，takeover 结束旧实例后接手，"
+            "stats 输出旧实例的统计后退出 / When an instance already runs in this session (user + display): "
+            "exit quits, takeover stops it and takes over, stats prints its stats and quits"
+        ),
+    )
+
+    parser.add_argument(
+        "--control",
+        nargs="?",
+        const="default",
+        default=None,
+        metavar="ADDRESS",
+        help=(
+            "开启运行时控制通道（pause、resume、set-interval、set-method、stats、stop），"
+            "默认 $XDG_RUNTIME_DIR/mouse-keepalive.sock，也可以是 unix:/path 或 127.0.0.1:PORT / "
+            "Enable the runtime control channel (pause, resume, set-interval, set-method, stats, stop), "
+            "default $XDG_RUNTIME_DIR/mouse-keepalive.sock, or unix:/path or 127.0.0.1:PORT"
+        ),
+    )
+
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default="auto",
+        metavar="NAME",
+        help=(
+            "输入后端：auto、xlib、uinput、pyautogui、xdotool、null 或插件注册的后端，默认自动选择开销最低的 / "
+            "Input backend: auto, xlib, uinput, pyautogui, xdotool, null or a plugin-registered one; "
+            "default picks the cheapest"
+        ),
+    )
+
+    parser.add_argument(
+        "--move-duration",
+        type=float,
+        default=0.1,
+        metavar="SECONDS",
+        help=(
+            "每次移动的补间时长，0 表示无补间的相对移动（tick 约 1 毫秒） / "
+            "Tween duration of each move; 0 injects an untweened relative move (about 1ms per tick)"
+        ),
+    )
+
+    parser.add_argument(
+        "--pattern",
+        choices=["diagonal", "micro", "circle", "random-walk", "bezier"],
+        default=None,
+        help=(
+            "移动图案，启动时预计算、每个 tick 回放；默认 ±25 像素对角移动 / "
+            "Movement pattern, precomputed at start-up and replayed every tick; defaults to the ±25px diagonal move"
+        ),
+    )
+
+    parser.add_argument(
+        "--lang",
+        choices=["zh", "en", "both"],
+        default="both",
+        help="输出语言，默认中英双语 / Output language, default both",
+    )
+
+    parser.add_argument(
+        "--log-format",
+        choices=["text", "json"],
+        default="text",
+        help="输出格式：text 或 json（每行一个 JSON 对象） / Output format: text or json (one JSON object per line)",
+    )
+
+    parser.add_argument(
+        "--log-level",
+        choices=["debug", "info", "warning", "error"],
+        default=None,
+        help="最低输出级别，默认 info（-v 时为 debug） / Minimum log level, default info (debug with -v)",
+    )
+
     args = parser.parse_args()
 
-    if args.interval < 1:
+    from .control import MIN_INTERVAL
+
+    if args.interval != "auto" and args.interval < MIN_INTERVAL:
         print("错误: 移动间隔必须大于0")
         print("Error: Interval must be greater than 0")
         sys.exit(1)
@@ -514,94 +1468,248 @@ def main():
         print("Error: Duration must be greater than 0")
         sys.exit(1)
 
+    if args.jitter < 0:
+        print("错误: 抖动不能为负数")
+        print("Error: Jitter must not be negative")
+        sys.exit(1)
+
+    if args.backend != "auto":
+        from .backends import backend_names
+
+        if args.backend not in backend_names():
+            print(f"错误: 未知后端 {args.backend}")
+            print(f"Error: Unknown backend {args.backend} (available: {', '.join(backend_names())})")
+            sys.exit(1)
+
+    if args.call_timeout is not None and args.call_timeout < 0:
+        print("错误: 调用时限不能为负数")
+        print("Error: Call timeout must not be negative")
+        sys.exit(1)
+
+    schedule = None
+    if args.schedule is not None:
+        from .work_hours import WorkSchedule, parse_holidays
+
+        try:
+            schedule = WorkSchedule(args.schedule, parse_holidays(args.holidays) if args.holidays else ())
+        except (OSError, ValueError) as e:
+            print(f"错误: 工作时间无效: {e}")
+            print(f"Error: Invalid working hours: {e}")
+            sys.exit(1)
+    elif args.holidays is not None:
+        print("错误: --holidays 需要配合 --schedule 使用")
+        print("Error: --holidays requires --schedule")
+        sys.exit(1)
+
+    if args.move_duration < 0:
+        print("错误: 移动时长不能为负数")
+        print("Error: Move duration must not be negative")
+        sys.exit(1)
+
+    if args.idle_threshold is not None and args.idle_threshold <= 0:
+        print("错误: 空闲阈值必须大于0")
+        print("Error: Idle threshold must be greater than 0")
+        sys.exit(1)
+
+    from .backends import IDLE, close_controllers, detect_backend, get_backend, get_controller, reopen_controller
+
+    backend = args.backend if args.backend != "auto" else detect_backend()
+    if backend is None:
+        print("错误: 没有可用的输入后端，请安装 pyautogui 或 xdotool")
+        print("Error: No input backend available, please install pyautogui or xdotool")
+        sys.exit(1)
+
+    if backend == "pyautogui":
+        try:
+            _load_pyautogui()
+        except ImportError:
+            print("错误: 未安装 pyautogui 库")
+            print("Error: pyautogui library not installed")
+            print("请运行: pip install pyautogui")
+            print("Please run: pip install pyautogui")
+            sys.exit(1)
+    if args.call_timeout is None:
+        from .backends import BLOCKING
+        from .call_timeout import DEFAULT_TIMEOUT
+
+        # 不会卡住的后端不需要每次调用多一次线程切换 / Backends that cannot hang skip the per-call thread hop
+        args.call_timeout = DEFAULT_TIMEOUT if BLOCKING in get_backend(backend).capabilities else 0
+
+    # 在创建控制器（例如 uinput 虚拟设备）和绑定端口之前加锁 / Lock before creating controllers (e.g. the uinput
+    # virtual device) and binding ports
+    instance = _claim_instance(args.if_running)
+    try:
+        controller = get_controller(backend)
+    except BaseException:
+        instance.release()
+        raise
+    # 后端能查询空闲时间时（例如 xlib 使用同一个显示）优先使用它；经由 mover 取控制器，重连后仍然有效
+    # Prefer the backend's own idle query when it has one; reached through the mover so it survives a reconnect
+    idle_func = (lambda: mover.controller.idle_seconds()) if IDLE in get_backend(backend).capabilities else None
+
+    if args.cprofile:
+        # 先确认能写，免得运行结束才发现 / Check it is writable now rather than at the end of the run
+        try:
+            open(args.cprofile, "ab").close()
+        except OSError as e:
+            print(f"错误: 无法写入 cProfile 文件: {e}")
+            print(f"Error: Cannot write cProfile file: {e}")
+            instance.release()
+            sys.exit(1)
+
+    metrics = None
+    metrics_server = None
+    if args.metrics:
+        from .metrics import Metrics, MetricsServer
+
+        metrics = Metrics()
+        try:
+            metrics_server = MetricsServer(metrics, args.metrics).start()
+        except (OSError, ValueError) as e:
+            print(f"错误: 无法启动指标端点: {e}")
+            print(f"Error: Cannot start metrics endpoint: {e}")
+            instance.release()
+            sys.exit(1)
+
+    probe = None
+    policy = None
+    if args.probe or args.method == "auto":
+        from .policy import EscalationPolicy
+        from .probe import ResetProbe
+
+        if args.probe:
+            probe = ResetProbe(backend=backend)
+        if args.method == "auto":
+            policy = EscalationPolicy(probe=probe or ResetProbe(backend=backend))
+
+    tracer = None
+    if args.profile:
+        from .profiling import TickTracer
+
+        tracer = TickTracer()
+
+    from .patterns import get_pattern
+    from .reporter import Reporter, RunReporter
+
+    level = args.log_level or ("debug" if args.verbose else "info")
+    reporter = Reporter(level=level, locale=args.lang, fmt=args.log_format)
+
+    control = None
+    if args.control or args.daemon:
+        from .control import Control
+
+        control = Control()
+
     # 直接走 MouseMover.run，这样可以透传 diagnose 参数，同时保持 move_mouse() API 的向后兼容
     # Call MouseMover.run directly to pass diagnose, while keeping move_mouse() API backward compatible
-    mover = MouseMover()
+    mover = MouseMover(
+        controller=controller,
+        idle_func=idle_func,
+        metrics=metrics,
+        reporter=reporter,
+        move_duration=args.move_duration,
+        inhibit_fallback=args.fallback_method,
+        control=control,
+        sleep_func=control.sleep if control is not None else None,
+        call_timeout=args.call_timeout or None,
+        reconnect=lambda: reopen_controller(backend),
+        pattern=get_pattern(args.pattern) if args.pattern else None,
+        probe=probe,
+        policy=policy,
+        tracer=tracer,
+    )
+    interval = _auto_interval(reporter) if args.interval == "auto" else args.interval
+    callbacks = RunReporter(
+        reporter,
+        method=args.method,
+        interval=interval,
+        duration=args.duration,
+        verbose=args.verbose,
+        diagnose=args.diagnose,
+        idle_threshold=args.idle_threshold,
+        scheduler=args.scheduler,
+        missed=args.missed,
+        backend=backend,
+        schedule=schedule,
+        probe=probe,
+        control=control,
+    )
 
-    def on_start():
-        if args.method == "keyboard":
-            mover.print_func("开始自动按键保持活动...")
-            mover.print_func("Starting keyboard keepalive...")
-        else:
-            mover.print_func("开始自动移动鼠标...")
-            mover.print_func("Starting mouse keepalive...")
-        mover.print_func(f"活动方式: {args.method} / Method: {args.method}")
-        mover.print_func(f"移动间隔: {args.interval} 秒 / Interval: {args.interval} seconds")
-        if args.duration:
-            mover.print_func(f"运行时长: {args.duration} 秒 / Duration: {args.duration} seconds")
-        else:
-            mover.print_func("运行时长: 无限（按 Ctrl+C 停止） / Duration: Infinite (Press Ctrl+C to stop)")
-        mover.print_func(f"操作系统: {platform.system()} / OS: {platform.system()}")
-        if args.verbose:
-            mover.print_func("详细模式: 已启用 / Verbose mode: Enabled")
-        if args.diagnose:
-            mover.print_func(
-                "诊断模式: 已启用（将输出 Windows idle 秒数） / Diagnose: Enabled (prints Windows idle seconds)"
-            )
-        mover.print_func("-" * 50)
-
-    def on_move(move_count: int, current_pos: MousePosition, elapsed: float, success: bool):
-        # 复用 move_mouse() 的输出逻辑（保持一致）
-        # Reuse the same output behavior as move_mouse()
-        status = "成功" if success else "失败"
-        if args.method == "keyboard":
-            if args.verbose:
-                mover.print_func(
-                    f"[{int(elapsed)}s] 已按键 {move_count} 次 (状态: {status}) / "
-                    f"Pressed key {move_count} times (status: {status})"
-                )
-            elif success:
-                mover.print_func(f"[{int(elapsed)}s] 已按键 {move_count} 次 / Pressed key {move_count} times")
-            else:
-                mover.print_func(f"[{int(elapsed)}s] 警告: 按键失败 / Warning: Key press failed (attempt {move_count})")
-        else:
-            if args.verbose:
-                mover.print_func(
-                    f"[{int(elapsed)}s] 已移动鼠标 {move_count} 次 (当前位置: {current_pos.x}, {current_pos.y}, 状态: {status})"
-                )
-                status_text = "success" if success else "failed"
-                mover.print_func(
-                    f"[{int(elapsed)}s] Moved mouse {move_count} times "
-                    f"(current position: {current_pos.x}, {current_pos.y}, status: {status_text})"
-                )
-            elif success:
-                mover.print_func(
-                    f"[{int(elapsed)}s] 已移动鼠标 {move_count} 次 "
-                    f"(位置: {current_pos.x}, {current_pos.y}) / "
-                    f"Moved mouse {move_count} times "
-                    f"(position: {current_pos.x}, {current_pos.y})"
-                )
-            else:
-                mover.print_func(
-                    f"[{int(elapsed)}s] 警告: 鼠标移动失败 / Warning: Mouse movement failed (attempt {move_count})"
-                )
-
-    def on_finish(move_count: int, elapsed: float):
-        if args.duration:
-            mover.print_func(f"\n达到运行时长 {args.duration} 秒，程序退出")
-            mover.print_func(f"Duration {args.duration} seconds reached, exiting")
-        else:
-            mover.print_func("\n\n程序被用户中断")
-            mover.print_func("Program interrupted by user")
-        if args.method == "keyboard":
-            mover.print_func(f"总共按键 {move_count} 次 / Total key presses: {move_count}")
-        else:
-            mover.print_func(f"总共移动鼠标 {move_count} 次 / Total moves: {move_count}")
-        mover.print_func(f"运行时长: {int(elapsed)} 秒 / Duration: {int(elapsed)} seconds")
+    control_server = None
+    if control is not None:
+
+        def on_control(command: str, value: Any) -> None:
+            if command == "set-method":
+                callbacks.method = value
+            reporter.info("control", command=command, value=value if command.startswith("set-") else "")
+
+        control.on_change = on_control
+
+    if args.control:
+        from .control import ControlServer
+
+        try:
+            control_server = ControlServer(control, None if args.control == "default" else args.control).start()
+        except (OSError, ValueError) as e:
+            print(f"错误: 无法启动控制通道: {e}")
+            print(f"Error: Cannot start control channel: {e}")
+            reporter.close()
+            instance.release()
+            sys.exit(1)
+        instance.update(control=control_server.address)
+        reporter.info("control_listening", address=control_server.address)
+
+    daemon = None
+    if args.daemon:
+        from .daemon import Daemon, install_signal_handlers
+
+        install_signal_handlers(control)
+        daemon = Daemon(control).start()
+
+    from contextlib import nullcontext
+
+    profiler: Any = nullcontext()
+    if args.cprofile:
+        from .profiling import cprofiled
+
+        profiler = cprofiled(args.cprofile)
 
     try:
-        mover.run(
-            interval=args.interval,
-            duration=args.duration,
-            verbose=args.verbose,
-            method=args.method,
-            diagnose=args.diagnose,
-            on_start=on_start,
-            on_move=on_move,
-            on_finish=on_finish,
-        )
+        with profiler:
+            mover.run(
+                interval=interval,
+                duration=args.duration,
+                verbose=args.verbose,
+                method=args.method,
+                diagnose=args.diagnose,
+                on_start=callbacks.on_start,
+                on_move=callbacks.on_move,
+                on_finish=callbacks.on_finish,
+                idle_threshold=args.idle_threshold,
+                on_skip=callbacks.on_skip,
+                scheduler=args.scheduler,
+                missed_policy=args.missed,
+                jitter=args.jitter,
+                schedule=schedule,
+            )
     except KeyboardInterrupt:
         pass
+    finally:
+        if tracer is not None:
+            from .profiling import report_profile
+
+            report_profile(reporter, tracer, None if args.profile == "-" else args.profile)
+        if args.cprofile:
+            reporter.info("profile_cprofile", path=args.cprofile)
+        reporter.close()
+        close_controllers()
+        if metrics_server is not None:
+            metrics_server.close()
+        if daemon is not None:
+            daemon.close()
+        if control_server is not None:
+            control_server.close()
+        instance.release()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+"""
+预计算的移动图案 / Precomputed movement patterns
+
+默认的 ±25 像素对角移动有时不会被活动检测识别。这里的图案在启动时生成一次，
+保存为紧凑的坐标表（array('h')，每步 dx、dy 交错存放），之后每个 tick 只按表回放：
+The default ±25px diagonal move is sometimes ignored by activity detectors. The patterns here
+are generated once at start-up into compact coordinate tables (array('h'), dx and dy interleaved
+per step) and every tick just replays a table:
+
+    diagonal      ±25 像素对角移动并移回（与默认行为相同）/ ±25px diagonal and back (the default motion)
+    micro         1 像素抖动 / 1px jiggle
+    circle        半径 10 像素的小圆 / A small circle with a 10px radius
+    random-walk   随机游走后原路返回 / A random walk retraced back to the start
+    bezier        贝塞尔曲线的类人移动 / Human-like Bezier curves
+
+每条路径都回到起点，并且每一步都有大小相等、方向相反的一步，逐步施加的指针加速度会互相抵消。
+控制器提供 move_path() 时整条路径只需一次后端调用。
+Every path returns to its start, and each step has an equal and opposite step, so pointer
+acceleration applied per step cancels out. Controllers with move_path() replay a whole path in one
+backend call.
+"""
+
+import math
+import random
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 每个图案预计算的路径数，按 tick 轮换 / Paths precomputed per pattern, rotated per tick
+VARIANTS = 8
+
+Step = Tuple[int, int]
+
+
+def _retrace(steps: List[Step]) -> List[Step]:
+    """走出去再原路返回 / Go out and retrace the steps back"""
+    return steps + [(-dx, -dy) for dx, dy in reversed(steps)]
+
+
+def _deltas(points: Sequence[Tuple[float, float]]) -> List[Step]:
+    """从起点 (0, 0) 出发的取整点序列转换为相对步长 / Rounded points starting from (0, 0) to relative steps"""
+    steps = []
+    x = y = 0
+    for px, py in points:
+        nx, ny = round(px), round(py)
+        if nx != x or ny != y:
+            steps.append((nx - x, ny - y))
+            x, y = nx, ny
+    return steps
+
+
+def _diagonal(rng: random.Random, index: int) -> List[Step]:
+    offset = 25 if index % 2 == 0 else -25
+    return [(offset, offset), (-offset, -offset)]
+
+
+def _micro(rng: random.Random, index: int) -> List[Step]:
+    offset = 1 if index % 2 == 0 else -1
+    return [(offset, offset), (-offset, -offset)]
+
+
+def _circle(rng: random.Random, index: int, radius: int = 10, points: int = 16) -> List[Step]:
+    # 从圆的最右点出发，奇数路径逆时针 / Start at the rightmost point, odd paths run counter-clockwise
+    direction = 1 if index % 2 == 0 else -1
+    angles = (2 * math.pi * k / points for k in range(1, points + 1))
+    return _deltas([(radius * math.cos(a) - radius, direction * radius * math.sin(a)) for a in angles])
+
+
+def _random_walk(rng: random.Random, index: int, length: int = 10, reach: int = 4) -> List[Step]:
+    steps: List[Step] = []
+    while len(steps) < length:
+        step = (rng.randint(-reach, reach), rng.randint(-reach, reach))
+        if step != (0, 0):
+            steps.append(step)
+    return _retrace(steps)
+
+
+def _bezier(rng: random.Random, index: int, samples: int = 12) -> List[Step]:
+    # 三次贝塞尔曲线到 30-80 像素外的目标，控制点偏离直线，速度先快后慢
+    # A cubic Bezier curve to a target 30-80px away, control points off the line, easing in and out
+    angle = rng.uniform(0, 2 * math.pi)
+    distance = rng.uniform(30, 80)
+    tx, ty = distance * math.cos(angle), distance * math.sin(angle)
+    nx, ny = -ty / distance, tx / distance
+    c1 = (tx / 3 + nx * rng.uniform(-0.3, 0.3) * distance, ty / 3 + ny * rng.uniform(-0.3, 0.3) * distance)
+    c2 = (2 * tx / 3 + nx * rng.uniform(-0.3, 0.3) * distance, 2 * ty / 3 + ny * rng.uniform(-0.3, 0.3) * distance)
+    points = []
+    for k in range(1, samples + 1):
+        t = k / samples
+        t = t * t * (3 - 2 * t)
+        u = 1 - t
+        points.append(
+            (
+                3 * u * u * t * c1[0] + 3 * u * t * t * c2[0] + t * t * t * tx,
+                3 * u * u * t * c1[1] + 3 * u * t * t * c2[1] + t * t * t * ty,
+            )
+        )
+    return _retrace(_deltas(points))
+
+
+_BUILDERS: Dict[str, Callable[[random.Random, int], List[Step]]] = {
+    "diagonal": _diagonal,
+    "micro": _micro,
+    "circle": _circle,
+    "random-walk": _random_walk,
+    "bezier": _bezier,
+}
+
+PATTERNS = tuple(_BUILDERS)
+
+
+class Pattern:
+    """
+    一组预计算的路径 / A set of precomputed paths
+
+    steps(i) 返回相对步长表，points(i) 返回相对起点的累计坐标表，均为 dx、dy（x、y）交错的 array('h')；
+    整组路径的包围盒也预先算好，shift() 只需常数时间
+    steps(i) returns the relative step table and points(i) the cumulative offsets from the start, both
+    array('h') with dx/dy (x/y) interleaved; the bounding box of all paths is precomputed too, so
+    shift() takes constant time
+    """
+
+    def __init__(self, name: str, paths: Sequence[Sequence[Step]]):
+        """
+        Args:
+            name: 图案名称 / Pattern name
+            paths: 相对步长序列的列表，每条都应回到起点 / Lists of relative steps, each returning to its start
+        """
+        if not paths or not all(paths):
+            raise ValueError("a pattern needs at least one non-empty path")
+        self.name = name
+        self._steps: List[array] = []
+        self._points: List[array] = []
+        min_x = min_y = max_x = max_y = 0
+        for path in paths:
+            steps = array("h")
+            points = array("h")
+            x = y = 0
+            for dx, dy in path:
+                x += dx
+                y += dy
+                steps.extend((dx, dy))
+                points.extend((x, y))
+                min_x, max_x = min(min_x, x), max(max_x, x)
+                min_y, max_y = min(min_y, y), max(max_y, y)
+            if x or y:
+                raise ValueError(f"path of pattern {name} does not return to its start")
+            self._steps.append(steps)
+            self._points.append(points)
+        self.bounds = (min_x, min_y, max_x, max_y)
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def steps(self, index: int, shift: Step = (0, 0)) -> array:
+        """
+        第 index 条路径的相对步长表 / Relative step table of path index
+
+        shift 非零时在首尾加上平移和反向平移（生成新表）；为零时直接返回预计算的表
+        A non-zero shift adds the shift and its inverse around the path (a new table); a zero shift
+        returns the precomputed table itself
+        """
+        table = self._steps[index % len(self._steps)]
+        sx, sy = shift
+        if not sx and not sy:
+            return table
+        return array("h", (sx, sy)) + table + array("h", (-sx, -sy))
+
+    def points(self, index: int) -> array:
+        """第 index 条路径相对起点的累计坐标表 / Cumulative offsets of path index from its start"""
+        return self._points[index % len(self._points)]
+
+    def shift(self, x: int, y: int, width: int, height: int) -> Step:
+        """
+        让路径完全落在 [1, 尺寸 - 1] 内所需的起点平移 / Start offset that keeps the path within [1, size - 1]
+
+        屏幕比路径还小时优先保证左上边界 / When the screen is smaller than the path, the top-left edge wins
+        """
+        min_x, min_y, max_x, max_y = self.bounds
+        return _fit(x, min_x, max_x, width), _fit(y, min_y, max_y, height)
+
+
+def _fit(position: int, low: int, high: int, size: int) -> int:
+    if position + high > size - 1:
+        return max(1 - (position + low), size - 1 - (position + high))
+    if position + low < 1:
+        return 1 - (position + low)
+    return 0
+
+
+def get_pattern(name: str, seed: Optional[int] = None, variants: int = VARIANTS) -> Pattern:
+    """
+    生成图案 / Build a pattern
+
+    Args:
+        name: 图案名称，见 PATTERNS / Pattern name, see PATTERNS
+        seed: 随机种子，None 表示每次运行不同 / Random seed, None differs per run
+        variants: 预计算的路径数 / Number of precomputed paths
+
+    Raises:
+        ValueError: 未知图案 / Unknown pattern
+    """
+    builder = _BUILDERS.get(name)
+    if builder is None:
+        raise ValueError(f"unknown pattern: {name} (choose from {', '.join(PATTERNS)})")
+    rng = random.Random(seed)
+    return Pattern(name, [builder(rng, index) for index in range(variants)])
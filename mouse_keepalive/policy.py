@@ -0,0 +1,185 @@
+"""
+自动升级策略：选用能让会话保持活跃的最省开销的方式 / Escalation policy: pick the cheapest method that
+keeps the session awake
+
+--method auto 从最不打扰的动作开始，每次注入后用 ResetProbe 验证系统空闲计时是否重置；连续
+escalate_after 次没有重置才升级到下一级，在当前级别稳定 stable_period 秒后再尝试降一级。
+降级后很快又失败的级别，下次要等更久才会再降回去（每次翻倍，最多 2**max_backoff 倍）。
+--method auto starts with the least intrusive action and verifies after every injection, through
+ResetProbe, that the system idle timer reset; only escalate_after consecutive misses escalate to the
+next level, and after stable_period seconds at a level it tries one level lower again. A level that
+fails again soon after a step-down waits longer before the next retry (doubling each time, at most
+2**max_backoff times).
+
+级别 / Levels:
+    micro     1 像素移动 / 1px move
+    mouse     完整移动（--pattern 或 ±25 像素）/ Full move (--pattern or ±25px)
+    keyboard  Shift 按键 / Shift tap
+    inhibit   休眠抑制，不注入输入 / Sleep inhibition, no input
+
+读不到空闲时间时无法验证，策略停在 mouse 级别（与固定方式的默认行为一致）。
+Without idle time nothing can be verified, so the policy stays at the mouse level (the default of a
+fixed method).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+from .patterns import Pattern, get_pattern
+from .probe import ResetProbe
+
+LEVELS = ("micro", "mouse", "keyboard", "inhibit")
+
+# 每个级别对应的 MouseMover 活动方式 / MouseMover activity method of each level
+LEVEL_METHODS: Dict[str, str] = {"micro": "mouse", "mouse": "mouse", "keyboard": "keyboard", "inhibit": "inhibit"}
+
+# 无法验证时使用的级别 / Level used when nothing can be verified
+UNVERIFIED_LEVEL = "mouse"
+
+
+@dataclass(frozen=True)
+class PolicyState:
+    """
+    一次 tick 之后的策略状态，作为 on_move 的第五个参数 / Policy state after one tick, passed to on_move as
+    the fifth argument
+    """
+
+    # 本次 tick 使用的级别 / Level used by this tick
+    level: str
+    # reset、miss、busy、unavailable、held 或 failed / reset, miss, busy, unavailable, held or failed
+    verdict: str
+    # 下一次 tick 使用的级别 / Level of the next tick
+    next_level: str
+    escalations: int
+    step_downs: int
+
+    @property
+    def method(self) -> str:
+        """本次 tick 的活动方式 / Activity method of this tick"""
+        return LEVEL_METHODS[self.level]
+
+    @property
+    def changed(self) -> Optional[str]:
+        """升级为 "escalate"，降级为 "step_down"，不变为 None / "escalate", "step_down" or None when unchanged"""
+        if self.next_level == self.level:
+            return None
+        return "escalate" if LEVELS.index(self.next_level) > LEVELS.index(self.level) else "step_down"
+
+
+class EscalationPolicy:
+    """
+    按验证结果在级别之间升降 / Move between levels according to verification verdicts
+    """
+
+    def __init__(
+        self,
+        levels: Sequence[str] = LEVELS,
+        escalate_after: int = 2,
+        stable_period: float = 1800.0,
+        max_backoff: int = 3,
+        probe: Optional[ResetProbe] = None,
+    ):
+        """
+        Args:
+            levels: 从便宜到昂贵的级别，LEVELS 的子序列 / Levels from cheapest to most expensive, a
+                subsequence of LEVELS
+            escalate_after: 连续多少次未重置后升级 / Consecutive misses before escalating
+            stable_period: 在一个级别稳定多少秒后尝试降级 / Seconds of stability at a level before stepping down
+            max_backoff: 降级失败后等待时间的最大翻倍次数 / Max doublings of the wait after a failed step-down
+            probe: 验证用的探测，None 时由 MouseMover.run 创建 / Probe used for verification, created by
+                MouseMover.run when None
+
+        Raises:
+            ValueError: 级别无效 / Invalid levels
+        """
+        unknown = [level for level in levels if level not in LEVELS]
+        if unknown or not levels:
+            raise ValueError(f"levels must be a subsequence of {', '.join(LEVELS)}")
+        if escalate_after < 1:
+            raise ValueError("escalate_after must be at least 1")
+        self.levels = tuple(sorted(set(levels), key=LEVELS.index))
+        self.escalate_after = escalate_after
+        self.stable_period = stable_period
+        self.max_backoff = max_backoff
+        self.probe = probe
+        self.index = 0
+        self.misses = 0
+        self.escalations = 0
+        self.step_downs = 0
+        # 每个级别降级失败的次数 / Failed step-downs per level
+        self.backoff: Dict[str, int] = {level: 0 for level in self.levels}
+        # 当前级别开始稳定的时间，None 表示还没有开始计时 / When the current level became stable, None until then
+        self._stable_since: Optional[float] = None
+        # 刚降到的级别，验证通过前失败会加倍等待 / Level just stepped down to; failing before a reset doubles its wait
+        self._probation = False
+        self._micro: Optional[Pattern] = None
+
+    @property
+    def level(self) -> str:
+        """当前级别 / Current level"""
+        return self.levels[self.index]
+
+    @property
+    def method(self) -> str:
+        """当前级别的活动方式 / Activity method of the current level"""
+        return LEVEL_METHODS[self.level]
+
+    @property
+    def pattern(self) -> Optional[Pattern]:
+        """当前级别的移动图案，None 表示使用 MouseMover 自己的 / Pattern of the current level, None uses the mover's"""
+        if self.level != "micro":
+            return None
+        if self._micro is None:
+            self._micro = get_pattern("micro")
+        return self._micro
+
+    def step_down_after(self) -> float:
+        """当前级别还要稳定多久才降级 / How long the current level must be stable before stepping down"""
+        if self.index == 0:
+            return float("inf")
+        lower = self.levels[self.index - 1]
+        return self.stable_period * 2.0 ** min(self.backoff[lower], self.max_backoff)
+
+    def _move(self, index: int) -> None:
+        self.index = index
+        self.misses = 0
+        self._stable_since = None
+
+    def update(self, verdict: str, now: float) -> PolicyState:
+        """
+        记录一次 tick 的验证结果并决定下一次的级别 / Record one tick's verdict and choose the next level
+
+        Args:
+            verdict: reset、held（已验证有效）；miss、failed（无效）；busy（用户活跃，不计）；
+                unavailable（读不到空闲时间）/ reset, held (verified); miss, failed (ineffective);
+                busy (user active, ignored); unavailable (no idle time)
+            now: 当前时间（秒）/ Current time (seconds)
+
+        Returns:
+            本次 tick 之后的状态 / State after this tick
+        """
+        level = self.level
+        if verdict in ("reset", "held"):
+            self.misses = 0
+            self._probation = False
+            if self._stable_since is None:
+                self._stable_since = now
+            elif now - self._stable_since >= self.step_down_after():
+                self._move(self.index - 1)
+                self.step_downs += 1
+                self._probation = True
+        elif verdict in ("miss", "failed"):
+            self._stable_since = None
+            self.misses += 1
+            if self.misses >= self.escalate_after and self.index < len(self.levels) - 1:
+                if self._probation:
+                    self.backoff[level] += 1
+                    self._probation = False
+                self._move(self.index + 1)
+                self.escalations += 1
+        elif verdict == "unavailable" and UNVERIFIED_LEVEL in self.levels:
+            floor = self.levels.index(UNVERIFIED_LEVEL)
+            if self.index < floor:
+                self._move(floor)
+                self.escalations += 1
+        return PolicyState(level, verdict, self.level, self.escalations, self.step_downs)
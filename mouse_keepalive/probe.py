@@ -0,0 +1,213 @@
+"""
+注入有效性探测 / Injection-effectiveness probe
+
+每次移动或按键之后轮询系统空闲时间，判断操作系统是否把这次注入算作用户输入、隔多久才算上；
+按 (方式, 后端) 分别统计重置延迟的分布，结束时给出直方图和摘要，用数据回答"哪种方式在这台机器上
+最省开销地有效"。
+After every move or key press the system idle time is polled to tell whether, and how soon, the OS
+counted the injection as user input; reset latencies are kept per (method, backend) and reported as
+a histogram and a summary at the end, answering with data which method works most cheaply on this
+machine.
+
+判定 / Verdicts:
+- reset: 空闲时间回落到注入开始之后 / Idle time dropped back to after the injection started
+- miss: 超时仍未回落，系统没有把注入算作输入 / Not within the timeout, the OS ignored the injection
+- unknown: 读不到空闲时间，或注入前用户刚操作过（无法区分）/
+  Idle time unavailable, or the user was active right before (indistinguishable)
+
+用法 / Usage:
+    mouse-keepalive --probe --duration 600 --method keyboard
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import Histogram
+
+# 重置延迟分桶（秒）/ Reset-latency buckets (seconds)
+PROBE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0)
+
+# 认为一种方式"有效"所需的重置比例 / Reset rate for a method to count as effective
+EFFECTIVE_RATE = 0.9
+
+
+class ProbeStats:
+    """一个 (方式, 后端) 的统计 / Statistics of one (method, backend)"""
+
+    def __init__(self, buckets: Sequence[float] = PROBE_BUCKETS):
+        self.latency = Histogram(buckets)
+        self.resets = 0
+        self.misses = 0
+        self.unknown = 0
+        # 注入本身的耗时（秒）/ Time spent in the injection itself (seconds)
+        self.cost = 0.0
+        self.attempts = 0
+
+    @property
+    def measured(self) -> int:
+        """有明确结论的次数 / Attempts with a verdict"""
+        return self.resets + self.misses
+
+    @property
+    def rate(self) -> Optional[float]:
+        """重置比例，没有明确结论时为 None / Reset rate, None without any verdict"""
+        return self.resets / self.measured if self.measured else None
+
+    @property
+    def mean_cost(self) -> float:
+        return self.cost / self.attempts if self.attempts else 0.0
+
+
+class ResetProbe:
+    """
+    测量空闲计时器的重置延迟 / Measure idle-timer reset latency
+
+    延迟按空闲读数反推：注入开始后，"现在 - 空闲时间" 就是系统记录到最后一次输入的时刻，
+    所以即使轮询稍晚，测到的也是系统真正重置的时间
+    Latency is derived from the idle reading: after the injection starts, "now - idle" is when the
+    OS registered the last input, so a late poll still measures when the reset really happened
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        timeout: float = 1.0,
+        poll: float = 0.01,
+        min_idle: float = 1.0,
+        resolution: float = 0.05,
+        clock: Optional[Callable[[], float]] = None,
+        sleep: Optional[Callable[[float], None]] = None,
+        buckets: Sequence[float] = PROBE_BUCKETS,
+    ):
+        """
+        Args:
+            backend: 统计归属的后端名 / Backend name the statistics belong to
+            timeout: 注入结束后最多等待重置的时间（秒）/ How long to wait for a reset after the injection (seconds)
+            poll: 轮询间隔（秒）/ Polling interval (seconds)
+            min_idle: 注入前空闲不足该秒数时无法区分用户输入，记为 unknown /
+                Below this idle time before the injection, user input is indistinguishable and counts as unknown
+            resolution: 空闲时间来源的精度（秒）/ Resolution of the idle source (seconds)
+            clock: 单调时钟，默认 time.perf_counter / Monotonic clock, defaults to time.perf_counter
+            sleep: 睡眠函数，默认 time.sleep / Sleep function, defaults to time.sleep
+            buckets: 延迟分桶 / Latency buckets
+        """
+        self.backend = backend or "unknown"
+        self.timeout = timeout
+        self.poll = poll
+        self.min_idle = min_idle
+        self.resolution = resolution
+        self.clock = clock or time.perf_counter
+        self.sleep = sleep or time.sleep
+        self.buckets = buckets
+        self.stats: Dict[Tuple[str, str], ProbeStats] = {}
+        # 最近一次的判定：reset、miss、busy（用户刚操作过）或 unavailable（读不到空闲时间）/
+        # Latest verdict: reset, miss, busy (the user was just active) or unavailable (no idle time)
+        self.last_verdict = "unavailable"
+
+    def _stats(self, method: str) -> ProbeStats:
+        key = (method, self.backend)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = ProbeStats(self.buckets)
+        return stats
+
+    def observe(
+        self,
+        method: str,
+        idle_func: Callable[[], Optional[float]],
+        idle_before: Optional[float],
+        started: float,
+    ) -> Optional[float]:
+        """
+        注入结束后调用，轮询直到空闲计时器重置或超时 / Call after an injection; polls until the idle
+        timer resets or the timeout passes
+
+        Args:
+            method: 注入方式 / Injection method
+            idle_func: 空闲时间函数 / Idle-time function
+            idle_before: 注入前的空闲时间 / Idle time before the injection
+            started: 注入开始时的 clock() / clock() when the injection started
+
+        Returns:
+            重置延迟（秒），没有重置或无法判断时为 None / Reset latency (seconds), None without a reset or verdict
+        """
+        stats = self._stats(method)
+        injected = self.clock()
+        stats.attempts += 1
+        stats.cost += injected - started
+        if idle_before is None or idle_before < self.min_idle:
+            stats.unknown += 1
+            self.last_verdict = "unavailable" if idle_before is None else "busy"
+            return None
+
+        deadline = injected + self.timeout
+        while True:
+            idle = idle_func()
+            now = self.clock()
+            if idle is None:
+                stats.unknown += 1
+                self.last_verdict = "unavailable"
+                return None
+            # 最后一次输入发生在注入开始之后 / The last input happened after the injection started
+            if idle < idle_before and idle <= now - started + self.resolution:
+                latency = max(0.0, now - idle - started)
+                stats.latency.observe(latency)
+                stats.resets += 1
+                self.last_verdict = "reset"
+                return latency
+            if now >= deadline:
+                stats.misses += 1
+                self.last_verdict = "miss"
+                return None
+            self.sleep(self.poll)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        每个 (方式, 后端) 一行摘要 / One summary row per (method, backend)
+
+        Returns:
+            method、backend、attempts、resets、misses、unknown、rate、p50、p95（秒，分桶上界）、cost_ms
+        """
+        rows = []
+        for (method, backend), stats in sorted(self.stats.items()):
+            rows.append(
+                {
+                    "method": method,
+                    "backend": backend,
+                    "attempts": stats.attempts,
+                    "resets": stats.resets,
+                    "misses": stats.misses,
+                    "unknown": stats.unknown,
+                    "rate": stats.rate,
+                    "p50": stats.latency.quantile(0.5),
+                    "p95": stats.latency.quantile(0.95),
+                    "cost_ms": round(stats.mean_cost * 1000, 1),
+                }
+            )
+        return rows
+
+    def histogram(self, method: str, backend: Optional[str] = None) -> str:
+        """
+        非累积的分桶计数，只列出非空的桶 / Non-cumulative bucket counts, non-empty buckets only
+
+        例如 / e.g. "<=0.05s:3 <=0.1s:12 >2.0s:1"
+        """
+        stats = self.stats.get((method, backend or self.backend))
+        if stats is None:
+            return ""
+        hist = stats.latency
+        labels = [f"<={bound}s" for bound in hist.buckets] + [f">{hist.buckets[-1]}s"]
+        return " ".join(f"{label}:{count}" for label, count in zip(labels, hist.counts) if count)
+
+    def best(self) -> Optional[Dict[str, Any]]:
+        """
+        重置比例达到 EFFECTIVE_RATE 的方式中注入耗时最小的一行 / The cheapest row among those whose reset
+        rate reaches EFFECTIVE_RATE
+
+        Returns:
+            摘要行，没有有效方式时为 None / Summary row, None when no method is effective
+        """
+        effective = [row for row in self.summary() if row["rate"] is not None and row["rate"] >= EFFECTIVE_RATE]
+        if not effective:
+            return None
+        return min(effective, key=lambda row: (row["cost_ms"], row["p50"]))
@@ -0,0 +1,211 @@
+"""
+tick 分阶段计时与性能分析 / Per-phase tick tracing and profiling
+
+MouseMover 在每个阶段（后端调用、calculate_next_position、on_move、sleep 以及整个 tick）结束时
+调用 TickTracer.record()；记录写入预先分配的环形缓冲区（perf_counter_ns），不分配对象，
+只保留最近 capacity 条。结束时可以输出摘要或 Chrome 追踪文件（chrome://tracing、Perfetto）。
+MouseMover calls TickTracer.record() at the end of every phase (backend calls,
+calculate_next_position, on_move, sleep and the whole tick); records go into a preallocated ring
+buffer (perf_counter_ns) without allocating objects, keeping the latest capacity entries. At exit
+a summary or a Chrome trace file (chrome://tracing, Perfetto) can be written.
+
+用法 / Usage:
+    mouse-keepalive --profile                     # 退出时输出各阶段摘要 / Print a per-phase summary at exit
+    mouse-keepalive --profile trace.json          # 写出 Chrome 追踪文件 / Write a Chrome trace file
+    mouse-keepalive --cprofile run.prof           # 用 cProfile 包裹整个运行 / Wrap the whole run in cProfile
+
+    mover.add_phase_hook(lambda name, start_ns, end_ns: ...)   # 编程接口 / Programmatic hook
+"""
+
+import json
+from array import array
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# 默认环形缓冲区容量（条）/ Default ring capacity (entries)
+DEFAULT_CAPACITY = 4096
+
+# 阶段钩子：(阶段名, 开始纳秒, 结束纳秒) / Phase hook: (phase name, start ns, end ns)
+PhaseHook = Callable[[str, int, int], None]
+
+# 包含其他阶段的外层阶段 / Outer phase that encloses the others
+TICK = "tick"
+
+
+class TickTracer:
+    """
+    分阶段计时的环形缓冲区 / Ring buffer of phase timings
+
+    阶段名在第一次出现时编号，每条记录只占 (编号, 开始, 结束) 三个数组槽位
+    Phase names are numbered on first use, so each entry takes three array slots: (id, start, end)
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            capacity: 保留的最近记录条数 / Number of latest entries kept
+
+        Raises:
+            ValueError: 容量无效 / Invalid capacity
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._phase = array("H", [0]) * capacity
+        self._start = array("q", [0]) * capacity
+        self._end = array("q", [0]) * capacity
+        self._next = 0
+        # 累计记录条数，超过 capacity 时旧记录被覆盖 / Total entries recorded; older ones are overwritten
+        self.recorded = 0
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self.hooks: List[PhaseHook] = []
+
+    def record(self, name: str, start_ns: int, end_ns: int) -> None:
+        """记录一个阶段 / Record one phase"""
+        ident = self._ids.get(name)
+        if ident is None:
+            ident = self._ids[name] = len(self.names)
+            self.names.append(name)
+        i = self._next
+        self._phase[i] = ident
+        self._start[i] = start_ns
+        self._end[i] = end_ns
+        self._next = i + 1 if i + 1 < self.capacity else 0
+        self.recorded += 1
+        for hook in self.hooks:
+            hook(name, start_ns, end_ns)
+
+    def entries(self) -> List[Tuple[str, int, int]]:
+        """按时间顺序返回保留的 (阶段, 开始, 结束) / Kept (phase, start, end) entries in recording order"""
+        count = min(self.recorded, self.capacity)
+        first = (self._next - count) % self.capacity
+        result = []
+        for offset in range(count):
+            i = (first + offset) % self.capacity
+            result.append((self.names[self._phase[i]], self._start[i], self._end[i]))
+        return result
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        每个阶段的统计，按总耗时降序 / Statistics per phase, by total time descending
+
+        Returns:
+            phase、count、total_ms、mean_us、p50_us、p95_us、max_us
+        """
+        durations: Dict[str, List[int]] = {}
+        for name, start, end in self.entries():
+            durations.setdefault(name, []).append(end - start)
+        rows: List[Dict[str, Any]] = []
+        for name, samples in durations.items():
+            samples.sort()
+            total = sum(samples)
+            rows.append(
+                {
+                    "phase": name,
+                    "count": len(samples),
+                    "total_ms": round(total / 1e6, 3),
+                    "mean_us": round(total / len(samples) / 1e3, 1),
+                    "p50_us": round(samples[len(samples) // 2] / 1e3, 1),
+                    "p95_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] / 1e3, 1),
+                    "max_us": round(samples[-1] / 1e3, 1),
+                }
+            )
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def slowest_ticks(self, n: int = 5) -> List[Dict[str, Any]]:
+        """
+        最慢的 n 个 tick 及其内部各阶段耗时 / The n slowest ticks with the phases inside them
+
+        Returns:
+            [{"start_ns", "duration_us", "phases": {阶段 / phase: 微秒 / us}}]
+        """
+        entries = self.entries()
+        ticks = [(start, end) for name, start, end in entries if name == TICK]
+        ticks.sort(key=lambda span: span[1] - span[0], reverse=True)
+        result = []
+        for start, end in ticks[:n]:
+            phases: Dict[str, float] = {}
+            for name, phase_start, phase_end in entries:
+                if name != TICK and start <= phase_start and phase_end <= end:
+                    phases[name] = round(phases.get(name, 0.0) + (phase_end - phase_start) / 1e3, 1)
+            result.append({"start_ns": start, "duration_us": round((end - start) / 1e3, 1), "phases": phases})
+        return result
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        Chrome 追踪格式（完整事件 "X"，微秒）/ Chrome trace format (complete "X" events, microseconds)
+        """
+        entries = self.entries()
+        origin = min((start for _, start, _ in entries), default=0)
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - origin) / 1e3,
+                "dur": (end - start) / 1e3,
+                "pid": 1,
+                "tid": 1,
+                "cat": "tick" if name == TICK else "phase",
+            }
+            for name, start, end in entries
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> None:
+        """写出 Chrome 追踪文件 / Write a Chrome trace file"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+@contextmanager
+def cprofiled(path: Optional[str]) -> Iterator[Any]:
+    """
+    在 cProfile 下运行代码块，结束时写出 pstats 文件 / Run the block under cProfile and dump a pstats file
+
+    path 为 None 时不做任何事 / Does nothing when path is None
+
+    用法 / Usage:
+        with cprofiled("run.prof"):
+            mover.run(...)
+        python -m pstats run.prof
+    """
+    if path is None:
+        yield None
+        return
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def report_profile(reporter: Any, tracer: TickTracer, trace_path: Optional[str] = None, slowest: int = 3) -> None:
+    """
+    通过 Reporter 输出各阶段摘要和最慢的 tick，并按需写出追踪文件 / Report the per-phase summary and the
+    slowest ticks through a Reporter, writing the trace file when asked
+
+    Args:
+        reporter: 输出 / Reporter
+        tracer: 计时数据 / Timing data
+        trace_path: Chrome 追踪文件路径，None 表示不写 / Chrome trace path, None writes none
+        slowest: 列出的最慢 tick 数 / How many of the slowest ticks to list
+    """
+    for row in tracer.summary():
+        reporter.info("profile_phase", **row)
+    for tick in tracer.slowest_ticks(slowest):
+        phases = ", ".join(f"{name} {us}us" for name, us in sorted(tick["phases"].items(), key=lambda kv: -kv[1]))
+        reporter.info("profile_slow_tick", duration_us=tick["duration_us"], phases=phases or "-")
+    if trace_path is None:
+        return
+    try:
+        tracer.write_chrome_trace(trace_path)
+    except OSError as e:
+        reporter.warning("profile_error", error=str(e))
+        return
+    reporter.info("profile_trace", path=trace_path)
@@ -0,0 +1,417 @@
+"""
+分级、结构化、非阻塞的输出 / Leveled, structured, non-blocking output
+
+- 日志级别：低于当前级别的事件在调用处直接丢弃，不会构建任何字符串
+  Log levels: events below the current level are dropped at the call site, no strings are built
+- 语言：zh、en 或 both（同一行输出中英文）/ Locale: zh, en or both (one bilingual line)
+- 格式：text 或 json（JSON Lines）/ Format: text or json (JSON Lines)
+- 后台写线程：事件放入有界队列，由后台线程格式化和写出；stdout 阻塞时丢弃而不是阻塞 tick
+  Background writer: events go into a bounded queue and are formatted and written by a background
+  thread; when stdout is blocked they are dropped instead of delaying a tick
+"""
+
+import json
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TextIO, Tuple
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+LOCALES = ("zh", "en", "both")
+
+# 事件模板 (中文, 英文) / Event templates (Chinese, English)
+MESSAGES: Dict[str, Tuple[str, str]] = {
+    "start": ("开始自动移动鼠标...", "Starting mouse keepalive..."),
+    "start_keyboard": ("开始自动按键保持活动...", "Starting keyboard keepalive..."),
+    "start_inhibit": ("开始阻止屏保和休眠...", "Starting sleep inhibition..."),
+    "config_method": ("活动方式: {method}", "Method: {method}"),
+    "config_backend": ("输入后端: {backend}", "Backend: {backend}"),
+    "config_interval": ("移动间隔: {interval} 秒", "Interval: {interval} seconds"),
+    "config_interval_auto": ("移动间隔: 自动（按屏保/锁屏超时）", "Interval: auto (from the screensaver/lock timeout)"),
+    "interval_auto": (
+        "自动间隔: 超时 {timeout} 秒，间隔 {interval} 秒",
+        "Auto interval: timeout {timeout}s, interval {interval}s",
+    ),
+    "interval_auto_default": (
+        "自动间隔: 未读取到超时，使用 {interval} 秒",
+        "Auto interval: no timeout found, using {interval}s",
+    ),
+    "config_duration": ("运行时长: {duration} 秒", "Duration: {duration} seconds"),
+    "config_infinite": ("运行时长: 无限（按 Ctrl+C 停止）", "Duration: Infinite (Press Ctrl+C to stop)"),
+    "config_idle_threshold": ("空闲阈值: {idle_threshold} 秒", "Idle threshold: {idle_threshold} seconds"),
+    "config_scheduler": ("调度方式: {scheduler}（错过策略: {missed}）", "Scheduler: {scheduler} (missed: {missed})"),
+    "config_os": ("操作系统: {os}", "OS: {os}"),
+    "config_verbose": ("详细模式: 已启用", "Verbose mode: Enabled"),
+    "config_diagnose": ("诊断模式: 已启用（将输出系统 idle 秒数）", "Diagnose: Enabled (prints system idle seconds)"),
+    "separator": ("-" * 50, "-" * 50),
+    "move": (
+        "[{elapsed}s] 已移动鼠标 {count} 次 (位置: {x}, {y})",
+        "[{elapsed}s] Moved mouse {count} times (position: {x}, {y})",
+    ),
+    "key": ("[{elapsed}s] 已按键 {count} 次", "[{elapsed}s] Pressed key {count} times"),
+    "move_failed": (
+        "[{elapsed}s] 警告: 鼠标移动失败 (第 {count} 次)",
+        "[{elapsed}s] Warning: Mouse movement failed (attempt {count})",
+    ),
+    "key_failed": (
+        "[{elapsed}s] 警告: 按键失败 (第 {count} 次)",
+        "[{elapsed}s] Warning: Key press failed (attempt {count})",
+    ),
+    "inhibit": ("[{elapsed}s] 已保持唤醒 {count} 次", "[{elapsed}s] Kept awake {count} times"),
+    "inhibit_failed": (
+        "[{elapsed}s] 警告: 保持唤醒失败 (第 {count} 次)",
+        "[{elapsed}s] Warning: Keeping awake failed (attempt {count})",
+    ),
+    "inhibit_acquired": ("已阻止休眠: {name}", "Inhibition acquired: {name}"),
+    "inhibit_lost": ("警告: 休眠抑制已失效: {name}", "Warning: Inhibition lost: {name}"),
+    "inhibit_unavailable": ("无法阻止休眠，改用 {fallback}", "Inhibition unavailable, falling back to {fallback}"),
+    "move_error": ("警告: 鼠标移动失败: {error}", "Warning: Mouse movement failed: {error}"),
+    "key_error": ("警告: 键盘输入失败: {error}", "Warning: Key press failed: {error}"),
+    "worker_error": ("错误: 保活循环异常退出: {error}", "Error: Keepalive loop failed: {error}"),
+    "skip": (
+        "[{elapsed}s] 用户活跃（空闲 {idle:.0f} 秒），跳过本次",
+        "[{elapsed}s] User active (idle {idle:.0f}s), skipped",
+    ),
+    "call_timeout": (
+        "警告: {call} 超过 {timeout} 秒未返回，{backoff} 秒内不再调用后端",
+        "Warning: {call} did not return within {timeout}s, backing off for {backoff}s",
+    ),
+    "reconnect": ("已重新连接后端（连续 {stalls} 次超时）", "Backend reconnected after {stalls} timeouts"),
+    "reconnect_failed": ("警告: 重连后端失败: {error}", "Warning: Backend reconnect failed: {error}"),
+    "paused": ("[{elapsed}s] 已暂停，跳过本次", "[{elapsed}s] Paused, skipped"),
+    "schedule_sleep": ("不在工作时间，休眠到 {until}", "Outside working hours, sleeping until {until}"),
+    "config_schedule": ("工作时间: {schedule}", "Working hours: {schedule}"),
+    "control": ("控制命令: {command} {value}", "Control command: {command} {value}"),
+    "control_listening": ("控制通道: {address}", "Control channel: {address}"),
+    "diagnose": (
+        "[{elapsed}s] diagnose: idle_before={idle_before}, idle_after={idle_after} (seconds)",
+        "[{elapsed}s] diagnose: idle_before={idle_before}, idle_after={idle_after} (seconds)",
+    ),
+    "finish_duration": ("达到运行时长 {duration} 秒，程序退出", "Duration {duration} seconds reached, exiting"),
+    "finish_interrupted": ("程序被用户中断", "Program interrupted by user"),
+    "finish_stopped": ("已收到停止请求，程序退出", "Stop requested, exiting"),
+    "total_moves": ("总共移动鼠标 {count} 次，成功 {success} 次", "Total moves: {count}, successful: {success}"),
+    "total_keys": ("总共按键 {count} 次，成功 {success} 次", "Total key presses: {count}, successful: {success}"),
+    "total_inhibit": ("总共保持唤醒 {count} 次，成功 {success} 次", "Total keepalives: {count}, successful: {success}"),
+    "total_elapsed": ("运行时长: {elapsed} 秒", "Duration: {elapsed} seconds"),
+    "config_probe": ("探测: 已启用（测量空闲计时器的重置）", "Probe: Enabled (measures idle-timer resets)"),
+    "probe_summary": (
+        "探测 {method}/{backend}: 重置 {resets} 次，未重置 {misses} 次，无法判断 {unknown} 次，"
+        "p50 {p50} 秒，p95 {p95} 秒，注入耗时 {cost_ms} 毫秒",
+        "Probe {method}/{backend}: {resets} resets, {misses} misses, {unknown} unknown, "
+        "p50 {p50}s, p95 {p95}s, injection {cost_ms}ms",
+    ),
+    "probe_histogram": (
+        "探测 {method}/{backend} 重置延迟: {buckets}",
+        "Probe {method}/{backend} reset latency: {buckets}",
+    ),
+    "probe_best": ("最省开销的有效方式: {method}（{backend}）", "Cheapest effective method: {method} ({backend})"),
+    "probe_none": ("没有方式能可靠地重置系统空闲计时", "No method reliably reset the system idle timer"),
+    "profile_phase": (
+        "阶段 {phase}: {count} 次，共 {total_ms} 毫秒，平均 {mean_us} 微秒，p95 {p95_us} 微秒，最长 {max_us} 微秒",
+        "Phase {phase}: {count} calls, {total_ms}ms total, mean {mean_us}us, p95 {p95_us}us, max {max_us}us",
+    ),
+    "profile_slow_tick": ("慢 tick: {duration_us} 微秒（{phases}）", "Slow tick: {duration_us}us ({phases})"),
+    "profile_trace": ("追踪文件已写入: {path}", "Trace written to {path}"),
+    "profile_cprofile": (
+        "cProfile 结果已写入: {path}（用 python -m pstats 查看）",
+        "cProfile stats written to {path} (view with python -m pstats)",
+    ),
+    "profile_error": ("警告: 无法写出性能分析结果: {error}", "Warning: Cannot write profiling output: {error}"),
+    "policy_escalate": (
+        "策略升级: {previous} -> {current}（{verdict}）",
+        "Policy escalated: {previous} -> {current} ({verdict})",
+    ),
+    "policy_step_down": (
+        "策略降级: {previous} -> {current}（已稳定）",
+        "Policy stepped down: {previous} -> {current} (stable)",
+    ),
+}
+
+_STOP = object()
+
+
+class Reporter:
+    """
+    输出接收器 / Output sink
+
+    emit() 只把 (时间, 级别, 事件, 字段) 放入队列；格式化和写出都在后台线程完成。
+    emit() only enqueues (time, level, event, fields); formatting and writing happen on a background thread.
+    """
+
+    def __init__(
+        self,
+        level: str = "info",
+        locale: str = "both",
+        fmt: str = "text",
+        stream: Optional[TextIO] = None,
+        background: bool = True,
+        max_queue: int = 1024,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        """
+        Args:
+            level: 最低输出级别 / Minimum level: debug, info, warning, error
+            locale: 语言 / Locale: zh, en, both
+            fmt: 输出格式 / Output format: text, json
+            stream: 输出流，默认写出时的 sys.stdout / Output stream, defaults to sys.stdout at write time
+            background: 是否使用后台写线程 / Whether to use the background writer thread
+            max_queue: 队列容量，满了之后丢弃新事件 / Queue capacity, new events are dropped once full
+            clock: JSON 时间戳时钟，默认 time.time / Clock for JSON timestamps, defaults to time.time
+        """
+        if level not in LEVELS:
+            raise ValueError(f"unknown level: {level}")
+        if locale not in LOCALES:
+            raise ValueError(f"unknown locale: {locale}")
+        if fmt not in ("text", "json"):
+            raise ValueError(f"unknown format: {fmt}")
+
+        self.level = LEVELS[level]
+        self.locale = locale
+        self.fmt = fmt
+        self.stream = stream
+        self.background = background
+        self.clock = clock or time.time
+        # 因队列已满而丢弃的事件数 / Events dropped because the queue was full
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def enabled(self, level: str) -> bool:
+        """该级别是否会输出 / Whether this level is emitted"""
+        return LEVELS[level] >= self.level
+
+    def emit(self, level: str, event: str, **fields: Any) -> None:
+        """
+        记录一个事件 / Record an event
+
+        Args:
+            level: 级别 / Level
+            event: 事件名（见 MESSAGES）/ Event name (see MESSAGES)
+            fields: 模板字段 / Template fields
+        """
+        if LEVELS[level] < self.level:
+            return
+        # 文本格式不显示时间戳，省掉一次时钟调用 / Text output has no timestamp, so skip the clock call
+        record = (self.clock() if self.fmt == "json" else 0.0, level, event, fields)
+        if not self.background:
+            self._write(record)
+            return
+
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def debug(self, event: str, **fields: Any) -> None:
+        self.emit("debug", event, **fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        self.emit("info", event, **fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        self.emit("warning", event, **fields)
+
+    def error(self, event: str, **fields: Any) -> None:
+        self.emit("error", event, **fields)
+
+    def format(self, record: Tuple[float, str, str, Dict[str, Any]]) -> str:
+        """把事件格式化为一行文本 / Format an event as one line of text"""
+        timestamp, level, event, fields = record
+        zh, en = MESSAGES.get(event, (event, event))
+        if self.locale == "zh":
+            message = zh.format(**fields)
+        elif self.locale == "en":
+            message = en.format(**fields)
+        else:
+            zh_text, en_text = zh.format(**fields), en.format(**fields)
+            message = zh_text if zh_text == en_text else f"{zh_text} / {en_text}"
+
+        if self.fmt == "json":
+            payload = {"time": timestamp, "level": level, "event": event, "message": message}
+            payload.update(fields)
+            return json.dumps(payload, ensure_ascii=False, default=str)
+        return message
+
+    def _write(self, record: Tuple[float, str, str, Dict[str, Any]]) -> None:
+        stream = self.stream or sys.stdout
+        try:
+            stream.write(self.format(record) + "\n")
+            stream.flush()
+        except (OSError, ValueError):
+            # 输出端已关闭时不影响保活 / A closed output must not affect keepalive
+            pass
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._drain, name="reporter", daemon=True)
+                self._thread.start()
+
+    def _drain(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is _STOP:
+                return
+            self._write(record)
+
+    def close(self, timeout: float = 1.0) -> None:
+        """
+        写出剩余事件并停止后台线程 / Flush remaining events and stop the background thread
+
+        Args:
+            timeout: 最长等待时间；输出端阻塞时放弃剩余事件 / Max wait; remaining events are abandoned if output is stuck
+        """
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+
+class RunReporter:
+    """
+    MouseMover.run 的标准回调，move_mouse() 和 main() 共用 / Standard MouseMover.run callbacks shared by
+    move_mouse() and main()
+    """
+
+    def __init__(
+        self,
+        reporter: Reporter,
+        method: str = "mouse",
+        interval: Any = 60,
+        duration: Optional[float] = None,
+        verbose: bool = False,
+        diagnose: bool = False,
+        idle_threshold: Optional[float] = None,
+        scheduler: str = "interval",
+        missed: str = "skip",
+        backend: Optional[str] = None,
+        schedule: Any = None,
+        probe: Any = None,
+        control: Any = None,
+    ):
+        """
+        Args:
+            control: 运行使用的 Control；其 stopped 区分被停止的运行和正常结束的运行 / The run's Control; its
+                stopped flag tells a stopped run from a completed one
+        """
+        self.reporter = reporter
+        self.probe = probe
+        self.control = control
+        self.backend = backend
+        self.schedule = schedule
+        self.method = method
+        self.interval = interval
+        self.duration = duration
+        self.verbose = verbose
+        self.diagnose = diagnose
+        self.idle_threshold = idle_threshold
+        self.scheduler = scheduler
+        self.missed = missed
+        self.success_count = 0
+
+    def on_start(self) -> None:
+        import platform
+
+        report = self.reporter.info
+        report({"keyboard": "start_keyboard", "inhibit": "start_inhibit"}.get(self.method, "start"))
+        report("config_method", method=self.method)
+        if self.backend is not None:
+            report("config_backend", backend=self.backend)
+        if callable(self.interval):
+            report("config_interval_auto")
+        else:
+            report("config_interval", interval=self.interval)
+        if self.duration:
+            report("config_duration", duration=self.duration)
+        else:
+            report("config_infinite")
+        if self.idle_threshold is not None:
+            report("config_idle_threshold", idle_threshold=self.idle_threshold)
+        if self.scheduler != "interval":
+            report("config_scheduler", scheduler=self.scheduler, missed=self.missed)
+        if self.schedule is not None:
+            report("config_schedule", schedule=str(self.schedule))
+        report("config_os", os=platform.system())
+        if self.verbose:
+            report("config_verbose")
+        if self.diagnose:
+            report("config_diagnose")
+        if self.probe is not None:
+            report("config_probe")
+        report("separator")
+
+    def on_move(self, move_count: int, current_pos: Any, elapsed: float, success: bool, state: Any = None) -> None:
+        """
+        Args:
+            state: method="auto" 时的 PolicyState，级别和判定作为 policy、verdict 字段输出 /
+                PolicyState with method="auto"; its level and verdict are reported as policy and verdict fields
+        """
+        if success:
+            self.success_count += 1
+        if not self.reporter.enabled("info" if success else "warning"):
+            return
+
+        elapsed_s = int(elapsed)
+        method = self.method
+        fields: Dict[str, Any] = {"elapsed": elapsed_s, "count": move_count}
+        if state is not None:
+            method = state.method
+            fields.update(policy=state.level, verdict=state.verdict)
+        if method == "inhibit":
+            if success:
+                self.reporter.info("inhibit", **fields)
+            else:
+                self.reporter.warning("inhibit_failed", **fields)
+        elif method == "keyboard":
+            if success:
+                self.reporter.info("key", **fields)
+            else:
+                self.reporter.warning("key_failed", **fields)
+        elif success:
+            self.reporter.info("move", x=current_pos.x, y=current_pos.y, **fields)
+        else:
+            self.reporter.warning("move_failed", **fields)
+
+    def on_skip(self, idle_seconds: float, elapsed: float) -> None:
+        self.reporter.debug("skip", elapsed=int(elapsed), idle=idle_seconds)
+
+    def on_finish(self, move_count: int, elapsed: float) -> None:
+        report = self.reporter.info
+        if self.duration and elapsed >= self.duration:
+            report("finish_duration", duration=self.duration)
+        elif self.control is not None and self.control.stopped:
+            report("finish_stopped")
+        else:
+            report("finish_interrupted")
+        event = {"keyboard": "total_keys", "inhibit": "total_inhibit"}.get(self.method, "total_moves")
+        report(event, count=move_count, success=self.success_count)
+        report("total_elapsed", elapsed=int(elapsed))
+        if self.probe is not None:
+            self.report_probe()
+
+    def report_probe(self) -> None:
+        """输出探测的直方图和摘要 / Report the probe's histograms and summary"""
+        report = self.reporter.info
+        rows = self.probe.summary()
+        for row in rows:
+            buckets = self.probe.histogram(row["method"], row["backend"]) or "-"
+            report("probe_histogram", method=row["method"], backend=row["backend"], buckets=buckets)
+            # 没有重置时没有分位数 / No quantiles without resets
+            report("probe_summary", **{**row, "p50": row["p50"] or "-", "p95": row["p95"] or "-"})
+        if not any(row["rate"] is not None for row in rows):
+            return
+        best = self.probe.best()
+        if best is None:
+            report("probe_none")
+        else:
+            report("probe_best", method=best["method"], backend=best["backend"])
@@ -0,0 +1,119 @@
+"""
+无漂移截止时间调度器 / Drift-free deadline scheduler
+
+按绝对截止时间（anchor + k * interval）安排 tick，每次 tick 的执行耗时不会累积成漂移。
+Ticks are scheduled on absolute deadlines (anchor + k * interval), so the work done in each
+tick does not accumulate into drift.
+"""
+
+import random
+from typing import Optional
+
+
+class DeadlineScheduler:
+    """
+    截止时间调度器 / Deadline scheduler
+
+    错过截止时间（例如系统挂起后恢复）时的策略 / Policies after missed deadlines (e.g. resume from suspend):
+    - "skip": 跳过错过的 tick，对齐到下一个未来的截止时间 / Drop missed ticks and realign to the next future deadline
+    - "catch-up": 立即补一次 tick，并从当前时间重新对齐 / Fire one tick immediately and re-anchor from now
+
+    抖动只会让 tick 提前，不会晚于原定时间，保证不会错过锁屏超时
+    Jitter only ever fires ticks early, never later than scheduled, so lock timeouts are never overshot
+    """
+
+    POLICIES = ("skip", "catch-up")
+
+    def __init__(
+        self,
+        interval: float,
+        policy: str = "skip",
+        jitter: float = 0.0,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            interval: tick 间隔（秒）/ Tick interval (seconds)
+            policy: 错过截止时间时的策略 / Policy for missed deadlines
+            jitter: 最大抖动（秒），不超过间隔的一半 / Max jitter (seconds), capped at half the interval
+            rng: 随机数生成器，便于测试 / Random generator, for testing
+        """
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0")
+        if policy not in self.POLICIES:
+            raise ValueError(f"unknown missed-deadline policy: {policy}")
+        if jitter < 0:
+            raise ValueError("jitter must not be negative")
+
+        self.interval = interval
+        self.policy = policy
+        self.max_jitter = jitter
+        self.jitter = min(jitter, interval / 2)
+        self.rng = rng or random.Random()
+        self.anchor = 0.0
+        self.index = 0
+        self.next_deadline = 0.0
+        # 最近一次 tick 相对截止时间的延迟（秒）/ Lateness of the latest tick relative to its deadline
+        self.last_lateness = 0.0
+        # 累计跳过的 tick 数 / Total ticks dropped by the skip policy
+        self.missed = 0
+
+    def _deadline(self, index: int) -> float:
+        offset = self.rng.uniform(0, self.jitter) if self.jitter else 0.0
+        return self.anchor + index * self.interval - offset
+
+    def start(self, now: float) -> None:
+        """
+        以当前时间为锚点开始调度，第一个 tick 立即执行 / Start scheduling anchored at now, first tick is immediate
+        """
+        self.anchor = now
+        self.index = 0
+        self.next_deadline = now
+        self.last_lateness = 0.0
+        self.missed = 0
+
+    def set_interval(self, interval: float) -> None:
+        """
+        修改间隔，从最近一个截止时间开始生效 / Change the interval, effective from the most recent deadline
+
+        在 advance() 之前调用，使下一个截止时间使用新间隔 / Call before advance() so the next deadline uses it
+        """
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0")
+        if interval == self.interval:
+            return
+        self.anchor += self.index * self.interval
+        self.index = 0
+        self.interval = interval
+        self.jitter = min(self.max_jitter, interval / 2)
+
+    def delay(self, now: float) -> float:
+        """距离下一个截止时间还需等待的秒数 / Seconds left until the next deadline"""
+        return max(0.0, self.next_deadline - now)
+
+    def advance(self, now: float) -> float:
+        """
+        记录一次 tick 在 now 开始执行，并计算下一个截止时间 / Record a tick that started at now and compute the next deadline
+
+        Returns:
+            下一个截止时间 / The next deadline
+        """
+        self.last_lateness = max(0.0, now - self.next_deadline)
+        self.index += 1
+        nominal = self.anchor + self.index * self.interval
+
+        if now > nominal:
+            # 已错过至少一个截止时间（挂起、时钟停顿、tick 过慢）
+            # At least one deadline was missed (suspend, clock stall, slow tick)
+            if self.policy == "catch-up":
+                self.anchor = now
+                self.index = 0
+                self.next_deadline = now
+                return self.next_deadline
+
+            due = int((now - self.anchor) // self.interval) + 1
+            self.missed += due - self.index
+            self.index = due
+
+        self.next_deadline = max(now, self._deadline(self.index))
+        return self.next_deadline
@@ -0,0 +1,296 @@
+"""
+虚拟时钟模拟：在毫秒内跑完多天的保活循环 / Virtual-clock simulation: multi-day keepalive runs in milliseconds
+
+MouseMover.run 的所有时间都来自注入的 time_func、monotonic_func 和 sleep_func；
+这里把它们接到同一个虚拟时钟上，并提供记录每次注入的控制器和脚本化的用户活动时间线。
+MouseMover.run takes all of its time from the injected time_func, monotonic_func and sleep_func;
+this wires them to one virtual clock and adds a controller that records every injection and
+a scripted user-activity timeline.
+
+用法 / Usage:
+    from mouse_keepalive.simulation import simulate
+
+    result = simulate(duration=7 * 86400, interval=60, scheduler="deadline")
+    assert result.tick_times[1] == 60
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from .move_mouse import MouseController, MouseMover, MousePosition, ScreenSize
+
+# 虚拟墙上时钟的起点（2024-01-01 00:00:00 UTC）/ Origin of the virtual wall clock (2024-01-01 00:00:00 UTC)
+EPOCH = 1704067200.0
+
+
+class VirtualClock:
+    """
+    虚拟时钟，sleep() 立即返回并推进时间 / Virtual clock whose sleep() returns at once and advances time
+
+    挂起期间墙上时钟和单调时钟一起前进（与 macOS、Windows 一致）；interrupt_at 之后的 sleep()
+    抛出 KeyboardInterrupt，模拟用户按下 Ctrl+C
+    Suspends advance the wall and monotonic clocks together (as on macOS and Windows); a sleep()
+    reaching interrupt_at raises KeyboardInterrupt, like the user pressing Ctrl+C
+    """
+
+    def __init__(self, start: float = 0.0, oversleep: float = 0.0, epoch: float = EPOCH):
+        """
+        Args:
+            start: 单调时钟的初始值（秒）/ Initial monotonic time (seconds)
+            oversleep: 每次 sleep 额外多睡的秒数，模拟调度延迟 / Extra seconds added to every sleep, like OS latency
+            epoch: time() 与 monotonic() 的差值 / Offset between time() and monotonic()
+        """
+        self.now = start
+        self.oversleep = oversleep
+        self.epoch = epoch
+        self.interrupt_at: Optional[float] = None
+        # 每次 sleep 请求的秒数 / Seconds requested by each sleep
+        self.sleeps: List[float] = []
+        self._suspends: List[Tuple[float, float]] = []
+
+    def time(self) -> float:
+        """虚拟墙上时钟 / Virtual wall clock"""
+        return self.epoch + self.now
+
+    def monotonic(self) -> float:
+        """虚拟单调时钟 / Virtual monotonic clock"""
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """推进时间，不记录为 sleep / Advance time without recording a sleep"""
+        self.now += seconds
+
+    def suspend(self, at: float, seconds: float) -> None:
+        """
+        在 at 时刻挂起 seconds 秒 / Suspend for seconds at time at
+
+        在跨过 at 的那次 sleep 中生效 / Applied during the sleep that crosses at
+        """
+        self._suspends.append((at, seconds))
+        self._suspends.sort()
+
+    def sleep(self, seconds: float) -> None:
+        """
+        推进 seconds（加上 oversleep 和经过的挂起）/ Advance by seconds (plus oversleep and any suspend crossed)
+
+        Raises:
+            KeyboardInterrupt: 睡眠跨过 interrupt_at / The sleep reaches interrupt_at
+        """
+        self.sleeps.append(seconds)
+        target = self.now + max(0.0, seconds) + self.oversleep
+        if self.interrupt_at is not None and target >= self.interrupt_at:
+            self.now = max(self.now, self.interrupt_at)
+            raise KeyboardInterrupt
+        while self._suspends and self._suspends[0][0] <= target:
+            _, length = self._suspends.pop(0)
+            target += length
+        self.now = target
+
+
+class ActivityTimeline:
+    """
+    脚本化的用户活动，作为 idle_func 使用 / Scripted user activity, used as idle_func
+
+    空闲秒数 = 距最近一次真实或注入输入的时间；注入输入由 RecordingController 通过 record_input() 上报
+    Idle seconds = time since the latest real or injected input; injected input is reported by
+    RecordingController through record_input()
+    """
+
+    def __init__(self, clock: VirtualClock, active: Sequence[Tuple[float, float]] = (), counts_injected: bool = True):
+        """
+        Args:
+            clock: 虚拟时钟 / Virtual clock
+            active: 用户活跃的 (开始, 结束) 区间，单位为单调秒 / (start, end) spans of user activity, monotonic seconds
+            counts_injected: 注入的输入是否重置空闲时间 / Whether injected input resets the idle time
+        """
+        self.clock = clock
+        self.active = sorted(active)
+        self.counts_injected = counts_injected
+        self._last_input = clock.monotonic()
+
+    def record_input(self) -> None:
+        """记录一次注入输入 / Record an injected input"""
+        if self.counts_injected:
+            self._last_input = self.clock.monotonic()
+
+    def user_active(self, at: Optional[float] = None) -> bool:
+        """用户是否正在操作 / Whether the user is active"""
+        now = self.clock.monotonic() if at is None else at
+        return any(start <= now < end for start, end in self.active)
+
+    def __call__(self) -> float:
+        now = self.clock.monotonic()
+        last = self._last_input
+        for start, end in self.active:
+            if start > now:
+                break
+            last = max(last, min(end, now))
+        return now - last
+
+
+@dataclass
+class SimEvent:
+    """一次记录的控制器调用 / One recorded controller call"""
+
+    at: float
+    kind: str
+    args: Tuple[Any, ...] = ()
+
+
+class RecordingController(MouseController):
+    """
+    记录每次注入的控制器 / Controller that records every injection
+
+    move_to() 按补间时长推进虚拟时钟，和真实后端的阻塞时间一致
+    move_to() advances the virtual clock by its tween duration, like a real backend blocks
+    """
+
+    def __init__(
+        self,
+        clock: VirtualClock,
+        timeline: Optional[ActivityTimeline] = None,
+        position: MousePosition = MousePosition(500, 400),
+        screen: ScreenSize = ScreenSize(1920, 1080),
+        fail: Optional[Callable[[float], bool]] = None,
+    ):
+        """
+        Args:
+            clock: 虚拟时钟 / Virtual clock
+            timeline: 注入时通知的活动时间线 / Activity timeline notified of injections
+            position: 鼠标位置 / Pointer position
+            screen: 屏幕尺寸 / Screen size
+            fail: 返回 True 时本次注入抛出 OSError，参数为当前单调时间 /
+                Makes the injection raise OSError when it returns True, called with the monotonic time
+        """
+        self.clock = clock
+        self.timeline = timeline
+        self.position = position
+        self.screen = screen
+        self.fail = fail
+        self.events: List[SimEvent] = []
+
+    def _inject(self, kind: str, *args: Any) -> None:
+        now = self.clock.monotonic()
+        if self.fail is not None and self.fail(now):
+            raise OSError(f"simulated {kind} failure")
+        self.events.append(SimEvent(now, kind, args))
+        if self.timeline is not None:
+            self.timeline.record_input()
+
+    def get_position(self) -> MousePosition:
+        return self.position
+
+    def get_screen_size(self) -> ScreenSize:
+        return self.screen
+
+    def move_to(self, x: int, y: int, duration: float = 0.1) -> None:
+        self._inject("move_to", x, y)
+        self.clock.advance(duration)
+
+    def jiggle(self, dx: int, dy: int) -> None:
+        self._inject("jiggle", dx, dy)
+
+    def move_path(self, steps: Sequence[int]) -> None:
+        self._inject("move_path", *steps)
+
+    def press_key(self, key: str = "shift") -> None:
+        self._inject("press_key", key)
+
+
+@dataclass
+class SimulationResult:
+    """一次模拟运行的结果 / Result of one simulated run"""
+
+    move_count: int
+    elapsed: float
+    # 每个注入 tick 开始时的单调时间 / Monotonic start time of each injecting tick
+    tick_times: List[float] = field(default_factory=list)
+    # on_skip 的单调时间 / Monotonic times of on_skip
+    skip_times: List[float] = field(default_factory=list)
+    events: List[SimEvent] = field(default_factory=list)
+    sleeps: List[float] = field(default_factory=list)
+    # method="auto" 时每个 tick 的策略级别 / Policy level of each tick with method="auto"
+    levels: List[str] = field(default_factory=list)
+    failures: int = 0
+    finished: bool = False
+    interrupted: bool = False
+
+
+def simulate(
+    duration: Optional[float],
+    interval: Any = 60,
+    clock: Optional[VirtualClock] = None,
+    active: Sequence[Tuple[float, float]] = (),
+    interrupt_at: Optional[float] = None,
+    move_duration: float = 0.1,
+    fail: Optional[Callable[[float], bool]] = None,
+    **run_kwargs: Any,
+) -> SimulationResult:
+    """
+    在虚拟时钟上运行 MouseMover.run / Run MouseMover.run on a virtual clock
+
+    Args:
+        duration: 模拟时长（秒），None 时必须设置 interrupt_at / Simulated duration (seconds),
+            interrupt_at is required when None
+        interval: 传给 run() 的间隔 / Interval passed to run()
+        clock: 虚拟时钟，None 时新建 / Virtual clock, a new one when None
+        active: 用户活跃区间 / User activity spans
+        interrupt_at: 在该单调时间模拟 Ctrl+C / Simulate Ctrl+C at this monotonic time
+        move_duration: 每次移动的补间时长 / Tween duration of each move
+        fail: 注入失败的条件，见 RecordingController / Injection failure condition, see RecordingController
+        **run_kwargs: 其余 run() 参数（scheduler、idle_threshold、method 等）/
+            Other run() arguments (scheduler, idle_threshold, method, ...)
+    """
+    if duration is None and interrupt_at is None:
+        raise ValueError("an unbounded simulation needs interrupt_at")
+
+    clock = clock or VirtualClock()
+    clock.interrupt_at = interrupt_at
+    timeline = ActivityTimeline(clock, active)
+    controller = RecordingController(clock, timeline, fail=fail)
+    mover = MouseMover(
+        controller=controller,
+        time_func=clock.time,
+        sleep_func=clock.sleep,
+        print_func=lambda *args, **kwargs: None,
+        idle_func=timeline,
+        monotonic_func=clock.monotonic,
+        move_duration=move_duration,
+    )
+    result = SimulationResult(0, 0.0, events=controller.events, sleeps=clock.sleeps)
+    perform_tick = mover.perform_tick
+
+    def timed_tick(method: str, move_count: int) -> Tuple[MousePosition, int, bool]:
+        # 记录 tick 开始的时间，而不是补间结束后 on_move 的时间 / Record when the tick starts, not on_move after the tweens
+        result.tick_times.append(clock.monotonic())
+        return perform_tick(method, move_count)
+
+    mover.perform_tick = timed_tick  # type: ignore[method-assign]
+
+    def on_move(move_count: int, position: MousePosition, elapsed: float, success: bool, state: Any = None) -> None:
+        if not success:
+            result.failures += 1
+        if state is not None:
+            result.levels.append(state.level)
+
+    def on_skip(idle_seconds: float, elapsed: float) -> None:
+        result.skip_times.append(clock.monotonic())
+
+    def on_finish(move_count: int, elapsed: float) -> None:
+        result.finished = True
+
+    started = clock.monotonic()
+    try:
+        result.move_count, result.elapsed = mover.run(
+            interval=interval,
+            duration=duration,
+            on_move=on_move,
+            on_skip=on_skip,
+            on_finish=on_finish,
+            **run_kwargs,
+        )
+    except KeyboardInterrupt:
+        result.interrupted = True
+        result.move_count = len(result.tick_times) - result.failures
+        result.elapsed = clock.monotonic() - started
+    return result
@@ -0,0 +1,302 @@
+"""
+多显示保活守护 / Multi-display keepalive supervisor
+
+一个进程为多个 X 会话（例如多个 Xvfb/Xvnc）保活：每个显示持有一个持久连接的控制器，
+所有 tick 由同一个定时器堆调度，注入在有界线程池中执行。
+One process keeps many X sessions (e.g. several Xvfb/Xvnc) alive: one persistent-connection
+controller per display, all ticks scheduled from a single timer heap, injections run on a
+bounded thread pool.
+
+用法 / Usage:
+    mouse-keepalive serve --displays :1,:2,:3 -i 60
+"""
+
+import heapq
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .call_timeout import DEFAULT_TIMEOUT
+from .move_mouse import MouseMover
+
+
+@dataclass
+class DisplayStats:
+    """单个显示的统计信息 / Per-display statistics"""
+
+    display: str
+    ticks: int = 0
+    successes: int = 0
+    failures: int = 0
+    # 最近一次成功的单调时钟时间，None 表示从未成功 / Monotonic time of the last success, None if never
+    last_success: Optional[float] = None
+    # 最近一次 tick 相对计划时间的延迟（秒）/ Lateness of the latest tick vs. its schedule (seconds)
+    last_lateness: float = 0.0
+    # 创建控制器失败时的错误，该显示不参与调度 / Error from creating the controller; the display is not scheduled
+    error: Optional[str] = None
+
+
+def default_controller_factory(display: str) -> Any:
+    """获取显示的共享 xlib 控制器 / Get the shared xlib controller of a display"""
+    from .backends import get_controller
+
+    return get_controller("xlib", display)
+
+
+class Supervisor:
+    """
+    多显示保活调度器 / Multi-display keepalive scheduler
+
+    主线程独占定时器堆；工作线程只负责注入，把结果放回队列，由主线程更新统计并重新排期。
+    The main thread owns the timer heap; worker threads only inject and hand results back
+    through a queue, so stats updates and rescheduling stay single-threaded.
+    """
+
+    def __init__(
+        self,
+        displays: Sequence[str],
+        interval: float = 60,
+        method: str = "mouse",
+        max_workers: int = 4,
+        controller_factory: Optional[Callable[[str], Any]] = None,
+        monotonic_func: Optional[Callable[[], float]] = None,
+        print_func: Optional[Callable[[str], None]] = None,
+        call_timeout: Optional[float] = DEFAULT_TIMEOUT,
+    ):
+        """
+        Args:
+            displays: 显示名列表，例如 [":1", ":2"] / Display names, e.g. [":1", ":2"]
+            interval: 每个显示的 tick 间隔（秒）/ Tick interval per display (seconds)
+            method: 活动方式，"mouse" 或 "keyboard" / Activity method, "mouse" or "keyboard"
+            max_workers: 注入线程池大小 / Size of the injection thread pool
+            controller_factory: 根据显示名创建控制器，默认使用共享的 xlib 后端 /
+                Creates a controller for a display name, defaults to the shared xlib backend
+            monotonic_func: 单调时钟，默认 time.monotonic / Monotonic clock, defaults to time.monotonic
+            print_func: 打印函数 / Print function
+            call_timeout: 每个显示单次后端调用的时限（秒），None 表示不限时；卡住的显示不会占住工作线程或阻塞退出 /
+                Deadline of one backend call per display (seconds), None disables it; a hung display then
+                neither holds a worker thread nor blocks shutdown
+        """
+        if not displays:
+            raise ValueError("at least one display is required")
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0")
+
+        self.interval = interval
+        self.method = method
+        self.max_workers = max(1, max_workers)
+        self.monotonic_func = monotonic_func or time.monotonic
+        self.print_func = print_func or (lambda message: print(message, flush=True))
+        factory = controller_factory or default_controller_factory
+
+        self.movers: Dict[str, MouseMover] = {}
+        self.stats: Dict[str, DisplayStats] = {}
+        self._move_counts: Dict[str, int] = {}
+        for display in displays:
+            self.stats[display] = DisplayStats(display)
+            printer = self._display_printer(display)
+            # 一个显示出错不影响其他显示 / One bad display does not stop the others
+            try:
+                controller = factory(display)
+            except Exception as e:
+                self.stats[display].error = str(e)
+                printer(f"错误: 无法创建控制器 / Error: Cannot create the controller: {e}")
+                continue
+            self.movers[display] = MouseMover(
+                controller=controller,
+                print_func=printer,
+                monotonic_func=self.monotonic_func,
+                call_timeout=call_timeout,
+            )
+            self._move_counts[display] = 0
+
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self._results: "queue.Queue[Optional[Tuple[str, float, bool]]]" = queue.Queue()
+        self._stop = threading.Event()
+
+    def _display_printer(self, display: str) -> Callable[[str], None]:
+        def printer(message: str) -> None:
+            self.print_func(f"[{display}] {message}")
+
+        return printer
+
+    def _schedule(self, display: str, deadline: float) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (deadline, self._seq, display))
+
+    def _tick(self, display: str, deadline: float) -> None:
+        """在工作线程中执行一次注入 / Run one injection on a worker thread"""
+        mover = self.movers[display]
+        success = False
+        try:
+            _, self._move_counts[display], success = mover.perform_tick(self.method, self._move_counts[display])
+        except Exception as e:
+            mover.print_func(f"错误: tick 失败 / Error: Tick failed: {e}")
+        finally:
+            # 无论如何都交回结果，否则该显示不会再被排期 / Always hand a result back, or the display is never
+            # scheduled again
+            self._results.put((display, deadline, success))
+
+    def _record(self, display: str, deadline: float, success: bool) -> None:
+        """记录结果并排期下一次 tick / Record a result and schedule the next tick"""
+        now = self.monotonic_func()
+        stats = self.stats[display]
+        stats.ticks += 1
+        if success:
+            stats.successes += 1
+            stats.last_success = now
+        else:
+            stats.failures += 1
+
+        # 按绝对截止时间排期；落后太多时从现在重新对齐 / Schedule on absolute deadlines, realign if far behind
+        next_deadline = deadline + self.interval
+        if next_deadline < now:
+            next_deadline = now
+        self._schedule(display, next_deadline)
+
+    def stop(self) -> None:
+        """请求停止 run()，可在任意线程调用 / Ask run() to stop, callable from any thread"""
+        self._stop.set()
+        # 唤醒正在等待结果的主循环 / Wake the main loop if it is waiting for results
+        self._results.put(None)
+
+    def run(self, duration: Optional[float] = None) -> Dict[str, DisplayStats]:
+        """
+        运行调度循环 / Run the scheduling loop
+
+        Args:
+            duration: 运行时长（秒），None 表示直到 stop() 或 Ctrl+C / Duration (seconds), None until stop() or Ctrl+C
+
+        Returns:
+            每个显示的统计信息 / Per-display statistics
+        """
+        start = self.monotonic_func()
+        end = start + duration if duration else None
+        for display in self.movers:
+            self._schedule(display, start)
+
+        in_flight = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="keepalive") as pool:
+            try:
+                while not self._stop.is_set():
+                    now = self.monotonic_func()
+                    if end is not None and now >= end:
+                        break
+
+                    # 派发所有到期的 tick / Dispatch every due tick
+                    while self._heap and self._heap[0][0] <= now:
+                        deadline, _, display = heapq.heappop(self._heap)
+                        self.stats[display].last_lateness = now - deadline
+                        pool.submit(self._tick, display, deadline)
+                        in_flight += 1
+
+                    # 等待下一个截止时间或某个注入完成 / Wait for the next deadline or a finished injection
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    if end is not None:
+                        timeout = min(timeout, end - now) if timeout is not None else end - now
+                    try:
+                        result = self._results.get(timeout=max(0.0, timeout) if timeout is not None else 0.5)
+                    except queue.Empty:
+                        continue
+                    if result is None:
+                        continue
+                    in_flight -= 1
+                    self._record(*result)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                self._stop.set()
+
+        # 线程池已退出，收集剩余结果 / The pool has drained, collect the remaining results
+        while in_flight:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if result is None:
+                continue
+            in_flight -= 1
+            self._record(*result)
+
+        for mover in self.movers.values():
+            mover.close()
+            close = getattr(mover.controller, "close", None)
+            if close is not None:
+                close()
+        return self.stats
+
+    def format_stats(self) -> str:
+        """把统计信息格式化为表格 / Format statistics as a table"""
+        now = self.monotonic_func()
+        lines = [f"{'display':<12}{'ticks':>8}{'ok':>8}{'failed':>8}{'last ok (s ago)':>18}"]
+        for stats in self.stats.values():
+            last_ok = f"{now - stats.last_success:.1f}" if stats.last_success is not None else "-"
+            line = f"{stats.display:<12}{stats.ticks:>8}{stats.successes:>8}{stats.failures:>8}{last_ok:>18}"
+            lines.append(f"{line}  {stats.error}" if stats.error else line)
+        return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """serve 子命令入口 / Entry point of the serve subcommand"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="mouse-keepalive serve",
+        description="在一个进程中为多个 X 显示保活 / Keep several X displays alive from one process",
+    )
+    parser.add_argument(
+        "--displays",
+        required=True,
+        help="逗号分隔的显示列表，例如 :1,:2,:3 / Comma-separated displays, e.g. :1,:2,:3",
+    )
+    parser.add_argument("-i", "--interval", type=int, default=60, help="移动间隔（秒） / Interval (seconds)")
+    parser.add_argument("-d", "--duration", type=int, default=None, help="运行时长（秒） / Duration (seconds)")
+    parser.add_argument(
+        "-m", "--method", choices=["mouse", "keyboard"], default="mouse", help="活动方式 / Activity method"
+    )
+    parser.add_argument("--workers", type=int, default=4, help="注入线程数 / Injection worker threads")
+    parser.add_argument(
+        "--call-timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        metavar="SECONDS",
+        help=f"单次后端调用的时限，0 表示不限时，默认 {DEFAULT_TIMEOUT:g} 秒 / Deadline of one backend call, "
+        f"0 disables it, default {DEFAULT_TIMEOUT:g} seconds",
+    )
+    args = parser.parse_args(argv)
+
+    displays = [display.strip() for display in args.displays.split(",") if display.strip()]
+    if not displays:
+        print("错误: 至少需要一个显示")
+        print("Error: At least one display is required")
+        sys.exit(1)
+    if args.interval < 1:
+        print("错误: 移动间隔必须大于0")
+        print("Error: Interval must be greater than 0")
+        sys.exit(1)
+    if args.call_timeout < 0:
+        print("错误: 调用时限不能为负数")
+        print("Error: Call timeout must not be negative")
+        sys.exit(1)
+
+    supervisor = Supervisor(
+        displays,
+        interval=args.interval,
+        method=args.method,
+        max_workers=args.workers,
+        call_timeout=args.call_timeout or None,
+    )
+    if not supervisor.movers:
+        print("错误: 没有可用的显示")
+        print("Error: No usable display")
+        sys.exit(1)
+    supervisor.print_func(
+        f"守护 {len(displays)} 个显示: {', '.join(displays)} / Supervising {len(displays)} displays: {', '.join(displays)}"
+    )
+    supervisor.run(duration=args.duration)
+    supervisor.print_func(supervisor.format_stats())
@@ -0,0 +1,186 @@
+"""
+基于 Linux uinput 的虚拟输入设备控制器 / Virtual input device controller on Linux uinput
+
+启动时通过 /dev/uinput 创建一个同时具有相对指针和键盘能力的虚拟设备，之后每次注入
+都把完整的事件序列（移动 + 反向移动，或一次 Shift 按下/释放）打包成一次 write()。
+不依赖任何显示服务器，因此在无 X 的主机和 Wayland 上同样有效。
+Creates one virtual device with relative-pointer and keyboard capabilities through /dev/uinput
+at startup; every injection then packs the whole event sequence (a move plus its inverse, or
+one Shift press/release) into a single write(). It does not depend on any display server, so
+it works on headless hosts and under Wayland alike.
+
+需要对 /dev/uinput 有写权限（例如 udev 规则或 input 组）/ Requires write access to /dev/uinput
+(e.g. a udev rule or the input group)
+"""
+
+import os
+import struct
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from .move_mouse import MousePosition, ScreenSize
+
+# linux/input-event-codes.h
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_REL = 0x02
+SYN_REPORT = 0
+REL_X = 0x00
+REL_Y = 0x01
+BTN_LEFT = 0x110
+BTN_RIGHT = 0x111
+KEY_CODES = {"shift": 42, "ctrl": 29, "alt": 56}
+
+# linux/uinput.h ioctl 编号 / ioctl numbers
+UI_DEV_CREATE = 0x5501
+UI_DEV_DESTROY = 0x5502
+UI_DEV_SETUP = 0x405C5503
+UI_SET_EVBIT = 0x40045564
+UI_SET_KEYBIT = 0x40045565
+UI_SET_RELBIT = 0x40045566
+
+BUS_VIRTUAL = 0x06
+DEVICE_NAME = b"mouse-keepalive"
+
+# struct input_event { struct timeval time; __u16 type; __u16 code; __s32 value; }
+# 时间字段由内核填写 / The kernel fills in the time field
+_EVENT = struct.Struct("llHHi")
+
+
+def _events(*events: Any) -> bytes:
+    """把 (type, code, value) 序列打包为 input_event 数组 / Pack (type, code, value) triples into input_events"""
+    return b"".join(_EVENT.pack(0, 0, event_type, code, value) for event_type, code, value in events)
+
+
+class UinputController:
+    """
+    uinput 虚拟设备控制器 / uinput virtual device controller
+
+    uinput 无法读取光标位置：控制器在一个虚拟屏幕上跟踪自己的位置（初始为中心，偏移不会被截断），
+    实际移动只用相对事件完成。
+    uinput cannot read the cursor position: the controller tracks its own position on a virtual
+    screen (starting at the centre so offsets are never clamped), and the actual motion uses
+    relative events only.
+
+    移动总是瞬时的，move_to 忽略 duration；instant_moves 让 MouseMover 在补间时长不为 0 时也用 jiggle()，
+    每次注入仍只有一次 write()
+    Moves are always instantaneous and move_to ignores duration; instant_moves lets MouseMover use jiggle()
+    even with a non-zero tween duration, so every injection is still one write()
+    """
+
+    VIRTUAL_SCREEN = ScreenSize(65536, 65536)
+
+    # 见 MouseMover 的 move_duration / See MouseMover's move_duration
+    instant_moves = True
+
+    def __init__(
+        self,
+        display: Optional[str] = None,
+        path: str = "/dev/uinput",
+        ioctl: Optional[Callable[[int, int, Any], Any]] = None,
+    ):
+        """
+        Args:
+            display: 忽略，uinput 与显示无关 / Ignored, uinput is display-independent
+            path: uinput 设备路径 / uinput device path
+            ioctl: ioctl 函数，默认 fcntl.ioctl，便于测试 / ioctl function, defaults to fcntl.ioctl, for testing
+
+        Raises:
+            OSError: 无法打开或创建设备 / The device cannot be opened or created
+        """
+        if ioctl is None:
+            import fcntl
+
+            ioctl = fcntl.ioctl
+        self._ioctl = ioctl
+        self._position = MousePosition(self.VIRTUAL_SCREEN.width // 2, self.VIRTUAL_SCREEN.height // 2)
+        fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            self._create(fd)
+        except OSError:
+            os.close(fd)
+            raise
+        self._fd: Optional[int] = fd
+
+    def _create(self, fd: int) -> None:
+        for ev in (EV_SYN, EV_KEY, EV_REL):
+            self._ioctl(fd, UI_SET_EVBIT, ev)
+        for rel in (REL_X, REL_Y):
+            self._ioctl(fd, UI_SET_RELBIT, rel)
+        # 有按键的相对设备才会被 libinput 识别为鼠标 / libinput only treats relative devices with buttons as mice
+        for key in (BTN_LEFT, BTN_RIGHT, *KEY_CODES.values()):
+            self._ioctl(fd, UI_SET_KEYBIT, key)
+
+        # struct uinput_setup { struct input_id id; char name[80]; __u32 ff_effects_max; }
+        setup = struct.pack("HHHH80sI", BUS_VIRTUAL, 0x1209, 0x6D6B, 1, DEVICE_NAME, 0)
+        try:
+            self._ioctl(fd, UI_DEV_SETUP, setup)
+        except OSError:
+            # 4.5 之前的内核：写入 struct uinput_user_dev / Kernels before 4.5: write struct uinput_user_dev
+            os.write(fd, struct.pack("80sHHHHI", DEVICE_NAME, BUS_VIRTUAL, 0x1209, 0x6D6B, 1, 0) + bytes(4 * 64 * 4))
+        self._ioctl(fd, UI_DEV_CREATE, 0)
+
+    def _write(self, data: bytes) -> None:
+        if self._fd is None:
+            raise OSError("uinput 设备已关闭 / uinput device is closed")
+        os.write(self._fd, data)
+
+    def get_position(self) -> MousePosition:
+        """虚拟位置 / Virtual position"""
+        return self._position
+
+    def get_screen_size(self) -> ScreenSize:
+        """虚拟屏幕尺寸 / Virtual screen size"""
+        return self.VIRTUAL_SCREEN
+
+    def jiggle(self, dx: int, dy: int) -> None:
+        """相对移动和反向移动，一次 write() / Relative move and its inverse in one write()"""
+        dx, dy = int(dx), int(dy)
+        self._write(
+            _events(
+                (EV_REL, REL_X, dx),
+                (EV_REL, REL_Y, dy),
+                (EV_SYN, SYN_REPORT, 0),
+                (EV_REL, REL_X, -dx),
+                (EV_REL, REL_Y, -dy),
+                (EV_SYN, SYN_REPORT, 0),
+            )
+        )
+
+    def move_path(self, steps: Sequence[int]) -> None:
+        """按 dx、dy 交错的相对步长移动，一次 write() / Move through interleaved dx, dy steps in one write()"""
+        events: List[Tuple[int, int, int]] = []
+        for i in range(0, len(steps), 2):
+            events += ((EV_REL, REL_X, int(steps[i])), (EV_REL, REL_Y, int(steps[i + 1])), (EV_SYN, SYN_REPORT, 0))
+        self._write(_events(*events))
+
+    def move_to(self, x: int, y: int, duration: float = 0.1) -> None:
+        """按与虚拟位置的差值相对移动，忽略 duration / Move by the difference from the virtual position, ignoring duration"""
+        dx, dy = int(x) - self._position.x, int(y) - self._position.y
+        if dx or dy:
+            self._write(_events((EV_REL, REL_X, dx), (EV_REL, REL_Y, dy), (EV_SYN, SYN_REPORT, 0)))
+        self._position = MousePosition(int(x), int(y))
+
+    def press_key(self, key: str = "shift") -> None:
+        """按下并释放，一次 write() / Press and release in one write()"""
+        try:
+            code = KEY_CODES[key]
+        except KeyError:
+            raise ValueError(f"未知按键 / Unknown key: {key}") from None
+        self._write(
+            _events(
+                (EV_KEY, code, 1),
+                (EV_SYN, SYN_REPORT, 0),
+                (EV_KEY, code, 0),
+                (EV_SYN, SYN_REPORT, 0),
+            )
+        )
+
+    def close(self) -> None:
+        """销毁虚拟设备 / Destroy the virtual device"""
+        if self._fd is not None:
+            try:
+                self._ioctl(self._fd, UI_DEV_DESTROY, 0)
+            except OSError:
+                pass
+            os.close(self._fd)
+            self._fd = None
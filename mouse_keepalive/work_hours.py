@@ -0,0 +1,213 @@
+"""
+工作时间日历 / Working-hours calendar
+
+只在工作时间内保活，其余时间循环在一次可中断的长等待中休眠到下一个窗口开始。
+Keep the session alive during working hours only; outside them the loop sleeps in one
+interruptible wait until the next window opens.
+
+规格 / Spec:
+    [TZ=<时区 / zone>] <星期 / days> <时间段 / times>[; <星期 / days> <时间段 / times> ...]
+
+    Mon-Fri 08:30-18:00
+    TZ=Europe/Berlin Mon-Thu 08:00-12:00,13:00-17:30; Fri 08:00-14:00
+    daily 22:00-06:00                  跨午夜的窗口 / A window across midnight
+
+星期可以是 Mon..Sun、范围（Fri-Mon 可以跨周末）、逗号列表、* 或 daily；节假日整天不活跃。
+Days are Mon..Sun, ranges (Fri-Mon wraps the weekend), comma lists, * or daily; holidays are
+inactive all day.
+"""
+
+import bisect
+import os
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Iterable, List, Optional, Tuple
+
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# 查找下一个窗口时最多向后看的天数 / How many days ahead the next-window search looks
+HORIZON_DAYS = 400
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _parse_days(text: str) -> List[int]:
+    text = text.lower()
+    if text in ("*", "daily"):
+        return list(range(7))
+    days: List[int] = []
+    for part in text.split(","):
+        first, _, last = part.partition("-")
+        try:
+            start = DAYS.index(first[:3])
+            end = DAYS.index(last[:3]) if last else start
+        except ValueError:
+            raise ValueError(f"unknown day: {part}") from None
+        days.extend((start + offset) % 7 for offset in range((end - start) % 7 + 1))
+    return days
+
+
+def _parse_minute(text: str) -> int:
+    hours, sep, minutes = text.partition(":")
+    try:
+        value = int(hours) * 60 + (int(minutes) if sep else 0)
+    except ValueError:
+        raise ValueError(f"invalid time: {text}") from None
+    if not 0 <= value <= MINUTES_PER_DAY or (sep and not 0 <= int(minutes) < 60):
+        raise ValueError(f"invalid time: {text}")
+    return value
+
+
+def _merge(windows: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _timezone(name: str) -> tzinfo:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown time zone: {name}") from None
+
+
+class WorkSchedule:
+    """
+    编译后的工作时间 / Compiled working hours
+
+    每个星期几对应一个排好序、已合并的 (开始分钟, 结束分钟) 列表，跨午夜的窗口拆到第二天；
+    查询下一个窗口只需按天向后看，每天一次二分查找
+    Each weekday maps to a sorted, merged list of (start minute, end minute), with windows across
+    midnight split into the next day; finding the next window walks forward day by day with one
+    binary search per day
+    """
+
+    def __init__(self, spec: str, holidays: Iterable[date] = ()):
+        """
+        Args:
+            spec: 工作时间规格，见模块说明 / Working-hours spec, see the module docstring
+            holidays: 整天不活跃的日期（按规格的时区）/ Dates inactive all day (in the spec's zone)
+
+        Raises:
+            ValueError: 规格无效 / Invalid spec
+        """
+        self.spec = spec.strip()
+        self.holidays = frozenset(holidays)
+        self.tz: Optional[tzinfo] = None
+        week: List[List[Tuple[int, int]]] = [[] for _ in range(7)]
+
+        entries = self.spec
+        if entries[:3].upper() == "TZ=":
+            zone, _, entries = entries[3:].partition(" ")
+            self.tz = _timezone(zone)
+        for entry in filter(None, (entry.strip() for entry in entries.split(";"))):
+            days, _, times = entry.partition(" ")
+            if not times.strip():
+                raise ValueError(f"missing times in: {entry}")
+            for span in times.replace(" ", "").split(","):
+                first, sep, last = span.partition("-")
+                if not sep:
+                    raise ValueError(f"invalid time range: {span}")
+                start, end = _parse_minute(first), _parse_minute(last)
+                if start == end:
+                    raise ValueError(f"empty time range: {span}")
+                for day in _parse_days(days):
+                    if start < end:
+                        week[day].append((start, end))
+                    else:
+                        # 跨午夜 / Across midnight
+                        week[day].append((start, MINUTES_PER_DAY))
+                        week[(day + 1) % 7].append((0, end))
+        if not any(week):
+            raise ValueError("the schedule has no working hours")
+        self._week = [_merge(windows) for windows in week]
+        self._ends = [[end for _, end in windows] for windows in self._week]
+
+    def _local(self, timestamp: float) -> datetime:
+        if self.tz is None:
+            return datetime.fromtimestamp(timestamp)
+        return datetime.fromtimestamp(timestamp, self.tz)
+
+    def _timestamp(self, day: date, minute: int) -> float:
+        # 在墙上时间上相加，夏令时切换日也落在正确的本地时间 / Wall-clock arithmetic, so DST days land right
+        return (datetime.combine(day, time(), tzinfo=self.tz) + timedelta(minutes=minute)).timestamp()
+
+    def next_window(self, timestamp: float) -> Optional[Tuple[float, float]]:
+        """
+        包含 timestamp 或之后的第一个窗口 / The first window containing or after timestamp
+
+        Returns:
+            (开始, 结束) 时间戳；HORIZON_DAYS 天内都没有时返回 None /
+            (start, end) timestamps, None when there is none within HORIZON_DAYS
+        """
+        today = self._local(timestamp).date()
+        for offset in range(HORIZON_DAYS):
+            day = today + timedelta(days=offset)
+            if day in self.holidays:
+                continue
+            weekday = day.weekday()
+            windows = self._week[weekday]
+            if not windows:
+                continue
+            index = 0
+            if offset == 0:
+                minute = self._minute_of(timestamp)
+                index = bisect.bisect_right(self._ends[weekday], minute)
+            for start, end in windows[index:]:
+                end_ts = self._timestamp(day, end)
+                if end_ts > timestamp:
+                    return self._timestamp(day, start), end_ts
+        return None
+
+    def _minute_of(self, timestamp: float) -> int:
+        local = self._local(timestamp)
+        return local.hour * 60 + local.minute
+
+    def seconds_until_active(self, timestamp: float) -> float:
+        """
+        距离下一个窗口开始的秒数，在窗口内时为 0 / Seconds until the next window opens, 0 inside a window
+
+        找不到窗口时返回 HORIZON_DAYS 天，醒来后再查一次 / Without any window, HORIZON_DAYS days, to check again
+        """
+        window = self.next_window(timestamp)
+        if window is None:
+            return HORIZON_DAYS * 86400.0
+        return max(0.0, window[0] - timestamp)
+
+    def active(self, timestamp: float) -> bool:
+        """timestamp 是否在工作时间内 / Whether timestamp falls within working hours"""
+        return self.seconds_until_active(timestamp) == 0
+
+    def format(self, timestamp: float) -> str:
+        """按规格的时区格式化时间戳 / Format a timestamp in the spec's time zone"""
+        return self._local(timestamp).strftime("%Y-%m-%d %H:%M")
+
+    def __str__(self) -> str:
+        return self.spec
+
+
+def parse_holidays(value: str) -> List[date]:
+    """
+    解析节假日：逗号分隔的 ISO 日期，或每行一个日期的文件（# 开头为注释）/ Parse holidays: comma-separated
+    ISO dates, or a file with one date per line (# starts a comment)
+
+    Raises:
+        ValueError: 日期无效 / Invalid date
+    """
+    if os.path.isfile(value):
+        with open(value, encoding="utf-8") as f:
+            items = [line.split("#", 1)[0].strip() for line in f]
+    else:
+        items = [item.strip() for item in value.split(",")]
+    holidays = []
+    for item in filter(None, items):
+        try:
+            holidays.append(date.fromisoformat(item))
+        except ValueError:
+            raise ValueError(f"invalid holiday date: {item}") from None
+    return holidays
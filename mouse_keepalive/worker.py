@@ -0,0 +1,319 @@
+"""
+常驻工作进程：通过 stdio 上的 JSON Lines 控制一个 MouseMover / Long-lived worker: one MouseMover driven
+by JSON Lines over stdio
+
+npm 包装器（lib/moveMouse.js 的 startWorker()）只启动一次 Python，之后可以反复 start、stop、
+查询，而不必每次都付出解释器启动的开销。
+The npm wrapper (startWorker() in lib/moveMouse.js) starts Python once and can then start, stop
+and query keepalive repeatedly without paying interpreter start-up every time.
+
+每行一个请求，每个请求回复一行（带相同的 id）；运行事件是 Reporter 的 JSON 行，没有 id：
+One request per line, each answered with one line carrying the same id; run events are the
+Reporter's JSON lines, without an id:
+
+    -> {"id": 1, "cmd": "start", "interval": 60, "method": "mouse"}
+    <- {"id": 1, "ok": true}
+    <- {"time": ..., "level": "info", "event": "start", ...}
+    -> {"id": 2, "cmd": "stats"}
+    <- {"id": 2, "ok": true, "result": {"running": true, "successes": 3, ...}}
+
+命令 / Commands: start、stop、pause、resume、set-interval、set-method、stats、quit。
+stdin 关闭（Node 端退出）时等同于 quit / Closing stdin (the Node side exiting) acts as quit.
+
+用法 / Usage:
+    mouse-keepalive worker
+"""
+
+import json
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TextIO
+
+from .move_mouse import MouseMover
+
+if TYPE_CHECKING:
+    from .instance_lock import InstanceLock
+
+# stop 等待当前 tick 结束的时间（秒）/ How long stop waits for the current tick to end (seconds)
+STOP_TIMEOUT = 5.0
+
+# start 接受的参数及其默认值 / Arguments accepted by start and their defaults
+START_OPTIONS: Dict[str, Any] = {
+    "interval": 60,
+    "duration": None,
+    "method": "mouse",
+    "idle_threshold": None,
+    "scheduler": "interval",
+    "missed_policy": "skip",
+    "jitter": 0.0,
+}
+
+# MouseMover.run 的调度方式 / Scheduling modes of MouseMover.run
+SCHEDULERS = ("interval", "deadline")
+
+
+class _LineWriter:
+    """
+    多线程共享的行输出 / Line output shared between threads
+
+    Reporter 的写线程和请求处理都经由它写出，整行在锁内写入，不会交错
+    The Reporter's writer thread and the request loop both write through it; whole lines are written
+    under a lock, so they never interleave
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            self.stream.write(text)
+            self.stream.flush()
+
+    def flush(self) -> None:
+        pass
+
+
+class Worker:
+    """
+    处理 JSON 请求，在后台线程中运行 MouseMover.run / Handle JSON requests, running MouseMover.run on a
+    background thread
+
+    MouseMover 和控制器在第一次 start 时创建并一直复用，每次 start 只换一个新的 Control；会话锁也在第一次
+    start 时获取，close() 时释放
+    The MouseMover and controller are created on the first start and reused; every start only gets a
+    fresh Control. The session lock is likewise taken on the first start and released by close()
+    """
+
+    def __init__(
+        self,
+        output: TextIO,
+        mover_factory: Optional[Callable[[Any], MouseMover]] = None,
+        instance: Optional["InstanceLock"] = None,
+    ):
+        """
+        Args:
+            output: 回复和事件的输出流 / Output stream for replies and events
+            mover_factory: 以 Reporter 为参数创建 MouseMover，None 表示自动选择后端 /
+                Creates the MouseMover from a Reporter, None picks the backend automatically
+            instance: 会话锁，None 表示不加锁 / Session lock, None runs without one
+        """
+        from .reporter import Reporter
+
+        self.output = _LineWriter(output)
+        self.reporter = Reporter(fmt="json", locale="en", stream=self.output)  # type: ignore[arg-type]
+        self.mover_factory = mover_factory or _default_mover
+        self.instance = instance
+        self.mover: Optional[MouseMover] = None
+        self.control: Any = None
+        self._thread: Optional[threading.Thread] = None
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "start": self.start,
+            "stop": self.stop,
+            "pause": lambda request: self._require_control().pause(),
+            "resume": lambda request: self._require_control().resume(),
+            "set-interval": lambda request: self._require_control().set_interval(float(request["interval"])),
+            "set-method": lambda request: self._require_control().set_method(request["method"]),
+            "stats": self.stats,
+        }
+
+    @property
+    def running(self) -> bool:
+        """是否有正在运行的保活循环 / Whether a keepalive loop is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _require_control(self) -> Any:
+        if not self.running:
+            raise ValueError("not running")
+        return self.control
+
+    def start(self, request: Dict[str, Any]) -> None:
+        """开始保活循环 / Start the keepalive loop"""
+        from .control import METHODS, Control
+        from .reporter import RunReporter
+        from .scheduler import DeadlineScheduler
+
+        if self.running:
+            raise ValueError("already running")
+        unknown = set(request) - set(START_OPTIONS) - {"id", "cmd"}
+        if unknown:
+            raise ValueError(f"unknown option: {', '.join(sorted(unknown))}")
+        options = {key: request.get(key, default) for key, default in START_OPTIONS.items()}
+        if not isinstance(options["interval"], (int, float)) or options["interval"] <= 0:
+            raise ValueError("interval must be greater than 0")
+        if options["method"] not in METHODS:
+            raise ValueError(f"method must be one of {', '.join(METHODS)}")
+        if options["scheduler"] not in SCHEDULERS:
+            raise ValueError(f"scheduler must be one of {', '.join(SCHEDULERS)}")
+        if options["missed_policy"] not in DeadlineScheduler.POLICIES:
+            raise ValueError(f"missed_policy must be one of {', '.join(DeadlineScheduler.POLICIES)}")
+        if not isinstance(options["jitter"], (int, float)) or options["jitter"] < 0:
+            raise ValueError("jitter must not be negative")
+
+        # 与 CLI 共用会话锁，同一会话中不会有两个进程同时注入 / Shares the CLI's session lock, so two processes
+        # never inject into the same session at once
+        if self.instance is not None and not self.instance.acquire():
+            pid = (self.instance.owner() or {}).get("pid", "?")
+            raise ValueError(f"already running in this session (pid {pid})")
+        if self.mover is None:
+            self.mover = self.mover_factory(self.reporter)
+        control = Control()
+        self.mover.control = control
+        self.mover.sleep_func = control.sleep
+        self.control = control
+        callbacks = RunReporter(
+            self.reporter,
+            method=options["method"],
+            interval=options["interval"],
+            duration=options["duration"],
+            idle_threshold=options["idle_threshold"],
+            control=control,
+        )
+        mover = self.mover
+
+        def run() -> None:
+            try:
+                mover.run(
+                    on_start=callbacks.on_start,
+                    on_move=callbacks.on_move,
+                    on_finish=callbacks.on_finish,
+                    on_skip=callbacks.on_skip,
+                    **options,
+                )
+            except Exception as e:
+                self.reporter.error("worker_error", error=str(e))
+
+        self._thread = threading.Thread(target=run, name="keepalive", daemon=True)
+        self._thread.start()
+
+    def stop(self, request: Optional[Dict[str, Any]] = None) -> None:
+        """
+        停止保活循环并等待当前 tick 结束 / Stop the keepalive loop and wait for the current tick
+
+        Raises:
+            TimeoutError: 当前 tick 在 STOP_TIMEOUT 内没有结束；循环仍算在运行，不能再次 start /
+                The current tick did not end within STOP_TIMEOUT; the loop still counts as running, so start is
+                refused
+        """
+        if self.control is not None:
+            self.control.stop()
+        if self._thread is not None:
+            self._thread.join(STOP_TIMEOUT)
+            if self._thread.is_alive():
+                raise TimeoutError("still stopping, the current tick has not finished")
+            self._thread = None
+
+    def stats(self, request: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """运行状态和计数 / Run state and counters"""
+        stats = self.control.stats() if self.control is not None else {}
+        stats["running"] = self.running
+        return stats
+
+    def handle(self, request: Any) -> Dict[str, Any]:
+        """
+        处理一个请求 / Handle one request
+
+        Returns:
+            回复对象 / Reply object
+        """
+        if not isinstance(request, dict):
+            return {"id": None, "ok": False, "error": "request must be a JSON object"}
+        reply: Dict[str, Any] = {"id": request.get("id")}
+        handler = self._handlers.get(request.get("cmd"))  # type: ignore[arg-type]
+        if handler is None:
+            reply.update(ok=False, error=f"unknown command: {request.get('cmd')}")
+            return reply
+        try:
+            result = handler(request)
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            reply.update(ok=False, error=str(e) if not isinstance(e, KeyError) else f"missing field: {e}")
+            return reply
+        reply["ok"] = True
+        if result is not None:
+            reply["result"] = result
+        return reply
+
+    def reply(self, reply: Dict[str, Any]) -> None:
+        self.output.write(json.dumps(reply, ensure_ascii=False, default=str) + "\n")
+
+    def serve(self, lines: Any) -> None:
+        """
+        逐行处理请求，直到 quit 或输入结束 / Handle requests line by line until quit or end of input
+        """
+        try:
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    self.reply({"id": None, "ok": False, "error": f"invalid JSON: {e}"})
+                    continue
+                if isinstance(request, dict) and request.get("cmd") == "quit":
+                    self.reply(self.handle(dict(request, cmd="stop")))
+                    return
+                self.reply(self.handle(request))
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """停止循环、关闭控制器、释放会话锁并写出剩余事件 / Stop the loop, close controllers, release the
+        session lock and flush events"""
+        from .backends import close_controllers
+
+        try:
+            self.stop()
+        except TimeoutError as e:
+            # 进程即将退出，守护线程随之结束 / The process is about to exit, taking the daemon thread with it
+            self.reporter.error("worker_error", error=str(e))
+        if self.mover is not None:
+            self.mover.close()
+            close_controllers()
+        if self.instance is not None:
+            self.instance.release()
+        self.reporter.close()
+
+
+def _default_mover(reporter: Any, backend: str = "auto") -> MouseMover:
+    from .backends import BLOCKING, IDLE, detect_backend, get_backend, get_controller, reopen_controller
+    from .call_timeout import DEFAULT_TIMEOUT
+
+    name = detect_backend() if backend == "auto" else backend
+    if name is None:
+        raise ValueError("no input backend available, please install pyautogui or xdotool")
+    capabilities = get_backend(name).capabilities
+    mover = MouseMover(
+        controller=get_controller(name),
+        reporter=reporter,
+        call_timeout=DEFAULT_TIMEOUT if BLOCKING in capabilities else None,
+        reconnect=lambda: reopen_controller(name),
+    )
+    if IDLE in capabilities:
+        # 每次取共享实例，重连后仍然有效 / Look up the shared instance each time, so it survives a reconnect
+        mover.idle_func = lambda: get_controller(name).idle_seconds()
+    return mover
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """worker 子命令入口 / Entry point of the worker subcommand"""
+    import argparse
+
+    from .backends import backend_names
+    from .instance_lock import InstanceLock
+
+    parser = argparse.ArgumentParser(
+        prog="mouse-keepalive worker",
+        description="通过 stdio 上的 JSON Lines 控制保活 / Drive keepalive with JSON Lines over stdio",
+    )
+    parser.add_argument(
+        "--backend", choices=["auto", *backend_names()], default="auto", help="输入后端 / Input backend"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        instance = InstanceLock()
+    except OSError as e:
+        print(f"Error: Cannot take the session lock: {e}", file=sys.stderr)
+        sys.exit(1)
+    Worker(sys.stdout, lambda reporter: _default_mover(reporter, args.backend), instance).serve(sys.stdin)
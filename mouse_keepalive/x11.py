@@ -0,0 +1,268 @@
+"""
+基于 ctypes 的 X11 控制器 / ctypes-based X11 controller
+
+直接调用 libX11 和 XTest 扩展，每个控制器持有一个到指定 DISPLAY 的持久连接，
+因此一个进程可以同时控制多个 X 会话，并且不需要导入 pyautogui。
+Talks to libX11 and the XTest extension directly. Each controller holds one persistent
+connection to its DISPLAY, so one process can drive several X sessions without pyautogui.
+
+X 服务器退出时，Xlib 默认会调用 exit() 结束整个进程；guard_connection() 让连接断开变成 OSError，
+一个显示掉线不会带走 serve 中的其他显示。
+When an X server goes away Xlib calls exit() by default, ending the whole process. guard_connection()
+turns a lost connection into an OSError instead, so one display dying does not take down the others in serve.
+"""
+
+import ctypes
+import ctypes.util
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Set
+
+from .move_mouse import MousePosition, ScreenSize
+
+if TYPE_CHECKING:
+    from .idle import XScreenSaverIdleSource
+
+_libraries: Dict[str, Any] = {}
+
+# 已断开的 Display 指针，由 Xlib 的 IO 错误回调记录 / Display pointers whose connection was lost, recorded by
+# Xlib's IO error callbacks
+_lost_connections: Set[int] = set()
+
+_IOErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p)
+_IOErrorExitHandler = ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.c_void_p)
+
+
+def _on_io_error(dpy: Optional[int]) -> int:
+    if dpy:
+        _lost_connections.add(dpy)
+    return 0
+
+
+def _on_io_error_exit(dpy: Optional[int], data: Optional[int]) -> None:
+    # 返回而不是 exit()，Xlib 随后把该连接标记为不可用 / Return instead of exit(); Xlib then marks the
+    # connection unusable
+    if dpy:
+        _lost_connections.add(dpy)
+
+
+# 回调对象必须一直存活 / The callback objects must stay alive
+_io_error_handler = _IOErrorHandler(_on_io_error)
+_io_error_exit_handler = _IOErrorExitHandler(_on_io_error_exit)
+
+
+def load_library(name: str) -> Any:
+    """
+    加载并缓存共享库 / Load and cache a shared library
+
+    Args:
+        name: 库名，例如 "X11"、"Xtst" / Library name, e.g. "X11", "Xtst"
+
+    Raises:
+        OSError: 找不到库时抛出 / Raised when the library cannot be found
+    """
+    if name not in _libraries:
+        path = ctypes.util.find_library(name)
+        if not path:
+            raise OSError(f"未找到 lib{name} / lib{name} not found")
+        _libraries[name] = ctypes.cdll.LoadLibrary(path)
+    return _libraries[name]
+
+
+def guard_connection(xlib: Any, dpy: int) -> bool:
+    """
+    让该连接断开时不再结束进程 / Keep a lost connection from ending the process
+
+    需要 libX11 1.7 及以上的 XSetIOErrorExitHandler；更早的版本中 Xlib 仍会在连接断开时退出
+    Needs XSetIOErrorExitHandler from libX11 1.7 or later; with older versions Xlib still exits when the
+    connection is lost
+
+    Returns:
+        是否已安装 / Whether the handlers were installed
+    """
+    try:
+        set_exit_handler = xlib.XSetIOErrorExitHandler
+    except AttributeError:
+        return False
+    xlib.XSetIOErrorHandler.restype = ctypes.c_void_p
+    xlib.XSetIOErrorHandler.argtypes = [_IOErrorHandler]
+    set_exit_handler.restype = None
+    set_exit_handler.argtypes = [ctypes.c_void_p, _IOErrorExitHandler, ctypes.c_void_p]
+    xlib.XSetIOErrorHandler(_io_error_handler)
+    set_exit_handler(dpy, _io_error_exit_handler, None)
+    return True
+
+
+def connection_lost(dpy: Optional[int]) -> bool:
+    """
+    连接是否已断开，断开的连接只报告一次 / Whether the connection was lost; each loss is reported once
+
+    断开的 Display 不再调用 XCloseDisplay，关闭时 Xlib 会再次触发 IO 错误
+    A lost Display is not passed to XCloseDisplay, which would raise the IO error again
+    """
+    if dpy in _lost_connections:
+        _lost_connections.discard(dpy)
+        return True
+    return False
+
+
+def _configure_xlib(xlib: Any) -> None:
+    xlib.XOpenDisplay.restype = ctypes.c_void_p
+    xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+    xlib.XFlush.argtypes = [ctypes.c_void_p]
+    xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+    xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+    xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+    xlib.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    xlib.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    xlib.XQueryPointer.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_ulong,
+        ctypes.POINTER(ctypes.c_ulong),
+        ctypes.POINTER(ctypes.c_ulong),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_uint),
+    ]
+    xlib.XStringToKeysym.restype = ctypes.c_ulong
+    xlib.XStringToKeysym.argtypes = [ctypes.c_char_p]
+    xlib.XKeysymToKeycode.restype = ctypes.c_ubyte
+    xlib.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+
+
+def _configure_xtst(xtst: Any) -> None:
+    xtst.XTestFakeMotionEvent.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+    xtst.XTestFakeRelativeMotionEvent.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+    xtst.XTestFakeKeyEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+
+
+# pyautogui 风格的按键名到 X keysym 名称 / pyautogui-style key names to X keysym names
+_KEYSYM_NAMES = {"shift": "Shift_L", "ctrl": "Control_L", "alt": "Alt_L"}
+
+
+class X11Controller:
+    """
+    X11 鼠标控制器（持久连接）/ X11 mouse controller (persistent connection)
+
+    与 MouseController 接口相同；移动是瞬时的，duration 参数被忽略
+    Same interface as MouseController; moves are instantaneous and duration is ignored
+    """
+
+    def __init__(self, display: Optional[str] = None, xlib: Any = None, xtst: Any = None):
+        """
+        Args:
+            display: X 显示名，例如 ":1"，None 表示使用 $DISPLAY / X display name, e.g. ":1", None uses $DISPLAY
+            xlib: libX11 句柄，便于测试 / libX11 handle, for testing
+            xtst: libXtst 句柄，便于测试 / libXtst handle, for testing
+        """
+        self.display = display
+        self._xlib = xlib
+        self._xtst = xtst
+        self._dpy = None
+        self._idle: Optional["XScreenSaverIdleSource"] = None
+
+    def _connection(self) -> Any:
+        """获取（必要时打开）X 连接 / Get the X connection, opening it if needed"""
+        if self._dpy is None:
+            if self._xlib is None:
+                self._xlib = load_library("X11")
+                _configure_xlib(self._xlib)
+            if self._xtst is None:
+                self._xtst = load_library("Xtst")
+                _configure_xtst(self._xtst)
+            dpy = self._xlib.XOpenDisplay(self.display.encode() if self.display else None)
+            if not dpy:
+                raise OSError(f"无法连接 X 显示 {self.display} / Cannot open X display {self.display}")
+            guard_connection(self._xlib, dpy)
+            self._dpy = dpy
+        return self._dpy
+
+    def _check(self, dpy: Any) -> None:
+        """连接在本次调用中断开时丢弃它并抛出 OSError / Drop the connection and raise OSError if it was lost"""
+        if connection_lost(dpy):
+            self._dpy = None
+            raise OSError(f"X 显示 {self.display} 连接已断开 / Lost the connection to X display {self.display}")
+
+    def get_position(self) -> MousePosition:
+        """获取当前鼠标位置 / Get current mouse position"""
+        dpy = self._connection()
+        root = self._xlib.XDefaultRootWindow(dpy)
+        root_ret, child_ret = ctypes.c_ulong(), ctypes.c_ulong()
+        root_x, root_y, win_x, win_y = ctypes.c_int(), ctypes.c_int(), ctypes.c_int(), ctypes.c_int()
+        mask = ctypes.c_uint()
+        self._xlib.XQueryPointer(
+            dpy,
+            root,
+            ctypes.byref(root_ret),
+            ctypes.byref(child_ret),
+            ctypes.byref(root_x),
+            ctypes.byref(root_y),
+            ctypes.byref(win_x),
+            ctypes.byref(win_y),
+            ctypes.byref(mask),
+        )
+        self._check(dpy)
+        return MousePosition(root_x.value, root_y.value)
+
+    def get_screen_size(self) -> ScreenSize:
+        """获取屏幕尺寸 / Get screen size"""
+        dpy = self._connection()
+        screen = self._xlib.XDefaultScreen(dpy)
+        size = ScreenSize(self._xlib.XDisplayWidth(dpy, screen), self._xlib.XDisplayHeight(dpy, screen))
+        self._check(dpy)
+        return size
+
+    def move_to(self, x: int, y: int, duration: float = 0.1) -> None:
+        """移动鼠标到指定位置（瞬时）/ Move mouse to specified position (instantaneous)"""
+        dpy = self._connection()
+        self._xtst.XTestFakeMotionEvent(dpy, -1, int(x), int(y), 0)
+        self._xlib.XFlush(dpy)
+        self._check(dpy)
+
+    def jiggle(self, dx: int, dy: int) -> None:
+        """相对移动并反向移回，两个事件一次刷新 / Relative move and its inverse, flushed together"""
+        dpy = self._connection()
+        self._xtst.XTestFakeRelativeMotionEvent(dpy, int(dx), int(dy), 0)
+        self._xtst.XTestFakeRelativeMotionEvent(dpy, -int(dx), -int(dy), 0)
+        self._xlib.XFlush(dpy)
+        self._check(dpy)
+
+    def move_path(self, steps: Sequence[int]) -> None:
+        """按 dx、dy 交错的相对步长移动，所有事件一次刷新 / Move through interleaved dx, dy steps, flushed together"""
+        dpy = self._connection()
+        motion = self._xtst.XTestFakeRelativeMotionEvent
+        for i in range(0, len(steps), 2):
+            motion(dpy, int(steps[i]), int(steps[i + 1]), 0)
+        self._xlib.XFlush(dpy)
+        self._check(dpy)
+
+    def press_key(self, key: str = "shift") -> None:
+        """模拟按键按下和释放 / Simulate key press and release"""
+        dpy = self._connection()
+        keysym = self._xlib.XStringToKeysym(_KEYSYM_NAMES.get(key, key).encode())
+        keycode = self._xlib.XKeysymToKeycode(dpy, keysym)
+        if not keycode:
+            self._check(dpy)
+            raise ValueError(f"未知按键 / Unknown key: {key}")
+        self._xtst.XTestFakeKeyEvent(dpy, keycode, True, 0)
+        self._xtst.XTestFakeKeyEvent(dpy, keycode, False, 0)
+        self._xlib.XFlush(dpy)
+        self._check(dpy)
+
+    def idle_seconds(self) -> Optional[float]:
+        """该显示的用户空闲时间（XScreenSaver），未知时返回 None / User idle time of this display (XScreenSaver), None if unknown"""
+        if self._idle is None:
+            from .idle import XScreenSaverIdleSource
+
+            self._idle = XScreenSaverIdleSource(self.display)
+        return self._idle.idle_seconds()
+
+    def close(self) -> None:
+        """关闭 X 连接 / Close the X connection"""
+        if self._idle is not None:
+            self._idle.close()
+            self._idle = None
+        if self._dpy is not None:
+            self._xlib.XCloseDisplay(self._dpy)
+            self._dpy = None
@@ -5,8 +5,15 @@ Pytest configuration and fixtures
 import sys
 from unittest.mock import MagicMock
 
+import pytest
+
 # Mock pyautogui before any imports
 mock_pyautogui = MagicMock()
 mock_pyautogui.FAILSAFE = False
 sys.modules['pyautogui'] = mock_pyautogui
 
+
+@pytest.fixture(autouse=True)
+def isolated_runtime_dir(tmp_path_factory, monkeypatch):
+    """Keep instance locks and control sockets out of the user's real runtime directory"""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path_factory.mktemp("run")))
@@ -0,0 +1,148 @@
+"""
+Tests for mouse_keepalive.async_mover module
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import mouse_keepalive  # noqa: E402
+from mouse_keepalive.async_mover import AsyncMouseMover  # noqa: E402
+from mouse_keepalive.control import Control  # noqa: E402
+from mouse_keepalive.inhibit import Inhibitor  # noqa: E402
+from mouse_keepalive.move_mouse import MouseController, MousePosition, ScreenSize  # noqa: E402
+
+
+def make_controller():
+    ctrl = Mock(spec=MouseController)
+    ctrl.get_position.return_value = MousePosition(100, 200)
+    ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+    return ctrl
+
+
+class TestAsyncMouseMover:
+    def test_lazy_package_export(self):
+        assert mouse_keepalive.AsyncMouseMover is AsyncMouseMover
+
+    def test_run_async_until_duration(self):
+        ctrl = make_controller()
+        on_move = Mock()
+        on_finish = Mock()
+        mover = AsyncMouseMover(controller=ctrl)
+
+        move_count, elapsed = asyncio.run(
+            mover.run_async(interval=0.01, duration=0.035, on_move=on_move, on_finish=on_finish)
+        )
+
+        assert move_count >= 3
+        assert on_move.call_count == move_count
+        assert ctrl.move_to.call_count == 2 * move_count
+        on_finish.assert_called_once()
+        assert elapsed >= 0.035
+
+    def test_stop_wakes_pending_wait(self):
+        ctrl = make_controller()
+        on_finish = Mock()
+        mover = AsyncMouseMover(controller=ctrl)
+
+        async def scenario():
+            task = asyncio.create_task(mover.run_async(interval=3600, on_finish=on_finish))
+            await asyncio.sleep(0.05)
+            mover.stop()
+            return await asyncio.wait_for(task, timeout=1)
+
+        move_count, _ = asyncio.run(scenario())
+
+        assert move_count == 1
+        on_finish.assert_called_once()
+
+    def test_cancellation_calls_on_finish(self):
+        ctrl = make_controller()
+        on_finish = Mock()
+        mover = AsyncMouseMover(controller=ctrl)
+
+        async def scenario():
+            task = asyncio.create_task(mover.run_async(interval=3600, method="keyboard", on_finish=on_finish))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(scenario())
+
+        ctrl.press_key.assert_called_once_with("shift")
+        on_finish.assert_called_once()
+
+    def test_cancellation_during_a_tick_calls_on_finish(self):
+        ctrl = make_controller()
+        ctrl.press_key.side_effect = lambda key: time.sleep(0.2)
+        on_finish = Mock()
+        mover = AsyncMouseMover(controller=ctrl, call_timeout=1)
+
+        async def scenario():
+            task = asyncio.create_task(mover.run_async(interval=3600, method="keyboard", on_finish=on_finish))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(scenario())
+
+        on_finish.assert_called_once()
+        # 调用线程随任务一起结束 / The call thread ends with the task
+        assert mover._worker is None
+
+    @pytest.mark.parametrize("kwargs", [{"method": "auto"}, {}])
+    def test_unsupported_modes_are_rejected(self, kwargs):
+        mover = AsyncMouseMover(controller=make_controller(), control=None if kwargs else Control())
+        on_start = Mock()
+
+        with pytest.raises(ValueError):
+            asyncio.run(mover.run_async(interval=60, duration=1, on_start=on_start, **kwargs))
+        on_start.assert_not_called()
+
+    def test_idle_threshold_skips_in_executor(self):
+        ctrl = make_controller()
+        on_skip = Mock()
+        mover = AsyncMouseMover(controller=ctrl, idle_func=lambda: 1.0)
+
+        asyncio.run(mover.run_async(interval=0.01, duration=0.015, idle_threshold=30, on_skip=on_skip))
+
+        assert on_skip.call_count >= 1
+        ctrl.move_to.assert_not_called()
+
+    def test_inhibitor_stays_on_one_thread_off_the_loop(self):
+        threads = []
+
+        class ThreadInhibitor(Inhibitor):
+            name = "thread"
+
+            def acquire(self):
+                threads.append(threading.get_ident())
+                return True
+
+            def valid(self):
+                threads.append(threading.get_ident())
+                return True
+
+            def release(self):
+                threads.append(threading.get_ident())
+
+        mover = AsyncMouseMover(controller=make_controller(), inhibitors=[ThreadInhibitor()])
+
+        async def scenario():
+            await mover.run_async(interval=0.01, duration=0.05, method="inhibit")
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(scenario())
+
+        assert len(threads) >= 3
+        assert len(set(threads)) == 1 and threads[0] != loop_thread
@@ -0,0 +1,135 @@
+"""
+Tests for mouse_keepalive.backends module
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive import backends  # noqa: E402
+from mouse_keepalive.backends import (  # noqa: E402
+    IDLE,
+    KEYS,
+    RELATIVE,
+    NullController,
+    XdotoolController,
+    close_controllers,
+    detect_backend,
+    get_backend,
+    get_controller,
+    register_backend,
+    reopen_controller,
+)
+from mouse_keepalive.move_mouse import MouseMover, MousePosition, ScreenSize  # noqa: E402
+
+
+@pytest.fixture
+def registry():
+    """测试期间隔离注册表和实例缓存 / Isolate the registry and instance cache during a test"""
+    with patch.dict(backends._registry), patch.object(backends, "AUTO_ORDER", []), patch.dict(backends._instances):
+        yield
+
+
+class TestRegistry:
+    def test_builtin_capabilities(self):
+        assert {RELATIVE, KEYS, IDLE} <= get_backend("xlib").capabilities
+        assert IDLE not in get_backend("xdotool").capabilities
+        with pytest.raises(ValueError):
+            get_backend("nope")
+
+    def test_detect_uses_auto_order(self, registry):
+        register_backend("slow", NullController, probe=lambda display: True)
+        register_backend("fast", NullController, probe=lambda display: False)
+        register_backend("broken", NullController, probe=MagicMock(side_effect=OSError))
+        backends.AUTO_ORDER[:] = ["broken", "fast", "slow"]
+
+        assert detect_backend() == "slow"
+        backends.AUTO_ORDER[:] = ["fast"]
+        assert detect_backend() is None
+        with pytest.raises(ValueError):
+            get_controller("auto")
+
+    def test_wayland_session_prefers_uinput(self, registry, monkeypatch):
+        register_backend("xlib", NullController, probe=lambda display: True)
+        register_backend("uinput", NullController, probe=lambda display: True)
+        backends.AUTO_ORDER[:] = ["xlib", "uinput"]
+        monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+        monkeypatch.delenv("XDG_SESSION_TYPE", raising=False)
+        assert detect_backend() == "xlib"
+
+        monkeypatch.setenv("XDG_SESSION_TYPE", "wayland")
+        assert detect_backend() == "uinput"
+        # 指定的 X 显示仍然使用 X 后端 / An explicit X display still uses an X backend
+        assert detect_backend(":1") == "xlib"
+        assert backends.AUTO_ORDER == ["xlib", "uinput"]
+
+    def test_controllers_are_shared_and_closed(self, registry):
+        factory = MagicMock(side_effect=lambda display: MagicMock())
+        register_backend("fake", factory)
+
+        first = get_controller("fake", ":1")
+        assert get_controller("fake", ":1") is first
+        assert get_controller("fake", ":2") is not first
+        assert factory.call_count == 2
+
+        close_controllers()
+        first.close.assert_called_once_with()
+        assert backends._instances == {}
+
+    def test_reopen_drops_the_shared_instance_without_closing_it(self, registry):
+        register_backend("fake", lambda display: MagicMock())
+
+        stuck = get_controller("fake")
+        fresh = reopen_controller("fake")
+        assert fresh is not stuck
+        assert get_controller("fake") is fresh
+        stuck.close.assert_not_called()
+
+    def test_null_backend_runs_zero_tween(self):
+        mover = MouseMover(controller=NullController(), print_func=lambda message: None, move_duration=0)
+        assert mover.perform_move(0)[1:] == (1, True)
+        assert mover.last_tick_calls["jiggle"] == 1
+
+
+class TestXdotoolController:
+    def run_with(self, stdout):
+        return patch.object(
+            subprocess, "run", return_value=subprocess.CompletedProcess([], 0, stdout=stdout, stderr="")
+        )
+
+    def test_queries(self):
+        ctrl = XdotoolController(":5")
+        with self.run_with("X=10\nY=20\nSCREEN=0\nWINDOW=1\n") as run:
+            assert ctrl.get_position() == MousePosition(10, 20)
+        assert run.call_args.kwargs["env"]["DISPLAY"] == ":5"
+
+        with self.run_with("1920 1080\n"):
+            assert ctrl.get_screen_size() == ScreenSize(1920, 1080)
+
+    def test_jiggle_and_key_use_one_process_each(self):
+        ctrl = XdotoolController()
+        with self.run_with("") as run:
+            ctrl.jiggle(25, -25)
+            ctrl.press_key("shift")
+
+        assert [call.args[0] for call in run.call_args_list] == [
+            ["xdotool", "mousemove_relative", "--", "25", "-25", "mousemove_relative", "--", "-25", "25"],
+            ["xdotool", "key", "Shift_L"],
+        ]
+        assert run.call_args.kwargs["env"] is None
+
+    def test_move_path_uses_one_process(self):
+        ctrl = XdotoolController()
+        with self.run_with("") as run:
+            ctrl.move_path([3, 4, -3, -4])
+
+        run.assert_called_once()
+        assert run.call_args.args[0] == [
+            "xdotool", "mousemove_relative", "--", "3", "4", "mousemove_relative", "--", "-3", "-4"
+        ]
@@ -0,0 +1,46 @@
+"""
+Tests for mouse_keepalive.benchmark module
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive import benchmark  # noqa: E402
+
+BENCHMARKS = {
+    "calculate_next_position",
+    "perform_move",
+    "perform_move_zero_tween",
+    "perform_move_pattern",
+    "perform_key_press",
+    "callback_format",
+    "run_iteration",
+}
+
+
+class TestBenchmark:
+    def test_run_benchmarks_with_fake_controller(self):
+        results = benchmark.run_benchmarks(iterations=5)
+
+        assert set(results) == BENCHMARKS
+        for stats in results.values():
+            assert stats["iterations"] == 5
+            assert 0 <= stats["min_ns"] <= stats["median_ns"] <= stats["p95_ns"] <= stats["max_ns"]
+            assert stats["alloc_bytes_per_call"] >= 0
+        assert results["perform_move"]["backend_calls_per_tick"] == {"get_position": 1, "move_to": 2}
+        assert results["perform_move_pattern"]["backend_calls_per_tick"] == {"get_position": 1, "move_path": 1}
+
+    def test_main_writes_json(self, tmp_path, capsys):
+        output = tmp_path / "bench.json"
+        with patch.object(benchmark, "_package_version", return_value="0.0.0"):
+            benchmark.main(["-n", "3", "-o", str(output)])
+
+        report = json.loads(output.read_text())
+        assert report["backend"] == "fake"
+        assert set(report["results"]) == BENCHMARKS
+        assert json.loads(capsys.readouterr().out) == report
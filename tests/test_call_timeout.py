@@ -0,0 +1,213 @@
+"""
+Tests for mouse_keepalive.call_timeout module
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.call_timeout import CallTimeout, CallWorker  # noqa: E402
+from mouse_keepalive.metrics import Metrics  # noqa: E402
+from mouse_keepalive.move_mouse import MouseController, MouseMover, MousePosition, ScreenSize  # noqa: E402
+
+
+class TestCallWorker:
+    def test_returns_results_and_raises_errors(self):
+        worker = CallWorker()
+        try:
+            assert worker.call(1, lambda a, b=0: a + b, 1, b=2) == 3
+            with pytest.raises(OSError):
+                worker.call(1, Mock(side_effect=OSError("gone")))
+        finally:
+            worker.close()
+
+    def test_calls_run_on_one_thread(self):
+        worker = CallWorker()
+        try:
+            threads = {worker.call(1, threading.get_ident) for _ in range(5)}
+            assert len(threads) == 1
+            assert threads != {threading.get_ident()}
+        finally:
+            worker.close()
+
+    def test_hung_call_blocks_further_calls_until_it_returns(self):
+        release = threading.Event()
+        worker = CallWorker()
+        try:
+            thread = worker.call(1, threading.get_ident)
+            started = time.monotonic()
+            with pytest.raises(CallTimeout):
+                worker.call(0.05, release.wait)
+            assert time.monotonic() - started < 1
+            assert worker.stuck
+            # 卡住期间不从另一个线程调用同一个后端 / No call reaches the backend from another thread meanwhile
+            called = Mock()
+            with pytest.raises(CallTimeout, match="has not returned"):
+                worker.call(0.05, called)
+            called.assert_not_called()
+
+            release.set()
+            assert worker.call(1, threading.get_ident) == thread
+            assert not worker.stuck
+            assert worker.abandoned == 0
+        finally:
+            release.set()
+            worker.close()
+
+    def test_abandon_moves_to_a_fresh_thread(self):
+        release = threading.Event()
+        worker = CallWorker()
+        try:
+            thread = worker.call(1, threading.get_ident)
+            with pytest.raises(CallTimeout):
+                worker.call(0.05, release.wait)
+
+            worker.abandon()
+
+            assert worker.abandoned == 1
+            assert worker.call(1, threading.get_ident) != thread
+        finally:
+            release.set()
+            worker.close()
+
+
+class HangingController:
+    """get_position 卡住直到 release 被设置 / get_position hangs until release is set"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def get_position(self):
+        self.release.wait()
+        return MousePosition(100, 200)
+
+    def get_screen_size(self):
+        return ScreenSize(1920, 1080)
+
+    def move_to(self, x, y, duration=0.1):
+        pass
+
+
+def healthy_controller():
+    controller = Mock(spec=MouseController)
+    controller.get_position.return_value = MousePosition(100, 200)
+    controller.get_screen_size.return_value = ScreenSize(1920, 1080)
+    return controller
+
+
+class TestMoverTimeouts:
+    def test_timeout_counts_as_failure_and_backs_off(self):
+        hanging = HangingController()
+        now = [0.0]
+        metrics = Metrics()
+        mover = MouseMover(
+            controller=hanging,
+            print_func=lambda *args: None,
+            monotonic_func=lambda: now[0],
+            metrics=metrics,
+            call_timeout=0.05,
+        )
+        try:
+            assert mover.perform_move(0)[1:] == (0, False)
+            assert mover.stalls == 1
+            assert mover.call_timeouts["get_position"] == 1
+            assert 'mouse_keepalive_call_timeouts_total{call="get_position"} 1' in metrics.render()
+
+            # 退避期内不调用后端 / No backend calls during the backoff
+            started = time.monotonic()
+            assert mover.perform_move(0)[1:] == (0, False)
+            assert time.monotonic() - started < 0.04
+            assert mover.stalls == 1
+
+            now[0] = 1.0
+            hanging.release.set()
+            assert mover.perform_move(0)[1:] == (1, True)
+            assert mover.stalls == 0
+        finally:
+            hanging.release.set()
+
+    def test_reconnects_after_repeated_stalls(self):
+        hanging = HangingController()
+        fresh = healthy_controller()
+        reconnect = MagicMock(return_value=fresh)
+        now = [0.0]
+        mover = MouseMover(
+            controller=hanging,
+            print_func=lambda *args: None,
+            monotonic_func=lambda: now[0],
+            call_timeout=0.02,
+            reconnect=reconnect,
+            reconnect_after=2,
+        )
+        try:
+            mover.perform_move(0)
+            now[0] += 100
+            mover.perform_move(0)
+            reconnect.assert_called_once_with()
+            assert mover.controller is fresh
+
+            now[0] += 1000
+            assert mover.perform_move(0)[1:] == (1, True)
+        finally:
+            hanging.release.set()
+
+    def test_backoff_grows_and_is_capped(self):
+        hanging = HangingController()
+        now = [0.0]
+        mover = MouseMover(
+            controller=hanging,
+            print_func=lambda *args: None,
+            monotonic_func=lambda: now[0],
+            call_timeout=0.01,
+            max_backoff=0.03,
+        )
+        try:
+            backoffs = []
+            for _ in range(4):
+                mover.perform_move(0)
+                backoffs.append(round(mover._backoff_until - now[0], 3))
+                now[0] += 10
+            assert backoffs == [0.01, 0.02, 0.03, 0.03]
+        finally:
+            hanging.release.set()
+
+    def test_tweened_moves_get_their_duration_on_top(self):
+        controller = healthy_controller()
+        controller.move_to.side_effect = lambda x, y, duration: time.sleep(duration)
+        mover = MouseMover(controller=controller, print_func=lambda *args: None, move_duration=0.1, call_timeout=0.05)
+        assert mover.perform_move(0)[1:] == (1, True)
+
+    def test_inhibitor_is_released_on_the_thread_that_acquired_it(self):
+        threads = {}
+
+        class ThreadBoundInhibitor:
+            name = "thread-bound"
+
+            def acquire(self):
+                threads["acquire"] = threading.get_ident()
+                return True
+
+            def valid(self):
+                return True
+
+            def release(self):
+                threads["release"] = threading.get_ident()
+
+        mover = MouseMover(
+            controller=healthy_controller(),
+            print_func=lambda *args: None,
+            call_timeout=1,
+            inhibitors=[ThreadBoundInhibitor()],
+        )
+        mover.perform_inhibit(0)
+        mover.release_inhibitor()
+
+        assert threads["acquire"] == threads["release"] != threading.get_ident()
+        mover._worker.close()
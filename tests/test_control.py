@@ -0,0 +1,245 @@
+"""
+Tests for mouse_keepalive.control module
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.control import Control, ControlServer, default_address, send_command, token_path  # noqa: E402
+from mouse_keepalive.simulation import RecordingController, VirtualClock  # noqa: E402
+from mouse_keepalive.move_mouse import MouseMover  # noqa: E402
+
+
+class TestControl:
+    def test_commands_update_state(self):
+        changes = []
+        control = Control(on_change=lambda command, value: changes.append((command, value)))
+
+        assert control.handle("pause\n") == "ok paused"
+        assert control.paused
+        assert control.handle("resume") == "ok running"
+        assert not control.paused
+        assert control.handle("set-interval 30") == "ok interval 30"
+        assert control.interval == 30
+        assert control.handle("set-method keyboard") == "ok method keyboard"
+        assert control.method == "keyboard"
+        assert control.handle("stop") == "ok stopping"
+        assert control.stopped
+        assert changes == [
+            ("pause", True),
+            ("resume", False),
+            ("set-interval", 30.0),
+            ("set-method", "keyboard"),
+            ("stop", True),
+        ]
+
+    def test_invalid_commands(self):
+        control = Control()
+        assert control.handle("") == "error empty command"
+        assert control.handle("reboot").startswith("error unknown command")
+        assert control.handle("set-interval soon").startswith("error")
+        assert control.handle("set-interval 0").startswith("error")
+        assert control.handle("set-interval 0.5").startswith("error")
+        assert control.handle("set-method telepathy").startswith("error")
+        assert control.interval is None and control.method is None
+
+    @pytest.mark.parametrize("value", ["nan", "inf", "-inf"])
+    def test_non_finite_interval_is_rejected(self, value):
+        control = Control()
+
+        assert control.handle(f"set-interval {value}").startswith("error")
+        assert control.interval is None
+
+    def test_sleep_survives_rejected_intervals(self):
+        control = Control()
+        control.handle("set-interval inf")
+        control.handle("set-interval nan")
+        started = time.monotonic()
+
+        control.sleep(0.05)
+
+        assert 0.05 <= time.monotonic() - started < 5
+
+    def test_stats_is_json(self):
+        control = Control()
+        control.record(moves=3, skips=1)
+        reply = control.handle("stats")
+        assert reply.startswith("ok ")
+        stats = json.loads(reply[3:])
+        assert stats == {"paused": False, "interval": None, "method": None, "moves": 3, "skips": 1}
+
+
+class TestInterruptibleSleep:
+    def test_stop_wakes_sleep(self):
+        control = Control()
+        threading.Timer(0.05, control.stop).start()
+        started = time.monotonic()
+        control.sleep(10)
+        assert time.monotonic() - started < 5
+
+    def test_shorter_interval_shortens_sleep(self):
+        control = Control()
+        threading.Timer(0.05, control.set_interval, args=(1,)).start()
+        started = time.monotonic()
+        control.sleep(10)
+        assert 0.99 <= time.monotonic() - started < 5
+
+    def test_pause_does_not_wake_sleep(self):
+        control = Control()
+        threading.Timer(0.02, control.pause).start()
+        started = time.monotonic()
+        control.sleep(0.15)
+        assert time.monotonic() - started >= 0.15
+
+
+class TestControlServer:
+    def test_unix_socket_round_trip(self, tmp_path):
+        control = Control()
+        address = f"unix:{tmp_path / 'control.sock'}"
+        server = ControlServer(control, address).start()
+        try:
+            assert (tmp_path / "control.sock").stat().st_mode & 0o077 == 0
+            assert send_command("pause", address) == "ok paused"
+            assert control.paused
+            assert json.loads(send_command("stats", address)[3:])["paused"] is True
+        finally:
+            server.close()
+        assert not (tmp_path / "control.sock").exists()
+
+    def test_tcp_round_trip(self):
+        control = Control()
+        server = ControlServer(control, "127.0.0.1:0").start()
+        try:
+            host, port = server.server_address
+            assert send_command("set-method inhibit", f"{host}:{port}") == "ok method inhibit"
+        finally:
+            server.close()
+
+    def test_tcp_requires_the_token(self):
+        control = Control()
+        server = ControlServer(control, "127.0.0.1:0").start()
+        host, port = server.server_address
+        path = Path(token_path(port))
+        try:
+            if sys.platform != "win32":
+                assert path.stat().st_mode & 0o077 == 0
+            for first_line in (b"pause\n", b"auth wrong\n"):
+                with socket.create_connection((host, port), timeout=2) as sock:
+                    sock.sendall(first_line + b"pause\n")
+                    assert sock.makefile("rb").read() == b"error unauthorized\n"
+            assert not control.paused
+
+            path.write_text("0" * 32 + "\n")
+            assert send_command("pause", f"{host}:{port}") == "error unauthorized"
+            assert not control.paused
+        finally:
+            server.close()
+        assert not path.exists()
+
+    def test_refuses_a_socket_that_is_in_use(self, tmp_path):
+        address = f"unix:{tmp_path / 'control.sock'}"
+        first = ControlServer(Control(), address).start()
+        try:
+            with pytest.raises(OSError):
+                ControlServer(Control(), address).start()
+            assert send_command("pause", address) == "ok paused"
+        finally:
+            first.close()
+
+    def test_replaces_a_stale_socket(self, tmp_path):
+        path = tmp_path / "control.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(str(path))
+        server = ControlServer(Control(), f"unix:{path}").start()
+        try:
+            assert send_command("stats", f"unix:{path}").startswith("ok")
+        finally:
+            server.close()
+
+    def test_does_not_delete_other_files(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("keep")
+
+        with pytest.raises(OSError):
+            ControlServer(Control(), f"unix:{path}").start()
+        assert path.read_text() == "keep"
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Unix socket")
+    def test_default_address_is_per_display(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+        monkeypatch.setenv("DISPLAY", ":0")
+        first = default_address()
+        monkeypatch.setenv("DISPLAY", ":1")
+
+        assert first != default_address()
+        assert first.startswith(f"unix:{tmp_path}")
+
+    def test_send_command_without_server(self, tmp_path):
+        with pytest.raises(OSError):
+            send_command("stats", f"unix:{tmp_path / 'missing.sock'}")
+
+
+class TestRunWithControl:
+    def test_pause_set_method_and_stop(self):
+        clock = VirtualClock()
+        control = Control()
+        controller = RecordingController(clock)
+        script = {2: control.pause, 4: control.resume, 5: lambda: control.set_method("keyboard"), 7: control.stop}
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock.sleep(seconds)
+            script.get(len(sleeps), lambda: None)()
+
+        finished = []
+        mover = MouseMover(
+            controller=controller,
+            time_func=clock.time,
+            sleep_func=sleep,
+            monotonic_func=clock.monotonic,
+            print_func=lambda *args: None,
+            move_duration=0,
+            control=control,
+        )
+        move_count, _ = mover.run(interval=60, on_finish=lambda count, elapsed: finished.append(count))
+
+        kinds = [event.kind for event in controller.events]
+        # tick 0、1 移动；2、3 暂停；4 移动；5、6 按键；7 前停止 / Ticks 0, 1 move; 2, 3 paused; 4 moves;
+        # 5, 6 press keys; stopped before 7
+        assert kinds == ["jiggle", "jiggle", "jiggle", "press_key", "press_key"]
+        assert move_count == 5
+        assert finished == [5]
+        assert control.stats()["skips"] == 2
+
+    def test_set_interval_applies_in_deadline_mode(self):
+        clock = VirtualClock()
+        control = Control()
+        controller = RecordingController(clock)
+
+        def sleep(seconds):
+            clock.sleep(seconds)
+            if clock.monotonic() >= 120:
+                control.set_interval(10)
+
+        mover = MouseMover(
+            controller=controller,
+            time_func=clock.time,
+            sleep_func=sleep,
+            monotonic_func=clock.monotonic,
+            move_duration=0,
+            control=control,
+        )
+        mover.run(interval=60, duration=150, scheduler="deadline")
+
+        assert [event.at for event in controller.events] == [0, 60, 120, 130, 140, 150]
@@ -0,0 +1,124 @@
+"""
+Tests for mouse_keepalive.daemon module
+"""
+
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.control import Control  # noqa: E402
+from mouse_keepalive.daemon import Daemon, install_signal_handlers, notify, watchdog_interval  # noqa: E402
+from mouse_keepalive.move_mouse import MouseMover  # noqa: E402
+from mouse_keepalive.simulation import RecordingController, VirtualClock  # noqa: E402
+
+
+class TestNotify:
+    def test_sends_datagram(self, tmp_path):
+        path = str(tmp_path / "notify")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as server:
+            server.bind(path)
+            assert notify("READY=1", path)
+            assert server.recv(1024) == b"READY=1"
+
+    def test_abstract_address(self):
+        name = f"mouse-keepalive-test-{os.getpid()}"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as server:
+            server.bind("\0" + name)
+            assert notify("STATUS=ok", "@" + name)
+            assert server.recv(1024) == b"STATUS=ok"
+
+    def test_without_systemd(self, monkeypatch):
+        monkeypatch.delenv("NOTIFY_SOCKET", raising=False)
+        assert not notify("READY=1")
+
+
+class TestWatchdogInterval:
+    def test_reads_watchdog_usec(self, monkeypatch):
+        monkeypatch.setenv("WATCHDOG_USEC", "30000000")
+        monkeypatch.delenv("WATCHDOG_PID", raising=False)
+        assert watchdog_interval() == 30
+
+    def test_ignores_other_pid(self, monkeypatch):
+        monkeypatch.setenv("WATCHDOG_USEC", "30000000")
+        monkeypatch.setenv("WATCHDOG_PID", str(os.getpid() + 1))
+        assert watchdog_interval() is None
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.delenv("WATCHDOG_USEC", raising=False)
+        assert watchdog_interval() is None
+
+
+class TestDaemon:
+    def test_watchdog_follows_tick_progress(self):
+        now = [0.0]
+        sent = []
+        control = Control()
+        daemon = Daemon(control, notify_func=sent.append, monotonic_func=lambda: now[0], watchdog=20, grace=5)
+
+        control.record(successes=1, skips=0, current_interval=60)
+        now[0] = 30
+        assert daemon.check()
+        assert sent[-1] == "WATCHDOG=1\nSTATUS=running, 1 ticks, 0 skipped"
+
+        # 被跳过的 tick 也算健康 / Skipped ticks count as healthy too
+        now[0] = 90
+        control.record(successes=1, skips=1, current_interval=60)
+        assert daemon.check()
+
+        # 之后的 tick 全部失败或卡住 / Every later tick fails or hangs
+        now[0] = 150
+        assert daemon.check()
+        now[0] = 156
+        assert not daemon.check()
+        assert sent[-1] == "STATUS=running, 1 ticks, 1 skipped"
+
+        now[0] = 160
+        control.record(successes=2, skips=1, current_interval=60)
+        assert daemon.check()
+
+    def test_start_and_close_notifications(self):
+        sent = []
+        daemon = Daemon(Control(), notify_func=sent.append, watchdog=None).start()
+        daemon.close()
+        assert sent[0].startswith("READY=1\n")
+        assert sent[-1] == "STOPPING=1"
+
+
+class TestSignals:
+    @pytest.fixture
+    def restore_sigusr1(self):
+        previous = signal.getsignal(signal.SIGUSR1)
+        yield
+        signal.signal(signal.SIGUSR1, previous)
+
+    def test_signal_stops_after_the_current_tick(self, restore_sigusr1):
+        control = Control()
+        install_signal_handlers(control, [signal.SIGUSR1])
+        clock = VirtualClock()
+        controller = RecordingController(clock)
+        finished = []
+
+        mover = MouseMover(
+            controller=controller,
+            sleep_func=control.sleep,
+            print_func=lambda *args: None,
+            move_duration=0,
+            control=control,
+        )
+        threading.Timer(0.1, os.kill, args=(os.getpid(), signal.SIGUSR1)).start()
+        started = time.monotonic()
+        move_count, _ = mover.run(interval=30, on_finish=lambda count, elapsed: finished.append(count))
+
+        assert time.monotonic() - started < 10
+        assert control.stopped
+        assert move_count == 1
+        assert finished == [1]
@@ -0,0 +1,76 @@
+"""
+Tests for mouse_keepalive.dbus module
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.dbus import (  # noqa: E402
+    BUS_NAME,
+    BUS_PATH,
+    DESTINATION,
+    MEMBER,
+    METHOD_CALL,
+    PATH,
+    SIGNAL,
+    SIGNATURE,
+    Message,
+    _socket_path,
+    decode_message,
+    encode_message,
+    message_size,
+)
+
+
+class TestCodec:
+    def test_round_trip(self):
+        fields = {PATH: "/org/freedesktop/ScreenSaver", MEMBER: "Inhibit", DESTINATION: "org.freedesktop.ScreenSaver"}
+        data = encode_message(Message(METHOD_CALL, 7, fields, ["mouse-keepalive", "why", 42, True]), "ssub")
+
+        assert len(data) == message_size(data[:16])
+        message = decode_message(data)
+        assert (message.type, message.serial) == (METHOD_CALL, 7)
+        assert message.fields == {**fields, SIGNATURE: "ssub"}
+        assert message.body == ["mouse-keepalive", "why", 42, True]
+
+    def test_header_is_padded_to_eight_bytes(self):
+        data = encode_message(Message(METHOD_CALL, 1, {PATH: "/a", MEMBER: "Hello"}))
+        assert len(data) % 8 == 0
+        assert decode_message(data).body == []
+
+    def test_header_only_skips_unsupported_bodies(self):
+        data = encode_message(Message(SIGNAL, 3, {PATH: "/a", MEMBER: "Changed", SIGNATURE: "a{sv}"}))
+
+        assert decode_message(data, body=False).fields[MEMBER] == "Changed"
+        with pytest.raises(ValueError):
+            decode_message(data)
+
+    def test_socket_path(self):
+        assert _socket_path("unix:path=/run/user/1000/bus") == "/run/user/1000/bus"
+        assert _socket_path("tcp:host=x;unix:abstract=/tmp/dbus-1,guid=00") == "\0/tmp/dbus-1"
+        with pytest.raises(OSError):
+            _socket_path("tcp:host=localhost,port=1")
+
+
+@pytest.mark.skipif(shutil.which("dbus-run-session") is None, reason="dbus-daemon not installed")
+def test_real_session_bus():
+    script = (
+        "from mouse_keepalive.dbus import Connection\n"
+        "c = Connection()\n"
+        f"print(c.call({BUS_NAME!r}, {BUS_PATH!r}, {BUS_NAME!r}, 'GetNameOwner', 's', [{BUS_NAME!r}])[0])"
+    )
+    result = subprocess.run(
+        ["dbus-run-session", "--", sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        cwd=str(project_root),
+    )
+    assert result.stdout.strip() == BUS_NAME
@@ -0,0 +1,152 @@
+"""
+Tests for mouse_keepalive.idle module
+"""
+
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive import idle  # noqa: E402
+from mouse_keepalive.idle import (  # noqa: E402
+    EvdevIdleSource,
+    IdleSource,
+    MacOSIdleSource,
+    ProcInterruptsIdleSource,
+    XScreenSaverIdleSource,
+)
+
+INTERRUPTS = """           CPU0       CPU1
+   1:        {kbd}          0   IO-APIC    1-edge      i8042
+   8:          0          0   IO-APIC    8-edge      rtc0
+  12:        {mouse}         3   IO-APIC   12-edge      i8042
+ LOC:     {timer}     {timer}   Local timer interrupts
+"""
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def input_event(timestamp):
+    sec = int(timestamp)
+    return struct.pack("llHHi", sec, int((timestamp - sec) * 1e6), 1, 42, 1)
+
+
+def write_interrupts(path, kbd=10, mouse=20, timer=1000):
+    path.write_text(INTERRUPTS.format(kbd=kbd, mouse=mouse, timer=timer))
+
+
+class TestProcInterruptsIdleSource:
+    def test_idle_grows_until_input_irq_changes(self, tmp_path):
+        path = tmp_path / "interrupts"
+        write_interrupts(path)
+        clock = FakeClock(100.0)
+        source = ProcInterruptsIdleSource(str(path), clock=clock)
+
+        assert source.idle_seconds() == 0.0
+
+        # 只有非输入设备中断变化 / Only non-input IRQs change
+        clock.now = 130.0
+        write_interrupts(path, timer=5000)
+        assert source.idle_seconds() == 30.0
+
+        clock.now = 140.0
+        write_interrupts(path, kbd=11, timer=6000)
+        assert source.idle_seconds() == 0.0
+
+        clock.now = 145.0
+        assert source.idle_seconds() == 5.0
+
+    def test_missing_file_returns_none(self, tmp_path):
+        source = ProcInterruptsIdleSource(str(tmp_path / "missing"))
+        assert source.idle_seconds() is None
+
+
+class TestEvdevIdleSource:
+    def test_reads_reset_idle(self, tmp_path):
+        fifo = tmp_path / "event0"
+        os.mkfifo(fifo)
+        clock = FakeClock(0.0)
+        source = EvdevIdleSource([str(fifo)], clock=clock)
+        writer = os.open(fifo, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            assert source.available
+            clock.now = 20.0
+            assert source.idle_seconds() == 20.0
+
+            os.write(writer, input_event(time.time()))
+            clock.now = 25.0
+            assert source.idle_seconds() == pytest.approx(0.0, abs=0.5)
+        finally:
+            os.close(writer)
+            source.close()
+
+    def test_idle_counts_from_the_last_event_timestamp(self, tmp_path):
+        fifo = tmp_path / "event0"
+        os.mkfifo(fifo)
+        clock = FakeClock(0.0)
+        source = EvdevIdleSource([str(fifo)], clock=clock)
+        writer = os.open(fifo, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            # 一次读到的多个事件中，最后一个决定空闲时间 / Of several events in one read, the last one counts
+            now = time.time()
+            os.write(writer, input_event(now - 30) + input_event(now - 7))
+            clock.now = 40.0
+            assert source.idle_seconds() == pytest.approx(7.0, abs=0.5)
+
+            # 比已知活动更早的事件不会让空闲时间变长 / An event older than known activity does not extend idle
+            os.write(writer, input_event(now - 60))
+            assert source.idle_seconds() == pytest.approx(7.0, abs=0.5)
+        finally:
+            os.close(writer)
+            source.close()
+
+    def test_no_devices_returns_none(self):
+        source = EvdevIdleSource([])
+        assert not source.available
+        assert source.idle_seconds() is None
+
+
+class TestDefaultIdleSource:
+    def test_unsupported_platform_returns_none(self):
+        with patch.object(idle.sys, "platform", "sunos5"):
+            assert type(idle.default_idle_source()) is IdleSource
+
+    def test_macos_uses_quartz(self):
+        with patch.object(idle.sys, "platform", "darwin"):
+            assert isinstance(idle.default_idle_source(), MacOSIdleSource)
+
+    def test_macos_source_without_framework_returns_none(self):
+        source = MacOSIdleSource()
+        with patch.object(MacOSIdleSource, "_load", return_value=False):
+            assert source.idle_seconds() is None
+
+    def test_linux_prefers_xscreensaver(self):
+        with patch.object(idle.sys, "platform", "linux"), patch.dict(os.environ, {"DISPLAY": ":0"}), patch.object(
+            XScreenSaverIdleSource, "idle_seconds", return_value=12.0
+        ):
+            assert isinstance(idle.default_idle_source(), XScreenSaverIdleSource)
+
+    def test_get_system_idle_seconds_caches_source(self):
+        class Source(IdleSource):
+            def idle_seconds(self):
+                return 7.0
+
+        with patch.object(idle, "_default_source", None), patch.object(
+            idle, "default_idle_source", return_value=Source()
+        ) as factory:
+            assert idle.get_system_idle_seconds() == 7.0
+            assert idle.get_system_idle_seconds() == 7.0
+            factory.assert_called_once()
@@ -0,0 +1,63 @@
+"""
+Import-time benchmark for mouse_keepalive
+
+Runs ``python -X importtime -c "import mouse_keepalive"`` in a fresh interpreter
+and enforces a startup budget, so that ``--help``/``--version`` and fleet
+launchers never pay pyautogui's import cost.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+# 启动预算（微秒），可通过环境变量覆盖 / Startup budget (microseconds), overridable via environment
+IMPORT_BUDGET_US = int(os.environ.get("MOUSE_KEEPALIVE_IMPORT_BUDGET_MS", "50")) * 1000
+
+# 这些模块不应在 import mouse_keepalive 时被加载 / These must not be loaded by import mouse_keepalive
+HEAVY_MODULES = {"pyautogui", "pymsgbox", "PIL", "Xlib", "importlib.metadata", "argparse"}
+
+
+def _import_profile(statement="import mouse_keepalive"):
+    """
+    在子进程中运行 -X importtime，返回 {模块名: 累计微秒} / Run -X importtime in a subprocess
+
+    Returns:
+        {module: cumulative_us}
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=str(project_root),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+class TestImportTime:
+    def test_import_does_not_load_heavy_modules(self):
+        profile = _import_profile()
+
+        assert "mouse_keepalive" in profile
+        loaded = HEAVY_MODULES.intersection(profile)
+        assert not loaded, f"import mouse_keepalive loaded heavy modules: {sorted(loaded)}"
+
+    def test_import_within_budget(self):
+        # 取多次运行的最小值以减少噪声 / Take the best of several runs to reduce noise
+        best = min(_import_profile()["mouse_keepalive"] for _ in range(3))
+
+        assert best <= IMPORT_BUDGET_US, f"import mouse_keepalive took {best}us (budget {IMPORT_BUDGET_US}us)"
+
+    def test_version_is_resolved_lazily(self):
+        profile = _import_profile("import mouse_keepalive; mouse_keepalive.__version__")
+
+        assert "importlib.metadata" in profile
@@ -0,0 +1,283 @@
+"""
+Tests for mouse_keepalive.inhibit module
+"""
+
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.dbus import (  # noqa: E402
+    DESTINATION,
+    ERROR,
+    ERROR_NAME,
+    MEMBER,
+    METHOD_RETURN,
+    PATH,
+    REPLY_SERIAL,
+    SIGNAL,
+    SIGNATURE,
+    Message,
+    decode_message,
+    encode_message,
+    message_size,
+)
+from mouse_keepalive.inhibit import Inhibitor, ProcessInhibitor, ScreenSaverInhibitor, systemd_inhibitor  # noqa: E402
+from mouse_keepalive.move_mouse import MouseController, MouseMover, MousePosition, ScreenSize  # noqa: E402
+
+
+class FakeSessionBus:
+    """
+    会话总线替身：实现认证、Hello、GetNameOwner 和 ScreenSaver 接口 /
+    Session bus stand-in implementing auth, Hello, GetNameOwner and the ScreenSaver interface
+    """
+
+    def __init__(self, path):
+        self.address = f"unix:path={path}"
+        self.owner = ":1.7"
+        # 在每个回复前发送一个 body 类型不受支持的信号 / Send a signal with an unsupported body type before
+        # every reply
+        self.noisy = False
+        # cookie -> 连接 / cookie -> connection
+        self.inhibits = {}
+        self._cookies = iter(range(100, 1000))
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(path))
+        self._server.listen()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        buffer = b""
+
+        def read(size):
+            nonlocal buffer
+            while len(buffer) < size:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    raise EOFError
+                buffer += chunk
+            data, buffer = buffer[:size], buffer[size:]
+            return data
+
+        def read_line():
+            nonlocal buffer
+            while b"\r\n" not in buffer:
+                buffer += conn.recv(4096)
+            line, _, buffer = buffer.partition(b"\r\n")
+            return line
+
+        try:
+            assert read_line().startswith(b"\0AUTH EXTERNAL ")
+            conn.sendall(b"OK 0123456789abcdef\r\n")
+            assert read_line() == b"BEGIN"
+            while True:
+                prefix = read(16)
+                message = decode_message(prefix + read(message_size(prefix) - 16))
+                signature, body, error = self._handle(conn, message)
+                fields = {REPLY_SERIAL: message.serial, DESTINATION: ":1.1"}
+                if error:
+                    fields[ERROR_NAME] = error
+                if self.noisy:
+                    signal = Message(SIGNAL, 1, {PATH: "/x", MEMBER: "Changed", SIGNATURE: "a{sv}"})
+                    conn.sendall(encode_message(signal))
+                reply = Message(ERROR if error else METHOD_RETURN, 1, fields, body)
+                conn.sendall(encode_message(reply, signature))
+        except (EOFError, OSError):
+            pass
+        finally:
+            # 连接关闭时抑制失效 / Inhibitions die with the connection
+            for cookie in [cookie for cookie, owner in self.inhibits.items() if owner is conn]:
+                del self.inhibits[cookie]
+            conn.close()
+
+    def _handle(self, conn, message):
+        member = message.fields[MEMBER]
+        if member == "Hello":
+            return "s", [":1.1"], None
+        if member == "GetNameOwner":
+            if self.owner is None:
+                return "s", ["no owner"], "org.freedesktop.DBus.Error.NameHasNoOwner"
+            return "s", [self.owner], None
+        if member == "Inhibit" and message.fields[PATH] == "/ScreenSaver":
+            cookie = next(self._cookies)
+            self.inhibits[cookie] = conn
+            return "u", [cookie], None
+        if member == "UnInhibit":
+            self.inhibits.pop(message.body[0], None)
+            return "", [], None
+        return "s", ["unknown method"], "org.freedesktop.DBus.Error.UnknownMethod"
+
+    def close(self):
+        self._server.close()
+
+
+@pytest.fixture
+def bus(tmp_path):
+    fake = FakeSessionBus(tmp_path / "bus")
+    yield fake
+    fake.close()
+
+
+class TestScreenSaverInhibitor:
+    def test_acquire_holds_until_release(self, bus):
+        inhibitor = ScreenSaverInhibitor(bus.address)
+
+        # 第一个路径不存在，回退到 /ScreenSaver / The first path is missing, falls back to /ScreenSaver
+        assert inhibitor.acquire() is True
+        assert len(bus.inhibits) == 1
+        assert inhibitor.valid() is True
+
+        inhibitor.release()
+        assert inhibitor.valid() is False
+        assert bus.inhibits == {}
+
+    def test_unrelated_signals_are_skipped(self, bus):
+        bus.noisy = True
+        inhibitor = ScreenSaverInhibitor(bus.address)
+
+        assert inhibitor.acquire() is True
+        assert inhibitor.valid() is True
+        inhibitor.release()
+
+    def test_service_restart_invalidates(self, bus):
+        inhibitor = ScreenSaverInhibitor(bus.address)
+        assert inhibitor.acquire()
+
+        bus.owner = ":1.8"
+        assert inhibitor.valid() is False
+        inhibitor.release()
+
+    def test_unavailable_without_service(self, bus, tmp_path):
+        bus.owner = None
+        assert ScreenSaverInhibitor(bus.address).acquire() is False
+        assert ScreenSaverInhibitor(f"unix:path={tmp_path / 'missing'}").acquire() is False
+
+
+class TestProcessInhibitor:
+    def test_held_while_process_runs(self):
+        inhibitor = ProcessInhibitor("sleep", [sys.executable, "-c", "import time; time.sleep(30)"])
+        assert inhibitor.acquire() is True
+        assert inhibitor.valid() is True
+
+        inhibitor.release()
+        assert inhibitor.valid() is False
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+    def test_held_child_exits_when_the_owner_is_killed(self, tmp_path):
+        pid_file = tmp_path / "child.pid"
+        child = "import os, sys; open(sys.argv[1], 'w').write(str(os.getpid())); sys.stdin.read()"
+        code = (
+            "import sys, time; sys.path.insert(0, sys.argv[1]);"
+            "from mouse_keepalive.inhibit import ProcessInhibitor;"
+            f"inhibitor = ProcessInhibitor('held', [sys.executable, '-c', {child!r}, sys.argv[2]], hold_stdin=True);"
+            "assert inhibitor.acquire(); print('held', flush=True); time.sleep(30)"
+        )
+        owner = subprocess.Popen(
+            [sys.executable, "-c", code, str(project_root), str(pid_file)], stdout=subprocess.PIPE, text=True
+        )
+        assert owner.stdout.readline().strip() == "held"
+        pid = int(pid_file.read_text())
+
+        owner.kill()
+        owner.wait()
+
+        def alive():
+            try:
+                # 僵尸进程已经退出 / A zombie has already exited
+                return Path(f"/proc/{pid}/stat").read_text().split(")")[-1].split()[0] != "Z"
+            except OSError:
+                return False
+
+        deadline = time.monotonic() + 5
+        while alive():
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+    def test_systemd_inhibitor_is_tied_to_this_process(self):
+        inhibitor = systemd_inhibitor()
+
+        assert inhibitor.hold_stdin
+        assert "--mode=block" in inhibitor.command and inhibitor.command[-1] == "cat"
+
+    def test_immediate_exit_is_failure(self):
+        assert ProcessInhibitor("exit", [sys.executable, "-c", "pass"]).acquire() is False
+        assert ProcessInhibitor("missing", ["mouse-keepalive-no-such-command"]).acquire() is False
+
+
+def make_controller():
+    ctrl = Mock(spec=MouseController)
+    ctrl.get_position.return_value = MousePosition(100, 200)
+    ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+    return ctrl
+
+
+class TestInhibitMethod:
+    def test_run_holds_one_inhibitor_without_input(self):
+        inhibitor = MagicMock(spec=Inhibitor)
+        inhibitor.acquire.return_value = True
+        inhibitor.valid.return_value = True
+        ctrl = make_controller()
+        mover = MouseMover(
+            controller=ctrl,
+            time_func=iter([0, 1, 2, 3, 3]).__next__,
+            sleep_func=Mock(),
+            print_func=Mock(),
+            inhibitors=[inhibitor],
+        )
+
+        move_count, _ = mover.run(interval=1, duration=3, method="inhibit")
+
+        assert move_count == 3
+        inhibitor.acquire.assert_called_once_with()
+        assert inhibitor.valid.call_count == 2
+        inhibitor.release.assert_called_once_with()
+        ctrl.move_to.assert_not_called()
+
+    def test_falls_back_when_unavailable(self):
+        unavailable = MagicMock(spec=Inhibitor)
+        unavailable.acquire.return_value = False
+        ctrl = make_controller()
+        print_func = Mock()
+        mover = MouseMover(
+            controller=ctrl, print_func=print_func, inhibitors=[unavailable], inhibit_fallback="keyboard"
+        )
+
+        assert mover.perform_tick("inhibit", 0)[1:] == (1, True)
+        assert mover.perform_tick("inhibit", 1)[1:] == (2, True)
+
+        # 只尝试一次，之后直接回退 / Tried once, then falls back directly
+        unavailable.acquire.assert_called_once_with()
+        assert ctrl.press_key.call_count == 2
+        assert "falling back to keyboard" in print_func.call_args_list[0].args[0]
+
+    def test_lost_inhibitor_is_reacquired(self):
+        first, second = MagicMock(spec=Inhibitor), MagicMock(spec=Inhibitor)
+        first.acquire.side_effect = [True, False]
+        first.valid.return_value = False
+        second.acquire.return_value = True
+        ctrl = make_controller()
+        mover = MouseMover(controller=ctrl, print_func=Mock(), inhibitors=[first, second])
+
+        mover.perform_tick("inhibit", 0)
+        assert mover.inhibitor is first
+        mover.perform_tick("inhibit", 1)
+
+        first.release.assert_called_once_with()
+        assert mover.inhibitor is second
+        ctrl.move_to.assert_not_called()
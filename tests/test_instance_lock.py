@@ -0,0 +1,220 @@
+"""
+Tests for mouse_keepalive.instance_lock module
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.control import Control, ControlServer  # noqa: E402
+from mouse_keepalive.instance_lock import InstanceLock, session_key, state_dir, stop_owner  # noqa: E402
+
+move_mouse_module = sys.modules["mouse_keepalive.move_mouse"]
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="flock lock file")
+
+
+class TestSessionKey:
+    def test_includes_user_and_display(self, monkeypatch):
+        monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+        monkeypatch.setenv("DISPLAY", ":1")
+        monkeypatch.setattr("getpass.getuser", lambda: "alice")
+        assert session_key() == "alice-_1"
+
+        monkeypatch.setenv("DISPLAY", ":2")
+        assert session_key() == "alice-_2"
+
+
+class TestStateDir:
+    def test_uses_the_runtime_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        assert state_dir() == str(tmp_path)
+
+    def test_falls_back_to_a_private_directory(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        monkeypatch.setattr("tempfile.gettempdir", lambda: str(tmp_path))
+
+        path = state_dir()
+
+        assert path == str(tmp_path / f"mouse-keepalive-{os.getuid()}")
+        assert os.stat(path).st_mode & 0o777 == 0o700
+
+    def test_refuses_a_shared_directory(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        monkeypatch.setattr("tempfile.gettempdir", lambda: str(tmp_path))
+        (tmp_path / f"mouse-keepalive-{os.getuid()}").mkdir(mode=0o777)
+        os.chmod(tmp_path / f"mouse-keepalive-{os.getuid()}", 0o777)
+
+        with pytest.raises(OSError):
+            state_dir()
+
+
+class TestInstanceLock:
+    def test_second_lock_fails_until_release(self, tmp_path):
+        first = InstanceLock("s", str(tmp_path))
+        second = InstanceLock("s", str(tmp_path))
+        assert first.acquire()
+        assert first.acquire()
+        assert not second.acquire()
+
+        info = second.owner()
+        assert info is not None and info["pid"] == __import__("os").getpid()
+        assert info["control"] is None
+
+        first.update(control="unix:/tmp/x.sock")
+        assert second.owner()["control"] == "unix:/tmp/x.sock"
+
+        first.release()
+        first.release()
+        assert second.owner() is None
+        assert second.acquire()
+        second.release()
+
+    def test_does_not_follow_a_planted_symlink(self, tmp_path):
+        target = tmp_path / "victim"
+        target.write_text("keep")
+        (tmp_path / "mouse-keepalive-s.lock").symlink_to(target)
+
+        with pytest.raises(OSError):
+            InstanceLock("s", str(tmp_path)).acquire()
+        assert target.read_text() == "keep"
+
+    def test_other_sessions_are_independent(self, tmp_path):
+        first = InstanceLock("alice-_1", str(tmp_path))
+        second = InstanceLock("alice-_2", str(tmp_path))
+        assert first.acquire() and second.acquire()
+        first.release()
+        second.release()
+
+    def test_lock_is_released_when_the_process_dies(self, tmp_path):
+        code = (
+            "import sys, time; sys.path.insert(0, sys.argv[1]);"
+            "from mouse_keepalive.instance_lock import InstanceLock;"
+            "lock = InstanceLock('s', sys.argv[2]); assert lock.acquire(); print('locked', flush=True); time.sleep(30)"
+        )
+        child = subprocess.Popen(
+            [sys.executable, "-c", code, str(project_root), str(tmp_path)], stdout=subprocess.PIPE, text=True
+        )
+        try:
+            assert child.stdout.readline().strip() == "locked"
+            lock = InstanceLock("s", str(tmp_path))
+            assert not lock.acquire()
+            assert stop_owner(lock.owner())
+            assert lock.wait(5)
+            lock.release()
+        finally:
+            child.kill()
+            child.wait()
+
+    def test_stop_owner_prefers_the_control_channel(self, tmp_path):
+        control = Control()
+        server = ControlServer(control, f"unix:{tmp_path / 'c.sock'}").start()
+        try:
+            assert stop_owner({"pid": -1, "control": server.address})
+            assert control.stopped
+        finally:
+            server.close()
+
+    def test_stop_owner_never_signals_itself(self):
+        import os
+
+        assert not stop_owner({"pid": os.getpid(), "control": None})
+
+
+class TestClaimInstance:
+    @pytest.fixture
+    def runtime_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        return tmp_path
+
+    def test_first_instance_gets_the_lock(self, runtime_dir):
+        lock = move_mouse_module._claim_instance("exit")
+        try:
+            assert lock.held
+        finally:
+            lock.release()
+
+    @patch("builtins.print")
+    def test_unusable_lock_file_is_a_clean_error(self, mock_print, runtime_dir):
+        (runtime_dir / f"mouse-keepalive-{session_key()}.lock").symlink_to(runtime_dir / "elsewhere")
+
+        with pytest.raises(SystemExit) as exc:
+            move_mouse_module._claim_instance("exit")
+
+        assert exc.value.code == 1
+        assert any("Cannot take the session lock" in str(call.args[0]) for call in mock_print.call_args_list)
+
+    @patch("builtins.print")
+    def test_lock_is_released_when_backend_setup_fails(self, mock_print, runtime_dir, monkeypatch):
+        monkeypatch.setattr(sys, "argv", ["mouse-keepalive", "--backend", "null"])
+        with patch("mouse_keepalive.backends.get_controller", side_effect=RuntimeError("no display")):
+            with pytest.raises(RuntimeError):
+                move_mouse_module.main()
+
+        lock = InstanceLock()
+        assert lock.acquire()
+        lock.release()
+
+    @patch("builtins.print")
+    def test_explicit_call_timeout_still_takes_the_lock(self, mock_print, runtime_dir, monkeypatch):
+        monkeypatch.setattr(sys, "argv", ["mouse-keepalive", "--backend", "null", "--call-timeout", "1", "-d", "1"])
+        holder = InstanceLock()
+        assert holder.acquire()
+        try:
+            with pytest.raises(SystemExit) as exc:
+                move_mouse_module.main()
+            assert exc.value.code == 0
+            assert any("Already running" in str(call.args[0]) for call in mock_print.call_args_list)
+        finally:
+            holder.release()
+
+    @patch("builtins.print")
+    def test_exit_policy(self, mock_print, runtime_dir):
+        holder = InstanceLock()
+        assert holder.acquire()
+        try:
+            with pytest.raises(SystemExit) as exc:
+                move_mouse_module._claim_instance("exit")
+            assert exc.value.code == 0
+            assert any("Already running" in str(call.args[0]) for call in mock_print.call_args_list)
+        finally:
+            holder.release()
+
+    @patch("builtins.print")
+    def test_stats_policy_queries_the_control_channel(self, mock_print, runtime_dir):
+        control = Control()
+        control.record(moves=7)
+        server = ControlServer(control, f"unix:{runtime_dir / 'c.sock'}").start()
+        holder = InstanceLock()
+        assert holder.acquire()
+        holder.update(control=server.address)
+        try:
+            with pytest.raises(SystemExit):
+                move_mouse_module._claim_instance("stats")
+            assert '"moves": 7' in mock_print.call_args_list[0].args[0]
+        finally:
+            holder.release()
+            server.close()
+
+    @patch("builtins.print")
+    def test_takeover_policy_stops_the_holder(self, mock_print, runtime_dir):
+        control = Control()
+        server = ControlServer(control, f"unix:{runtime_dir / 'c.sock'}").start()
+        holder = InstanceLock()
+        assert holder.acquire()
+        holder.update(control=server.address)
+        # 旧实例收到 stop 后释放锁 / The old instance releases its lock once told to stop
+        control.on_change = lambda command, value: holder.release()
+        try:
+            lock = move_mouse_module._claim_instance("takeover")
+            assert lock.held
+            lock.release()
+        finally:
+            server.close()
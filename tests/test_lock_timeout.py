@@ -0,0 +1,117 @@
+"""
+Tests for mouse_keepalive.lock_timeout module
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive import lock_timeout  # noqa: E402
+from mouse_keepalive.lock_timeout import AutoInterval, effective_idle_timeout, interval_for  # noqa: E402
+from mouse_keepalive.move_mouse import MouseController, MouseMover, MousePosition, ScreenSize  # noqa: E402
+
+
+class TestIntervalFor:
+    def test_leaves_a_margin_before_the_timeout(self):
+        # 余量至少 5 秒，长超时按 10% / Margin is at least 5s, 10% for long timeouts
+        assert interval_for(30) == 25
+        assert interval_for(60) == 54
+        assert interval_for(300) == 270
+        assert interval_for(600) == 540
+
+    def test_never_below_minimum(self):
+        assert interval_for(6) == 5
+        assert interval_for(6, minimum=1) == 1
+
+    def test_default_without_timeout(self):
+        assert interval_for(None) == 60
+        assert interval_for(None, default=30) == 30
+
+
+class TestReaders:
+    def test_gnome_idle_delay_parses_gsettings(self):
+        with patch.object(lock_timeout, "_command_output", return_value="uint32 300"):
+            assert lock_timeout.gnome_idle_delay() == 300
+        with patch.object(lock_timeout, "_command_output", return_value="uint32 0"):
+            assert lock_timeout.gnome_idle_delay() is None
+        with patch.object(lock_timeout, "_command_output", return_value=None):
+            assert lock_timeout.gnome_idle_delay() is None
+
+    def test_effective_timeout_is_the_shortest_reading(self, monkeypatch):
+        monkeypatch.setattr(sys, "platform", "linux")
+        monkeypatch.setenv("DISPLAY", ":0")
+        monkeypatch.setattr(lock_timeout, "x11_timeout", lambda: 600.0)
+        monkeypatch.setattr(lock_timeout, "gnome_idle_delay", lambda: 300.0)
+        assert effective_idle_timeout() == 300
+
+    def test_effective_timeout_ignores_failing_readers(self, monkeypatch):
+        monkeypatch.setattr(sys, "platform", "linux")
+        monkeypatch.setenv("DISPLAY", ":0")
+        monkeypatch.setattr(lock_timeout, "x11_timeout", Mock(side_effect=OSError))
+        monkeypatch.setattr(lock_timeout, "gnome_idle_delay", lambda: None)
+        assert effective_idle_timeout() is None
+
+
+class TestAutoInterval:
+    def test_rereads_after_refresh_and_reports_changes(self):
+        now = [0.0]
+        reader = Mock(side_effect=[300.0, 120.0])
+        on_change = MagicMock()
+        auto = AutoInterval(reader=reader, refresh=100, monotonic_func=lambda: now[0], on_change=on_change)
+
+        assert auto() == 270
+        now[0] = 99
+        assert auto() == 270
+        assert reader.call_count == 1
+
+        now[0] = 100
+        assert auto() == 108
+        assert reader.call_count == 2
+        assert on_change.call_args_list == [((300.0, 270.0),), ((120.0, 108.0),)]
+
+    def test_reader_error_uses_default(self):
+        auto = AutoInterval(reader=Mock(side_effect=RuntimeError), default=42)
+        assert auto() == 42
+        assert auto.timeout is None
+
+    def test_run_sleeps_for_the_current_interval(self):
+        ctrl = Mock(spec=MouseController)
+        ctrl.get_position.return_value = MousePosition(100, 200)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        intervals = iter([30, 30, 20, 20, 20])
+        mover = MouseMover(controller=ctrl, time_func=lambda: now[0], sleep_func=sleep)
+        mover.run(interval=lambda: next(intervals), duration=60)
+
+        assert sleeps == [30, 20, 20]
+
+    def test_run_deadline_scheduler_follows_interval_changes(self):
+        ctrl = Mock(spec=MouseController)
+        ctrl.get_position.return_value = MousePosition(100, 200)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        intervals = iter([10, 10, 5, 5, 5, 5])
+        mover = MouseMover(controller=ctrl, sleep_func=sleep, monotonic_func=lambda: now[0])
+        mover.run(interval=lambda: next(intervals), duration=20, scheduler="deadline")
+
+        # 第二个 tick 起间隔变为 5 秒 / The interval becomes 5s from the second tick
+        assert sleeps == pytest.approx([10, 5, 5])
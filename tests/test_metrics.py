@@ -0,0 +1,120 @@
+"""
+Tests for mouse_keepalive.metrics module
+"""
+
+import socket
+import sys
+import urllib.request
+from pathlib import Path
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.metrics import Histogram, Metrics, MetricsServer  # noqa: E402
+from mouse_keepalive.move_mouse import MouseController, MouseMover, MousePosition, ScreenSize  # noqa: E402
+
+
+def make_controller():
+    ctrl = Mock(spec=MouseController)
+    ctrl.get_position.return_value = MousePosition(100, 200)
+    ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+    return ctrl
+
+
+class TestHistogram:
+    def test_cumulative_buckets(self):
+        hist = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            hist.observe(value)
+
+        assert hist.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+        assert hist.sum == 3.65
+
+    def test_quantile_is_bucket_upper_bound(self):
+        hist = Histogram(buckets=(0.1, 1.0))
+        assert hist.quantile(0.5) is None
+        for value in (0.05, 0.1, 0.5, 3.0):
+            hist.observe(value)
+
+        assert hist.quantile(0.5) == 0.1
+        assert hist.quantile(0.75) == 1.0
+        assert hist.quantile(1.0) == float("inf")
+
+
+class TestMetrics:
+    def test_run_feeds_metrics(self):
+        ctrl = make_controller()
+        ctrl.press_key.side_effect = [None, RuntimeError("stalled")]
+        metrics = Metrics(clock=lambda: 1700000000.0)
+
+        mover = MouseMover(
+            controller=ctrl,
+            time_func=MagicMock(side_effect=[0, 0.1, 1.1, 1.1]),
+            sleep_func=MagicMock(),
+            print_func=Mock(),
+            metrics=metrics,
+        )
+        mover.run(interval=1, duration=1, method="keyboard")
+
+        text = metrics.render()
+        assert "mouse_keepalive_ticks_total 2" in text
+        assert 'mouse_keepalive_injections_total{method="keyboard",result="success"} 1' in text
+        assert 'mouse_keepalive_injections_total{method="keyboard",result="failure"} 1' in text
+        assert 'mouse_keepalive_call_duration_seconds_count{call="press_key"} 2' in text
+        assert 'mouse_keepalive_call_duration_seconds_count{call="get_position"} 2' in text
+        assert "mouse_keepalive_scheduler_lateness_seconds_count 1" in text
+        assert "mouse_keepalive_last_success_timestamp_seconds 1700000000.0" in text
+
+    def test_skips_are_counted(self):
+        metrics = Metrics()
+        metrics.record_skip()
+        assert "mouse_keepalive_skipped_total 1" in metrics.render()
+
+
+class TestMetricsServer:
+    def test_serves_metrics_over_tcp(self):
+        metrics = Metrics()
+        metrics.record_tick("mouse", True)
+        server = MetricsServer(metrics, "127.0.0.1:0").start()
+        try:
+            host, port = server.server_address
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+                body = response.read().decode()
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        finally:
+            server.close()
+
+        assert "mouse_keepalive_ticks_total 1" in body
+
+    def test_refuses_a_unix_socket_that_is_in_use(self, tmp_path):
+        address = f"unix:{tmp_path / 'metrics.sock'}"
+        first = MetricsServer(Metrics(), address).start()
+        try:
+            with pytest.raises(OSError):
+                MetricsServer(Metrics(), address).start()
+        finally:
+            first.close()
+
+    def test_serves_metrics_over_unix_socket(self, tmp_path):
+        path = tmp_path / "metrics.sock"
+        server = MetricsServer(Metrics(), f"unix:{path}").start()
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(5)
+                client.connect(str(path))
+                client.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+                data = b""
+                while True:
+                    chunk = client.recv(65536)
+                    if not chunk:
+                        break
+                    data += chunk
+        finally:
+            server.close()
+
+        assert data.startswith(b"HTTP/1.0 200")
+        assert b"mouse_keepalive_ticks_total 0" in data
+        assert not path.exists()
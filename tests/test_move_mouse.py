@@ -50,6 +50,65 @@ class TestMouseMoverCore:
         assert success is True
         assert ctrl.move_to.call_count == 2
 
+    def test_zero_move_duration_uses_single_jiggle(self):
+        ctrl = Mock(spec=MouseController)
+        ctrl.get_position.return_value = MousePosition(1910, 200)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+
+        mover = MouseMover(controller=ctrl, move_duration=0)
+        _, next_count, success = mover.perform_move(move_count=0)
+
+        assert (next_count, success) == (1, True)
+        # 右边缘被截断，反向移动仍然精确 / Clamped at the right edge, the inverse stays exact
+        ctrl.jiggle.assert_called_once_with(9, 25)
+        ctrl.move_to.assert_not_called()
+        assert mover.last_tick_calls == {"get_position": 1, "get_screen_size": 1, "jiggle": 1}
+
+    def test_move_duration_is_passed_to_move_to(self):
+        ctrl = Mock(spec=["get_position", "get_screen_size", "move_to", "press_key"])
+        ctrl.get_position.return_value = MousePosition(100, 200)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+
+        # 控制器没有 jiggle() 时回退到 move_to / Falls back to move_to without a jiggle() method
+        MouseMover(controller=ctrl, move_duration=0).perform_move(move_count=0)
+
+        assert [call.kwargs["duration"] for call in ctrl.move_to.call_args_list] == [0, 0]
+
+    def test_screen_size_is_cached_between_ticks(self):
+        ctrl = Mock(spec=MouseController)
+        ctrl.get_position.return_value = MousePosition(100, 200)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+        clock = MagicMock(return_value=0.0)
+
+        mover = MouseMover(controller=ctrl, monotonic_func=clock, screen_size_ttl=10)
+        mover.perform_move(move_count=0)
+        mover.perform_move(move_count=1)
+        assert ctrl.get_screen_size.call_count == 1
+        assert mover.last_tick_calls == {"get_position": 1, "move_to": 2}
+        assert mover.backend_calls == {"get_position": 2, "get_screen_size": 1, "move_to": 4}
+
+        # TTL 过期后重新查询 / Re-query once the TTL expires
+        clock.return_value = 10.0
+        mover.perform_move(move_count=2)
+        assert ctrl.get_screen_size.call_count == 2
+
+        # 显式失效 / Explicit invalidation
+        mover.invalidate_screen_size()
+        mover.perform_move(move_count=3)
+        assert ctrl.get_screen_size.call_count == 3
+
+    def test_screen_changed_hook_invalidates_cache(self):
+        ctrl = Mock()
+        ctrl.get_position.return_value = MousePosition(100, 200)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+        ctrl.screen_changed.side_effect = [False, True]
+
+        mover = MouseMover(controller=ctrl, screen_size_ttl=None)
+        mover.perform_move(move_count=0)
+        mover.perform_move(move_count=1)
+
+        assert ctrl.get_screen_size.call_count == 2
+
     def test_run_interval_and_duration(self):
         ctrl = Mock(spec=MouseController)
         ctrl.get_position.return_value = MousePosition(100, 200)
@@ -89,6 +148,94 @@ class TestMouseMoverCore:
         assert on_move.call_count >= 1
         on_finish.assert_called_once()
 
+    def test_run_deadline_scheduler_sleeps_until_deadline(self):
+        ctrl = Mock(spec=MouseController)
+        ctrl.get_position.return_value = MousePosition(100, 200)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+
+        now = [0.0]
+        sleeps = []
+
+        def monotonic():
+            return now[0]
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        def slow_move(*args, **kwargs):
+            now[0] += 0.1
+
+        ctrl.move_to.side_effect = slow_move
+        wall_clock = MagicMock(side_effect=AssertionError("deadline mode must not use wall time"))
+
+        mover = MouseMover(controller=ctrl, time_func=wall_clock, sleep_func=sleep, monotonic_func=monotonic)
+        move_count, elapsed = mover.run(interval=10, duration=25, scheduler="deadline")
+
+        # tick 在 0、10、20、25 秒开始；每次工作 0.2 秒不会累积 / Ticks start at 0, 10, 20, 25; work does not accumulate
+        assert move_count == 4
+        assert sleeps == pytest.approx([9.8, 9.8, 4.8])
+        assert elapsed == pytest.approx(25.2)
+
+    def test_run_skips_injection_while_user_active(self):
+        ctrl = Mock(spec=MouseController)
+        ctrl.get_position.return_value = MousePosition(100, 200)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+
+        times = [0, 1, 2, 3, 3]
+        idle_values = [5.0, 120.0, None]
+        on_skip = Mock()
+        on_move = Mock()
+
+        mover = MouseMover(
+            controller=ctrl,
+            time_func=MagicMock(side_effect=times),
+            sleep_func=MagicMock(),
+            idle_func=MagicMock(side_effect=idle_values),
+        )
+        move_count, _ = mover.run(interval=1, duration=3, idle_threshold=60, on_move=on_move, on_skip=on_skip)
+
+        # 第一次用户活跃被跳过，之后空闲和未知都会注入 / First tick skipped, idle and unknown both inject
+        on_skip.assert_called_once_with(5.0, 1)
+        assert on_move.call_count == 2
+        assert move_count == 2
+
+
+class TestLazyBackend:
+    def test_missing_pyautogui_raises_import_error(self):
+        with patch.object(move_mouse_module, "_pyautogui", None), patch.dict(sys.modules, {"pyautogui": None}):
+            with pytest.raises(ImportError):
+                move_mouse_module._load_pyautogui()
+
+    def test_controller_loads_backend_on_first_use(self):
+        backend = MagicMock()
+        backend.position.return_value = (3, 4)
+        with patch.object(move_mouse_module, "_pyautogui", backend):
+            assert MouseController().get_position() == MousePosition(3, 4)
+
+    def test_controller_skips_pyautogui_pause(self):
+        backend = MagicMock()
+        with patch.object(move_mouse_module, "_pyautogui", backend):
+            MouseController().jiggle(5, -5)
+            MouseController().press_key()
+
+        assert [call.args for call in backend.moveRel.call_args_list] == [(5, -5), (-5, 5)]
+        assert all(call.kwargs == {"duration": 0, "_pause": False} for call in backend.moveRel.call_args_list)
+        backend.press.assert_called_once_with("shift", _pause=False)
+
+    @patch("builtins.print")
+    def test_main_exits_when_backend_missing(self, mock_print):
+        orig = sys.argv
+        sys.argv = ["mouse-keepalive", "--backend", "pyautogui"]
+        try:
+            with patch.object(move_mouse_module, "_load_pyautogui", side_effect=ImportError("missing")):
+                with pytest.raises(SystemExit):
+                    main()
+        finally:
+            sys.argv = orig
+
+        assert any("pyautogui" in str(call.args[0]) for call in mock_print.call_args_list if call.args)
+
 
 class TestMoveMouseAPI:
     @patch.object(move_mouse_module, "MouseController")
@@ -160,6 +307,14 @@ class TestMainCLI:
 
         mock_move.assert_called_once_with(interval=30, duration=None, verbose=False)
 
+    def test_interval_arg_accepts_auto(self):
+        import argparse
+
+        assert move_mouse_module._interval_arg("auto") == "auto"
+        assert move_mouse_module._interval_arg("30") == 30
+        with pytest.raises(argparse.ArgumentTypeError):
+            move_mouse_module._interval_arg("soon")
+
     @patch.object(move_mouse_module, "move_mouse")
     @patch("builtins.print")
     def test_main_invalid_params_exit(self, mock_print, mock_move_mouse):
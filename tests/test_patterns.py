@@ -0,0 +1,141 @@
+"""
+Tests for mouse_keepalive.patterns module
+"""
+
+import sys
+from array import array
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.move_mouse import MouseMover, MousePosition, ScreenSize  # noqa: E402
+from mouse_keepalive.patterns import PATTERNS, VARIANTS, Pattern, get_pattern  # noqa: E402
+
+
+def pairs(table):
+    return [(table[i], table[i + 1]) for i in range(0, len(table), 2)]
+
+
+class TestGetPattern:
+    @pytest.mark.parametrize("name", PATTERNS)
+    def test_every_path_returns_to_its_start(self, name):
+        pattern = get_pattern(name, seed=1)
+
+        assert len(pattern) == VARIANTS
+        for index in range(VARIANTS):
+            steps = pairs(pattern.steps(index))
+            assert steps
+            assert sum(dx for dx, _ in steps) == 0
+            assert sum(dy for _, dy in steps) == 0
+            assert pairs(pattern.points(index))[-1] == (0, 0)
+
+    @pytest.mark.parametrize("name", PATTERNS)
+    def test_every_step_has_an_opposite_step(self, name):
+        # 指针加速度逐步施加时仍能回到起点 / Per-step pointer acceleration still cancels out
+        pattern = get_pattern(name, seed=2)
+        for index in range(VARIANTS):
+            steps = pairs(pattern.steps(index))
+            assert sorted(steps) == sorted((-dx, -dy) for dx, dy in steps)
+
+    def test_tables_are_compact_arrays(self):
+        pattern = get_pattern("bezier", seed=0)
+
+        assert isinstance(pattern.steps(0), array)
+        assert pattern.steps(0).typecode == "h"
+        # 不平移时直接返回预计算的表，不重新生成 / Without a shift the precomputed table itself is returned
+        assert pattern.steps(3) is pattern.steps(3 + VARIANTS)
+
+    def test_diagonal_matches_default_motion(self):
+        pattern = get_pattern("diagonal")
+
+        assert pairs(pattern.steps(0)) == [(25, 25), (-25, -25)]
+        assert pairs(pattern.steps(1)) == [(-25, -25), (25, 25)]
+
+    def test_micro_moves_one_pixel(self):
+        assert pairs(get_pattern("micro").steps(0)) == [(1, 1), (-1, -1)]
+
+    def test_seed_makes_random_patterns_reproducible(self):
+        assert get_pattern("random-walk", seed=5).steps(0) == get_pattern("random-walk", seed=5).steps(0)
+        assert get_pattern("bezier", seed=5).steps(0) != get_pattern("bezier", seed=6).steps(0)
+
+    def test_unknown_pattern(self):
+        with pytest.raises(ValueError):
+            get_pattern("zigzag")
+
+    def test_path_must_return_to_start(self):
+        with pytest.raises(ValueError):
+            Pattern("broken", [[(1, 0)]])
+
+
+class TestShift:
+    def test_no_shift_inside_the_screen(self):
+        pattern = get_pattern("circle")
+
+        assert pattern.shift(500, 400, 1920, 1080) == (0, 0)
+
+    def test_shift_keeps_the_path_on_screen(self):
+        pattern = get_pattern("bezier", seed=3)
+        min_x, min_y, max_x, max_y = pattern.bounds
+        width, height = 1920, 1080
+
+        for x, y in [(1, 1), (1919, 1079), (1, 1079), (1919, 1)]:
+            sx, sy = pattern.shift(x, y, width, height)
+            assert 1 <= x + sx + min_x and x + sx + max_x <= width - 1
+            assert 1 <= y + sy + min_y and y + sy + max_y <= height - 1
+
+    def test_shifted_steps_wrap_the_path(self):
+        pattern = get_pattern("micro")
+
+        assert pairs(pattern.steps(0, (3, -2))) == [(3, -2), (1, 1), (-1, -1), (-3, 2)]
+
+
+class TestMouseMoverPattern:
+    def make_mover(self, controller, pattern):
+        controller.get_position.return_value = MousePosition(500, 400)
+        controller.get_screen_size.return_value = ScreenSize(1920, 1080)
+        return MouseMover(controller=controller, print_func=lambda *args: None, pattern=pattern)
+
+    def test_replays_path_in_one_call(self):
+        ctrl = MagicMock()
+        pattern = get_pattern("circle")
+        mover = self.make_mover(ctrl, pattern)
+
+        _, count, success = mover.perform_move(1)
+
+        assert success and count == 2
+        ctrl.move_path.assert_called_once_with(pattern.steps(1))
+        ctrl.move_to.assert_not_called()
+        assert mover.last_tick_calls == {"get_position": 1, "get_screen_size": 1, "move_path": 1}
+
+    def test_falls_back_to_move_to_per_point(self):
+        # 控制器没有 move_path() 时逐点移动 / Without move_path() every point is a move_to()
+        ctrl = MagicMock(spec=["get_position", "get_screen_size", "move_to", "press_key"])
+        pattern = get_pattern("micro")
+        mover = self.make_mover(ctrl, pattern)
+
+        mover.perform_move(0)
+
+        assert [call.args for call in ctrl.move_to.call_args_list] == [(501, 401), (500, 400)]
+        assert ctrl.move_to.call_args.kwargs["duration"] == pytest.approx(0.05)
+
+    def test_fallback_returns_to_start_after_shift(self):
+        ctrl = MagicMock(spec=["get_position", "get_screen_size", "move_to", "press_key"])
+        mover = self.make_mover(ctrl, get_pattern("micro"))
+        ctrl.get_position.return_value = MousePosition(1919, 1079)
+
+        mover.perform_move(0)
+
+        assert [call.args for call in ctrl.move_to.call_args_list] == [(1919, 1079), (1918, 1078), (1919, 1079)]
+
+    def test_without_pattern_keeps_default_move(self):
+        ctrl = MagicMock()
+        mover = self.make_mover(ctrl, None)
+
+        mover.perform_move(0)
+
+        ctrl.move_path.assert_not_called()
+        assert ctrl.move_to.call_count == 2
@@ -0,0 +1,194 @@
+"""
+Tests for mouse_keepalive.policy module
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.control import Control  # noqa: E402
+from mouse_keepalive.move_mouse import MouseMover, MousePosition, ScreenSize  # noqa: E402
+from mouse_keepalive.policy import EscalationPolicy, PolicyState  # noqa: E402
+from mouse_keepalive.reporter import Reporter, RunReporter  # noqa: E402
+from mouse_keepalive.simulation import simulate  # noqa: E402
+
+
+class TestEscalationPolicy:
+    def test_starts_with_the_cheapest_level(self):
+        policy = EscalationPolicy()
+
+        assert policy.level == "micro"
+        assert policy.method == "mouse"
+        assert policy.pattern is not None
+
+    def test_escalates_after_consecutive_misses(self):
+        policy = EscalationPolicy(escalate_after=2)
+
+        assert policy.update("miss", 0).changed is None
+        state = policy.update("miss", 60)
+
+        assert (state.level, state.next_level, state.changed) == ("micro", "mouse", "escalate")
+        assert policy.pattern is None
+
+    def test_reset_and_busy_do_not_escalate(self):
+        policy = EscalationPolicy(escalate_after=2)
+
+        policy.update("miss", 0)
+        policy.update("reset", 60)
+        policy.update("miss", 120)
+        # 用户活跃时无法判断，不计入 / Indeterminate while the user is active, not counted
+        policy.update("busy", 180)
+
+        assert policy.level == "micro"
+
+    def test_steps_down_after_a_stable_period(self):
+        policy = EscalationPolicy(escalate_after=1, stable_period=600)
+        policy.update("miss", 0)
+        policy.update("miss", 60)
+        assert policy.level == "keyboard"
+
+        for now in range(120, 720, 60):
+            assert policy.update("reset", now).changed is None
+        state = policy.update("reset", 720)
+
+        assert state.changed == "step_down"
+        assert policy.level == "mouse"
+
+    def test_failed_step_down_doubles_the_wait(self):
+        policy = EscalationPolicy(escalate_after=1, stable_period=600)
+        policy.update("miss", 0)
+        policy.update("reset", 60)
+        policy.update("reset", 660)
+        assert policy.level == "micro"
+
+        # 降级后立即失败 / Fails right after the step-down
+        policy.update("miss", 720)
+
+        assert policy.level == "mouse"
+        assert policy.step_down_after() == 1200
+
+    def test_top_level_does_not_escalate_further(self):
+        policy = EscalationPolicy(levels=("keyboard", "inhibit"), escalate_after=1)
+
+        policy.update("failed", 0)
+        policy.update("failed", 60)
+
+        assert policy.level == "inhibit"
+        assert policy.escalations == 1
+
+    def test_unverifiable_runs_at_the_mouse_level(self):
+        policy = EscalationPolicy()
+
+        state = policy.update("unavailable", 0)
+
+        assert state.next_level == "mouse"
+        for now in range(60, 7200, 60):
+            policy.update("unavailable", now)
+        assert policy.level == "mouse"
+
+    @pytest.mark.parametrize("levels", [(), ("micro", "teleport")])
+    def test_invalid_levels(self, levels):
+        with pytest.raises(ValueError):
+            EscalationPolicy(levels=levels)
+
+
+class FakeSystem:
+    def __init__(self):
+        self.now = 100.0
+        self.last_input = 0.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def idle(self):
+        return self.now - self.last_input
+
+
+class TestRunAuto:
+    def make_mover(self, system, effective):
+        ctrl = MagicMock()
+        ctrl.get_position.return_value = MousePosition(500, 400)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+
+        def injector(kind):
+            def inject(*args, **kwargs):
+                if kind in effective:
+                    system.last_input = system.now
+                system.now += 0.01
+
+            return inject
+
+        ctrl.move_path.side_effect = injector("micro")
+        ctrl.move_to.side_effect = injector("mouse")
+        ctrl.press_key.side_effect = injector("keyboard")
+        mover = MouseMover(
+            controller=ctrl,
+            print_func=lambda *args: None,
+            sleep_func=system.sleep,
+            time_func=system.clock,
+            monotonic_func=system.clock,
+            idle_func=system.idle,
+            policy=EscalationPolicy(stable_period=3600),
+        )
+        return mover, ctrl
+
+    def test_escalates_to_the_first_level_that_resets(self):
+        system = FakeSystem()
+        mover, ctrl = self.make_mover(system, effective={"keyboard"})
+        states = []
+
+        mover.run(interval=60, duration=600, method="auto", on_move=lambda *args: states.append(args[4]))
+
+        assert [state.level for state in states[:5]] == ["micro", "micro", "mouse", "mouse", "keyboard"]
+        assert {state.level for state in states[4:]} == {"keyboard"}
+        assert states[-1].verdict == "reset"
+        ctrl.press_key.assert_called_with("shift")
+
+    def test_stays_on_micro_moves_when_they_work(self):
+        system = FakeSystem()
+        mover, ctrl = self.make_mover(system, effective={"micro"})
+
+        mover.run(interval=60, duration=600, method="auto")
+
+        assert mover.policy.level == "micro"
+        assert mover.policy.escalations == 0
+        ctrl.move_to.assert_not_called()
+        ctrl.press_key.assert_not_called()
+
+    def test_control_can_switch_to_auto(self):
+        system = FakeSystem()
+        mover, ctrl = self.make_mover(system, effective={"micro"})
+        control = Control()
+        control.set_method("auto")
+        mover.control = control
+
+        mover.run(interval=60, duration=120, method="keyboard")
+
+        ctrl.press_key.assert_not_called()
+        assert ctrl.move_path.call_count == 3
+
+    def test_simulated_run_records_levels(self):
+        result = simulate(duration=600, interval=60, method="auto")
+
+        assert result.levels == ["micro"] * len(result.tick_times)
+        assert {event.kind for event in result.events} == {"move_path"}
+
+    def test_run_reporter_reports_the_level(self):
+        stream = io.StringIO()
+        callbacks = RunReporter(Reporter(fmt="json", stream=stream, background=False), method="auto")
+
+        callbacks.on_move(3, MousePosition(1, 2), 180, True, PolicyState("keyboard", "reset", "keyboard", 2, 0))
+
+        record = json.loads(stream.getvalue())
+        assert (record["event"], record["policy"], record["verdict"]) == ("key", "keyboard", "reset")
+        assert record["level"] == "info"
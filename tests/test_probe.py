@@ -0,0 +1,190 @@
+"""
+Tests for mouse_keepalive.probe module
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.move_mouse import MouseMover, MousePosition, ScreenSize  # noqa: E402
+from mouse_keepalive.probe import ResetProbe  # noqa: E402
+from mouse_keepalive.reporter import Reporter, RunReporter  # noqa: E402
+
+
+class FakeSystem:
+    """时钟和空闲计时器 / Clock and idle timer"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.last_input = 0.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def idle(self):
+        return self.now - self.last_input
+
+
+def make_probe(system, **kwargs):
+    return ResetProbe(backend="fake", clock=system.clock, sleep=system.sleep, **kwargs)
+
+
+class TestResetProbe:
+    def test_reset_latency_from_idle_reading(self):
+        system = FakeSystem()
+        probe = make_probe(system)
+        idle_before = system.idle()
+        started = system.clock()
+        # 注入 0.2 秒，系统在开始后 0.03 秒记录到输入 / A 0.2s injection the OS registered 0.03s in
+        system.last_input = started + 0.03
+        system.now += 0.2
+
+        latency = probe.observe("mouse", system.idle, idle_before, started)
+
+        assert abs(latency - 0.03) < 1e-9
+        row = probe.summary()[0]
+        assert (row["method"], row["backend"], row["resets"], row["misses"]) == ("mouse", "fake", 1, 0)
+        assert row["rate"] == 1.0
+        assert row["p50"] == 0.05
+        assert row["cost_ms"] == 200.0
+
+    def test_delayed_reset_is_polled_for(self):
+        system = FakeSystem()
+        probe = make_probe(system, poll=0.01)
+        started = system.clock()
+
+        def idle():
+            # 系统在注入结束 0.1 秒后才记录 / The OS registers the input 0.1s after the injection
+            if system.now >= started + 0.1 and system.last_input < started:
+                system.last_input = system.now
+            return system.idle()
+
+        latency = probe.observe("keyboard", idle, 100.0, started)
+
+        assert 0.1 <= latency < 0.12
+
+    def test_ignored_injection_is_a_miss(self):
+        system = FakeSystem()
+        probe = make_probe(system, timeout=0.5)
+
+        assert probe.observe("mouse", system.idle, system.idle(), system.clock()) is None
+
+        row = probe.summary()[0]
+        assert (row["resets"], row["misses"], row["rate"]) == (0, 1, 0.0)
+        assert system.now >= 100.5
+
+    def test_unknown_without_idle_or_when_user_active(self):
+        system = FakeSystem()
+        probe = make_probe(system)
+
+        probe.observe("mouse", lambda: None, 50.0, system.clock())
+        probe.observe("mouse", system.idle, None, system.clock())
+        probe.observe("mouse", system.idle, 0.2, system.clock())
+
+        row = probe.summary()[0]
+        assert (row["unknown"], row["attempts"], row["rate"]) == (3, 3, None)
+
+    def test_best_is_cheapest_effective_method(self):
+        system = FakeSystem()
+        probe = make_probe(system, timeout=0.1)
+        for method, cost, effective in [("mouse", 0.2, True), ("keyboard", 0.01, True)] * 10 + [("mouse", 0.2, True)]:
+            started = system.clock()
+            if effective:
+                system.last_input = started
+            system.now += cost
+            probe.observe(method, system.idle, 60.0, started)
+        assert probe.best()["method"] == "keyboard"
+
+        # 键盘不再重置后，鼠标胜出 / Once the keyboard stops resetting, mouse wins
+        for _ in range(5):
+            system.now += 60
+            probe.observe("keyboard", system.idle, system.idle(), system.clock())
+        assert probe.best()["method"] == "mouse"
+
+    def test_histogram_lists_non_empty_buckets(self):
+        system = FakeSystem()
+        probe = make_probe(system, buckets=(0.01, 0.1))
+        for delay in (0.005, 0.05, 0.05, 0.5):
+            started = system.clock()
+            system.last_input = started + delay
+            system.now += delay
+            probe.observe("mouse", system.idle, 60.0, started)
+
+        assert probe.histogram("mouse") == "<=0.01s:1 <=0.1s:2 >0.1s:1"
+        assert probe.histogram("keyboard") == ""
+
+
+class TestRunWithProbe:
+    def make_mover(self, system, effective):
+        ctrl = MagicMock()
+        ctrl.get_position.return_value = MousePosition(100, 100)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+
+        def inject(*args, **kwargs):
+            if effective:
+                system.last_input = system.now
+            system.now += 0.05
+
+        ctrl.move_to.side_effect = inject
+        ctrl.press_key.side_effect = inject
+        probe = make_probe(system, timeout=0.2)
+        mover = MouseMover(
+            controller=ctrl,
+            print_func=lambda *args: None,
+            sleep_func=system.sleep,
+            time_func=system.clock,
+            idle_func=system.idle,
+            probe=probe,
+        )
+        return mover, probe
+
+    def test_records_every_injection(self):
+        system = FakeSystem()
+        mover, probe = self.make_mover(system, effective=True)
+
+        mover.run(interval=60, duration=300, method="keyboard")
+
+        row = probe.summary()[0]
+        assert row["method"] == "keyboard"
+        # 0、60、…、300 秒各一次 / One at 0, 60, ..., 300 seconds
+        assert row["resets"] == row["attempts"] == 6
+        assert row["p50"] == 0.005
+
+    def test_inhibit_is_not_probed(self):
+        system = FakeSystem()
+        mover, probe = self.make_mover(system, effective=True)
+        inhibitor = MagicMock()
+        inhibitor.acquire.return_value = True
+        inhibitor.active.return_value = True
+        mover.inhibitors = [inhibitor]
+
+        mover.run(interval=60, duration=120, method="inhibit")
+
+        assert probe.summary() == []
+
+    def test_finish_reports_histogram_and_summary(self):
+        system = FakeSystem()
+        mover, probe = self.make_mover(system, effective=False)
+        stream = io.StringIO()
+        reporter = Reporter(fmt="json", locale="en", stream=stream, background=False)
+        callbacks = RunReporter(reporter, duration=120, backend="fake", probe=probe)
+
+        mover.run(interval=60, duration=120, on_start=callbacks.on_start, on_finish=callbacks.on_finish)
+
+        events = {}
+        for line in stream.getvalue().splitlines():
+            record = json.loads(line)
+            events[record["event"]] = record
+        assert "config_probe" in events
+        assert events["probe_histogram"]["buckets"] == "-"
+        assert events["probe_summary"]["misses"] == 3
+        assert "probe_none" in events
+        assert "probe_best" not in events
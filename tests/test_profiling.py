@@ -0,0 +1,184 @@
+"""
+Tests for mouse_keepalive.profiling module
+"""
+
+import io
+import json
+import pstats
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.move_mouse import MouseMover, MousePosition, ScreenSize  # noqa: E402
+from mouse_keepalive.profiling import TickTracer, cprofiled, report_profile  # noqa: E402
+from mouse_keepalive.reporter import Reporter  # noqa: E402
+
+
+def make_tracer():
+    """两个 tick，第二个更慢 / Two ticks, the second one slower"""
+    tracer = TickTracer()
+    tracer.record("get_position", 1000, 3000)
+    tracer.record("move_to", 3000, 8000)
+    tracer.record("tick", 0, 10000)
+    tracer.record("sleep", 10000, 55000)
+    tracer.record("get_position", 61000, 62000)
+    tracer.record("move_to", 62000, 90000)
+    tracer.record("tick", 60000, 100000)
+    return tracer
+
+
+class TestTickTracer:
+    def test_ring_keeps_the_latest_entries(self):
+        tracer = TickTracer(capacity=3)
+        for i in range(5):
+            tracer.record(f"phase{i % 2}", i * 10, i * 10 + 5)
+
+        assert tracer.recorded == 5
+        assert tracer.entries() == [("phase0", 20, 25), ("phase1", 30, 35), ("phase0", 40, 45)]
+        assert tracer.names == ["phase0", "phase1"]
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            TickTracer(capacity=0)
+
+    def test_summary_per_phase(self):
+        rows = {row["phase"]: row for row in make_tracer().summary()}
+
+        assert rows["move_to"]["count"] == 2
+        assert rows["move_to"]["total_ms"] == 0.033
+        assert rows["move_to"]["max_us"] == 28.0
+        assert rows["get_position"]["mean_us"] == 1.5
+        # 按总耗时降序 / By total time descending
+        assert [row["phase"] for row in make_tracer().summary()] == ["tick", "sleep", "move_to", "get_position"]
+
+    def test_slowest_ticks_break_down_phases(self):
+        ticks = make_tracer().slowest_ticks(1)
+
+        assert ticks == [{"start_ns": 60000, "duration_us": 40.0, "phases": {"get_position": 1.0, "move_to": 28.0}}]
+
+    def test_chrome_trace_uses_microseconds(self):
+        trace = make_tracer().chrome_trace()
+
+        events = trace["traceEvents"]
+        assert len(events) == 7
+        assert events[0] == {
+            "name": "get_position",
+            "ph": "X",
+            "ts": 1.0,
+            "dur": 2.0,
+            "pid": 1,
+            "tid": 1,
+            "cat": "phase",
+        }
+        assert events[2]["cat"] == "tick"
+
+    def test_hooks_see_every_phase(self):
+        tracer = TickTracer()
+        seen = []
+        tracer.hooks.append(lambda *args: seen.append(args))
+
+        tracer.record("tick", 1, 2)
+
+        assert seen == [("tick", 1, 2)]
+
+
+class TestCProfiled:
+    def test_none_does_nothing(self):
+        with cprofiled(None) as profiler:
+            assert profiler is None
+
+    def test_writes_pstats_file(self, tmp_path):
+        path = tmp_path / "run.prof"
+
+        with cprofiled(str(path)):
+            sum(range(1000))
+
+        assert pstats.Stats(str(path)).total_calls > 0
+
+
+class TestMouseMoverTracing:
+    def make_mover(self, **kwargs):
+        ctrl = MagicMock()
+        ctrl.get_position.return_value = MousePosition(500, 400)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        return MouseMover(
+            controller=ctrl,
+            print_func=lambda *args: None,
+            sleep_func=sleep,
+            time_func=lambda: clock[0],
+            **kwargs,
+        )
+
+    def test_run_records_phases(self):
+        tracer = TickTracer()
+        mover = self.make_mover(tracer=tracer)
+
+        mover.run(interval=60, duration=120, on_move=lambda *args: None)
+
+        counts = {row["phase"]: row["count"] for row in tracer.summary()}
+        assert counts["tick"] == 3
+        assert counts["move_to"] == 6
+        assert counts["calculate_next_position"] == 3
+        assert counts["on_move"] == 3
+        assert counts["sleep"] == 2
+        assert len(tracer.slowest_ticks(10)) == 3
+
+    def test_phase_hook_creates_a_tracer(self):
+        mover = self.make_mover()
+        seen = []
+
+        def hook(name, start_ns, end_ns):
+            seen.append(name)
+
+        mover.add_phase_hook(hook)
+        mover.run(interval=60, duration=60)
+        mover.remove_phase_hook(hook)
+        mover.run(interval=60, duration=60)
+
+        assert mover.tracer is not None
+        assert seen.count("tick") == 2
+        # 移除钩子后仍然计时 / Timing continues after the hook is removed
+        assert mover.tracer.recorded > len(seen)
+
+    def test_no_tracer_by_default(self):
+        mover = self.make_mover()
+
+        mover.run(interval=60, duration=60)
+
+        assert mover.tracer is None
+
+
+class TestReportProfile:
+    def read_events(self, stream):
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_reports_phases_and_slow_ticks(self, tmp_path):
+        stream = io.StringIO()
+        reporter = Reporter(fmt="json", locale="en", stream=stream, background=False)
+        path = tmp_path / "trace.json"
+
+        report_profile(reporter, make_tracer(), str(path), slowest=1)
+
+        events = self.read_events(stream)
+        assert [e["event"] for e in events] == ["profile_phase"] * 4 + ["profile_slow_tick", "profile_trace"]
+        assert events[4]["phases"] == "move_to 28.0us, get_position 1.0us"
+        assert json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+
+    def test_unwritable_trace_is_a_warning(self, tmp_path):
+        stream = io.StringIO()
+        reporter = Reporter(fmt="json", locale="en", stream=stream, background=False)
+
+        report_profile(reporter, make_tracer(), str(tmp_path / "missing" / "trace.json"))
+
+        last = self.read_events(stream)[-1]
+        assert (last["event"], last["level"]) == ("profile_error", "warning")
@@ -0,0 +1,158 @@
+"""
+Tests for mouse_keepalive.reporter module
+"""
+
+import io
+import json
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.control import Control  # noqa: E402
+from mouse_keepalive.move_mouse import MouseController, MouseMover, MousePosition, ScreenSize  # noqa: E402
+from mouse_keepalive.reporter import Reporter, RunReporter  # noqa: E402
+
+
+class BlockingStream:
+    """write() 阻塞直到被释放 / write() blocks until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.lines = []
+
+    def write(self, text):
+        self.release.wait(5)
+        self.lines.append(text)
+
+    def flush(self):
+        pass
+
+
+class TestReporter:
+    def test_locales(self):
+        for locale, expected in (
+            ("zh", "活动方式: mouse\n"),
+            ("en", "Method: mouse\n"),
+            ("both", "活动方式: mouse / Method: mouse\n"),
+        ):
+            stream = io.StringIO()
+            Reporter(locale=locale, stream=stream, background=False).info("config_method", method="mouse")
+            assert stream.getvalue() == expected
+
+    def test_level_filters_before_formatting(self):
+        stream = io.StringIO()
+        reporter = Reporter(level="warning", stream=stream, background=False)
+        reporter.info("move", elapsed=0, count=1, x=0, y=0)
+        reporter.debug("unknown_event_with_missing_fields")
+        reporter.warning("move_error", error="boom")
+
+        assert stream.getvalue() == "警告: 鼠标移动失败: boom / Warning: Mouse movement failed: boom\n"
+        assert reporter.enabled("error")
+        assert not reporter.enabled("info")
+
+    def test_json_lines(self):
+        stream = io.StringIO()
+        reporter = Reporter(locale="en", fmt="json", stream=stream, background=False, clock=lambda: 12.5)
+        reporter.info("key", elapsed=60, count=3)
+
+        record = json.loads(stream.getvalue())
+        assert record == {
+            "time": 12.5,
+            "level": "info",
+            "event": "key",
+            "message": "[60s] Pressed key 3 times",
+            "elapsed": 60,
+            "count": 3,
+        }
+
+    def test_background_writer_flushes_on_close(self):
+        stream = io.StringIO()
+        reporter = Reporter(locale="en", stream=stream)
+        for count in range(5):
+            reporter.info("key", elapsed=count, count=count)
+        reporter.close()
+
+        assert stream.getvalue().count("Pressed key") == 5
+
+    def test_blocked_stream_drops_instead_of_blocking(self):
+        stream = BlockingStream()
+        reporter = Reporter(locale="en", stream=stream, max_queue=2)
+        for count in range(10):
+            reporter.info("key", elapsed=count, count=count)
+
+        # 1 条正在写、2 条在队列中，其余被丢弃 / One being written, two queued, the rest dropped
+        assert reporter.dropped >= 7
+        stream.release.set()
+        reporter.close()
+        assert len(stream.lines) + reporter.dropped == 10
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            Reporter(level="trace")
+        with pytest.raises(ValueError):
+            Reporter(locale="fr")
+        with pytest.raises(ValueError):
+            Reporter(fmt="xml")
+
+
+class TestRunReporter:
+    def test_run_output(self):
+        stream = io.StringIO()
+        reporter = Reporter(locale="en", stream=stream, background=False)
+        ctrl = Mock(spec=MouseController)
+        ctrl.get_position.return_value = MousePosition(100, 200)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+        ctrl.move_to.side_effect = [None, None, RuntimeError("no display")]
+        mover = MouseMover(
+            controller=ctrl, time_func=iter([0, 60, 120, 120]).__next__, sleep_func=Mock(), reporter=reporter
+        )
+        callbacks = RunReporter(reporter, interval=60, duration=120)
+
+        mover.run(
+            interval=60,
+            duration=120,
+            on_start=callbacks.on_start,
+            on_move=callbacks.on_move,
+            on_finish=callbacks.on_finish,
+        )
+
+        lines = stream.getvalue().splitlines()
+        assert lines[0] == "Starting mouse keepalive..."
+        assert "[60s] Moved mouse 1 times (position: 100, 200)" in lines
+        assert "Warning: Mouse movement failed: no display" in lines
+        assert "[120s] Warning: Mouse movement failed (attempt 1)" in lines
+        assert "Total moves: 1, successful: 1" in lines
+        assert lines[-1] == "Duration: 120 seconds"
+
+    def test_stopped_run_is_not_reported_as_completed(self):
+        stream = io.StringIO()
+        control = Control()
+        callbacks = RunReporter(Reporter(locale="en", stream=stream, background=False), duration=120, control=control)
+        control.stop()
+        callbacks.on_finish(1, 30.0)
+        callbacks.on_finish(4, 120.0)
+
+        lines = stream.getvalue().splitlines()
+        assert lines[0] == "Stop requested, exiting"
+        assert "Duration 120 seconds reached, exiting" in lines
+
+    def test_interrupted_run_before_the_duration(self):
+        stream = io.StringIO()
+        RunReporter(Reporter(locale="en", stream=stream, background=False), duration=120).on_finish(0, 5.0)
+        assert stream.getvalue().splitlines()[0] == "Program interrupted by user"
+
+    def test_skip_is_debug_only(self):
+        stream = io.StringIO()
+        callbacks = RunReporter(Reporter(locale="en", stream=stream, background=False))
+        callbacks.on_skip(3.0, 10.0)
+        assert stream.getvalue() == ""
+
+        callbacks = RunReporter(Reporter(level="debug", locale="en", stream=stream, background=False))
+        callbacks.on_skip(3.0, 10.0)
+        assert stream.getvalue() == "[10s] User active (idle 3s), skipped\n"
@@ -0,0 +1,81 @@
+"""
+Tests for mouse_keepalive.scheduler module
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.scheduler import DeadlineScheduler  # noqa: E402
+
+
+class TestDeadlineScheduler:
+    def test_deadlines_do_not_drift_with_work_time(self):
+        sched = DeadlineScheduler(60)
+        sched.start(1000.0)
+
+        # 每次 tick 开始时间都晚 0.3 秒（例如 tween 耗时）/ Every tick starts 0.3s late (e.g. tween time)
+        assert sched.advance(1000.0) == 1060.0
+        assert sched.advance(1060.3) == 1120.0
+        assert sched.delay(1060.5) == pytest.approx(59.5)
+        assert sched.advance(1120.3) == 1180.0
+        assert sched.last_lateness == pytest.approx(0.3)
+
+    def test_skip_policy_realigns_after_suspend(self):
+        sched = DeadlineScheduler(60, policy="skip")
+        sched.start(0.0)
+        sched.advance(0.0)
+
+        # 挂起了 10 分钟 / Suspended for 10 minutes
+        assert sched.advance(610.0) == 660.0
+        assert sched.missed == 9
+        assert sched.advance(660.0) == 720.0
+
+    def test_catch_up_policy_fires_immediately_then_reanchors(self):
+        sched = DeadlineScheduler(60, policy="catch-up")
+        sched.start(0.0)
+        sched.advance(0.0)
+
+        assert sched.advance(610.0) == 610.0
+        assert sched.delay(610.5) == 0.0
+        assert sched.advance(610.5) == 670.0
+
+    def test_jitter_is_bounded_and_early_only(self):
+        sched = DeadlineScheduler(60, jitter=100, rng=random.Random(1))
+        assert sched.jitter == 30
+        sched.start(0.0)
+        for index in range(1, 50):
+            deadline = sched.advance(sched.next_deadline)
+            assert index * 60 - 30 <= deadline <= index * 60
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            DeadlineScheduler(0)
+        with pytest.raises(ValueError):
+            DeadlineScheduler(60, policy="later")
+        with pytest.raises(ValueError):
+            DeadlineScheduler(60, jitter=-1)
+
+    def test_set_interval_takes_effect_from_the_current_deadline(self):
+        sched = DeadlineScheduler(60)
+        sched.start(0.0)
+        sched.advance(0.0)
+        assert sched.advance(60.0) == 120.0
+
+        sched.set_interval(30)
+        assert sched.advance(120.0) == 150.0
+        assert sched.advance(150.0) == 180.0
+        with pytest.raises(ValueError):
+            sched.set_interval(0)
+
+    def test_set_interval_rebounds_jitter(self):
+        sched = DeadlineScheduler(60, jitter=20)
+        sched.set_interval(30)
+        assert sched.jitter == 15
+        sched.set_interval(60)
+        assert sched.jitter == 20
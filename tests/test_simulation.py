@@ -0,0 +1,116 @@
+"""
+Tests for mouse_keepalive.simulation module
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.simulation import ActivityTimeline, VirtualClock, simulate  # noqa: E402
+
+DAY = 86400
+
+
+class TestVirtualClock:
+    def test_sleep_advances_both_clocks(self):
+        clock = VirtualClock(oversleep=0.5)
+        clock.sleep(10)
+        assert clock.monotonic() == 10.5
+        assert clock.time() - clock.monotonic() == clock.epoch
+        assert clock.sleeps == [10]
+
+    def test_suspend_is_applied_by_the_crossing_sleep(self):
+        clock = VirtualClock()
+        clock.suspend(15, 600)
+        clock.sleep(10)
+        assert clock.monotonic() == 10
+        clock.sleep(10)
+        assert clock.monotonic() == 620
+
+    def test_interrupt_stops_at_the_interrupt_time(self):
+        clock = VirtualClock()
+        clock.interrupt_at = 25
+        clock.sleep(20)
+        with pytest.raises(KeyboardInterrupt):
+            clock.sleep(20)
+        assert clock.monotonic() == 25
+
+
+class TestActivityTimeline:
+    def test_idle_counts_from_the_latest_input(self):
+        clock = VirtualClock()
+        timeline = ActivityTimeline(clock, active=[(100, 200)])
+        clock.advance(50)
+        assert timeline() == 50
+        clock.advance(100)
+        assert timeline() == 0
+        assert timeline.user_active()
+        clock.advance(100)
+        assert timeline() == 50
+        timeline.record_input()
+        assert timeline() == 0
+
+
+class TestSimulate:
+    def test_week_long_deadline_run_has_exact_tick_times(self):
+        started = time.perf_counter()
+        result = simulate(duration=7 * DAY, interval=60, scheduler="deadline")
+        assert time.perf_counter() - started < 10
+
+        assert result.finished and not result.interrupted
+        assert len(result.tick_times) == 7 * DAY // 60 + 1
+        assert result.tick_times[:3] == [0, 60, 120]
+        assert result.tick_times[-1] == 7 * DAY
+        assert len(result.events) == 2 * len(result.tick_times)
+
+    def test_interval_mode_drifts_by_the_tween_time(self):
+        result = simulate(duration=DAY, interval=60, move_duration=0.1)
+        # 每个 tick 两次 0.1 秒的补间 / Two 0.1s tweens per tick
+        assert result.tick_times[1] == pytest.approx(60.2)
+        assert result.tick_times[100] == pytest.approx(100 * 60.2)
+        assert result.elapsed >= DAY
+
+    def test_duration_cut_off_in_deadline_mode(self):
+        result = simulate(duration=10 * 3600 + 30, interval=60, scheduler="deadline", move_duration=0)
+        assert result.tick_times[-1] == 10 * 3600 + 30
+        assert result.elapsed == 10 * 3600 + 30
+        assert result.sleeps[-1] == 30
+
+    def test_keyboard_interrupt_ends_the_run(self):
+        result = simulate(duration=None, interval=60, interrupt_at=3 * DAY + 90, move_duration=0)
+        assert result.interrupted and result.finished
+        assert result.elapsed == 3 * DAY + 90
+        assert result.move_count == 3 * DAY // 60 + 2
+
+    def test_idle_threshold_skips_while_the_user_works(self):
+        workday = [(day * DAY + 9 * 3600, day * DAY + 17 * 3600) for day in range(5)]
+        result = simulate(
+            duration=5 * DAY, interval=60, active=workday, idle_threshold=50, scheduler="deadline", move_duration=0
+        )
+        # 启动时和每个工作日（含下班那一刻）的 tick 被跳过 / The tick at start-up and every tick of each workday
+        # (including the moment work stops) is skipped
+        assert len(result.skip_times) == 1 + 5 * (8 * 60 + 1)
+        assert all(at == 0 or any(start <= at <= end for start, end in workday) for at in result.skip_times)
+        assert not any(start <= at < end for start, end in workday for at in result.tick_times)
+
+    def test_suspend_with_skip_policy(self):
+        clock = VirtualClock()
+        clock.suspend(3600, 8 * 3600)
+        result = simulate(duration=DAY, interval=60, clock=clock, scheduler="deadline", move_duration=0)
+        # 挂起期间的 tick 被跳过，之后回到原来的网格 / Ticks during the suspend are skipped, then realign to the grid
+        assert len(result.tick_times) == (DAY - 8 * 3600) // 60 + 1
+        assert all(at % 60 == 0 for at in result.tick_times)
+
+    def test_injection_failures_are_counted(self):
+        result = simulate(duration=3600, interval=60, move_duration=0, fail=lambda now: now >= 1800)
+        assert result.failures == 31
+        assert result.move_count == 30
+
+    def test_unbounded_run_requires_interrupt(self):
+        with pytest.raises(ValueError):
+            simulate(duration=None)
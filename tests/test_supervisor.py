@@ -0,0 +1,126 @@
+"""
+Tests for mouse_keepalive.supervisor module
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive import supervisor as supervisor_module  # noqa: E402
+from mouse_keepalive.move_mouse import MouseController, MousePosition, ScreenSize  # noqa: E402
+from mouse_keepalive.supervisor import Supervisor  # noqa: E402
+
+
+def make_controller(fail=False):
+    ctrl = Mock(spec=MouseController)
+    ctrl.get_position.return_value = MousePosition(100, 200)
+    ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+    if fail:
+        ctrl.move_to.side_effect = RuntimeError("X server gone")
+    return ctrl
+
+
+class TestSupervisor:
+    def test_ticks_every_display_with_one_controller_each(self):
+        controllers = {":1": make_controller(), ":2": make_controller(), ":3": make_controller(fail=True)}
+        factory = Mock(side_effect=lambda display: controllers[display])
+
+        sup = Supervisor(list(controllers), interval=0.02, max_workers=2, controller_factory=factory, print_func=Mock())
+        stats = sup.run(duration=0.1)
+
+        assert factory.call_count == 3
+        for display in (":1", ":2"):
+            assert stats[display].ticks >= 3
+            assert stats[display].successes == stats[display].ticks
+            assert stats[display].last_success is not None
+        assert stats[":3"].failures == stats[":3"].ticks >= 3
+        assert stats[":3"].last_success is None
+        assert ":3" in sup.format_stats()
+
+    def test_stop_from_another_thread(self):
+        sup = Supervisor([":1"], interval=3600, controller_factory=lambda display: make_controller())
+        timer = threading.Timer(0.05, sup.stop)
+        timer.start()
+
+        stats = sup.run()
+
+        timer.join()
+        assert stats[":1"].ticks == 1
+
+    def test_controllers_are_closed(self):
+        ctrl = make_controller()
+        ctrl.close = Mock()
+        sup = Supervisor([":1"], interval=1, controller_factory=lambda display: ctrl)
+        sup.run(duration=0.01)
+        ctrl.close.assert_called_once()
+
+    def test_display_is_rescheduled_after_a_tick_raises(self):
+        sup = Supervisor([":1"], interval=0.02, controller_factory=lambda display: make_controller(), print_func=Mock())
+        sup.movers[":1"].perform_tick = Mock(side_effect=RuntimeError("unexpected"))
+
+        stats = sup.run(duration=0.1)
+
+        assert stats[":1"].failures == stats[":1"].ticks >= 3
+
+    def test_hung_display_does_not_block_shutdown(self):
+        release = threading.Event()
+        hung = make_controller()
+        hung.get_position.side_effect = lambda: release.wait() and MousePosition(100, 200)
+        controllers = {":1": make_controller(), ":2": hung}
+        sup = Supervisor(
+            list(controllers),
+            interval=0.02,
+            controller_factory=lambda display: controllers[display],
+            print_func=Mock(),
+            call_timeout=0.05,
+        )
+        try:
+            started = time.monotonic()
+            stats = sup.run(duration=0.2)
+
+            assert time.monotonic() - started < 2
+            assert stats[":1"].successes >= 3
+            assert stats[":2"].successes == 0
+        finally:
+            release.set()
+
+    def test_bad_display_does_not_stop_the_others(self):
+        def factory(display):
+            if display == ":2":
+                raise OSError("Cannot open X display :2")
+            return make_controller()
+
+        printed = []
+        sup = Supervisor([":1", ":2"], interval=0.02, controller_factory=factory, print_func=printed.append)
+        stats = sup.run(duration=0.1)
+
+        assert stats[":1"].successes >= 3
+        assert stats[":2"].ticks == 0 and stats[":2"].error == "Cannot open X display :2"
+        assert any(line.startswith("[:2] ") for line in printed)
+        assert "Cannot open X display :2" in sup.format_stats()
+
+    def test_requires_displays(self):
+        with pytest.raises(ValueError):
+            Supervisor([], controller_factory=lambda display: make_controller())
+
+    def test_serve_subcommand_dispatch(self):
+        orig = sys.argv
+        sys.argv = ["mouse-keepalive", "serve", "--displays", ":1,:2", "-d", "1"]
+        try:
+            with patch.object(supervisor_module, "Supervisor") as sup_cls:
+                from mouse_keepalive.move_mouse import main
+
+                main()
+        finally:
+            sys.argv = orig
+
+        assert sup_cls.call_args.args[0] == [":1", ":2"]
+        assert sup_cls.call_args.kwargs["call_timeout"] == 5.0
+        sup_cls.return_value.run.assert_called_once_with(duration=1)
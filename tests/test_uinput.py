@@ -0,0 +1,131 @@
+"""
+Tests for mouse_keepalive.uinput module
+"""
+
+import struct
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.move_mouse import MouseMover, MousePosition  # noqa: E402
+from mouse_keepalive.uinput import (  # noqa: E402
+    EV_KEY,
+    EV_REL,
+    EV_SYN,
+    REL_X,
+    REL_Y,
+    UI_DEV_CREATE,
+    UI_DEV_DESTROY,
+    UI_DEV_SETUP,
+    UinputController,
+)
+
+EVENT = struct.Struct("llHHi")
+
+
+def read_events(path):
+    data = path.read_bytes()
+    return [EVENT.unpack_from(data, offset)[2:] for offset in range(0, len(data), EVENT.size)]
+
+
+@pytest.fixture
+def device(tmp_path):
+    """用普通文件代替 /dev/uinput，写入的事件可以读回 / A plain file stands in for /dev/uinput so writes can be read back"""
+    path = tmp_path / "uinput"
+    path.write_bytes(b"")
+    ioctl = MagicMock()
+    ctrl = UinputController(path=str(path), ioctl=ioctl)
+    yield ctrl, path, ioctl
+    ctrl.close()
+
+
+class TestUinputController:
+    def test_device_is_created_at_startup(self, device):
+        _, path, ioctl = device
+        requests = [call.args[1] for call in ioctl.call_args_list]
+        assert requests[-2:] == [UI_DEV_SETUP, UI_DEV_CREATE]
+        assert path.read_bytes() == b""
+
+    def test_legacy_setup_fallback(self, tmp_path):
+        path = tmp_path / "uinput"
+        path.write_bytes(b"")
+
+        def ioctl(fd, request, arg):
+            if request == UI_DEV_SETUP:
+                raise OSError("Inappropriate ioctl for device")
+
+        UinputController(path=str(path), ioctl=ioctl).close()
+        # struct uinput_user_dev
+        assert path.read_bytes()[:15] == b"mouse-keepalive"
+        assert len(path.read_bytes()) == 92 + 4 * 64 * 4
+
+    def test_jiggle_is_one_batched_write(self, device):
+        ctrl, path, _ = device
+        ctrl.jiggle(25, -25)
+
+        assert read_events(path) == [
+            (EV_REL, REL_X, 25),
+            (EV_REL, REL_Y, -25),
+            (EV_SYN, 0, 0),
+            (EV_REL, REL_X, -25),
+            (EV_REL, REL_Y, 25),
+            (EV_SYN, 0, 0),
+        ]
+
+    def test_move_path_is_one_batched_write(self, device):
+        ctrl, path, _ = device
+        ctrl.move_path([3, 4, -3, -4])
+
+        assert read_events(path) == [
+            (EV_REL, REL_X, 3),
+            (EV_REL, REL_Y, 4),
+            (EV_SYN, 0, 0),
+            (EV_REL, REL_X, -3),
+            (EV_REL, REL_Y, -4),
+            (EV_SYN, 0, 0),
+        ]
+        # 路径回到起点，虚拟位置不变 / The path returns to its start, so the virtual position is unchanged
+        assert ctrl.get_position() == MousePosition(32768, 32768)
+
+    def test_press_key(self, device):
+        ctrl, path, _ = device
+        ctrl.press_key("shift")
+
+        assert read_events(path) == [(EV_KEY, 42, 1), (EV_SYN, 0, 0), (EV_KEY, 42, 0), (EV_SYN, 0, 0)]
+        with pytest.raises(ValueError):
+            ctrl.press_key("F13")
+
+    def test_tweened_path_returns_to_start(self, device):
+        ctrl, path, _ = device
+        mover = MouseMover(controller=ctrl, print_func=lambda message: None)
+        assert mover.perform_move(0)[2] is True
+
+        moves = [event for event in read_events(path) if event[0] == EV_REL]
+        assert sum(value for _, code, value in moves if code == REL_X) == 0
+        assert sum(value for _, code, value in moves if code == REL_Y) == 0
+        assert ctrl.get_position() == MousePosition(32768, 32768)
+
+    def test_default_tween_is_still_one_write(self, device):
+        ctrl, path, _ = device
+        writes = []
+        write = ctrl._write
+        ctrl._write = lambda data: (writes.append(data), write(data))
+        mover = MouseMover(controller=ctrl, print_func=lambda message: None)
+        assert mover.move_duration > 0
+
+        assert mover.perform_move(0)[2] is True
+        assert len(writes) == 1
+        assert [event[0] for event in read_events(path)] == [EV_REL, EV_REL, EV_SYN, EV_REL, EV_REL, EV_SYN]
+
+    def test_close_destroys_device(self, device):
+        ctrl, _, ioctl = device
+        ctrl.close()
+
+        assert ioctl.call_args.args[1] == UI_DEV_DESTROY
+        with pytest.raises(OSError):
+            ctrl.jiggle(1, 1)
@@ -0,0 +1,159 @@
+"""
+Tests for mouse_keepalive.work_hours module
+"""
+
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.control import Control  # noqa: E402
+from mouse_keepalive.move_mouse import MouseMover, MousePosition, ScreenSize  # noqa: E402
+from mouse_keepalive.simulation import simulate  # noqa: E402
+from mouse_keepalive.work_hours import WorkSchedule, parse_holidays  # noqa: E402
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def ts(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+class TestWorkSchedule:
+    def test_inside_and_outside_the_window(self):
+        schedule = WorkSchedule("TZ=UTC Mon-Fri 08:30-18:00")
+
+        # 2024-01-03 是周三 / 2024-01-03 is a Wednesday
+        assert schedule.active(ts(2024, 1, 3, 9, 0))
+        assert not schedule.active(ts(2024, 1, 3, 8, 29))
+        assert schedule.seconds_until_active(ts(2024, 1, 3, 8, 0)) == 30 * 60
+        assert not schedule.active(ts(2024, 1, 3, 18, 0))
+
+    def test_weekend_sleeps_until_monday(self):
+        schedule = WorkSchedule("TZ=UTC Mon-Fri 08:30-18:00")
+
+        start, end = schedule.next_window(ts(2024, 1, 5, 19, 0))
+
+        assert start == ts(2024, 1, 8, 8, 30)
+        assert end == ts(2024, 1, 8, 18, 0)
+
+    def test_several_entries_and_ranges(self):
+        schedule = WorkSchedule("TZ=UTC Mon-Thu 08:00-12:00,13:00-17:30; Fri 08:00-14:00")
+
+        assert schedule.seconds_until_active(ts(2024, 1, 1, 12, 30)) == 30 * 60
+        assert schedule.active(ts(2024, 1, 5, 13, 59))
+        assert schedule.next_window(ts(2024, 1, 5, 14, 0))[0] == ts(2024, 1, 8, 8, 0)
+
+    def test_window_across_midnight(self):
+        schedule = WorkSchedule("TZ=UTC Fri-Mon 22:00-06:00")
+
+        assert schedule.active(ts(2024, 1, 6, 3, 0))
+        # 周一晚上开始的窗口延续到周二早上 / Monday night's window runs into Tuesday morning
+        assert schedule.active(ts(2024, 1, 2, 5, 59))
+        assert not schedule.active(ts(2024, 1, 2, 6, 0))
+        assert schedule.next_window(ts(2024, 1, 2, 6, 0))[0] == ts(2024, 1, 5, 22, 0)
+
+    def test_holidays_are_skipped(self):
+        schedule = WorkSchedule("TZ=UTC Mon-Fri 09:00-17:00", holidays=[date(2024, 1, 1)])
+
+        assert not schedule.active(ts(2024, 1, 1, 10, 0))
+        assert schedule.next_window(ts(2024, 1, 1, 10, 0))[0] == ts(2024, 1, 2, 9, 0)
+
+    def test_time_zone_and_dst(self):
+        schedule = WorkSchedule("TZ=Europe/Berlin Mon-Fri 09:00-17:00")
+
+        # 冬令时 UTC+1，夏令时 UTC+2 / UTC+1 in winter, UTC+2 in summer
+        assert schedule.next_window(ts(2024, 1, 8, 0, 0))[0] == ts(2024, 1, 8, 8, 0)
+        assert schedule.next_window(ts(2024, 7, 1, 0, 0))[0] == ts(2024, 7, 1, 7, 0)
+        # 切换后的周一 / The Monday after the switch
+        assert schedule.next_window(ts(2024, 3, 30, 12, 0))[0] == ts(2024, 4, 1, 7, 0)
+
+    @pytest.mark.parametrize(
+        "spec",
+        [
+            "",
+            "Mon-Fri",
+            "Mon-Fry 08:00-09:00",
+            "Mon 25:00-26:00",
+            "Mon 08:60-09:00",
+            "Mon 08:00-08:00",
+            "Mon 0800",
+            "TZ=Nowhere/City Mon 08:00-09:00",
+        ],
+    )
+    def test_invalid_specs(self, spec):
+        with pytest.raises(ValueError):
+            WorkSchedule(spec)
+
+    def test_parse_holidays(self, tmp_path):
+        assert parse_holidays("2024-12-25, 2024-12-26") == [date(2024, 12, 25), date(2024, 12, 26)]
+        path = tmp_path / "holidays.txt"
+        path.write_text("# 公司假期 / Company holidays\n2024-05-01\n\n2024-10-01  # national day\n")
+        assert parse_holidays(str(path)) == [date(2024, 5, 1), date(2024, 10, 1)]
+        with pytest.raises(ValueError):
+            parse_holidays("2024-13-01")
+
+
+class TestRunWithSchedule:
+    def test_one_wait_per_night_and_weekend(self):
+        # EPOCH 是周一 00:00 UTC / EPOCH is Monday 00:00 UTC
+        schedule = WorkSchedule("TZ=UTC Mon-Fri 08:30-18:00")
+
+        result = simulate(duration=7 * DAY, interval=60, schedule=schedule)
+
+        ticks_per_day = (9 * HOUR + 30 * 60) // 60
+        assert abs(result.move_count - 5 * ticks_per_day) <= 5
+        # 周一凌晨、四个工作日夜晚和周末各一次长等待 / One long wait for early Monday, each weeknight and the weekend
+        long_waits = [seconds for seconds in result.sleeps if seconds > 60]
+        assert len(long_waits) == 6
+        assert len(result.sleeps) < 7 * DAY / 60 / 2
+
+    def test_deadline_scheduler_reanchors_at_window_start(self):
+        schedule = WorkSchedule("TZ=UTC Mon-Fri 08:30-18:00")
+
+        result = simulate(duration=DAY, interval=60, scheduler="deadline", schedule=schedule)
+
+        assert result.tick_times[0] == 8.5 * HOUR
+        assert result.tick_times[1] == 8.5 * HOUR + 60
+
+    def test_wait_is_capped_by_duration(self):
+        schedule = WorkSchedule("TZ=UTC Sat 08:00-09:00")
+
+        result = simulate(duration=HOUR, interval=60, schedule=schedule)
+
+        assert result.move_count == 0
+        assert result.finished
+        assert result.sleeps == [HOUR]
+
+    def test_stop_wakes_the_long_wait(self):
+        ctrl = MagicMock()
+        ctrl.get_position.return_value = MousePosition(100, 100)
+        ctrl.get_screen_size.return_value = ScreenSize(1920, 1080)
+        control = Control()
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            control.stop()
+
+        mover = MouseMover(
+            controller=ctrl,
+            print_func=lambda *args: None,
+            sleep_func=sleep,
+            time_func=lambda: ts(2024, 1, 6, 12, 0),
+            control=control,
+        )
+
+        move_count, _ = mover.run(interval=60, schedule=WorkSchedule("TZ=UTC Mon-Fri 08:30-18:00"))
+
+        assert move_count == 0
+        assert sleeps == [ts(2024, 1, 8, 8, 30) - ts(2024, 1, 6, 12, 0)]
+        # 看门狗按长等待判断健康 / The watchdog judges health against the long wait
+        assert control.stats()["current_interval"] == sleeps[0]
+        assert control.stats()["skips"] == 1
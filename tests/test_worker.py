@@ -0,0 +1,200 @@
+"""
+Tests for mouse_keepalive.worker module
+"""
+
+import io
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive import backends  # noqa: E402
+from mouse_keepalive.backends import IDLE, NullController, register_backend, reopen_controller  # noqa: E402
+from mouse_keepalive.instance_lock import InstanceLock  # noqa: E402
+from mouse_keepalive.move_mouse import MouseMover  # noqa: E402
+from mouse_keepalive.worker import Worker, _default_mover  # noqa: E402
+
+
+def make_worker(instance=None):
+    output = io.StringIO()
+    movers = []
+
+    def factory(reporter):
+        mover = MouseMover(controller=NullController(), reporter=reporter, idle_func=lambda: None)
+        movers.append(mover)
+        return mover
+
+    return Worker(output, factory, instance), output, movers
+
+
+def lines(output):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class TestWorker:
+    def test_start_stats_stop(self):
+        worker, _, _ = make_worker()
+
+        assert worker.handle({"id": 1, "cmd": "start", "interval": 0.05}) == {"id": 1, "ok": True}
+        wait_for(lambda: worker.stats().get("successes", 0) >= 2)
+        reply = worker.handle({"id": 2, "cmd": "stats"})
+        assert reply["ok"] and reply["result"]["running"]
+
+        assert worker.handle({"id": 3, "cmd": "stop"}) == {"id": 3, "ok": True}
+        assert not worker.running
+        worker.close()
+
+    def test_mover_is_reused_across_starts(self):
+        worker, _, movers = make_worker()
+
+        for request_id in (1, 2):
+            assert worker.handle({"id": request_id, "cmd": "start", "interval": 60})["ok"]
+            worker.handle({"id": request_id, "cmd": "stop"})
+
+        assert len(movers) == 1
+        worker.close()
+
+    def test_control_commands(self):
+        worker, _, _ = make_worker()
+        worker.handle({"id": 1, "cmd": "start", "interval": 60})
+
+        assert worker.handle({"id": 2, "cmd": "pause"})["ok"]
+        assert worker.stats()["paused"] is True
+        assert worker.handle({"id": 3, "cmd": "set-interval", "interval": 30})["ok"]
+        assert worker.stats()["interval"] == 30
+        assert worker.handle({"id": 4, "cmd": "set-method", "method": "keyboard"})["ok"]
+        worker.close()
+
+    def test_errors_are_replies(self):
+        worker, _, _ = make_worker()
+
+        assert worker.handle({"id": 1, "cmd": "pause"}) == {"id": 1, "ok": False, "error": "not running"}
+        assert not worker.handle({"id": 2, "cmd": "frobnicate"})["ok"]
+        assert not worker.handle({"id": 3, "cmd": "start", "interval": 0})["ok"]
+        assert not worker.handle({"id": 4, "cmd": "start", "speed": 3})["ok"]
+        assert not worker.handle({"id": 5, "cmd": "start", "method": "telepathy"})["ok"]
+        assert not worker.handle(["start"])["ok"]
+
+        assert not worker.handle({"id": 5, "cmd": "start", "scheduler": "cron"})["ok"]
+        assert not worker.handle({"id": 5, "cmd": "start", "missed_policy": "never"})["ok"]
+        assert not worker.handle({"id": 5, "cmd": "start", "jitter": -1})["ok"]
+        assert not worker.handle({"id": 5, "cmd": "start", "jitter": "lots"})["ok"]
+        assert not worker.running
+
+        worker.handle({"id": 6, "cmd": "start", "interval": 60})
+        assert worker.handle({"id": 7, "cmd": "start"})["error"] == "already running"
+        assert worker.handle({"id": 8, "cmd": "set-interval"})["error"] == "missing field: 'interval'"
+        worker.close()
+
+    def test_session_lock_is_held_until_close(self, tmp_path):
+        worker, _, _ = make_worker(InstanceLock("s", str(tmp_path)))
+        other = InstanceLock("s", str(tmp_path))
+
+        assert worker.handle({"id": 1, "cmd": "start", "interval": 60})["ok"]
+        worker.handle({"id": 2, "cmd": "stop"})
+        # stop 后仍然持有，下一次 start 不会被别的进程抢先 / Still held after stop, so the next start cannot lose it
+        assert not other.acquire()
+        worker.close()
+
+        assert other.acquire()
+        reply = worker.handle({"id": 3, "cmd": "start", "interval": 60})
+        assert not reply["ok"] and reply["error"].startswith("already running in this session")
+        other.release()
+
+    def test_stop_that_times_out_keeps_the_loop(self):
+        entered, release = threading.Event(), threading.Event()
+
+        class StuckController(NullController):
+            def move_to(self, x, y, duration=0.0):
+                entered.set()
+                release.wait(5)
+
+        worker = Worker(io.StringIO(), lambda reporter: MouseMover(controller=StuckController(), reporter=reporter))
+        worker.handle({"id": 1, "cmd": "start", "interval": 60})
+        assert entered.wait(2)
+        try:
+            with patch("mouse_keepalive.worker.STOP_TIMEOUT", 0.05):
+                reply = worker.handle({"id": 2, "cmd": "stop"})
+                assert not reply["ok"] and reply["error"].startswith("still stopping")
+                assert worker.running
+                assert worker.handle({"id": 3, "cmd": "start"})["error"] == "already running"
+        finally:
+            release.set()
+
+        assert worker.handle({"id": 4, "cmd": "stop"})["ok"]
+        assert not worker.running
+        worker.close()
+
+    def test_backend_setup_failure_is_a_reply(self):
+        def factory(reporter):
+            raise OSError(13, "Permission denied: '/dev/uinput'")
+
+        worker = Worker(io.StringIO(), factory)
+
+        reply = worker.handle({"id": 1, "cmd": "start", "interval": 60})
+
+        assert not reply["ok"] and "/dev/uinput" in reply["error"]
+        assert worker.handle({"id": 2, "cmd": "stats"})["ok"]
+        worker.close()
+
+    def test_serve_replies_and_events(self):
+        worker, output, _ = make_worker()
+
+        def requests():
+            yield '{"id": 1, "cmd": "start", "interval": 60}'
+            wait_for(lambda: worker.stats().get("successes", 0) >= 1)
+            yield "not json"
+            yield ""
+            yield '{"id": 2, "cmd": "quit"}'
+            yield '{"id": 3, "cmd": "stats"}'
+
+        worker.serve(requests())
+
+        messages = lines(output)
+        replies = [message for message in messages if "id" in message]
+        assert replies[0] == {"id": 1, "ok": True}
+        assert replies[1]["ok"] is False and replies[1]["id"] is None
+        # quit 之后的请求不再处理 / Requests after quit are not handled
+        assert replies[-1] == {"id": 2, "ok": True}
+        events = [message["event"] for message in messages if "id" not in message]
+        assert events[0] == "start"
+        assert "move" in events
+
+
+class IdleController(NullController):
+    def __init__(self, display=None):
+        super().__init__(display)
+        self.idle = 0.0
+
+    def idle_seconds(self):
+        return self.idle
+
+
+class TestDefaultMover:
+    def test_null_backend_calls_directly(self):
+        mover = _default_mover(None, "null")
+
+        assert mover.call_timeout is None
+
+    def test_idle_query_follows_reconnects(self):
+        with patch.dict(backends._registry), patch.dict(backends._instances):
+            register_backend("idle", IdleController, {IDLE})
+            mover = _default_mover(None, "idle")
+            backends.get_controller("idle").idle = 5.0
+            assert mover.idle_func() == 5.0
+
+            reopen_controller("idle").idle = 7.0
+
+            assert mover.idle_func() == 7.0
@@ -0,0 +1,111 @@
+"""
+Tests for mouse_keepalive.x11 module
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from mouse_keepalive.move_mouse import ScreenSize  # noqa: E402
+from mouse_keepalive.x11 import X11Controller, guard_connection  # noqa: E402
+
+
+def make_libs():
+    xlib, xtst = MagicMock(), MagicMock()
+    xlib.XOpenDisplay.return_value = 1234
+    xlib.XDisplayWidth.return_value = 1920
+    xlib.XDisplayHeight.return_value = 1080
+    xlib.XKeysymToKeycode.return_value = 50
+    return xlib, xtst
+
+
+class TestX11Controller:
+    def test_connection_is_opened_once(self):
+        xlib, xtst = make_libs()
+        ctrl = X11Controller(":3", xlib=xlib, xtst=xtst)
+
+        assert ctrl.get_screen_size() == ScreenSize(1920, 1080)
+        ctrl.move_to(10, 20)
+        ctrl.get_position()
+
+        xlib.XOpenDisplay.assert_called_once_with(b":3")
+        xtst.XTestFakeMotionEvent.assert_called_once_with(1234, -1, 10, 20, 0)
+        xlib.XFlush.assert_called_once_with(1234)
+
+    def test_press_key_sends_press_and_release(self):
+        xlib, xtst = make_libs()
+        ctrl = X11Controller(xlib=xlib, xtst=xtst)
+
+        ctrl.press_key("shift")
+
+        xlib.XStringToKeysym.assert_called_once_with(b"Shift_L")
+        assert [call.args[2] for call in xtst.XTestFakeKeyEvent.call_args_list] == [True, False]
+
+    def test_jiggle_flushes_move_and_inverse_together(self):
+        xlib, xtst = make_libs()
+        ctrl = X11Controller(xlib=xlib, xtst=xtst)
+
+        ctrl.jiggle(25, -25)
+
+        assert [call.args for call in xtst.XTestFakeRelativeMotionEvent.call_args_list] == [
+            (1234, 25, -25, 0),
+            (1234, -25, 25, 0),
+        ]
+        xlib.XFlush.assert_called_once_with(1234)
+
+    def test_move_path_flushes_all_steps_together(self):
+        xlib, xtst = make_libs()
+        ctrl = X11Controller(xlib=xlib, xtst=xtst)
+
+        ctrl.move_path([3, 4, -3, -4])
+
+        assert [call.args for call in xtst.XTestFakeRelativeMotionEvent.call_args_list] == [
+            (1234, 3, 4, 0),
+            (1234, -3, -4, 0),
+        ]
+        xlib.XFlush.assert_called_once_with(1234)
+
+    def test_open_failure_raises(self):
+        xlib, xtst = make_libs()
+        xlib.XOpenDisplay.return_value = None
+        ctrl = X11Controller(":9", xlib=xlib, xtst=xtst)
+
+        with pytest.raises(OSError):
+            ctrl.get_position()
+
+    def test_close(self):
+        xlib, xtst = make_libs()
+        ctrl = X11Controller(xlib=xlib, xtst=xtst)
+        ctrl.get_position()
+        ctrl.close()
+        xlib.XCloseDisplay.assert_called_once_with(1234)
+
+    def test_lost_connection_raises_instead_of_exiting(self):
+        xlib, xtst = make_libs()
+        handlers = []
+        xlib.XSetIOErrorExitHandler.side_effect = lambda dpy, handler, data: handlers.append(handler)
+        ctrl = X11Controller(":5", xlib=xlib, xtst=xtst)
+        ctrl.get_position()
+        # X 服务器退出：Xlib 调用退出回调而不是 exit() / The X server goes away: Xlib calls the exit handler
+        # rather than exit()
+        xlib.XFlush.side_effect = lambda dpy: handlers[0](dpy, None)
+
+        with pytest.raises(OSError, match="Lost the connection"):
+            ctrl.move_to(10, 20)
+
+        xlib.XFlush.side_effect = None
+        ctrl.move_to(10, 20)
+        assert xlib.XOpenDisplay.call_count == 2
+        ctrl.close()
+        xlib.XCloseDisplay.assert_called_once_with(1234)
+
+    def test_old_libx11_without_exit_handler(self):
+        xlib = MagicMock(spec=["XSetIOErrorHandler"])
+
+        assert not guard_connection(xlib, 1234)
+        xlib.XSetIOErrorHandler.assert_not_called()